@@ -0,0 +1,194 @@
+"""Add stored, language-aware search_vector columns to documents and chunks
+
+Revision ID: 113
+Revises: 112
+
+Full-text search previously recomputed to_tsvector('english', content) per
+row at query time. This migration:
+
+1. Adds searchspaces.text_search_config ('swedish' | 'english' | 'simple',
+   default 'swedish').
+2. Adds nullable tsvector columns documents.search_vector and
+   chunks.search_vector (metadata-only ALTERs, no table rewrite).
+3. Installs BEFORE INSERT/UPDATE triggers that fill the columns with
+   to_tsvector(<search space config>, content) for new and edited rows.
+4. Backfills existing rows in id-range batches, each committed on its own,
+   so no long-running transaction holds row locks.
+5. Builds GIN indexes on the new columns CONCURRENTLY and drops the old
+   to_tsvector('english', content) expression indexes.
+
+The migration is safe to re-run after an interruption: columns and indexes
+use IF NOT EXISTS and the backfill only touches rows that are still NULL.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "113"
+down_revision: str | None = "112"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Kept inline (instead of importing app.retriever.text_search) so the
+# migration does not change if the application code does.
+_TRIGGER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION documents_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector(
+            COALESCE(
+                (SELECT s.text_search_config FROM searchspaces s
+                 WHERE s.id = NEW.search_space_id),
+                'swedish'
+            )::regconfig,
+            COALESCE(NEW.content, '')
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION chunks_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector(
+            COALESCE(
+                (SELECT s.text_search_config FROM documents d
+                 JOIN searchspaces s ON s.id = d.search_space_id
+                 WHERE d.id = NEW.document_id),
+                'swedish'
+            )::regconfig,
+            COALESCE(NEW.content, '')
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS documents_search_vector_trigger ON documents",
+    """
+    CREATE TRIGGER documents_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF content, search_space_id ON documents
+    FOR EACH ROW EXECUTE FUNCTION documents_search_vector_update()
+    """,
+    "DROP TRIGGER IF EXISTS chunks_search_vector_trigger ON chunks",
+    """
+    CREATE TRIGGER chunks_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF content, document_id ON chunks
+    FOR EACH ROW EXECUTE FUNCTION chunks_search_vector_update()
+    """,
+)
+
+_BACKFILL_SQL = {
+    "documents": """
+        UPDATE documents AS d
+        SET search_vector = to_tsvector(s.text_search_config::regconfig, d.content)
+        FROM searchspaces AS s
+        WHERE s.id = d.search_space_id
+          AND d.id >= :start_id AND d.id < :end_id
+          AND d.search_vector IS NULL
+    """,
+    "chunks": """
+        UPDATE chunks AS c
+        SET search_vector = to_tsvector(s.text_search_config::regconfig, c.content)
+        FROM documents AS d
+        JOIN searchspaces AS s ON s.id = d.search_space_id
+        WHERE d.id = c.document_id
+          AND c.id >= :start_id AND c.id < :end_id
+          AND c.search_vector IS NULL
+    """,
+}
+
+
+def _backfill(table: str) -> None:
+    connection = op.get_bind()
+    bounds = connection.execute(
+        sa.text(f"SELECT MIN(id), MAX(id) FROM {table} WHERE search_vector IS NULL")
+    ).first()
+    if not bounds or bounds[0] is None:
+        return
+    min_id, max_id = bounds
+    for start_id in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+        # Each statement commits on its own inside the autocommit block.
+        connection.execute(
+            sa.text(_BACKFILL_SQL[table]),
+            {"start_id": start_id, "end_id": start_id + BACKFILL_BATCH_SIZE},
+        )
+
+
+def upgrade() -> None:
+    """Add stored search vectors, triggers, backfill and GIN indexes."""
+    op.execute(
+        """
+        ALTER TABLE searchspaces
+        ADD COLUMN IF NOT EXISTS text_search_config VARCHAR(32)
+        NOT NULL DEFAULT 'swedish'
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'ck_searchspaces_text_search_config'
+            ) THEN
+                ALTER TABLE searchspaces
+                ADD CONSTRAINT ck_searchspaces_text_search_config
+                CHECK (text_search_config IN ('swedish', 'english', 'simple'));
+            END IF;
+        END;
+        $$
+        """
+    )
+    op.execute("ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    op.execute("ALTER TABLE chunks ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    for statement in _TRIGGER_DDL:
+        op.execute(statement)
+
+    # Backfill and index outside the migration transaction so every batch
+    # commits independently and the indexes can be built CONCURRENTLY.
+    with op.get_context().autocommit_block():
+        _backfill("documents")
+        _backfill("chunks")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS document_search_vector_index "
+            "ON documents USING gin (search_vector)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS chunks_search_vector_index "
+            "ON chunks USING gin (search_vector)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS document_search_index")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS chucks_search_index")
+
+
+def downgrade() -> None:
+    """Restore the english expression indexes and drop the stored vectors."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS document_search_index "
+            "ON documents USING gin (to_tsvector('english', content))"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS chucks_search_index "
+            "ON chunks USING gin (to_tsvector('english', content))"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS chunks_search_vector_index")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS document_search_vector_index")
+
+    op.execute("DROP TRIGGER IF EXISTS chunks_search_vector_trigger ON chunks")
+    op.execute("DROP TRIGGER IF EXISTS documents_search_vector_trigger ON documents")
+    op.execute("DROP FUNCTION IF EXISTS chunks_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS documents_search_vector_update()")
+    op.execute("ALTER TABLE chunks DROP COLUMN IF EXISTS search_vector")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS search_vector")
+    op.execute(
+        "ALTER TABLE searchspaces "
+        "DROP CONSTRAINT IF EXISTS ck_searchspaces_text_search_config"
+    )
+    op.execute("ALTER TABLE searchspaces DROP COLUMN IF EXISTS text_search_config")
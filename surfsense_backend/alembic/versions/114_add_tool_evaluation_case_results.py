@@ -0,0 +1,74 @@
+"""Add memoized tool evaluation case results table
+
+Revision ID: 114
+Revises: 113
+
+Stores the outcome of every finished tool-evaluation case under a key built
+from the case, the prompts and the metadata of the tools it retrieved, so
+re-runs and interrupted runs only evaluate cases whose inputs changed.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "114"
+down_revision: str | None = "113"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tool_evaluation_case_results_global",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.Column(
+            "search_space_id",
+            sa.Integer(),
+            sa.ForeignKey("searchspaces.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("evaluation_kind", sa.String(length=40), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("test_id", sa.String(length=200), nullable=True),
+        sa.Column(
+            "outcome",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.UniqueConstraint(
+            "cache_key", name="uq_tool_evaluation_case_results_cache_key"
+        ),
+    )
+    for column in ("search_space_id", "evaluation_kind", "updated_at"):
+        op.create_index(
+            f"ix_tool_evaluation_case_results_global_{column}",
+            "tool_evaluation_case_results_global",
+            [column],
+        )
+
+
+def downgrade() -> None:
+    for column in ("updated_at", "evaluation_kind", "search_space_id"):
+        op.drop_index(
+            f"ix_tool_evaluation_case_results_global_{column}",
+            table_name="tool_evaluation_case_results_global",
+        )
+    op.drop_table("tool_evaluation_case_results_global")
@@ -0,0 +1,66 @@
+"""Add indexes for keyset-paginated thread listing and title search
+
+Revision ID: 115
+Revises: 114
+
+The sidebar lists threads per (search_space_id, archived) ordered by
+(updated_at DESC, id DESC) and filtered by the visibility rule
+(created_by_id = user OR visibility = SEARCH_SPACE OR created_by_id IS NULL).
+Each branch of that rule is served by one of the composite indexes below,
+so a page is an index range scan regardless of how many threads exist.
+
+Indexes added:
+1. idx_new_chat_threads_title_trgm - GIN trigram on title for ILIKE '%term%'
+2. idx_new_chat_threads_space_creator_updated - own and legacy threads
+3. idx_new_chat_threads_space_visibility_updated - shared threads
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "115"
+down_revision: str | None = "114"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add pg_trgm title index and keyset pagination indexes for threads."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    # 1. GIN trigram index on new_chat_threads.title for thread search
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_new_chat_threads_title_trgm
+        ON new_chat_threads USING gin (title gin_trgm_ops);
+        """
+    )
+
+    # 2. Own threads (created_by_id = user) and legacy threads (created_by_id IS NULL)
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_new_chat_threads_space_creator_updated
+        ON new_chat_threads
+            (search_space_id, archived, created_by_id, updated_at DESC, id DESC)
+        INCLUDE (title, visibility, created_at);
+        """
+    )
+
+    # 3. Threads shared with the search space (visibility = SEARCH_SPACE)
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_new_chat_threads_space_visibility_updated
+        ON new_chat_threads
+            (search_space_id, archived, visibility, updated_at DESC, id DESC)
+        INCLUDE (title, created_by_id, created_at);
+        """
+    )
+
+
+def downgrade() -> None:
+    """Remove thread listing indexes (extension is left in place)."""
+    op.execute("DROP INDEX IF EXISTS idx_new_chat_threads_space_visibility_updated;")
+    op.execute("DROP INDEX IF EXISTS idx_new_chat_threads_space_creator_updated;")
+    op.execute("DROP INDEX IF EXISTS idx_new_chat_threads_title_trgm;")
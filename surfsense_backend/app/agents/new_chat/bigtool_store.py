@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import dataclasses
 import hashlib
 import json
+import threading
+from collections import OrderedDict
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 from langchain_core.tools import BaseTool
 from langgraph.store.memory import InMemoryStore
 
@@ -17,6 +21,10 @@ from app.agents.new_chat.marketplace_tools import (
     MARKETPLACE_TOOL_DEFINITIONS,
     build_marketplace_tool_registry,
 )
+from app.agents.new_chat.query_embeddings import (
+    embed_query_sync,
+    prefetch_query_embeddings,
+)
 from app.agents.new_chat.retrieval_feedback import get_global_retrieval_feedback_store
 from app.agents.new_chat.riksdagen_agent import RIKSDAGEN_TOOL_DEFINITIONS
 from app.agents.new_chat.sandbox_runtime import sandbox_config_from_runtime_flags
@@ -42,6 +50,7 @@ from app.agents.new_chat.tools.smhi import SMHI_TOOL_DEFINITIONS
 from app.agents.new_chat.tools.trafikanalys import TRAFIKANALYS_TOOL_DEFINITIONS
 from app.agents.new_chat.tools.trafikverket import TRAFIKVERKET_TOOL_DEFINITIONS
 from app.services.cache_control import is_cache_disabled
+from app.services.embedding_cache import embed_with_cache
 from app.services.reranker_service import RerankerService
 from app.utils.text import normalize_text as _normalize_text, tokenize as _tokenize
 
@@ -1544,6 +1553,177 @@ def _score_entry_components(
     }
 
 
+# ---------------------------------------------------------------------------
+# Inverted lexical index
+# ---------------------------------------------------------------------------
+# ``_score_entry_components`` re-normalises and substring-matches every
+# tool's fields against the query, once per tool per query.  The lexical
+# index does that work once per compiled tool index instead:
+#
+# * description tokens are mapped to the tools they occur in, so description
+#   hits are accumulated from the postings of the query tokens only;
+# * name / keyword / example phrases are posted under one character trigram
+#   (their rarest one).  A phrase can only be a substring of the query when
+#   all of its trigrams occur in the query, so looking up the query's
+#   trigrams finds every candidate phrase -- including Swedish compound
+#   words such as "befolkning" inside "befolkningsmangd" -- and only those
+#   candidates are verified with the same ``phrase in query_norm`` test.
+#
+# Tools that share nothing with the query are never touched and score 0.
+
+_LEXICAL_FIELD_NAME = 0
+_LEXICAL_FIELD_KEYWORD = 1
+_LEXICAL_FIELD_EXAMPLE = 2
+_LEXICAL_FRAGMENT_SIZE = 3
+
+
+def _text_fragments(text: str) -> set[str]:
+    size = _LEXICAL_FRAGMENT_SIZE
+    return {text[index : index + size] for index in range(len(text) - size + 1)}
+
+
+@dataclass
+class LexicalScores:
+    name_match_hits: np.ndarray
+    keyword_hits_raw: np.ndarray
+    description_hits_raw: np.ndarray
+    example_hits_raw: np.ndarray
+    keyword_hits: np.ndarray
+    description_hits: np.ndarray
+    example_hits: np.ndarray
+    lexical_score: np.ndarray
+
+    def components_at(self, position: int) -> dict[str, Any]:
+        """Same shape as ``_score_entry_components`` for one tool."""
+        return {
+            "name_match_hits": int(self.name_match_hits[position]),
+            "keyword_hits": float(self.keyword_hits[position]),
+            "keyword_hits_raw": int(self.keyword_hits_raw[position]),
+            "description_hits": float(self.description_hits[position]),
+            "description_hits_raw": int(self.description_hits_raw[position]),
+            "example_hits": float(self.example_hits[position]),
+            "example_hits_raw": int(self.example_hits_raw[position]),
+            "lexical_score": float(self.lexical_score[position]),
+        }
+
+
+@dataclass
+class LexicalToolIndex:
+    size: int
+    description_postings: dict[str, list[int]]
+    phrase_postings: dict[str, list[tuple[int, int, str]]]
+    short_phrases: list[tuple[int, int, str]]
+    keyword_counts: np.ndarray
+    description_token_counts: np.ndarray
+    example_counts: np.ndarray
+
+    def score(
+        self,
+        query_tokens: set[str],
+        query_norm: str,
+        tuning: ToolRetrievalTuning,
+    ) -> LexicalScores:
+        size = self.size
+        name_hits = np.zeros(size, dtype=np.int64)
+        field_hits = (
+            name_hits,
+            np.zeros(size, dtype=np.int64),
+            np.zeros(size, dtype=np.int64),
+        )
+        description_hits_raw = np.zeros(size, dtype=np.int64)
+        for token in query_tokens:
+            postings = self.description_postings.get(token)
+            if postings:
+                description_hits_raw[postings] += 1
+        matched_phrases = list(self.short_phrases)
+        for fragment in _text_fragments(query_norm):
+            postings = self.phrase_postings.get(fragment)
+            if postings:
+                matched_phrases.extend(postings)
+        for position, field_code, phrase in matched_phrases:
+            if phrase in query_norm:
+                field_hits[field_code][position] += 1
+        keyword_hits_raw = field_hits[_LEXICAL_FIELD_KEYWORD]
+        example_hits_raw = field_hits[_LEXICAL_FIELD_EXAMPLE]
+        keyword_hits = keyword_hits_raw / self.keyword_counts
+        description_hits = description_hits_raw / self.description_token_counts
+        example_hits = example_hits_raw / self.example_counts
+        lexical_score = (
+            (name_hits * tuning.name_match_weight)
+            + (keyword_hits * tuning.keyword_weight)
+            + (description_hits * tuning.description_token_weight)
+            + (example_hits * tuning.example_query_weight)
+        )
+        return LexicalScores(
+            name_match_hits=name_hits,
+            keyword_hits_raw=keyword_hits_raw,
+            description_hits_raw=description_hits_raw,
+            example_hits_raw=example_hits_raw,
+            keyword_hits=keyword_hits,
+            description_hits=description_hits,
+            example_hits=example_hits,
+            lexical_score=lexical_score,
+        )
+
+
+def build_lexical_tool_index(
+    tool_index: Iterable[ToolIndexEntry],
+) -> LexicalToolIndex:
+    entries = list(tool_index)
+    description_postings: dict[str, list[int]] = {}
+    phrases: list[tuple[int, int, str]] = []
+    keyword_counts: list[int] = []
+    description_token_counts: list[int] = []
+    example_counts: list[int] = []
+    for position, entry in enumerate(entries):
+        name_norm = _normalize_text(entry.name)
+        if name_norm:
+            phrases.append((position, _LEXICAL_FIELD_NAME, name_norm))
+        for keyword in entry.keywords:
+            phrases.append(
+                (position, _LEXICAL_FIELD_KEYWORD, _normalize_text(keyword))
+            )
+        for example in entry.example_queries:
+            phrases.append(
+                (position, _LEXICAL_FIELD_EXAMPLE, _normalize_text(example))
+            )
+        description_tokens = set(_tokenize(_normalize_text(entry.description)))
+        for token in description_tokens:
+            description_postings.setdefault(token, []).append(position)
+        keyword_counts.append(max(1, len(entry.keywords)))
+        description_token_counts.append(max(1, len(description_tokens)))
+        example_counts.append(max(1, len(entry.example_queries)))
+
+    fragment_frequency: dict[str, int] = {}
+    phrase_fragments: list[set[str]] = []
+    for _, _, phrase in phrases:
+        fragments = _text_fragments(phrase)
+        phrase_fragments.append(fragments)
+        for fragment in fragments:
+            fragment_frequency[fragment] = fragment_frequency.get(fragment, 0) + 1
+    phrase_postings: dict[str, list[tuple[int, int, str]]] = {}
+    short_phrases: list[tuple[int, int, str]] = []
+    for posting, fragments in zip(phrases, phrase_fragments, strict=True):
+        if not fragments:
+            short_phrases.append(posting)
+            continue
+        anchor = min(
+            fragments, key=lambda fragment: (fragment_frequency[fragment], fragment)
+        )
+        phrase_postings.setdefault(anchor, []).append(posting)
+    return LexicalToolIndex(
+        size=len(entries),
+        description_postings=description_postings,
+        phrase_postings=phrase_postings,
+        short_phrases=short_phrases,
+        keyword_counts=np.asarray(keyword_counts, dtype=np.float64),
+        description_token_counts=np.asarray(
+            description_token_counts, dtype=np.float64
+        ),
+        example_counts=np.asarray(example_counts, dtype=np.float64),
+    )
+
+
 def _build_rerank_text(entry: ToolIndexEntry) -> str:
     parts: list[str] = []
     if entry.name:
@@ -1931,7 +2111,10 @@ def _get_embedding_for_tool(
     except Exception:
         return None
     try:
-        embedding = config.embedding_model_instance.embed(text)
+        embedding = embed_with_cache(
+            [text],
+            lambda batch: [config.embedding_model_instance.embed(batch[0])],
+        )[0]
     except Exception:
         return None
     normalized = _normalize_vector(embedding)
@@ -1942,19 +2125,183 @@ def _get_embedding_for_tool(
     return normalized
 
 
-def _cosine_similarity(left: list[float], right: list[float]) -> float:
-    if not left or not right or len(left) != len(right):
-        return 0.0
-    dot = 0.0
-    norm_left = 0.0
-    norm_right = 0.0
-    for a, b in zip(left, right, strict=False):
-        dot += a * b
-        norm_left += a * a
-        norm_right += b * b
-    if norm_left == 0.0 or norm_right == 0.0:
-        return 0.0
-    return dot / ((norm_left**0.5) * (norm_right**0.5))
+# ---------------------------------------------------------------------------
+# Compiled (matrix-backed) tool index
+# ---------------------------------------------------------------------------
+# Smart retrieval scores every tool in the index on every query.  Instead of
+# computing two pure-Python cosine similarities per tool, the index is
+# compiled once into pre-normalised float32 matrices so that all semantic and
+# structural scores come out of a single matrix-vector product each.  Rows are
+# cached per (tool_id, vector_kind) and keyed on the identity of the source
+# vector, so rebuilding the index after ``build_tool_index`` or a metadata
+# override change only re-normalises the tools whose embeddings changed.
+
+_COMPILED_TOOL_INDEX_CACHE_SIZE = 32
+_COMPILED_TOOL_INDEX_CACHE: OrderedDict[tuple[int, ...], CompiledToolIndex] = (
+    OrderedDict()
+)
+_TOOL_VECTOR_ROW_CACHE: dict[tuple[str, str], tuple[list[float], np.ndarray]] = {}
+_compiled_tool_index_lock = threading.Lock()
+
+
+@dataclass
+class CompiledToolIndex:
+    entries: tuple[ToolIndexEntry, ...]
+    tool_ids: tuple[str, ...]
+    semantic_matrix: np.ndarray
+    structural_matrix: np.ndarray
+    dimension: int
+    lexical: LexicalToolIndex
+    _namespace_masks: dict[tuple[tuple[str, ...], ...], np.ndarray] = dataclasses.field(
+        default_factory=dict
+    )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def namespace_mask(self, prefixes: Iterable[tuple[str, ...]]) -> np.ndarray:
+        """Boolean mask of entries whose namespace matches any of *prefixes*."""
+        key = tuple(tuple(prefix) for prefix in prefixes)
+        mask = self._namespace_masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (
+                    any(_match_namespace(entry.namespace, prefix) for prefix in key)
+                    for entry in self.entries
+                ),
+                dtype=bool,
+                count=len(self.entries),
+            )
+            self._namespace_masks[key] = mask
+        return mask
+
+    def embedding_scores(
+        self,
+        query_embedding: list[float] | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (semantic, structural) cosine scores for every entry."""
+        size = len(self.entries)
+        if (
+            not query_embedding
+            or self.dimension == 0
+            or len(query_embedding) != self.dimension
+        ):
+            return np.zeros(size, dtype=np.float64), np.zeros(size, dtype=np.float64)
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query_vector))
+        if norm == 0.0:
+            return np.zeros(size, dtype=np.float64), np.zeros(size, dtype=np.float64)
+        query_vector /= norm
+        semantic = (self.semantic_matrix @ query_vector).astype(np.float64)
+        structural = (self.structural_matrix @ query_vector).astype(np.float64)
+        return semantic, structural
+
+
+def _vector_dimension(tool_index: list[ToolIndexEntry]) -> int:
+    for entry in tool_index:
+        for vector in (
+            entry.semantic_embedding or entry.embedding,
+            entry.structural_embedding,
+        ):
+            if vector:
+                return len(vector)
+    return 0
+
+
+def _normalized_vector_row(
+    tool_id: str,
+    vector: list[float] | None,
+    *,
+    vector_kind: str,
+    dimension: int,
+) -> np.ndarray | None:
+    if not vector or len(vector) != dimension:
+        return None
+    cache_key = (tool_id, vector_kind)
+    cached = _TOOL_VECTOR_ROW_CACHE.get(cache_key)
+    if cached is not None and cached[0] is vector:
+        return cached[1]
+    row = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(row))
+    row = row / norm if norm > 0.0 else np.zeros(dimension, dtype=np.float32)
+    if not is_cache_disabled():
+        _TOOL_VECTOR_ROW_CACHE[cache_key] = (vector, row)
+    return row
+
+
+def _compile_tool_index(tool_index: list[ToolIndexEntry]) -> CompiledToolIndex:
+    dimension = _vector_dimension(tool_index)
+    size = len(tool_index)
+    semantic_matrix = np.zeros((size, dimension), dtype=np.float32)
+    structural_matrix = np.zeros((size, dimension), dtype=np.float32)
+    for position, entry in enumerate(tool_index):
+        semantic_row = _normalized_vector_row(
+            entry.tool_id,
+            entry.semantic_embedding or entry.embedding,
+            vector_kind="semantic",
+            dimension=dimension,
+        )
+        if semantic_row is not None:
+            semantic_matrix[position] = semantic_row
+        structural_row = _normalized_vector_row(
+            entry.tool_id,
+            entry.structural_embedding,
+            vector_kind="structural",
+            dimension=dimension,
+        )
+        if structural_row is not None:
+            structural_matrix[position] = structural_row
+    return CompiledToolIndex(
+        entries=tuple(tool_index),
+        tool_ids=tuple(entry.tool_id for entry in tool_index),
+        semantic_matrix=semantic_matrix,
+        structural_matrix=structural_matrix,
+        dimension=dimension,
+        lexical=build_lexical_tool_index(tool_index),
+    )
+
+
+def get_compiled_tool_index(tool_index: list[ToolIndexEntry]) -> CompiledToolIndex:
+    """Return the compiled matrix view of *tool_index*, building it on demand.
+
+    Compiled indexes are cached by the identity of their entries (the cache
+    holds strong references, so identities stay unique while cached).  A new
+    ``build_tool_index`` result therefore compiles a new index, reusing the
+    normalised rows of every tool whose embedding vectors are unchanged.
+    """
+    if is_cache_disabled():
+        return _compile_tool_index(tool_index)
+    key = tuple(id(entry) for entry in tool_index)
+    with _compiled_tool_index_lock:
+        compiled = _COMPILED_TOOL_INDEX_CACHE.get(key)
+        if compiled is not None:
+            _COMPILED_TOOL_INDEX_CACHE.move_to_end(key)
+            return compiled
+        compiled = _compile_tool_index(tool_index)
+        _COMPILED_TOOL_INDEX_CACHE[key] = compiled
+        while len(_COMPILED_TOOL_INDEX_CACHE) > _COMPILED_TOOL_INDEX_CACHE_SIZE:
+            _COMPILED_TOOL_INDEX_CACHE.popitem(last=False)
+        return compiled
+
+
+def _top_k_positions(scores: np.ndarray, positions: np.ndarray, k: int) -> np.ndarray:
+    """Top-*k* of ``scores[positions]`` ordered by score, ties by list order.
+
+    Equivalent to a stable descending sort followed by ``[:k]`` but only
+    sorts the candidates that survive an ``argpartition``-style threshold.
+    """
+    if k <= 0 or positions.size == 0:
+        return positions[:0]
+    subset = scores[positions]
+    order_key = np.arange(positions.size)
+    if positions.size > k:
+        kth = np.partition(subset, positions.size - k)[positions.size - k]
+        keep = np.flatnonzero(subset >= kth)
+        subset = subset[keep]
+        order_key = order_key[keep]
+        positions = positions[keep]
+    order = np.lexsort((order_key, -subset))
+    return positions[order[:k]]
 
 
 def _rerank_tool_candidates(
@@ -2029,6 +2376,9 @@ def record_tool_rerank(
 def clear_tool_caches() -> None:
     _TOOL_EMBED_CACHE.clear()
     _TOOL_RERANK_TRACE.clear()
+    _TOOL_VECTOR_ROW_CACHE.clear()
+    with _compiled_tool_index_lock:
+        _COMPILED_TOOL_INDEX_CACHE.clear()
 
 
 def get_tool_rerank_trace(
@@ -2042,6 +2392,46 @@ def get_tool_rerank_trace(
     return _TOOL_RERANK_TRACE.get((str(trace_key), query_norm))
 
 
+def _build_score_breakdown(
+    entry: ToolIndexEntry,
+    *,
+    lexical: dict[str, Any],
+    semantic_score: float,
+    structural_score: float,
+    tuning: ToolRetrievalTuning,
+    namespace_bonus: float,
+    retrieval_feedback_boost: float,
+    pre_rerank_score: float,
+    namespace_scope: str,
+) -> dict[str, Any]:
+    semantic_weighted = semantic_score * tuning.semantic_embedding_weight
+    structural_weighted = structural_score * tuning.structural_embedding_weight
+    return {
+        "tool_id": entry.tool_id,
+        "name": entry.name,
+        "category": entry.category,
+        "name_match_hits": lexical["name_match_hits"],
+        "keyword_hits": lexical["keyword_hits"],
+        "description_hits": lexical["description_hits"],
+        "example_hits": lexical["example_hits"],
+        "lexical_score": float(lexical["lexical_score"]),
+        "embedding_score_raw": float(semantic_score + structural_score),
+        "embedding_score_weighted": float(semantic_weighted + structural_weighted),
+        "semantic_embedding_score_raw": float(semantic_score),
+        "semantic_embedding_score_weighted": float(semantic_weighted),
+        "structural_embedding_score_raw": float(structural_score),
+        "structural_embedding_score_weighted": float(structural_weighted),
+        "namespace_bonus": float(namespace_bonus),
+        "retrieval_feedback_boost": float(retrieval_feedback_boost),
+        "pre_rerank_score": float(pre_rerank_score),
+        "namespace_scope": namespace_scope,
+        "lexical_candidate_selected": False,
+        "vector_recall_selected": False,
+        "vector_recall_rank": None,
+        "vector_only_candidate": False,
+    }
+
+
 def _run_smart_retrieval(
     query: str,
     *,
@@ -2060,140 +2450,62 @@ def _run_smart_retrieval(
     query_embedding: list[float] | None = None
     if query:
         try:
-            from app.config import config
-
-            query_embedding = _normalize_vector(
-                config.embedding_model_instance.embed(query)
-            )
+            query_embedding = _normalize_vector(embed_query_sync(query))
         except Exception:
             query_embedding = None
 
-    primary_scored: list[tuple[str, float]] = []
-    fallback_scored: list[tuple[str, float]] = []
-    primary_vector_scored: list[tuple[str, float]] = []
-    fallback_vector_scored: list[tuple[str, float]] = []
-    breakdown_by_id: dict[str, dict[str, Any]] = {}
-
-    for entry in tool_index:
-        breakdown = _score_entry_components(
-            entry,
-            query_tokens,
-            query_norm,
-            normalized_tuning,
-        )
-        semantic_score = 0.0
-        structural_score = 0.0
-        semantic_embedding = entry.semantic_embedding or entry.embedding
-        structural_embedding = entry.structural_embedding
-        if query_embedding and semantic_embedding:
-            semantic_score = _cosine_similarity(query_embedding, semantic_embedding)
-        if query_embedding and structural_embedding:
-            structural_score = _cosine_similarity(query_embedding, structural_embedding)
-        semantic_weighted = semantic_score * normalized_tuning.semantic_embedding_weight
-        structural_weighted = (
-            structural_score * normalized_tuning.structural_embedding_weight
-        )
-        embedding_weighted = semantic_weighted + structural_weighted
-        is_primary = any(
-            _match_namespace(entry.namespace, prefix) for prefix in primary_namespaces
-        )
-        is_fallback = any(
-            _match_namespace(entry.namespace, prefix) for prefix in fallback_namespaces
-        )
-        namespace_bonus = normalized_tuning.namespace_boost if is_primary else 0.0
-        retrieval_feedback_boost = retrieval_feedback_store.get_boost(
-            tool_id=entry.tool_id,
+    compiled = get_compiled_tool_index(tool_index)
+    lexical = compiled.lexical.score(query_tokens, query_norm, normalized_tuning)
+    lexical_scores = lexical.lexical_score
+    semantic_scores, structural_scores = compiled.embedding_scores(query_embedding)
+    embedding_weighted = (
+        semantic_scores * normalized_tuning.semantic_embedding_weight
+        + structural_scores * normalized_tuning.structural_embedding_weight
+    )
+    primary_mask = compiled.namespace_mask(primary_namespaces)
+    fallback_mask = compiled.namespace_mask(fallback_namespaces) & ~primary_mask
+    namespace_bonus = np.where(primary_mask, normalized_tuning.namespace_boost, 0.0)
+    feedback_boosts = np.asarray(
+        retrieval_feedback_store.get_boosts(
+            tool_ids=list(compiled.tool_ids),
             query=query_norm or query,
-        )
-        pre_rerank_score = (
-            breakdown["lexical_score"]
-            + embedding_weighted
-            + namespace_bonus
-            + retrieval_feedback_boost
-        )
-        breakdown_by_id[entry.tool_id] = {
-            "tool_id": entry.tool_id,
-            "name": entry.name,
-            "category": entry.category,
-            "name_match_hits": breakdown["name_match_hits"],
-            "keyword_hits": breakdown["keyword_hits"],
-            "description_hits": breakdown["description_hits"],
-            "example_hits": breakdown["example_hits"],
-            "lexical_score": float(breakdown["lexical_score"]),
-            "embedding_score_raw": float(semantic_score + structural_score),
-            "embedding_score_weighted": float(embedding_weighted),
-            "semantic_embedding_score_raw": float(semantic_score),
-            "semantic_embedding_score_weighted": float(semantic_weighted),
-            "structural_embedding_score_raw": float(structural_score),
-            "structural_embedding_score_weighted": float(structural_weighted),
-            "namespace_bonus": float(namespace_bonus),
-            "retrieval_feedback_boost": float(retrieval_feedback_boost),
-            "pre_rerank_score": float(pre_rerank_score),
-            "namespace_scope": "primary" if is_primary else ("fallback" if is_fallback else "none"),
-            "lexical_candidate_selected": False,
-            "vector_recall_selected": False,
-            "vector_recall_rank": None,
-            "vector_only_candidate": False,
-        }
-        if is_primary:
-            primary_scored.append((entry.tool_id, pre_rerank_score))
-            primary_vector_scored.append((entry.tool_id, float(embedding_weighted)))
-        elif is_fallback:
-            fallback_scored.append((entry.tool_id, pre_rerank_score))
-            fallback_vector_scored.append((entry.tool_id, float(embedding_weighted)))
-
-    primary_scored.sort(key=lambda item: item[1], reverse=True)
-    fallback_scored.sort(key=lambda item: item[1], reverse=True)
-    primary_vector_scored.sort(key=lambda item: item[1], reverse=True)
-    fallback_vector_scored.sort(key=lambda item: item[1], reverse=True)
-
-    tool_index_by_id = {entry.tool_id: entry for entry in tool_index}
-    scores_by_id = {tool_id: score for tool_id, score in primary_scored}
-    scores_by_id.update({tool_id: score for tool_id, score in fallback_scored})
-
-    candidate_ids: list[str] = []
-    if primary_scored and primary_scored[0][1] > 0:
-        candidate_ids = [
-            tool_id
-            for tool_id, _ in primary_scored[: normalized_tuning.rerank_candidates]
-        ]
-    elif fallback_scored and fallback_scored[0][1] > 0:
-        candidate_ids = [
-            tool_id
-            for tool_id, _ in fallback_scored[: normalized_tuning.rerank_candidates]
-        ]
-    elif primary_scored:
-        candidate_ids = [
-            tool_id
-            for tool_id, _ in primary_scored[: normalized_tuning.rerank_candidates]
-        ]
+        ),
+        dtype=np.float64,
+    )
+    pre_rerank_scores = (
+        lexical_scores + embedding_weighted + namespace_bonus + feedback_boosts
+    )
+
+    primary_positions = np.flatnonzero(primary_mask)
+    fallback_positions = np.flatnonzero(fallback_mask)
+    rerank_k = normalized_tuning.rerank_candidates
+    primary_top = _top_k_positions(pre_rerank_scores, primary_positions, rerank_k)
+    fallback_top = _top_k_positions(pre_rerank_scores, fallback_positions, rerank_k)
+    if primary_top.size and pre_rerank_scores[primary_top[0]] > 0:
+        candidate_positions = primary_top
+    elif fallback_top.size and pre_rerank_scores[fallback_top[0]] > 0:
+        candidate_positions = fallback_top
+    elif primary_top.size:
+        candidate_positions = primary_top
     else:
-        candidate_ids = [
-            tool_id
-            for tool_id, _ in fallback_scored[: normalized_tuning.rerank_candidates]
-        ]
+        candidate_positions = fallback_top
 
-    lexical_candidate_ids = list(candidate_ids)
-    lexical_candidate_set = set(lexical_candidate_ids)
-    for tool_id in lexical_candidate_ids:
-        if tool_id in breakdown_by_id:
-            breakdown_by_id[tool_id]["lexical_candidate_selected"] = True
+    position_by_id: dict[str, int] = {}
+    for position in (*primary_positions.tolist(), *fallback_positions.tolist()):
+        position_by_id[compiled.tool_ids[position]] = position
+    candidate_ids = [compiled.tool_ids[position] for position in candidate_positions]
+    lexical_candidate_set = set(candidate_ids)
 
     vector_candidate_ids: list[str] = []
     if query_embedding:
-        vector_source = [*primary_vector_scored, *fallback_vector_scored]
-        vector_source.sort(key=lambda item: item[1], reverse=True)
+        vector_positions = _top_k_positions(
+            embedding_weighted,
+            np.concatenate([primary_positions, fallback_positions]),
+            max(1, int(_VECTOR_RECALL_TOP_K)),
+        )
         vector_candidate_ids = [
-            tool_id
-            for tool_id, semantic_score in vector_source
-        ][: max(1, int(_VECTOR_RECALL_TOP_K))]
-        for vector_rank, tool_id in enumerate(vector_candidate_ids):
-            if tool_id in breakdown_by_id:
-                breakdown_by_id[tool_id]["vector_recall_selected"] = True
-                breakdown_by_id[tool_id]["vector_recall_rank"] = vector_rank + 1
-                breakdown_by_id[tool_id]["vector_only_candidate"] = (
-                    tool_id not in lexical_candidate_set
-                )
+            compiled.tool_ids[position] for position in vector_positions
+        ]
     if vector_candidate_ids:
         deduped_candidates: list[str] = []
         seen_candidate_ids: set[str] = set()
@@ -2204,6 +2516,41 @@ def _run_smart_retrieval(
             deduped_candidates.append(tool_id)
         candidate_ids = deduped_candidates
 
+    # Per-tool breakdowns are only materialised for the candidates that are
+    # reranked, returned and traced.
+    breakdown_by_id: dict[str, dict[str, Any]] = {}
+    for tool_id in candidate_ids:
+        position = position_by_id[tool_id]
+        is_primary = bool(primary_mask[position])
+        breakdown_by_id[tool_id] = _build_score_breakdown(
+            compiled.entries[position],
+            lexical=lexical.components_at(position),
+            semantic_score=float(semantic_scores[position]),
+            structural_score=float(structural_scores[position]),
+            tuning=normalized_tuning,
+            namespace_bonus=float(namespace_bonus[position]),
+            retrieval_feedback_boost=float(feedback_boosts[position]),
+            pre_rerank_score=float(pre_rerank_scores[position]),
+            namespace_scope="primary" if is_primary else "fallback",
+        )
+        breakdown_by_id[tool_id]["lexical_candidate_selected"] = (
+            tool_id in lexical_candidate_set
+        )
+    for vector_rank, tool_id in enumerate(vector_candidate_ids):
+        breakdown_by_id[tool_id]["vector_recall_selected"] = True
+        breakdown_by_id[tool_id]["vector_recall_rank"] = vector_rank + 1
+        breakdown_by_id[tool_id]["vector_only_candidate"] = (
+            tool_id not in lexical_candidate_set
+        )
+
+    tool_index_by_id = {
+        tool_id: compiled.entries[position_by_id[tool_id]] for tool_id in candidate_ids
+    }
+    scores_by_id = {
+        tool_id: float(pre_rerank_scores[position_by_id[tool_id]])
+        for tool_id in candidate_ids
+    }
+
     reranked_ids, rerank_scores = _rerank_tool_candidates(
         query,
         candidate_ids=candidate_ids,
@@ -2351,6 +2698,7 @@ def make_smart_retriever(
 
     async def aretrieve_tools(query: str) -> list[str]:
         """Async wrapper for namespace-aware tool selection."""
+        await prefetch_query_embeddings(query)
         return retrieve_tools(query)
 
     return retrieve_tools, aretrieve_tools
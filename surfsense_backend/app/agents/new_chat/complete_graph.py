@@ -3,15 +3,48 @@
 This module provides a stable construction API used by chat streaming routes.
 It decouples callers from supervisor internals so the graph can evolve without
 touching endpoint/task wiring.
+
+``get_or_build_complete_graph`` reuses compiled graphs through
+``GraphHolder``: one graph per registry version and build configuration
+(search space, model, prompts, runtime flags).  Request-scoped objects are
+then supplied per turn through the run config, see
+``app.agents.new_chat.request_dependencies``.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+from datetime import UTC, datetime
 from typing import Any
 
 from langgraph.types import Checkpointer
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.agents.new_chat.shared_worker_pool import _fingerprint_runtime_hitl
 from app.agents.new_chat.supervisor_agent import create_supervisor_agent
+from app.agents.new_chat.system_prompt import append_datetime_context
+from app.agents.new_chat.tools.mcp_tool import mcp_connectors_fingerprint
+from app.services.graph_holder import GraphHolder
+
+logger = logging.getLogger(__name__)
+
+# Dependencies that belong to one chat turn.  A cached graph must not keep
+# them alive after the turn that happened to build it, nor fall back to them
+# (another user's id or thread) in a turn without request dependencies.
+# ``_``-prefixed entries are created by the build for that turn and handed
+# over to it.
+_REQUEST_SCOPED_DEPENDENCIES = (
+    "db_session",
+    "connector_service",
+    "user_id",
+    "thread_id",
+    "checkpoint_ns",
+    "trace_recorder",
+    "trace_parent_span_id",
+    "_fan_out_tool_registry",
+)
 
 
 async def build_complete_graph(
@@ -74,3 +107,103 @@ async def build_complete_graph(
         tool_prompt_overrides=tool_prompt_overrides,
         think_on_tool_calls=think_on_tool_calls,
     )
+
+
+def _llm_fingerprint(llm: Any) -> str:
+    try:
+        params = dict(getattr(llm, "_identifying_params", None) or {})
+    except Exception:
+        params = {}
+    serialized = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha1(serialized.encode("utf-8")).hexdigest()[:16]
+    return f"{type(llm).__name__}:{digest}"
+
+
+def supervisor_graph_cache_key(
+    *,
+    llm,
+    dependencies: dict[str, Any],
+    checkpointer: Checkpointer | None,
+    config_schema: type[Any] | None = None,
+    mcp_fingerprint: str | None = None,
+    **build_kwargs: Any,
+) -> tuple[Any, ...]:
+    """Return the ``GraphHolder`` key for a supervisor graph configuration.
+
+    Prompts are normalized to midnight of the current UTC day, so the
+    timestamps ``append_datetime_context`` writes into them do not defeat
+    the cache while a changed date still does.  ``mcp_fingerprint`` ties
+    the graph to the MCP connectors its routing tool index was built from.
+    """
+    midnight = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    normalized = {
+        name: (
+            append_datetime_context(value, today=midnight)
+            if isinstance(value, str)
+            else value
+        )
+        for name, value in build_kwargs.items()
+    }
+    serialized = json.dumps(normalized, sort_keys=True, default=str)
+    return (
+        dependencies.get("search_space_id"),
+        _llm_fingerprint(llm),
+        id(checkpointer),
+        getattr(config_schema, "__name__", None),
+        _fingerprint_runtime_hitl(dependencies.get("runtime_hitl")),
+        mcp_fingerprint,
+        hashlib.sha1(serialized.encode("utf-8")).hexdigest(),
+    )
+
+
+async def _build_from_registry(*, registry, dependencies: dict[str, Any], **kwargs):
+    build_dependencies = {**dependencies, "graph_registry": registry}
+    graph = await build_complete_graph(dependencies=build_dependencies, **kwargs)
+    for name in _REQUEST_SCOPED_DEPENDENCIES:
+        value = build_dependencies.pop(name, None)
+        if name.startswith("_") and value is not None:
+            dependencies.setdefault(name, value)
+    return graph
+
+
+GraphHolder.set_build_fn(_build_from_registry)
+
+
+async def get_or_build_complete_graph(
+    *,
+    llm,
+    dependencies: dict[str, Any],
+    checkpointer: Checkpointer | None,
+    **build_kwargs: Any,
+):
+    """Return a compiled supervisor graph shared across chat turns.
+
+    The graph is rebuilt when the ``GraphRegistry`` version changes, the
+    search space's MCP connectors change, or the build configuration differs
+    from every cached graph.  Callers must pass the request's
+    ``dependencies`` in the run config under ``REQUEST_DEPENDENCIES_KEY``
+    when they invoke the returned graph.
+    """
+    session = dependencies.get("db_session")
+    search_space_id = dependencies.get("search_space_id")
+    mcp_fingerprint = None
+    if isinstance(session, AsyncSession) and search_space_id is not None:
+        try:
+            mcp_fingerprint = await mcp_connectors_fingerprint(session, search_space_id)
+        except Exception:
+            logger.warning("Failed to fingerprint MCP connectors", exc_info=True)
+    key = supervisor_graph_cache_key(
+        llm=llm,
+        dependencies=dependencies,
+        checkpointer=checkpointer,
+        mcp_fingerprint=mcp_fingerprint,
+        **build_kwargs,
+    )
+    return await GraphHolder.get(
+        session,
+        key=key,
+        llm=llm,
+        dependencies=dependencies,
+        checkpointer=checkpointer,
+        **build_kwargs,
+    )
@@ -5,17 +5,52 @@ Sprint P1 Extra: Parses JSON tokens as they arrive during ``astream()``,
 extracting the ``thinking`` field progressively so it can be streamed
 as reasoning-delta events while the rest of the schema fills in.
 
-Uses ``partial-json-parser`` for robust partial JSON parsing — handles
-all edge cases (nested objects, escaped strings, incomplete arrays)
-that the previous regex-based approach missed.
+The parser is a small resumable tokenizer for the top-level JSON object:
+tokenizer state survives between chunks, so each chunk is scanned once and
+the total cost is O(n) in the response length (re-parsing the whole buffer
+on every chunk made long synthesizer responses quadratic).  Top-level
+string values are decoded as they stream, escapes split across chunks
+included, and the ``thinking``/``response`` text is handed out as deltas
+without rebuilding the partial object.  Nested values are captured raw and
+decoded once, when they close.
 """
 
 from __future__ import annotations
 
 import json
+import re
 from typing import Any
 
-from partial_json_parser import loads as partial_loads
+# Fields whose decoded text is reported as deltas while it streams.
+_DELTA_FIELDS = ("thinking", "response")
+
+_WHITESPACE = " \t\n\r"
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_NESTED_SPECIAL_RE = re.compile(r'["\\{}\[\]]')
+_SCALAR_END_RE = re.compile(r"[,}\]\s]")
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+# Tokenizer states
+_BEFORE_OBJECT = "before_object"
+_EXPECT_KEY = "expect_key"
+_IN_KEY = "in_key"
+_EXPECT_COLON = "expect_colon"
+_EXPECT_VALUE = "expect_value"
+_IN_STRING = "in_string"
+_IN_NESTED = "in_nested"
+_IN_SCALAR = "in_scalar"
+_AFTER_VALUE = "after_value"
+_DONE = "done"
+_FAILED = "failed"
 
 
 class IncrementalSchemaParser:
@@ -24,6 +59,11 @@ class IncrementalSchemaParser:
     Feed chunks one at a time via :meth:`feed`.  The parser extracts the
     ``thinking`` field progressively and returns deltas of new text.
 
+    The *partial_result* returned by the ``feed*`` methods holds the
+    top-level fields whose values are complete (the string currently
+    streaming is reported through the deltas).  It is ``None`` until the
+    opening ``{`` has been seen, or if the output is not a JSON object.
+
     Example::
 
         parser = IncrementalSchemaParser()
@@ -35,10 +75,25 @@ class IncrementalSchemaParser:
     """
 
     def __init__(self) -> None:
-        self._buffer: str = ""
+        self._chunks: list[str] = []
         self._last_thinking_len: int = 0
         self._last_response_len: int = 0
 
+        self._state: str = _BEFORE_OBJECT
+        self._fields: dict[str, Any] = {}
+        self._key: str | None = None
+        # Decoded pieces of the key or string value being read
+        self._parts: list[str] = []
+        # Unfinished escape sequence carried over from the previous chunk
+        self._escape: str = ""
+        # Raw text of the nested or scalar value being read
+        self._raw: list[str] = []
+        self._depth: int = 0
+        self._nested_in_string: bool = False
+        self._nested_escape: bool = False
+        # Streamed text not yet handed out, per delta field
+        self._pending: dict[str, list[str]] = {field: [] for field in _DELTA_FIELDS}
+
     def feed(self, chunk: str) -> tuple[str, dict[str, Any] | None]:
         """Feed a new chunk.  Returns ``(thinking_delta, partial_result)``.
 
@@ -47,17 +102,10 @@ class IncrementalSchemaParser:
         *partial_result* is the best-effort parsed dict so far, or
         ``None`` if parsing is not yet possible.
         """
-        self._buffer += chunk
-        partial = self._try_partial_parse()
-
-        thinking_delta = ""
-        if isinstance(partial, dict) and "thinking" in partial:
-            full_thinking = str(partial["thinking"])
-            if len(full_thinking) > self._last_thinking_len:
-                thinking_delta = full_thinking[self._last_thinking_len:]
-                self._last_thinking_len = len(full_thinking)
-
-        return thinking_delta, partial
+        self._consume(chunk)
+        thinking_delta = self._take_delta("thinking")
+        self._last_thinking_len += len(thinking_delta)
+        return thinking_delta, self._partial()
 
     def feed_all(self, chunk: str) -> tuple[str, str, dict[str, Any] | None]:
         """Feed a new chunk.  Returns ``(thinking_delta, response_delta, partial)``.
@@ -65,67 +113,234 @@ class IncrementalSchemaParser:
         Combines thinking and response tracking in a single call — useful for
         output pipeline nodes where the streaming handler needs both deltas.
         """
-        self._buffer += chunk
-        partial = self._try_partial_parse()
-
-        thinking_delta = ""
-        if isinstance(partial, dict) and "thinking" in partial:
-            full_thinking = str(partial["thinking"])
-            if len(full_thinking) > self._last_thinking_len:
-                thinking_delta = full_thinking[self._last_thinking_len:]
-                self._last_thinking_len = len(full_thinking)
-
-        response_delta = ""
-        if isinstance(partial, dict) and "response" in partial:
-            full_response = str(partial["response"])
-            if len(full_response) > self._last_response_len:
-                response_delta = full_response[self._last_response_len:]
-                self._last_response_len = len(full_response)
-
-        return thinking_delta, response_delta, partial
+        self._consume(chunk)
+        thinking_delta = self._take_delta("thinking")
+        self._last_thinking_len += len(thinking_delta)
+        response_delta = self._take_delta("response")
+        self._last_response_len += len(response_delta)
+        return thinking_delta, response_delta, self._partial()
 
     def feed_response(self, chunk: str) -> tuple[str, dict[str, Any] | None]:
         """Feed a new chunk and also track ``response`` field deltas.
 
         Returns ``(response_delta, partial_result)``.
         """
-        self._buffer += chunk
-        partial = self._try_partial_parse()
-
-        response_delta = ""
-        if isinstance(partial, dict) and "response" in partial:
-            full_response = str(partial["response"])
-            if len(full_response) > self._last_response_len:
-                response_delta = full_response[self._last_response_len:]
-                self._last_response_len = len(full_response)
-
-        return response_delta, partial
+        self._consume(chunk)
+        response_delta = self._take_delta("response")
+        self._last_response_len += len(response_delta)
+        return response_delta, self._partial()
 
     def finalize(self) -> dict[str, Any]:
         """Return the final parsed JSON object.
 
         Raises ``json.JSONDecodeError`` if the buffer is not valid JSON.
         """
-        return json.loads(self._buffer)
+        return json.loads("".join(self._chunks))
 
     # ── internals ─────────────────────────────────────────────────
 
-    def _try_partial_parse(self) -> dict[str, Any] | None:
-        """Best-effort parse of the current buffer using partial-json-parser.
-
-        ``partial_loads`` handles incomplete JSON gracefully — it can parse
-        ``{"thinking": "partial text`` and return ``{"thinking": "partial text"}``
-        without needing regex fallbacks or suffix-guessing heuristics.
-        """
-        buf = self._buffer.strip()
-        if not buf:
+    def _partial(self) -> dict[str, Any] | None:
+        if self._state in (_BEFORE_OBJECT, _FAILED):
             return None
+        return self._fields
 
-        try:
-            obj = partial_loads(buf)
-            if isinstance(obj, dict):
-                return obj
-        except Exception:
-            pass
+    def _take_delta(self, field: str) -> str:
+        pending = self._pending[field]
+        if not pending:
+            return ""
+        delta = "".join(pending)
+        pending.clear()
+        return delta
+
+    def _consume(self, chunk: str) -> None:
+        """Advance the tokenizer over *chunk* only."""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        pos = 0
+        end = len(chunk)
+        while pos < end and self._state not in (_DONE, _FAILED):
+            state = self._state
+            if state in (_IN_STRING, _IN_KEY):
+                pos = self._read_string(chunk, pos)
+            elif state == _IN_NESTED:
+                pos = self._read_nested(chunk, pos)
+            elif state == _IN_SCALAR:
+                pos = self._read_scalar(chunk, pos)
+            else:
+                char = chunk[pos]
+                pos += 1
+                if char not in _WHITESPACE:
+                    self._read_structural(char)
+
+    def _read_structural(self, char: str) -> None:
+        state = self._state
+        if state == _BEFORE_OBJECT:
+            self._state = _EXPECT_KEY if char == "{" else _FAILED
+        elif state == _EXPECT_KEY:
+            if char == '"':
+                self._state = _IN_KEY
+            elif char == "}":
+                self._state = _DONE
+            else:
+                self._state = _FAILED
+        elif state == _EXPECT_COLON:
+            self._state = _EXPECT_VALUE if char == ":" else _FAILED
+        elif state == _EXPECT_VALUE:
+            if char == '"':
+                self._state = _IN_STRING
+            elif char in "{[":
+                self._raw = [char]
+                self._depth = 1
+                self._nested_in_string = False
+                self._nested_escape = False
+                self._state = _IN_NESTED
+            else:
+                self._raw = [char]
+                self._state = _IN_SCALAR
+        elif state == _AFTER_VALUE:
+            if char == ",":
+                self._state = _EXPECT_KEY
+            elif char == "}":
+                self._state = _DONE
+            else:
+                self._state = _FAILED
+
+    def _emit(self, text: str) -> None:
+        """Record decoded string text for the current key or value."""
+        if not text:
+            return
+        self._parts.append(text)
+        if self._state == _IN_STRING and self._key in self._pending:
+            self._pending[self._key].append(text)
+
+    def _read_string(self, chunk: str, pos: int) -> int:
+        """Decode string content up to the closing quote or end of chunk."""
+        end = len(chunk)
+        while pos < end and self._state != _FAILED:
+            if self._escape:
+                pos = self._read_escape(chunk, pos)
+                continue
+            match = _STRING_SPECIAL_RE.search(chunk, pos)
+            if match is None:
+                self._emit(chunk[pos:])
+                return end
+            self._emit(chunk[pos : match.start()])
+            pos = match.end()
+            if match.group() == "\\":
+                self._escape = "\\"
+                continue
+            self._close_string()
+            return pos
+        return pos
 
-        return None
+    def _read_escape(self, chunk: str, pos: int) -> int:
+        """Complete the pending escape sequence, possibly across chunks."""
+        end = len(chunk)
+        while True:
+            escape = self._escape
+            size = len(escape)
+            if size >= 2 and escape[1] != "u":
+                self._escape = ""
+                self._emit(_SIMPLE_ESCAPES.get(escape[1], escape[1]))
+                return pos
+            try:
+                if size == 6:
+                    high = int(escape[2:6], 16)
+                    if not 0xD800 <= high <= 0xDBFF:
+                        self._escape = ""
+                        self._emit(chr(high))
+                        return pos
+                elif size == 12:
+                    high = int(escape[2:6], 16)
+                    low = int(escape[8:12], 16)
+                    self._escape = ""
+                    if 0xDC00 <= low <= 0xDFFF:
+                        self._emit(
+                            chr(0x10000 + ((high - 0xD800) << 10) + low - 0xDC00)
+                        )
+                    else:
+                        self._emit(chr(high) + chr(low))
+                    return pos
+            except ValueError:
+                self._escape = ""
+                self._state = _FAILED
+                return end
+            if pos >= end:
+                return pos
+            char = chunk[pos]
+            # A high surrogate is only combined with an immediately
+            # following \uXXXX; anything else leaves it unpaired.
+            if size == 6 and char != "\\":
+                self._escape = ""
+                self._emit(chr(high))
+                return pos
+            if size == 7 and char != "u":
+                self._escape = "\\"
+                self._emit(chr(int(escape[2:6], 16)))
+                continue
+            self._escape = escape + char
+            pos += 1
+
+    def _close_string(self) -> None:
+        text = "".join(self._parts)
+        self._parts = []
+        if self._state == _IN_KEY:
+            self._key = text
+            self._state = _EXPECT_COLON
+            return
+        self._fields[self._key] = text
+        self._state = _AFTER_VALUE
+
+    def _read_nested(self, chunk: str, pos: int) -> int:
+        """Capture a nested object/array until its brackets balance."""
+        start = pos
+        end = len(chunk)
+        while pos < end:
+            if self._nested_escape:
+                self._nested_escape = False
+                pos += 1
+                continue
+            match = _NESTED_SPECIAL_RE.search(chunk, pos)
+            if match is None:
+                pos = end
+                break
+            char = match.group()
+            pos = match.end()
+            if char == "\\":
+                self._nested_escape = self._nested_in_string
+            elif char == '"':
+                self._nested_in_string = not self._nested_in_string
+            elif self._nested_in_string:
+                continue
+            elif char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._raw.append(chunk[start:pos])
+                    self._close_raw_value()
+                    return pos
+        self._raw.append(chunk[start:pos])
+        return pos
+
+    def _read_scalar(self, chunk: str, pos: int) -> int:
+        """Capture a number/literal until the next delimiter."""
+        match = _SCALAR_END_RE.search(chunk, pos)
+        if match is None:
+            self._raw.append(chunk[pos:])
+            return len(chunk)
+        self._raw.append(chunk[pos : match.start()])
+        self._close_raw_value()
+        # The delimiter belongs to the enclosing object.
+        return match.start()
+
+    def _close_raw_value(self) -> None:
+        raw = "".join(self._raw)
+        self._raw = []
+        try:
+            self._fields[self._key] = json.loads(raw)
+        except ValueError:
+            self._state = _FAILED
+            return
+        self._state = _AFTER_VALUE
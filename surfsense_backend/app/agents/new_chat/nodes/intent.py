@@ -9,6 +9,7 @@ from typing import Any, Callable
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
+from ..query_embeddings import embed_query_sync, prefetch_query_embeddings
 from ..structured_schemas import (
     IntentResult,
     pydantic_to_response_format,
@@ -61,11 +62,7 @@ def _embed_text_cached(text: str) -> list[float] | None:
     if cache_key in _INTENT_EMBED_CACHE:
         return _INTENT_EMBED_CACHE.get(cache_key)
     try:
-        from app.config import config
-
-        embedded = _normalize_vector(
-            config.embedding_model_instance.embed(normalized_text)
-        )
+        embedded = _normalize_vector(embed_query_sync(normalized_text))
     except Exception:
         embedded = None
     if embedded is not None:
@@ -333,6 +330,7 @@ def build_intent_resolver_node(
 
         else:
             # ── Normal path: embedding + lexical scoring ──
+            await prefetch_query_embeddings(str(latest_user_query or "").strip())
             intent_ranked = _rank_intent_candidates(
                 query=latest_user_query,
                 candidates=candidates,
@@ -0,0 +1,225 @@
+"""Per-turn query embeddings shared by the supervisor graph.
+
+One chat turn embeds the same texts in several places: the intent resolver
+ranks intents against the user query, agent retrieval and every worker's
+tool retrieval embed their task, and each connector search embeds its
+query.  The chat stream creates one :class:`QueryEmbeddingContext` per turn
+and passes it in the run config::
+
+    config["configurable"][QUERY_EMBEDDINGS_KEY] = context
+
+(or binds it with :func:`bind_query_embeddings` outside a graph run).
+Within the turn every distinct text is embedded at most once.
+
+Async callers use :func:`embed_query` or :func:`prefetch_query_embeddings`.
+Texts requested in the same event-loop iteration - e.g. by workers started
+with ``asyncio.gather`` - are collected into one ``embed_batch`` call that
+runs on the embedding worker pool, so the event loop is not blocked.  The
+synchronous retrieval helpers then read the vectors with
+:func:`embed_query_sync`, which only embeds on the calling thread when the
+text was not prefetched.  Without a context every helper behaves as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from contextvars import ContextVar, Token
+from typing import Any
+
+from app.services.embedding_service import embed_text, embed_texts, embed_texts_sync
+
+logger = logging.getLogger(__name__)
+
+QUERY_EMBEDDINGS_KEY = "query_embeddings"
+
+_current_context: ContextVar[QueryEmbeddingContext | None] = ContextVar(
+    "query_embedding_context", default=None
+)
+
+
+class QueryEmbeddingContext:
+    """Embeddings of the texts of one chat turn.
+
+    Args:
+        aembed_batch: Embeds a list of texts off the event loop.
+        embed_batch: Embeds a list of texts on the calling thread; used for
+            texts a synchronous caller needs before they were prefetched.
+    """
+
+    def __init__(
+        self,
+        *,
+        aembed_batch: Callable[[list[str]], Awaitable[Sequence[Any]]] = embed_texts,
+        embed_batch: Callable[[list[str]], Sequence[Any]] = embed_texts_sync,
+    ) -> None:
+        self._aembed_batch = aembed_batch
+        self._embed_batch = embed_batch
+        self._vectors: dict[str, Any] = {}
+        self._inflight: dict[str, asyncio.Future[None]] = {}
+        self._queued: list[str] = []
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hits = 0
+        self._embed_calls = 0
+        self._blocking_calls = 0
+        self._embedded_texts = 0
+        self._embed_seconds = 0.0
+
+    def _record(self, texts: list[str], vectors: Sequence[Any] | None, seconds: float):
+        # A failed call (vectors is None) is not cached, so the texts are
+        # embedded again on their next request.
+        with self._lock:
+            self._embed_calls += 1
+            self._embedded_texts += len(texts)
+            self._embed_seconds += seconds
+            if vectors is not None:
+                self._vectors.update(zip(texts, vectors, strict=True))
+
+    async def aembed_many(self, texts: Sequence[str]) -> list[Any]:
+        """Embeddings of *texts* (``None`` for empty or failed texts)."""
+        loop = asyncio.get_running_loop()
+        waiting: list[asyncio.Future[None]] = []
+        for text in texts:
+            if not text:
+                continue
+            with self._lock:
+                self._requests += 1
+                if text in self._vectors:
+                    self._hits += 1
+                    continue
+            future = self._inflight.get(text)
+            if future is None:
+                future = loop.create_future()
+                self._inflight[text] = future
+                self._queued.append(text)
+            else:
+                with self._lock:
+                    self._hits += 1
+            waiting.append(future)
+        if self._queued and not self._flush_scheduled:
+            # Let the other coroutines of this loop iteration queue their
+            # texts before the batch is sent.
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        if waiting:
+            # The futures are shared with other callers; cancelling this one
+            # must not cancel them.
+            await asyncio.shield(asyncio.gather(*waiting))
+        return [self._vectors.get(text) if text else None for text in texts]
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        texts, self._queued = self._queued, []
+        if texts:
+            task = asyncio.get_running_loop().create_task(self._embed_queued(texts))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _embed_queued(self, texts: list[str]) -> None:
+        started = time.perf_counter()
+        vectors: Sequence[Any] | None = None
+        try:
+            vectors = list(await self._aembed_batch(texts))
+        except Exception:
+            logger.warning("Query embedding batch failed", exc_info=True)
+        finally:
+            for text in texts:
+                future = self._inflight.pop(text, None)
+                if future is not None and not future.done():
+                    future.set_result(None)
+            # Waiters resume on a later loop iteration, after this runs.
+            self._record(texts, vectors, time.perf_counter() - started)
+
+    def embed(self, text: str) -> Any:
+        """Embedding of *text* for synchronous callers.
+
+        Raises the embedding error, like the model's own ``embed``.
+        """
+        if not text:
+            return None
+        with self._lock:
+            self._requests += 1
+            if text in self._vectors:
+                self._hits += 1
+                return self._vectors[text]
+            self._blocking_calls += 1
+        started = time.perf_counter()
+        vectors: Sequence[Any] | None = None
+        try:
+            vectors = list(self._embed_batch([text]))
+        finally:
+            self._record([text], vectors, time.perf_counter() - started)
+        return vectors[0]
+
+    def stats(self) -> dict[str, Any]:
+        """Per-turn counters for the trace."""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hits": self._hits,
+                "embed_calls": self._embed_calls,
+                "blocking_calls": self._blocking_calls,
+                "embedded_texts": self._embedded_texts,
+                "embed_ms": round(self._embed_seconds * 1000, 1),
+            }
+
+
+def bind_query_embeddings(
+    context: QueryEmbeddingContext | None,
+) -> Token[QueryEmbeddingContext | None]:
+    """Bind *context* to the current context; returns a reset token."""
+    return _current_context.set(context)
+
+
+def reset_query_embeddings(token: Token[QueryEmbeddingContext | None]) -> None:
+    _current_context.reset(token)
+
+
+def current_query_embeddings() -> QueryEmbeddingContext | None:
+    """The embedding context of the running turn, if any."""
+    context = _current_context.get()
+    if context is not None:
+        return context
+    try:
+        from langgraph.config import get_config
+
+        configurable = get_config().get("configurable") or {}
+    except RuntimeError:
+        return None
+    context = configurable.get(QUERY_EMBEDDINGS_KEY)
+    return context if isinstance(context, QueryEmbeddingContext) else None
+
+
+async def prefetch_query_embeddings(*texts: str) -> None:
+    """Embed *texts* off the event loop for later synchronous lookups."""
+    context = current_query_embeddings()
+    if context is not None:
+        await context.aembed_many(texts)
+
+
+async def embed_query(text: str) -> Any:
+    """Embed *text* off the event loop, once per turn."""
+    context = current_query_embeddings()
+    if context is not None:
+        vector = (await context.aembed_many([text]))[0]
+        if vector is not None:
+            return vector
+    # No context, or the turn's batch failed: embed directly so errors reach
+    # the caller instead of a missing vector.
+    return await embed_text(text)
+
+
+def embed_query_sync(text: str) -> Any:
+    """Embed *text*, reusing the turn's embedding when one exists."""
+    context = current_query_embeddings()
+    if context is None:
+        from app.config import config
+
+        return config.embedding_model_instance.embed(text)
+    return context.embed(text)
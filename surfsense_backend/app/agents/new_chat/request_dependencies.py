@@ -0,0 +1,69 @@
+"""Per-request dependencies for supervisor graphs that outlive a request.
+
+A cached supervisor graph is compiled once and then reused by many chat
+turns, so it cannot close over request-scoped objects such as the database
+session, the connector service, the trace recorder, the user or the thread
+id.  The chat stream passes those objects in the run config instead::
+
+    config["configurable"][REQUEST_DEPENDENCIES_KEY] = dependencies
+
+Code that runs outside a LangGraph runnable context can bind them to a
+context variable with :func:`bind_request_dependencies`.  Nodes resolve the
+active values with :func:`resolve_request_dependencies`, which falls back to
+the dependencies the graph was built with when neither is available.  The
+request-scoped entries are removed from those after the build (see
+``app.agents.new_chat.complete_graph``), so the fallback never hands out the
+building turn's session, user or thread.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from typing import Any
+
+REQUEST_DEPENDENCIES_KEY = "request_dependencies"
+
+_current_dependencies: ContextVar[dict[str, Any] | None] = ContextVar(
+    "supervisor_request_dependencies", default=None
+)
+
+
+def bind_request_dependencies(
+    dependencies: dict[str, Any] | None,
+) -> Token[dict[str, Any] | None]:
+    """Bind request dependencies to the current context; returns a reset token."""
+    return _current_dependencies.set(dependencies)
+
+
+def reset_request_dependencies(token: Token[dict[str, Any] | None]) -> None:
+    """Restore the dependencies that were bound before ``token`` was created."""
+    _current_dependencies.reset(token)
+
+
+def current_request_dependencies() -> dict[str, Any] | None:
+    """Return the dependencies of the running request, if any.
+
+    The run config takes precedence over the context variable so that
+    concurrent runs sharing one event loop task tree never see each other's
+    objects.
+    """
+    try:
+        from langgraph.config import get_config
+
+        configurable = get_config().get("configurable") or {}
+    except RuntimeError:
+        configurable = {}
+    dependencies = configurable.get(REQUEST_DEPENDENCIES_KEY)
+    if isinstance(dependencies, dict):
+        return dependencies
+    return _current_dependencies.get()
+
+
+def resolve_request_dependencies(
+    build_dependencies: dict[str, Any],
+) -> dict[str, Any]:
+    """Return the request dependencies, or ``build_dependencies`` without any."""
+    dependencies = current_request_dependencies()
+    if dependencies is None:
+        return build_dependencies
+    return dependencies
@@ -113,6 +113,28 @@ class RetrievalFeedbackStore:
             boost = max(-2.0, min(2.0, raw_score * 2.0))
             return round(boost, 4)
 
+    def get_boosts(self, *, tool_ids: list[str], query: str) -> list[float]:
+        """Batch variant of ``get_boost`` that hashes the query pattern once."""
+        pattern_hash = query_pattern_hash(query)
+        if not pattern_hash or not self._signals:
+            return [0.0] * len(tool_ids)
+        boosts: list[float] = []
+        with self._lock:
+            for tool_id in tool_ids:
+                normalized_tool_id = str(tool_id or "").strip().lower()
+                signal = (
+                    self._signals.get((normalized_tool_id, pattern_hash))
+                    if normalized_tool_id
+                    else None
+                )
+                if signal is None:
+                    boosts.append(0.0)
+                    continue
+                self._signals.move_to_end((normalized_tool_id, pattern_hash))
+                raw_score = float(signal.score)
+                boosts.append(round(max(-2.0, min(2.0, raw_score * 2.0)), 4))
+        return boosts
+
     def snapshot(self) -> dict[str, Any]:
         with self._lock:
             rows: list[dict[str, Any]] = []
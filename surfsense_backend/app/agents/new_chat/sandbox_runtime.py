@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
 import hashlib
 import json
 import os
 from pathlib import Path
+import queue
 import re
+import shlex
+import shutil
 import subprocess
 import threading
 import time
@@ -46,6 +51,15 @@ SANDBOX_SCOPE_THREAD = "thread"
 SANDBOX_SCOPE_SUBAGENT = "subagent"
 SANDBOX_SCOPE_CRITERION = "criterion"
 SANDBOX_VIRTUAL_WORKSPACE_PREFIX = "/workspace"
+DEFAULT_SANDBOX_WARM_POOL_SIZE = 2
+DEFAULT_SANDBOX_WARM_IDLE_SECONDS = 10 * 60
+
+# A container seen running this recently is not re-inspected on lease.
+_DOCKER_LIVENESS_TTL_SECONDS = 30
+_WARM_SLOT_DIR_NAME = ".warm"
+_WARM_BOUND_MARKER = "/tmp/.oneseek-sandbox-bound"
+_WARM_RECLAIM_MARGIN_SECONDS = 30
+_WARM_REFILL_BACKOFF_SECONDS = 60
 
 _LONG_LIVED_PATTERNS = (
     re.compile(r"\bnpm\s+run\s+(dev|start)\b", re.IGNORECASE),
@@ -139,6 +153,9 @@ class SandboxRuntimeConfig:
     scope_id: str | None = None
     timeout_seconds: int = DEFAULT_SANDBOX_TIMEOUT_SECONDS
     max_output_bytes: int = DEFAULT_SANDBOX_MAX_OUTPUT_BYTES
+    warm_pool_size: int = DEFAULT_SANDBOX_WARM_POOL_SIZE
+    warm_idle_seconds: int = DEFAULT_SANDBOX_WARM_IDLE_SECONDS
+    persistent_exec: bool = True
 
 
 def sandbox_config_from_runtime_flags(
@@ -230,6 +247,19 @@ def sandbox_config_from_runtime_flags(
         min_value=1024,
         max_value=1_000_000,
     )
+    warm_pool_size = _coerce_int(
+        payload.get("sandbox_warm_pool_size"),
+        default=DEFAULT_SANDBOX_WARM_POOL_SIZE,
+        min_value=0,
+        max_value=32,
+    )
+    warm_idle_seconds = _coerce_int(
+        payload.get("sandbox_warm_idle_seconds"),
+        default=DEFAULT_SANDBOX_WARM_IDLE_SECONDS,
+        min_value=60,
+        max_value=86_400,
+    )
+    persistent_exec = _coerce_bool(payload.get("sandbox_persistent_exec"), default=True)
     return SandboxRuntimeConfig(
         enabled=enabled,
         mode=mode,
@@ -248,6 +278,9 @@ def sandbox_config_from_runtime_flags(
         scope_id=scope_id,
         timeout_seconds=timeout_seconds,
         max_output_bytes=max_output_bytes,
+        warm_pool_size=warm_pool_size,
+        warm_idle_seconds=warm_idle_seconds,
+        persistent_exec=persistent_exec,
     )
 
 
@@ -288,11 +321,234 @@ class SandboxExecutionError(RuntimeError):
     pass
 
 
+def _format_command_output(
+    *,
+    stdout: str,
+    stderr: str,
+    max_output_bytes: int,
+    truncated: bool = False,
+) -> tuple[str, bool]:
+    output = _safe_shell_output(stdout=stdout, stderr=stderr)
+    if truncated or len(output) > max_output_bytes:
+        output = output[:max_output_bytes] + "\n\n[Output truncated due to size limits.]"
+        truncated = True
+    return output, truncated
+
+
+class _DockerExecChannel:
+    """Long-lived ``docker exec -i <container> sh`` used to run commands.
+
+    Every command runs in its own ``sh -lc`` inside the channel shell, so
+    working directory and environment changes do not leak between commands.
+    Output is framed by a random marker that is written to stdout (with the
+    exit code) and to stderr once the command has finished.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        self._argv = list(argv)
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen | None = None
+        self._stdout: queue.Queue[str | None] = queue.Queue()
+        self._stderr: queue.Queue[str | None] = queue.Queue()
+
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _open(self) -> None:
+        self._stdout = queue.Queue()
+        self._stderr = queue.Queue()
+        self._process = subprocess.Popen(
+            self._argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        for stream, sink in (
+            (self._process.stdout, self._stdout),
+            (self._process.stderr, self._stderr),
+        ):
+            threading.Thread(
+                target=self._pump,
+                args=(stream, sink),
+                daemon=True,
+            ).start()
+
+    @staticmethod
+    def _pump(stream, sink: queue.Queue[str | None]) -> None:
+        try:
+            for line in stream:
+                sink.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            sink.put(None)
+
+    def close(self) -> None:
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        try:
+            process.kill()
+            process.wait(timeout=2)
+        except Exception:
+            return
+
+    @staticmethod
+    def _collect(
+        sink: queue.Queue[str | None],
+        *,
+        marker: str,
+        deadline: float,
+        max_chars: int,
+    ) -> tuple[list[str], str | None, bool]:
+        """Read lines until *marker*. Returns ``(lines, marker_line, truncated)``.
+
+        ``marker_line`` is ``None`` when the deadline passed or the stream
+        closed before the marker arrived.
+        """
+        lines: list[str] = []
+        size = 0
+        truncated = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return lines, None, truncated
+            try:
+                line = sink.get(timeout=remaining)
+            except queue.Empty:
+                return lines, None, truncated
+            if line is None:
+                return lines, None, truncated
+            if line.startswith(marker):
+                return lines, line, truncated
+            if size < max_chars:
+                lines.append(line)
+                size += len(line)
+            else:
+                truncated = True
+
+    def run(
+        self,
+        command: str,
+        *,
+        timeout_seconds: int,
+        max_output_bytes: int,
+    ) -> tuple[str, int, bool]:
+        with self._lock:
+            if not self.alive():
+                try:
+                    self._open()
+                except FileNotFoundError as exc:
+                    return (
+                        f"Error: sandbox runtime binary not found ({exc}).",
+                        127,
+                        False,
+                    )
+            marker = f"__oneseek_exec_{uuid4().hex}__"
+            script = (
+                f"sh -lc {shlex.quote(command)} </dev/null; "
+                f"printf '\\n{marker} %d\\n' \"$?\"; "
+                f"printf '\\n{marker}\\n' >&2\n"
+            )
+            try:
+                self._process.stdin.write(script)
+                self._process.stdin.flush()
+            except (OSError, ValueError):
+                self.close()
+                return "Error: sandbox exec channel closed unexpectedly.", 1, False
+
+            deadline = time.monotonic() + float(timeout_seconds)
+            stdout_lines, exit_line, stdout_truncated = self._collect(
+                self._stdout,
+                marker=marker,
+                deadline=deadline,
+                max_chars=max_output_bytes + 1,
+            )
+            stderr_lines: list[str] = []
+            stderr_truncated = False
+            if exit_line is not None:
+                stderr_lines, stderr_end, stderr_truncated = self._collect(
+                    self._stderr,
+                    marker=marker,
+                    deadline=deadline,
+                    max_chars=max_output_bytes + 1,
+                )
+                if stderr_end is None:
+                    exit_line = None
+            if exit_line is None:
+                # Timed out or the channel died: the shell state is unknown,
+                # so drop the channel; the next command opens a new one.
+                timed_out = self.alive()
+                self.close()
+                if timed_out:
+                    return (
+                        f"Error: command timed out after {int(timeout_seconds)}s.",
+                        124,
+                        False,
+                    )
+                stderr_lines.append("sandbox exec channel closed unexpectedly\n")
+                exit_code = 1
+            else:
+                try:
+                    exit_code = int(exit_line[len(marker) :].strip())
+                except ValueError:
+                    exit_code = 1
+            output, truncated = _format_command_output(
+                stdout="".join(stdout_lines),
+                stderr="".join(stderr_lines),
+                max_output_bytes=max_output_bytes,
+                truncated=stdout_truncated or stderr_truncated,
+            )
+            return output, exit_code, truncated
+
+
+@dataclass
+class _WarmContainer:
+    name: str
+    slot_path: Path
+    created_at: float
+    channel: _DockerExecChannel | None
+
+
 class _DockerSandboxPool:
+    """Docker containers and exec channels shared by the sandbox leases.
+
+    * Containers known to be running are not re-inspected on every lease:
+      an open exec channel or a recent ``docker inspect`` counts as alive.
+    * Up to ``warm_pool_size`` containers per image/workspace root are kept
+      pre-started (refilled in the background). A new thread whose workspace
+      is still empty is bound to a warm container instead of cold-starting
+      one: its workspace directory becomes a symlink to the container's slot
+      directory, so files survive later idle releases exactly as before.
+    * Unbound warm containers exit on their own after ``warm_idle_seconds``
+      (orphans included) and are reclaimed from the pool.
+    """
+
     def __init__(self) -> None:
         self._lock = threading.RLock()
-
-    def _is_running(self, container_name: str) -> bool:
+        self._verified_at: dict[str, float] = {}
+        self._channels: dict[str, _DockerExecChannel] = {}
+        self._warm: dict[tuple[str, str, str], list[_WarmContainer]] = {}
+        self._refilling: set[tuple[str, str, str]] = set()
+        self._refill_backoff_until: dict[tuple[str, str, str], float] = {}
+        self._counters = {
+            "acquires": 0,
+            "reused": 0,
+            "warm_hits": 0,
+            "cold_starts": 0,
+            "warm_started": 0,
+            "warm_reclaimed": 0,
+        }
+        self._acquire_latencies: deque[float] = deque(maxlen=512)
+
+    # ── liveness ──────────────────────────────────────────────────
+
+    def _inspect_running(self, container_name: str) -> bool:
         try:
             result = subprocess.run(
                 ["docker", "inspect", "-f", "{{.State.Running}}", container_name],
@@ -305,13 +561,39 @@ class _DockerSandboxPool:
             return False
         return result.returncode == 0 and result.stdout.strip().lower() == "true"
 
+    def _is_running(self, container_name: str) -> bool:
+        with self._lock:
+            channel = self._channels.get(container_name)
+            if channel is not None and channel.alive():
+                return True
+            verified_at = self._verified_at.get(container_name)
+            if (
+                verified_at is not None
+                and time.monotonic() - verified_at < _DOCKER_LIVENESS_TTL_SECONDS
+            ):
+                return True
+        if not self._inspect_running(container_name):
+            with self._lock:
+                self._verified_at.pop(container_name, None)
+            return False
+        with self._lock:
+            self._verified_at[container_name] = time.monotonic()
+        return True
+
+    # ── container lifecycle ───────────────────────────────────────
+
     def _start(
         self,
         *,
         container_name: str,
         workspace_path: Path,
         docker_image: str,
+        entrypoint: str = "while true; do sleep 3600; done",
+        labels: dict[str, str] | None = None,
     ) -> None:
+        label_args: list[str] = []
+        for key, value in (labels or {}).items():
+            label_args.extend(["--label", f"{key}={value}"])
         result = subprocess.run(
             [
                 "docker",
@@ -320,6 +602,7 @@ class _DockerSandboxPool:
                 "-d",
                 "--name",
                 container_name,
+                *label_args,
                 "-w",
                 "/workspace",
                 "-v",
@@ -327,7 +610,7 @@ class _DockerSandboxPool:
                 docker_image,
                 "sh",
                 "-c",
-                "while true; do sleep 3600; done",
+                entrypoint,
             ],
             capture_output=True,
             text=True,
@@ -339,6 +622,16 @@ class _DockerSandboxPool:
             raise SandboxExecutionError(
                 f"Failed to start docker sandbox '{container_name}': {output}"
             )
+        with self._lock:
+            self._verified_at[container_name] = time.monotonic()
+
+    def forget(self, container_name: str) -> None:
+        """Drop cached liveness and the exec channel of a removed container."""
+        with self._lock:
+            self._verified_at.pop(container_name, None)
+            channel = self._channels.pop(container_name, None)
+        if channel is not None:
+            channel.close()
 
     def ensure(
         self,
@@ -346,19 +639,272 @@ class _DockerSandboxPool:
         container_name: str,
         workspace_path: Path,
         docker_image: str,
-    ) -> None:
-        with self._lock:
+        config: SandboxRuntimeConfig | None = None,
+    ) -> tuple[str, Path]:
+        """Make sure the thread's container runs. Returns ``(name, workspace)``.
+
+        The returned name and workspace differ from the arguments when the
+        thread was bound to a warm container.
+        """
+        started = time.perf_counter()
+        try:
             if self._is_running(container_name):
-                return
+                self._count("reused")
+                return container_name, workspace_path
+            if config is not None and config.warm_pool_size > 0:
+                bound = self._bind_warm(workspace_path=workspace_path, config=config)
+                if bound is not None:
+                    self._count("warm_hits")
+                    return bound
             self._start(
                 container_name=container_name,
                 workspace_path=workspace_path,
                 docker_image=docker_image,
             )
+            self._count("cold_starts")
+            return container_name, workspace_path
+        finally:
+            with self._lock:
+                self._counters["acquires"] += 1
+                self._acquire_latencies.append(time.perf_counter() - started)
+            if config is not None and config.warm_pool_size > 0:
+                self._schedule_refill(config)
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    # ── warm pool ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _warm_key(config: SandboxRuntimeConfig) -> tuple[str, str, str]:
+        return (
+            str(config.docker_image),
+            str(config.workspace_root),
+            str(config.docker_container_prefix),
+        )
+
+    @staticmethod
+    def _warm_root(config: SandboxRuntimeConfig) -> Path:
+        root = Path(str(config.workspace_root or DEFAULT_SANDBOX_WORKSPACE_ROOT))
+        return root.expanduser().resolve()
+
+    def _open_channel(
+        self,
+        container_name: str,
+        config: SandboxRuntimeConfig,
+    ) -> _DockerExecChannel | None:
+        if not config.persistent_exec:
+            return None
+        return _DockerExecChannel(["docker", "exec", "-i", container_name, "sh"])
+
+    def _start_warm(self, config: SandboxRuntimeConfig) -> _WarmContainer:
+        prefix = _sanitize_segment(
+            config.docker_container_prefix, fallback="oneseek-sandbox"
+        ).lower()
+        name = f"{prefix}-warm-{uuid4().hex[:12]}"[:63]
+        slot_path = self._warm_root(config) / _WARM_SLOT_DIR_NAME / name
+        slot_path.mkdir(parents=True, exist_ok=True)
+        ttl = max(5, int(config.warm_idle_seconds))
+        self._start(
+            container_name=name,
+            workspace_path=slot_path,
+            docker_image=config.docker_image,
+            # Exit unless bound within the TTL so orphaned warm containers
+            # (for example after a worker restart) clean themselves up.
+            entrypoint=(
+                f"i=0; while [ ! -e {_WARM_BOUND_MARKER} ]; do sleep 1; "
+                f'i=$((i+1)); if [ "$i" -ge {ttl} ]; then exit 0; fi; done; '
+                "while true; do sleep 3600; done"
+            ),
+            labels={"oneseek.sandbox": "warm"},
+        )
+        self._count("warm_started")
+        channel = self._open_channel(name, config)
+        if channel is not None:
+            # Open the channel now so binding the container costs no spawn.
+            channel.run(":", timeout_seconds=10, max_output_bytes=1024)
+        return _WarmContainer(
+            name=name,
+            slot_path=slot_path,
+            created_at=time.monotonic(),
+            channel=channel,
+        )
+
+    def _reclaim_expired(self, config: SandboxRuntimeConfig) -> None:
+        # Leave a margin so a container is never handed out just before its
+        # watchdog exits.
+        max_age = max(1, int(config.warm_idle_seconds) - _WARM_RECLAIM_MARGIN_SECONDS)
+        now = time.monotonic()
+        with self._lock:
+            entries = self._warm.get(self._warm_key(config), [])
+            expired = [entry for entry in entries if now - entry.created_at >= max_age]
+            for entry in expired:
+                entries.remove(entry)
+        for entry in expired:
+            self._discard_warm(entry)
+        if expired:
+            self._count("warm_reclaimed", len(expired))
+
+    def _discard_warm(self, entry: _WarmContainer) -> None:
+        if entry.channel is not None:
+            entry.channel.close()
+        _remove_docker_container(entry.name)
+        shutil.rmtree(entry.slot_path, ignore_errors=True)
+
+    def _take_warm(self, config: SandboxRuntimeConfig) -> _WarmContainer | None:
+        self._reclaim_expired(config)
+        with self._lock:
+            entries = self._warm.get(self._warm_key(config), [])
+            return entries.pop(0) if entries else None
+
+    def _bind_warm(
+        self,
+        *,
+        workspace_path: Path,
+        config: SandboxRuntimeConfig,
+    ) -> tuple[str, Path] | None:
+        # Only fresh, empty thread workspaces can move onto a warm slot;
+        # anything else keeps its own bind mount.
+        if workspace_path.parent != self._warm_root(config):
+            return None
+        if workspace_path.is_symlink() or not workspace_path.is_dir():
+            return None
+        if any(workspace_path.iterdir()):
+            return None
+        entry = self._take_warm(config)
+        if entry is None:
+            return None
+        channel = entry.channel
+        mark_command = f"touch {_WARM_BOUND_MARKER}"
+        if channel is not None:
+            _output, exit_code, _truncated = channel.run(
+                mark_command, timeout_seconds=5, max_output_bytes=1024
+            )
+        else:
+            _output, exit_code, _truncated = _run_subprocess(
+                command=["docker", "exec", entry.name, "sh", "-c", mark_command],
+                timeout_seconds=5,
+                max_output_bytes=1024,
+            )
+        if exit_code != 0:
+            self._discard_warm(entry)
+            return None
+        try:
+            workspace_path.rmdir()
+            workspace_path.symlink_to(entry.slot_path, target_is_directory=True)
+        except OSError:
+            self._discard_warm(entry)
+            return None
+        with self._lock:
+            self._verified_at[entry.name] = time.monotonic()
+            if channel is not None:
+                self._channels[entry.name] = channel
+        return entry.name, entry.slot_path
+
+    def _schedule_refill(self, config: SandboxRuntimeConfig) -> None:
+        key = self._warm_key(config)
+        with self._lock:
+            if key in self._refilling:
+                return
+            if time.monotonic() < self._refill_backoff_until.get(key, 0.0):
+                return
+            if len(self._warm.get(key, [])) >= int(config.warm_pool_size):
+                return
+            self._refilling.add(key)
+        threading.Thread(
+            target=self._refill,
+            args=(config,),
+            name="sandbox-warm-pool",
+            daemon=True,
+        ).start()
+
+    def _refill(self, config: SandboxRuntimeConfig) -> None:
+        key = self._warm_key(config)
+        try:
+            self._reclaim_expired(config)
+            while True:
+                with self._lock:
+                    if len(self._warm.get(key, [])) >= int(config.warm_pool_size):
+                        return
+                try:
+                    entry = self._start_warm(config)
+                except (SandboxExecutionError, OSError, subprocess.SubprocessError):
+                    with self._lock:
+                        self._refill_backoff_until[key] = (
+                            time.monotonic() + _WARM_REFILL_BACKOFF_SECONDS
+                        )
+                    return
+                with self._lock:
+                    self._warm.setdefault(key, []).append(entry)
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+    # ── execution ─────────────────────────────────────────────────
+
+    def exec(
+        self,
+        *,
+        container_name: str,
+        command: str,
+        timeout_seconds: int,
+        max_output_bytes: int,
+        persistent: bool = True,
+    ) -> tuple[str, int, bool]:
+        if not persistent:
+            return _run_subprocess(
+                command=["docker", "exec", container_name, "sh", "-lc", command],
+                timeout_seconds=timeout_seconds,
+                max_output_bytes=max_output_bytes,
+            )
+        with self._lock:
+            channel = self._channels.get(container_name)
+            if channel is None:
+                channel = _DockerExecChannel(
+                    ["docker", "exec", "-i", container_name, "sh"]
+                )
+                self._channels[container_name] = channel
+        return channel.run(
+            command,
+            timeout_seconds=timeout_seconds,
+            max_output_bytes=max_output_bytes,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool statistics for observability."""
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = sorted(self._acquire_latencies)
+            warm_ready = sum(len(entries) for entries in self._warm.values())
+            open_channels = sum(
+                1 for channel in self._channels.values() if channel.alive()
+            )
+        acquires = counters["acquires"]
+        served_warm = counters["reused"] + counters["warm_hits"]
+        latency_ms: dict[str, float] = {}
+        if latencies:
+            latency_ms = {
+                "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2),
+            }
+        return {
+            **counters,
+            "hit_rate": round(served_warm / acquires, 4) if acquires else 0.0,
+            "warm_ready": warm_ready,
+            "open_exec_channels": open_channels,
+            "acquire_latency_ms": latency_ms,
+        }
 
 
 _DOCKER_POOL = _DockerSandboxPool()
 
+
+def sandbox_pool_stats() -> dict[str, Any]:
+    """Docker sandbox pool hit rate, acquire latency and reclamation counters."""
+    return _DOCKER_POOL.stats()
+
 _STATE_BACKEND_FILE = "file"
 _STATE_BACKEND_REDIS = "redis"
 _REDIS_CLIENT_CACHE: dict[str, Any] = {}
@@ -597,6 +1143,7 @@ def _remove_docker_container(container_name: str) -> None:
     normalized = str(container_name or "").strip()
     if not normalized:
         return
+    _DOCKER_POOL.forget(normalized)
     try:
         subprocess.run(
             ["docker", "rm", "-f", normalized],
@@ -714,12 +1261,14 @@ def _finalize_record_for_mode(
                 thread_id=thread_id,
                 container_prefix=config.docker_container_prefix,
             )
-        _DOCKER_POOL.ensure(
+        container_name, workspace_path = _DOCKER_POOL.ensure(
             container_name=container_name,
             workspace_path=Path(updated["workspace_path"]),
             docker_image=config.docker_image,
+            config=config,
         )
         updated["container_name"] = container_name
+        updated["workspace_path"] = str(workspace_path)
     elif config.mode == SANDBOX_MODE_PROVISIONER:
         existing_sandbox_id = str(updated.get("sandbox_id") or "").strip() or thread_key
         response = _post_to_provisioner_allow_404(
@@ -1110,11 +1659,11 @@ def _run_subprocess(
             127,
             False,
         )
-    output = _safe_shell_output(stdout=result.stdout, stderr=result.stderr)
-    truncated = False
-    if len(output) > max_output_bytes:
-        output = output[:max_output_bytes] + "\n\n[Output truncated due to size limits.]"
-        truncated = True
+    output, truncated = _format_command_output(
+        stdout=result.stdout,
+        stderr=result.stderr,
+        max_output_bytes=max_output_bytes,
+    )
     return output, int(result.returncode), truncated
 
 
@@ -1546,10 +2095,12 @@ def run_sandbox_command(
         container_name = str(lease.container_name or "").strip()
         if not container_name:
             raise SandboxExecutionError("Missing docker container name for sandbox lease.")
-        output, exit_code, truncated = _run_subprocess(
-            command=["docker", "exec", container_name, "sh", "-lc", normalized_command],
+        output, exit_code, truncated = _DOCKER_POOL.exec(
+            container_name=container_name,
+            command=normalized_command,
             timeout_seconds=effective_timeout,
             max_output_bytes=max_output_bytes,
+            persistent=config.persistent_exec,
         )
         return SandboxCommandResult(
             mode=SANDBOX_MODE_DOCKER,
@@ -1588,3 +2139,41 @@ def run_sandbox_command(
         scope=lease.scope,
         scope_id=lease.scope_id,
     )
+
+
+async def arun_sandbox_command(
+    *,
+    command: str,
+    thread_id: Any,
+    runtime_hitl: dict[str, Any] | None,
+    timeout_seconds: int | None = None,
+) -> SandboxCommandResult:
+    """Async :func:`run_sandbox_command`; the blocking work runs in a thread."""
+    return await asyncio.to_thread(
+        run_sandbox_command,
+        command=command,
+        thread_id=thread_id,
+        runtime_hitl=runtime_hitl,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+async def asandbox_read_text_file(
+    *,
+    thread_id: Any,
+    runtime_hitl: dict[str, Any] | None,
+    path: str,
+    start_line: int | None = None,
+    end_line: int | None = None,
+    max_lines: int = 400,
+) -> str:
+    """Async :func:`sandbox_read_text_file`; the blocking work runs in a thread."""
+    return await asyncio.to_thread(
+        sandbox_read_text_file,
+        thread_id=thread_id,
+        runtime_hitl=runtime_hitl,
+        path=path,
+        start_line=start_line,
+        end_line=end_line,
+        max_lines=max_lines,
+    )
@@ -71,6 +71,8 @@ from app.agents.new_chat.nodes import (
 )
 from app.agents.new_chat.nodes.execution_router import get_execution_timeout_seconds
 from app.agents.new_chat.prompt_registry import resolve_prompt
+from app.agents.new_chat.query_embeddings import prefetch_query_embeddings
+from app.agents.new_chat.request_dependencies import resolve_request_dependencies
 from app.agents.new_chat.response_compressor import compress_response
 from app.agents.new_chat.retrieval_feedback import (
     get_global_retrieval_feedback_store,
@@ -288,6 +290,38 @@ from app.agents.new_chat.supervisor_helpers import (  # noqa: E402
 )
 
 
+# Request dependency entry holding the running request's Tavily key lookup.
+_TAVILY_KEY_LOOKUP = "tavily_api_key_lookup"
+
+
+async def _lookup_tavily_api_key(dependencies: dict[str, Any]) -> str | None:
+    """Resolve the Tavily API key for the search space in ``dependencies``.
+
+    Resolution order:
+    1. Per-search-space connector (TAVILY_API in DB)
+    2. Global PUBLIC_TAVILY_API_KEY environment variable
+    """
+    connector_service = dependencies.get("connector_service")
+    search_space_id = dependencies.get("search_space_id")
+    if connector_service and search_space_id is not None:
+        try:
+            from app.db import SearchSourceConnectorType
+
+            tavily_connector = await connector_service.get_connector_by_type(
+                SearchSourceConnectorType.TAVILY_API, search_space_id
+            )
+            if tavily_connector:
+                api_key = tavily_connector.config.get("TAVILY_API_KEY")
+                if api_key:
+                    return api_key
+        except Exception as exc:
+            logger.warning("failed to fetch Tavily API key from DB: %s", exc)
+
+    from app.config import Config as _AppConfig
+
+    return getattr(_AppConfig, "PUBLIC_TAVILY_API_KEY", None)
+
+
 async def create_supervisor_agent(
     *,
     llm,
@@ -1479,15 +1513,49 @@ async def create_supervisor_agent(
         checkpointer=checkpointer,
     )
 
-    connector_service = dependencies.get("connector_service")
     search_space_id = dependencies.get("search_space_id")
-    user_id = dependencies.get("user_id")
-    thread_id = dependencies.get("thread_id")
-    episodic_store = get_or_create_episodic_store(
-        search_space_id=search_space_id,
-        user_id=user_id,
-        max_entries=500,
-    )
+
+    # A cached graph serves many requests: nodes read request-scoped objects
+    # (session, connector service, user, thread, worker pool) through these
+    # helpers instead of the values captured above at build time.
+    def _request_deps() -> dict[str, Any]:
+        return resolve_request_dependencies(dependencies)
+
+    def _request_episodic_store():
+        request_deps = _request_deps()
+        return get_or_create_episodic_store(
+            search_space_id=request_deps.get("search_space_id"),
+            user_id=request_deps.get("user_id"),
+            max_entries=500,
+        )
+
+    async def _request_worker_pool():
+        request_deps = _request_deps()
+        if request_deps is dependencies:
+            return worker_pool
+        pool = await get_or_create_shared_worker_pool(
+            configs=worker_configs,
+            llm=llm,
+            dependencies=request_deps,
+            checkpointer=checkpointer,
+        )
+        pool._llm_gate_mode = worker_pool._llm_gate_mode
+        return pool
+
+    async def _request_tavily_api_key() -> str | None:
+        # The key belongs to the request's search space and may change between
+        # turns, so it is never captured at build time.  One lookup per request
+        # is shared by the parallel research workers, which would otherwise use
+        # the request's session concurrently.
+        request_deps = _request_deps()
+        if request_deps is dependencies:
+            return await _lookup_tavily_api_key(request_deps)
+        lookup = request_deps.get(_TAVILY_KEY_LOOKUP)
+        if lookup is None:
+            lookup = asyncio.ensure_future(_lookup_tavily_api_key(request_deps))
+            request_deps[_TAVILY_KEY_LOOKUP] = lookup
+        return await asyncio.shield(lookup)
+
     retrieval_feedback_store = get_global_retrieval_feedback_store()
     runtime_hitl_raw = dependencies.get("runtime_hitl")
     runtime_hitl_cfg = (
@@ -1665,7 +1733,7 @@ async def create_supervisor_agent(
     if sandbox_enabled:
         def _sandbox_read_fn(path: str) -> str:
             return sandbox_read_text_file(
-                thread_id=thread_id,
+                thread_id=_request_deps().get("thread_id"),
                 runtime_hitl=_artifact_runtime_hitl_thread_scope(runtime_hitl_cfg),
                 path=path,
             )
@@ -1702,14 +1770,19 @@ async def create_supervisor_agent(
         min_value=220,
         max_value=4_000,
     )
-    cross_session_memory_entries: list[dict[str, Any]] = []
-    if (
-        cross_session_memory_enabled
-        and isinstance(db_session, AsyncSession)
-        and user_id
-    ):
+
+    async def _load_cross_session_memory_entries(
+        session: Any, memory_user_id: Any
+    ) -> list[dict[str, Any]]:
+        entries: list[dict[str, Any]] = []
+        if (
+            not cross_session_memory_enabled
+            or not isinstance(session, AsyncSession)
+            or not memory_user_id
+        ):
+            return entries
         try:
-            user_uuid = UUID(str(user_id))
+            user_uuid = UUID(str(memory_user_id))
             stmt = (
                 select(UserMemory)
                 .where(UserMemory.user_id == user_uuid)
@@ -1721,7 +1794,7 @@ async def create_supervisor_agent(
                     (UserMemory.search_space_id == search_space_id)
                     | (UserMemory.search_space_id.is_(None))
                 )
-            rows = (await db_session.execute(stmt)).scalars().all()
+            rows = (await session.execute(stmt)).scalars().all()
             for row in rows:
                 raw_category = getattr(row, "category", None)
                 category = (
@@ -1732,7 +1805,7 @@ async def create_supervisor_agent(
                 memory_text = str(getattr(row, "memory_text", "") or "").strip()
                 if not memory_text:
                     continue
-                cross_session_memory_entries.append(
+                entries.append(
                     {
                         "id": str(getattr(row, "id", "") or ""),
                         "category": category.lower(),
@@ -1741,7 +1814,19 @@ async def create_supervisor_agent(
                     }
                 )
         except Exception:
-            cross_session_memory_entries = []
+            return []
+        return entries
+
+    async def _request_cross_session_memory_entries() -> list[dict[str, Any]]:
+        request_deps = _request_deps()
+        if "_cross_session_memory_entries" not in request_deps:
+            request_deps[
+                "_cross_session_memory_entries"
+            ] = await _load_cross_session_memory_entries(
+                request_deps.get("db_session"), request_deps.get("user_id")
+            )
+        return request_deps["_cross_session_memory_entries"]
+
     context_token_budget: TokenBudget | None = None
     context_budget_available_tokens = 0
     model_name_for_compaction = (
@@ -1826,14 +1911,16 @@ async def create_supervisor_agent(
         ]
     trafik_tool_ids = list(dict.fromkeys(trafik_tool_ids))
     live_tool_index = []
-    _tool_registry_for_fan_out: dict[str, Any] = {}
+    # Stored with the build dependencies, not in a closure: the tools close
+    # over the session, and a cached graph drops it after the build.
+    dependencies["_fan_out_tool_registry"] = {}
     if isinstance(db_session, AsyncSession):
         try:
             global_tool_registry = await build_global_tool_registry(
                 dependencies=dependencies,
                 include_mcp_tools=True,
             )
-            _tool_registry_for_fan_out = global_tool_registry
+            dependencies["_fan_out_tool_registry"] = global_tool_registry
             metadata_overrides = await get_global_tool_metadata_overrides(db_session)
             live_tool_index = build_tool_index(
                 global_tool_registry,
@@ -1842,6 +1929,22 @@ async def create_supervisor_agent(
         except Exception:
             live_tool_index = []
 
+    async def _request_fan_out_tool_registry() -> dict[str, Any]:
+        # Fan-out tools close over the session and trace recorder, so a
+        # cached graph builds them once per request.
+        request_deps = _request_deps()
+        if "_fan_out_tool_registry" not in request_deps:
+            try:
+                request_deps[
+                    "_fan_out_tool_registry"
+                ] = await build_global_tool_registry(
+                    dependencies=request_deps,
+                    include_mcp_tools=True,
+                )
+            except Exception:
+                request_deps["_fan_out_tool_registry"] = {}
+        return request_deps["_fan_out_tool_registry"]
+
     def _adaptive_tool_margin_threshold(tool_id: str, base_threshold: float) -> float:
         if not _live_phase_enabled(live_routing_config, "adaptive"):
             return base_threshold
@@ -2192,7 +2295,7 @@ async def create_supervisor_agent(
             tool_id,
             state=state,
         )
-        worker = await worker_pool.get(selected_agent_name)
+        worker = await (await _request_worker_pool()).get(selected_agent_name)
         if worker is None:
             return {
                 "status": "failed",
@@ -2215,7 +2318,9 @@ async def create_supervisor_agent(
                 "probability": probability,
             }
 
-        cached_payload = episodic_store.get(tool_id=tool_id, query=latest_user_query)
+        cached_payload = _request_episodic_store().get(
+            tool_id=tool_id, query=latest_user_query
+        )
         if isinstance(cached_payload, dict):
             cached_response = _strip_critic_json(
                 str(cached_payload.get("response") or "").strip()
@@ -2253,7 +2358,7 @@ async def create_supervisor_agent(
                     "from_episodic_cache": True,
                 }
 
-        prompt = worker_prompts.get(selected_agent_name, "")
+        prompt = append_datetime_context(worker_prompts.get(selected_agent_name, ""))
         scoped_prompt = _build_scoped_prompt_for_agent(
             selected_agent_name,
             latest_user_query,
@@ -2286,8 +2391,8 @@ async def create_supervisor_agent(
             "selected_tool_ids": selected_tool_ids_for_worker,
         }
         turn_key = _current_turn_key(state)
-        base_thread_id = str(dependencies.get("thread_id") or "thread")
-        worker_checkpoint_ns = str(dependencies.get("checkpoint_ns") or "").strip()
+        base_thread_id = str(_request_deps().get("thread_id") or "thread")
+        worker_checkpoint_ns = str(_request_deps().get("checkpoint_ns") or "").strip()
         worker_configurable = {
             "thread_id": (
                 f"{base_thread_id}:{selected_agent_name}:speculative:{turn_key}:{tool_id[:24]}"
@@ -2361,7 +2466,7 @@ async def create_supervisor_agent(
         status = str(result_contract.get("status") or "").strip().lower()
         speculative_status = status if status in {"success", "partial"} else "failed"
         if speculative_status in {"success", "partial"} and response_text:
-            episodic_store.put(
+            _request_episodic_store().put(
                 tool_id=tool_id,
                 query=latest_user_query,
                 value={
@@ -2781,9 +2886,11 @@ async def create_supervisor_agent(
                 query=query,
                 system_prompt=compare_external_prompt,
             )
-            if connector_service:
+            request_deps = _request_deps()
+            request_connector_service = request_deps.get("connector_service")
+            if request_connector_service:
                 try:
-                    document = await connector_service.ingest_tool_output(
+                    document = await request_connector_service.ingest_tool_output(
                         tool_name=spec.tool_name,
                         tool_output=result,
                         metadata={
@@ -2792,9 +2899,9 @@ async def create_supervisor_agent(
                             "model_display_name": result.get("model_display_name"),
                             "source": result.get("source"),
                         },
-                        user_id=user_id,
+                        user_id=request_deps.get("user_id"),
                         origin_search_space_id=search_space_id,
-                        thread_id=thread_id,
+                        thread_id=request_deps.get("thread_id"),
                     )
                     if document and getattr(document, "chunks", None):
                         result["document_id"] = document.id
@@ -2879,7 +2986,9 @@ async def create_supervisor_agent(
         )
         cached_agents = _get_cached_combo(cache_key)
         if cached_agents is None:
-            cached_agents = await _fetch_cached_combo_db(db_session, cache_key)
+            cached_agents = await _fetch_cached_combo_db(
+                _request_deps().get("db_session"), cache_key
+            )
             if cached_agents:
                 _set_cached_combo(cache_key, cached_agents)
         if (
@@ -2899,6 +3008,7 @@ async def create_supervisor_agent(
                 agent_by_name[name] for name in cached_agents if name in agent_by_name
             ]
         else:
+            await prefetch_query_embeddings(context_query)
             selected = _smart_retrieve_agents(
                 context_query,
                 agent_definitions=agent_definitions,
@@ -2983,7 +3093,7 @@ async def create_supervisor_agent(
             selected_names = [agent.name for agent in selected]
             if cache_key and cache_pattern:
                 await _store_cached_combo_db(
-                    db_session,
+                    _request_deps().get("db_session"),
                     cache_key=cache_key,
                     route_hint=route_hint,
                     pattern=cache_pattern,
@@ -3345,7 +3455,7 @@ async def create_supervisor_agent(
 
             artifact_seed = "|".join(
                 [
-                    str(thread_id or "thread"),
+                    str(_request_deps().get("thread_id") or "thread"),
                     current_turn_id or turn_key or "turn",
                     source_id,
                     content_sha1[:16],
@@ -3360,7 +3470,7 @@ async def create_supervisor_agent(
             artifact_uri, artifact_path, storage_backend = _persist_artifact_content(
                 artifact_id=artifact_id,
                 content=serialized_payload,
-                thread_id=thread_id,
+                thread_id=_request_deps().get("thread_id"),
                 turn_key=turn_key,
                 sandbox_enabled=bool(sandbox_enabled),
                 artifact_storage_mode=storage_mode,
@@ -3418,7 +3528,7 @@ async def create_supervisor_agent(
         )
         subagent_isolated = _subagent_isolation_active(execution_strategy)
         turn_key = _current_turn_key(injected_state)
-        base_thread_id = str(dependencies.get("thread_id") or "thread")
+        base_thread_id = str(_request_deps().get("thread_id") or "thread")
         subagent_id = (
             _build_subagent_id(
                 base_thread_id=base_thread_id,
@@ -3475,7 +3585,7 @@ async def create_supervisor_agent(
                 },
                 ensure_ascii=True,
             )
-        worker = await worker_pool.get(name)
+        worker = await (await _request_worker_pool()).get(name)
         if not worker:
             error_message = f"Agent '{agent_name}' not available."
             return json.dumps(
@@ -3542,6 +3652,7 @@ async def create_supervisor_agent(
                     if str(tool_id).strip()
                 ][:8]
         if not selected_tool_ids:
+            await prefetch_query_embeddings(task)
             tool_selection_meta = _resolve_live_tool_selection_for_agent(
                 name,
                 task,
@@ -3684,7 +3795,7 @@ async def create_supervisor_agent(
         cached_payload = (
             None
             if filesystem_sandbox_task
-            else episodic_store.get(
+            else _request_episodic_store().get(
                 tool_id=memory_scope_id,
                 query=task,
             )
@@ -3758,7 +3869,7 @@ async def create_supervisor_agent(
                     },
                     ensure_ascii=True,
                 )
-        prompt = worker_prompts.get(name, "")
+        prompt = append_datetime_context(worker_prompts.get(name, ""))
         scoped_prompt = _build_scoped_prompt_for_agent(
             name,
             task,
@@ -3789,7 +3900,7 @@ async def create_supervisor_agent(
                 fan_out_results = await execute_domain_fan_out(
                     agent_name=name,
                     query=task,
-                    tool_registry=_tool_registry_for_fan_out,
+                    tool_registry=await _request_fan_out_tool_registry(),
                 )
                 fan_out_context = format_fan_out_context(fan_out_results)
             except Exception as fan_out_exc:
@@ -3814,7 +3925,7 @@ async def create_supervisor_agent(
             isolated=subagent_isolated,
             subagent_id=subagent_id,
         )
-        worker_checkpoint_ns = str(dependencies.get("checkpoint_ns") or "").strip()
+        worker_checkpoint_ns = str(_request_deps().get("checkpoint_ns") or "").strip()
         worker_thread_id = f"{base_thread_id}:{name}:{turn_key}"
         if subagent_isolated and subagent_id:
             worker_thread_id = f"{worker_thread_id}:{subagent_id}"
@@ -4271,7 +4382,7 @@ async def create_supervisor_agent(
             }
             and str(response_text).strip()
         ):
-            episodic_store.put(
+            _request_episodic_store().put(
                 tool_id=memory_scope_id,
                 query=task,
                 value={
@@ -4395,7 +4506,7 @@ async def create_supervisor_agent(
             )
             agent_name = resolved_agent_name or requested_agent_name
             turn_key = _current_turn_key(injected_state)
-            base_thread_id = str(dependencies.get("thread_id") or "thread")
+            base_thread_id = str(_request_deps().get("thread_id") or "thread")
             subagent_id = (
                 _build_subagent_id(
                     base_thread_id=base_thread_id,
@@ -4447,7 +4558,7 @@ async def create_supervisor_agent(
                         else None
                     ),
                 }
-            worker = await worker_pool.get(agent_name)
+            worker = await (await _request_worker_pool()).get(agent_name)
             if not worker:
                 error_message = f"Agent '{agent_name}' not available."
                 result_contract = _build_agent_result_contract(
@@ -4506,6 +4617,7 @@ async def create_supervisor_agent(
                             if str(tool_id).strip()
                         ][:8]
                 if not selected_tool_ids:
+                    await prefetch_query_embeddings(task)
                     tool_selection_meta = _resolve_live_tool_selection_for_agent(
                         agent_name,
                         task,
@@ -4643,7 +4755,7 @@ async def create_supervisor_agent(
                 cached_payload = (
                     None
                     if filesystem_sandbox_task
-                    else episodic_store.get(
+                    else _request_episodic_store().get(
                         tool_id=memory_scope_id,
                         query=task,
                     )
@@ -4705,7 +4817,7 @@ async def create_supervisor_agent(
                                 else None
                             ),
                         }
-                prompt = worker_prompts.get(agent_name, "")
+                prompt = append_datetime_context(worker_prompts.get(agent_name, ""))
                 scoped_prompt = _build_scoped_prompt_for_agent(
                     agent_name,
                     task,
@@ -4736,7 +4848,7 @@ async def create_supervisor_agent(
                         fan_out_results = await execute_domain_fan_out(
                             agent_name=agent_name,
                             query=task,
-                            tool_registry=_tool_registry_for_fan_out,
+                            tool_registry=await _request_fan_out_tool_registry(),
                         )
                         fan_out_context = format_fan_out_context(fan_out_results)
                     except Exception as fan_out_exc:
@@ -4762,7 +4874,7 @@ async def create_supervisor_agent(
                     subagent_id=subagent_id,
                 )
                 worker_checkpoint_ns = str(
-                    dependencies.get("checkpoint_ns") or ""
+                    _request_deps().get("checkpoint_ns") or ""
                 ).strip()
                 worker_thread_id = f"{base_thread_id}:{agent_name}:{turn_key}"
                 if subagent_isolation_for_parallel and subagent_id:
@@ -4883,7 +4995,7 @@ async def create_supervisor_agent(
                     }
                     and str(response_text).strip()
                 ):
-                    episodic_store.put(
+                    _request_episodic_store().put(
                         tool_id=memory_scope_id,
                         query=task,
                         value={
@@ -5311,11 +5423,12 @@ async def create_supervisor_agent(
     ) -> SupervisorState:
         if not cross_session_memory_enabled:
             return {"cross_session_memory_context": None}
-        if not cross_session_memory_entries:
+        memory_entries = await _request_cross_session_memory_entries()
+        if not memory_entries:
             return {"cross_session_memory_context": None}
         latest_user_query = _latest_user_query(state.get("messages") or [])
         selected_entries = _select_cross_session_memory_entries(
-            entries=cross_session_memory_entries,
+            entries=memory_entries,
             query=latest_user_query,
             max_items=int(cross_session_memory_max_items),
         )
@@ -5636,7 +5749,7 @@ async def create_supervisor_agent(
 
             artifact_seed = "|".join(
                 [
-                    str(thread_id or "thread"),
+                    str(_request_deps().get("thread_id") or "thread"),
                     current_turn_id or "turn",
                     source_id,
                     content_sha1[:16],
@@ -5651,7 +5764,7 @@ async def create_supervisor_agent(
             artifact_uri, artifact_path, storage_backend = _persist_artifact_content(
                 artifact_id=artifact_id,
                 content=serialized_payload,
-                thread_id=thread_id,
+                thread_id=_request_deps().get("thread_id"),
                 turn_key=turn_key,
                 sandbox_enabled=bool(sandbox_enabled),
                 artifact_storage_mode=artifact_offload_storage_mode,
@@ -6286,115 +6399,74 @@ async def create_supervisor_agent(
             include_research=True,
         )
 
-        # Build tavily_search_fn for compare research agent.
-        # Pre-fetch the API key NOW (while the DB session is fresh) and
-        # cache it in the closure.  This avoids expired-session errors
-        # when the function is called minutes later from the research worker.
-        #
-        # Resolution order:
-        # 1. Per-search-space connector (TAVILY_API in DB)
-        # 2. Global PUBLIC_TAVILY_API_KEY environment variable
-        _compare_tavily_search_fn = None
-        _tavily_api_key: str | None = None
-        if connector_service and search_space_id is not None:
-            try:
-                from app.db import SearchSourceConnectorType
-
-                tavily_connector = await connector_service.get_connector_by_type(
-                    SearchSourceConnectorType.TAVILY_API, search_space_id
-                )
-                if tavily_connector:
-                    _tavily_api_key = tavily_connector.config.get("TAVILY_API_KEY")
-            except Exception as exc:
+        # Build tavily_search_fn for compare research agent.  The API key is
+        # resolved for the running request on each call (see
+        # _request_tavily_api_key), never captured from the building turn.
+        async def _compare_tavily_search_fn(
+            query: str, max_results: int
+        ) -> list[dict[str, Any]]:
+            """Call Tavily API with the running request's API key."""
+            api_key = await _request_tavily_api_key()
+            if not api_key:
                 logger.warning(
-                    "compare mode: failed to fetch Tavily API key from DB: %s", exc
+                    "compare_tavily_search_fn: no Tavily API key for this "
+                    "search space — skipping web search"
                 )
-
-        # Fallback: use global PUBLIC_TAVILY_API_KEY from environment
-        if not _tavily_api_key:
-            from app.config import Config as _AppConfig
-
-            _tavily_api_key = getattr(_AppConfig, "PUBLIC_TAVILY_API_KEY", None)
-            if _tavily_api_key:
-                logger.info(
-                    "compare mode: using PUBLIC_TAVILY_API_KEY from env "
-                    "(no per-space connector found)"
+                return []
+            logger.info(
+                "compare_tavily_search_fn: searching query=%r, max_results=%d",
+                query[:80],
+                max_results,
+            )
+            try:
+                from tavily import TavilyClient
+
+                client = TavilyClient(api_key=api_key)
+                response = await asyncio.to_thread(
+                    client.search,
+                    query=query,
+                    max_results=max_results,
+                    search_depth="basic",
+                    include_answer=True,
+                    include_raw_content=False,
+                    include_images=False,
                 )
 
-        if _tavily_api_key:
-            _cached_key = _tavily_api_key  # capture in closure
-
-            async def _compare_tavily_search_fn(
-                query: str, max_results: int
-            ) -> list[dict[str, Any]]:
-                """Call Tavily API directly with pre-fetched API key."""
-                logger.info(
-                    "compare_tavily_search_fn: searching query=%r, max_results=%d",
-                    query[:80],
-                    max_results,
-                )
-                try:
-                    from tavily import TavilyClient
-
-                    client = TavilyClient(api_key=_cached_key)
-                    response = await asyncio.to_thread(
-                        client.search,
-                        query=query,
-                        max_results=max_results,
-                        search_depth="basic",
-                        include_answer=True,
-                        include_raw_content=False,
-                        include_images=False,
+                results: list[dict[str, Any]] = []
+                for item in response.get("results", []):
+                    results.append(
+                        {
+                            "url": item.get("url", ""),
+                            "title": item.get("title", ""),
+                            "content": item.get("content", "")[:500],
+                        }
                     )
 
-                    results: list[dict[str, Any]] = []
-                    for item in response.get("results", []):
-                        results.append(
-                            {
-                                "url": item.get("url", ""),
-                                "title": item.get("title", ""),
-                                "content": item.get("content", "")[:500],
-                            }
-                        )
-
-                    # Include Tavily's own answer if available
-                    tavily_answer = response.get("answer", "")
-                    if tavily_answer and not results:
-                        results.append(
-                            {
-                                "url": "",
-                                "title": "Tavily AI Answer",
-                                "content": str(tavily_answer)[:500],
-                            }
-                        )
-
-                    logger.info(
-                        "compare_tavily_search_fn: got %d results for query=%r",
-                        len(results),
-                        query[:80],
+                # Include Tavily's own answer if available
+                tavily_answer = response.get("answer", "")
+                if tavily_answer and not results:
+                    results.append(
+                        {
+                            "url": "",
+                            "title": "Tavily AI Answer",
+                            "content": str(tavily_answer)[:500],
+                        }
                     )
-                    return results
 
-                except Exception as exc:
-                    logger.warning(
-                        "compare_tavily_search_fn: error: %s",
-                        exc,
-                        exc_info=True,
-                    )
-                    return []
+                logger.info(
+                    "compare_tavily_search_fn: got %d results for query=%r",
+                    len(results),
+                    query[:80],
+                )
+                return results
 
-            logger.info(
-                "compare mode: tavily_search_fn CREATED with pre-fetched API key",
-            )
-        else:
-            logger.warning(
-                "compare mode: tavily_search_fn is None! "
-                "(connector_service=%s, search_space_id=%s, key_found=%s) "
-                "— research agent will NOT perform web searches",
-                connector_service,
-                search_space_id,
-                bool(_tavily_api_key),
-            )
+            except Exception as exc:
+                logger.warning(
+                    "compare_tavily_search_fn: error: %s",
+                    exc,
+                    exc_info=True,
+                )
+                return []
 
         # Build compare subagent spawner (P4 pattern with specialized workers)
         # Compare mode uses sandbox with Redis state store to avoid the
@@ -6481,59 +6553,40 @@ async def create_supervisor_agent(
         )
 
         # Build Tavily search function for OneSeek (reuse compare pattern)
-        _debate_tavily_search_fn = None
-        _debate_tavily_key: str | None = None
-        if connector_service and search_space_id is not None:
+        async def _debate_tavily_search_fn(
+            query: str, max_results: int
+        ) -> list[dict[str, Any]]:
+            """Call Tavily API for debate mode OneSeek research."""
+            api_key = await _request_tavily_api_key()
+            if not api_key:
+                return []
             try:
-                from app.db import SearchSourceConnectorType
-
-                tavily_connector = await connector_service.get_connector_by_type(
-                    SearchSourceConnectorType.TAVILY_API, search_space_id
+                from tavily import TavilyClient
+
+                client = TavilyClient(api_key=api_key)
+                response = await asyncio.to_thread(
+                    client.search,
+                    query=query,
+                    max_results=max_results,
+                    search_depth="basic",
+                    include_answer=True,
+                    include_raw_content=False,
+                    include_images=False,
                 )
-                if tavily_connector:
-                    _debate_tavily_key = tavily_connector.config.get("TAVILY_API_KEY")
-            except Exception as exc:
-                logger.warning("debate mode: failed to fetch Tavily API key: %s", exc)
 
-        if not _debate_tavily_key:
-            from app.config import Config as _AppConfig
-
-            _debate_tavily_key = getattr(_AppConfig, "PUBLIC_TAVILY_API_KEY", None)
-
-        if _debate_tavily_key:
-            _cached_debate_key = _debate_tavily_key
-
-            async def _debate_tavily_search_fn(
-                query: str, max_results: int
-            ) -> list[dict[str, Any]]:
-                """Call Tavily API for debate mode OneSeek research."""
-                try:
-                    from tavily import TavilyClient
-
-                    client = TavilyClient(api_key=_cached_debate_key)
-                    response = await asyncio.to_thread(
-                        client.search,
-                        query=query,
-                        max_results=max_results,
-                        search_depth="basic",
-                        include_answer=True,
-                        include_raw_content=False,
-                        include_images=False,
+                results: list[dict[str, Any]] = []
+                for item in response.get("results", []):
+                    results.append(
+                        {
+                            "url": item.get("url", ""),
+                            "title": item.get("title", ""),
+                            "content": item.get("content", "")[:500],
+                        }
                     )
-
-                    results: list[dict[str, Any]] = []
-                    for item in response.get("results", []):
-                        results.append(
-                            {
-                                "url": item.get("url", ""),
-                                "title": item.get("title", ""),
-                                "content": item.get("content", "")[:500],
-                            }
-                        )
-                    return results
-                except Exception as exc:
-                    logger.warning("debate_tavily_search_fn: error: %s", exc)
-                    return []
+                return results
+            except Exception as exc:
+                logger.warning("debate_tavily_search_fn: error: %s", exc)
+                return []
 
         # Build debate round executor (runs all 4 rounds)
         debate_round_executor_node = build_debate_round_executor_node(
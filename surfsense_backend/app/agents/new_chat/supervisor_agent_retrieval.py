@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Any
 
 from app.agents.new_chat.bigtool_store import _normalize_text, _tokenize
+from app.agents.new_chat.query_embeddings import embed_query_sync
 from app.agents.new_chat.supervisor_constants import (
     _AGENT_EMBED_CACHE,
     AGENT_EMBEDDING_WEIGHT,
@@ -152,11 +153,7 @@ def _smart_retrieve_agents_with_breakdown(
     query_embedding: list[float] | None = None
     if query:
         try:
-            from app.config import config
-
-            query_embedding = _normalize_vector(
-                config.embedding_model_instance.embed(query)
-            )
+            query_embedding = _normalize_vector(embed_query_sync(query))
         except Exception:
             query_embedding = None
     recent_agents = [agent for agent in (recent_agents or []) if agent]
@@ -9,6 +9,7 @@ This module provides:
 """
 
 import json
+import logging
 from datetime import datetime
 from typing import Any
 
@@ -16,7 +17,9 @@ from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.connector_service import ConnectorService
+from app.services.connector_service import SHARED_SESSION_CONNECTORS, ConnectorService
+
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 # Connector Constants and Normalization
@@ -345,307 +348,328 @@ async def search_knowledge_base_async(
 
     connectors = _normalize_connectors(connectors_to_search, available_connectors)
 
-    for connector in connectors:
+    async def _search_connector(connector: str) -> list[dict[str, Any]]:
+        if connector == "YOUTUBE_VIDEO":
+            _, chunks = await connector_service.search_youtube(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "EXTENSION":
+            _, chunks = await connector_service.search_extension(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "CRAWLED_URL":
+            _, chunks = await connector_service.search_crawled_urls(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "FILE":
+            _, chunks = await connector_service.search_files(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "SLACK_CONNECTOR":
+            _, chunks = await connector_service.search_slack(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "TEAMS_CONNECTOR":
+            _, chunks = await connector_service.search_teams(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "NOTION_CONNECTOR":
+            _, chunks = await connector_service.search_notion(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "GITHUB_CONNECTOR":
+            _, chunks = await connector_service.search_github(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "LINEAR_CONNECTOR":
+            _, chunks = await connector_service.search_linear(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "TAVILY_API":
+            _, chunks = await connector_service.search_tavily(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+            )
+            return chunks
+
+        elif connector == "SEARXNG_API":
+            _, chunks = await connector_service.search_searxng(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+            )
+            return chunks
+
+        elif connector == "LINKUP_API":
+            # Keep behavior aligned with researcher: default "standard"
+            _, chunks = await connector_service.search_linkup(
+                user_query=query,
+                search_space_id=search_space_id,
+                mode="standard",
+            )
+            return chunks
+
+        elif connector == "BAIDU_SEARCH_API":
+            _, chunks = await connector_service.search_baidu(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+            )
+            return chunks
+
+        elif connector == "DISCORD_CONNECTOR":
+            _, chunks = await connector_service.search_discord(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "JIRA_CONNECTOR":
+            _, chunks = await connector_service.search_jira(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "GOOGLE_CALENDAR_CONNECTOR":
+            _, chunks = await connector_service.search_google_calendar(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "AIRTABLE_CONNECTOR":
+            _, chunks = await connector_service.search_airtable(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "GOOGLE_GMAIL_CONNECTOR":
+            _, chunks = await connector_service.search_google_gmail(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "GOOGLE_DRIVE_FILE":
+            _, chunks = await connector_service.search_google_drive(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "CONFLUENCE_CONNECTOR":
+            _, chunks = await connector_service.search_confluence(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "CLICKUP_CONNECTOR":
+            _, chunks = await connector_service.search_clickup(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "LUMA_CONNECTOR":
+            _, chunks = await connector_service.search_luma(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "ELASTICSEARCH_CONNECTOR":
+            _, chunks = await connector_service.search_elasticsearch(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "NOTE":
+            _, chunks = await connector_service.search_notes(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "BOOKSTACK_CONNECTOR":
+            _, chunks = await connector_service.search_bookstack(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "CIRCLEBACK":
+            _, chunks = await connector_service.search_circleback(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "OBSIDIAN_CONNECTOR":
+            _, chunks = await connector_service.search_obsidian(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        # =========================================================
+        # Composio Connectors
+        # =========================================================
+        elif connector == "COMPOSIO_GOOGLE_DRIVE_CONNECTOR":
+            _, chunks = await connector_service.search_composio_google_drive(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "COMPOSIO_GMAIL_CONNECTOR":
+            _, chunks = await connector_service.search_composio_gmail(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        elif connector == "COMPOSIO_GOOGLE_CALENDAR_CONNECTOR":
+            _, chunks = await connector_service.search_composio_google_calendar(
+                user_query=query,
+                search_space_id=search_space_id,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+            return chunks
+
+        return []
+
+    # Rank every indexed document type in one batch; the per-connector searches
+    # below then pick up their results without another database round trip.
+    document_types = [c for c in connectors if c not in SHARED_SESSION_CONNECTORS]
+    if len(document_types) > 1:
         try:
-            if connector == "YOUTUBE_VIDEO":
-                _, chunks = await connector_service.search_youtube(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "EXTENSION":
-                _, chunks = await connector_service.search_extension(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CRAWLED_URL":
-                _, chunks = await connector_service.search_crawled_urls(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "FILE":
-                _, chunks = await connector_service.search_files(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "SLACK_CONNECTOR":
-                _, chunks = await connector_service.search_slack(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "TEAMS_CONNECTOR":
-                _, chunks = await connector_service.search_teams(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "NOTION_CONNECTOR":
-                _, chunks = await connector_service.search_notion(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GITHUB_CONNECTOR":
-                _, chunks = await connector_service.search_github(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "LINEAR_CONNECTOR":
-                _, chunks = await connector_service.search_linear(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "TAVILY_API":
-                _, chunks = await connector_service.search_tavily(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "SEARXNG_API":
-                _, chunks = await connector_service.search_searxng(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "LINKUP_API":
-                # Keep behavior aligned with researcher: default "standard"
-                _, chunks = await connector_service.search_linkup(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    mode="standard",
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "BAIDU_SEARCH_API":
-                _, chunks = await connector_service.search_baidu(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "DISCORD_CONNECTOR":
-                _, chunks = await connector_service.search_discord(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "JIRA_CONNECTOR":
-                _, chunks = await connector_service.search_jira(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GOOGLE_CALENDAR_CONNECTOR":
-                _, chunks = await connector_service.search_google_calendar(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "AIRTABLE_CONNECTOR":
-                _, chunks = await connector_service.search_airtable(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GOOGLE_GMAIL_CONNECTOR":
-                _, chunks = await connector_service.search_google_gmail(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GOOGLE_DRIVE_FILE":
-                _, chunks = await connector_service.search_google_drive(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CONFLUENCE_CONNECTOR":
-                _, chunks = await connector_service.search_confluence(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CLICKUP_CONNECTOR":
-                _, chunks = await connector_service.search_clickup(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "LUMA_CONNECTOR":
-                _, chunks = await connector_service.search_luma(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "ELASTICSEARCH_CONNECTOR":
-                _, chunks = await connector_service.search_elasticsearch(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "NOTE":
-                _, chunks = await connector_service.search_notes(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "BOOKSTACK_CONNECTOR":
-                _, chunks = await connector_service.search_bookstack(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CIRCLEBACK":
-                _, chunks = await connector_service.search_circleback(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "OBSIDIAN_CONNECTOR":
-                _, chunks = await connector_service.search_obsidian(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            # =========================================================
-            # Composio Connectors
-            # =========================================================
-            elif connector == "COMPOSIO_GOOGLE_DRIVE_CONNECTOR":
-                _, chunks = await connector_service.search_composio_google_drive(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "COMPOSIO_GMAIL_CONNECTOR":
-                _, chunks = await connector_service.search_composio_gmail(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "COMPOSIO_GOOGLE_CALENDAR_CONNECTOR":
-                _, chunks = await connector_service.search_composio_google_calendar(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-        except Exception as e:
-            print(f"Error searching connector {connector}: {e}")
-            continue
+            await connector_service.prefetch_combined_rrf_searches(
+                query_text=query,
+                search_space_id=search_space_id,
+                document_types=document_types,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+        except Exception:
+            logger.exception("Error prefetching knowledge base results")
+
+    # Connectors are searched concurrently (bounded per request); results are
+    # merged in connector order so deduplication stays deterministic.
+    results_by_connector = await connector_service.search_connectors_concurrently(
+        connectors, _search_connector
+    )
+    for chunks in results_by_connector.values():
+        all_documents.extend(chunks)
 
     # Deduplicate by content hash
     seen_doc_ids: set[Any] = set()
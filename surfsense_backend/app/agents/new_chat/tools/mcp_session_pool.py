@@ -0,0 +1,452 @@
+"""Persistent MCP sessions shared across tool calls.
+
+Opening an MCP session is expensive: a stdio connector spawns the server
+process, and every transport runs the full ``initialize`` handshake.  Doing
+that per tool call (and again on every graph build just to list tools) makes
+call latency process-spawn time instead of round-trip time.
+
+``MCPSessionManager`` keeps one long-lived ``ClientSession`` per server
+configuration, keyed by a hash of the configuration, so connectors with the
+same config share a session and an edited config gets a new one:
+
+- Concurrent ``call_tool`` requests are multiplexed over the session (MCP
+  requests carry ids, so they do not wait for each other).
+- Each session is owned by a background task, because the anyio-based MCP
+  transports must be entered and exited in the same task.
+- Connecting retries with exponential backoff.  A call that fails because
+  the connection died discards the session and is retried once on a new
+  one.
+- ``list_tools`` results are cached for ``MCP_TOOLS_CACHE_TTL_SECONDS``.
+  The cache is dropped when the server announces ``tools/list_changed``
+  and when the connector is updated or deleted (``invalidate_connector``).
+- Sessions idle for longer than ``MCP_SESSION_IDLE_SECONDS`` are closed.
+
+Managers are per event loop (sessions cannot move between loops); use
+``get_mcp_session_manager()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+import httpx
+
+from app.agents.new_chat.tools.mcp_client import (
+    MAX_RETRIES,
+    RETRY_BACKOFF,
+    RETRY_DELAY,
+)
+
+logger = logging.getLogger(__name__)
+
+MCP_TOOLS_CACHE_TTL_SECONDS = float(os.getenv("MCP_TOOLS_CACHE_TTL_SECONDS", "300"))
+MCP_SESSION_IDLE_SECONDS = float(os.getenv("MCP_SESSION_IDLE_SECONDS", "900"))
+MCP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("MCP_CONNECT_TIMEOUT_SECONDS", "60"))
+
+
+@dataclass(frozen=True)
+class MCPServerConfig:
+    """Connection parameters of one MCP server."""
+
+    transport: str  # "stdio" or "http"
+    command: str | None = None
+    args: tuple[str, ...] = ()
+    env: tuple[tuple[str, str], ...] = ()
+    url: str | None = None
+    headers: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def stdio(
+        cls, command: str, args: list[str], env: dict[str, str] | None = None
+    ) -> MCPServerConfig:
+        return cls(
+            transport="stdio",
+            command=command,
+            args=tuple(str(a) for a in args),
+            env=tuple(sorted((str(k), str(v)) for k, v in (env or {}).items())),
+        )
+
+    @classmethod
+    def http(cls, url: str, headers: dict[str, str] | None = None) -> MCPServerConfig:
+        return cls(
+            transport="http",
+            url=url,
+            headers=tuple(sorted((str(k), str(v)) for k, v in (headers or {}).items())),
+        )
+
+    @property
+    def key(self) -> str:
+        encoded = json.dumps(
+            [self.transport, self.command, self.args, self.env, self.url, self.headers],
+            sort_keys=True,
+        )
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @property
+    def label(self) -> str:
+        if self.transport == "stdio":
+            return " ".join([self.command or "", *self.args]).strip()
+        return self.url or ""
+
+
+def _tool_definitions(response: Any) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": tool.name,
+            "description": tool.description or "",
+            "input_schema": tool.inputSchema if hasattr(tool, "inputSchema") else {},
+        }
+        for tool in response.tools
+    ]
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """Whether ``error`` means the session is unusable (not a tool error)."""
+    if isinstance(
+        error,
+        anyio.ClosedResourceError
+        | anyio.BrokenResourceError
+        | anyio.EndOfStream
+        | ConnectionError
+        | httpx.TransportError,
+    ):
+        return True
+    return "connection closed" in str(error).lower()
+
+
+@asynccontextmanager
+async def _open_client_session(
+    config: MCPServerConfig, on_tools_changed: Callable[[], None]
+) -> AsyncIterator[Any]:
+    """Open the transport and an initialized ``ClientSession`` for ``config``."""
+    from mcp import ClientSession, types
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+    from mcp.client.streamable_http import streamablehttp_client
+
+    async def message_handler(message: Any) -> None:
+        root = getattr(message, "root", None)
+        if isinstance(root, types.ToolListChangedNotification):
+            on_tools_changed()
+
+    if config.transport == "stdio":
+        server_env = os.environ.copy()
+        server_env.update(dict(config.env))
+        params = StdioServerParameters(
+            command=config.command, args=list(config.args), env=server_env
+        )
+        async with (
+            stdio_client(server=params) as (read, write),
+            ClientSession(read, write, message_handler=message_handler) as session,
+        ):
+            await session.initialize()
+            yield session
+    else:
+        async with (
+            streamablehttp_client(config.url, headers=dict(config.headers)) as (
+                read,
+                write,
+                _,
+            ),
+            ClientSession(read, write, message_handler=message_handler) as session,
+        ):
+            await session.initialize()
+            yield session
+
+
+SessionOpener = Callable[
+    [MCPServerConfig, Callable[[], None]], AbstractAsyncContextManager[Any]
+]
+
+
+@dataclass
+class _PooledSession:
+    config: MCPServerConfig
+    session: Any = None
+    error: BaseException | None = None
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    _owner: asyncio.Task | None = None
+    _ready: asyncio.Event = field(default_factory=asyncio.Event)
+    _close: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._owner is not None
+            and not self._owner.done()
+        )
+
+    async def start(self, opener: SessionOpener, on_tools_changed) -> None:
+        async def own() -> None:
+            try:
+                async with opener(self.config, on_tools_changed) as session:
+                    self.session = session
+                    self._ready.set()
+                    await self._close.wait()
+            except Exception as e:
+                self.error = e
+            finally:
+                self.session = None
+                self._ready.set()
+
+        self._owner = asyncio.create_task(
+            own(), name=f"mcp-session:{self.config.label}"
+        )
+        try:
+            await asyncio.wait_for(self._ready.wait(), MCP_CONNECT_TIMEOUT_SECONDS)
+        except TimeoutError:
+            await self.close()
+            raise TimeoutError(
+                f"MCP initialize timed out after {MCP_CONNECT_TIMEOUT_SECONDS:.0f}s"
+            ) from None
+        if self.session is None:
+            raise self.error or RuntimeError("MCP session closed during initialize")
+
+    async def close(self) -> None:
+        self._close.set()
+        owner = self._owner
+        if owner is None or owner.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(owner), timeout=5)
+        except TimeoutError:
+            owner.cancel()
+        except asyncio.CancelledError:
+            owner.cancel()
+            # Only absorb the owner's own cancellation, not the caller's
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+        except Exception:
+            pass
+
+
+class MCPServerHandle:
+    """``ClientSession``-like view of one server in a manager."""
+
+    def __init__(self, manager: MCPSessionManager, config: MCPServerConfig):
+        self._manager = manager
+        self.config = config
+
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None):
+        return await self._manager.call_tool(self.config, name, arguments or {})
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        return await self._manager.list_tools(self.config)
+
+
+class MCPSessionManager:
+    """Long-lived MCP sessions and cached tool lists, keyed by server config."""
+
+    def __init__(
+        self,
+        *,
+        opener: SessionOpener = _open_client_session,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: float = RETRY_DELAY,
+        tools_ttl: float = MCP_TOOLS_CACHE_TTL_SECONDS,
+        idle_timeout: float = MCP_SESSION_IDLE_SECONDS,
+    ):
+        self._opener = opener
+        self._max_retries = max(1, max_retries)
+        self._retry_delay = retry_delay
+        self._tools_ttl = tools_ttl
+        self._idle_timeout = idle_timeout
+        self._sessions: dict[str, _PooledSession] = {}
+        self._connect_locks: dict[str, asyncio.Lock] = {}
+        self._tools: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._connector_keys: dict[int, set[str]] = {}
+        # Metrics
+        self.connects = 0
+        self.calls = 0
+        self.reconnects = 0
+        self.tools_cache_hits = 0
+        self.tools_cache_misses = 0
+
+    def handle(
+        self, config: MCPServerConfig, *, connector_id: int | None = None
+    ) -> MCPServerHandle:
+        if connector_id is not None:
+            self._connector_keys.setdefault(connector_id, set()).add(config.key)
+        return MCPServerHandle(self, config)
+
+    async def call_tool(
+        self, config: MCPServerConfig, name: str, arguments: dict[str, Any]
+    ) -> Any:
+        """Call ``name`` on the shared session, reconnecting once if it died."""
+        self.calls += 1
+        for attempt in range(2):
+            pooled = await self._acquire(config)
+            pooled.in_flight += 1
+            try:
+                return await pooled.session.call_tool(name, arguments=arguments)
+            except Exception as e:
+                if attempt or not (_is_connection_error(e) or not pooled.alive):
+                    raise
+                logger.warning(
+                    "MCP session to %s failed (%s); reconnecting", config.label, e
+                )
+                self.reconnects += 1
+                await self._discard(config.key, pooled)
+            finally:
+                pooled.in_flight -= 1
+                pooled.last_used = time.monotonic()
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    async def list_tools(
+        self, config: MCPServerConfig, *, refresh: bool = False
+    ) -> list[dict[str, Any]]:
+        """Tool definitions of the server, cached per config."""
+        key = config.key
+        cached = self._tools.get(key)
+        if (
+            not refresh
+            and cached is not None
+            and time.monotonic() - cached[0] < self._tools_ttl
+        ):
+            self.tools_cache_hits += 1
+            return cached[1]
+        self.tools_cache_misses += 1
+
+        for attempt in range(2):
+            pooled = await self._acquire(config)
+            try:
+                response = await pooled.session.list_tools()
+                break
+            except Exception as e:
+                if attempt or not (_is_connection_error(e) or not pooled.alive):
+                    raise
+                self.reconnects += 1
+                await self._discard(key, pooled)
+            finally:
+                pooled.last_used = time.monotonic()
+        tools = _tool_definitions(response)
+        self._tools[key] = (time.monotonic(), tools)
+        return tools
+
+    def invalidate_tools(self, key: str) -> None:
+        self._tools.pop(key, None)
+
+    async def invalidate_connector(self, connector_id: int) -> None:
+        """Drop cached tools and close sessions of an updated/deleted connector."""
+        for key in self._connector_keys.pop(connector_id, set()):
+            self.invalidate_tools(key)
+            pooled = self._sessions.get(key)
+            if pooled is not None:
+                await self._discard(key, pooled)
+
+    async def close_all(self) -> None:
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        self._tools.clear()
+        for _, pooled in sessions:
+            await pooled.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sessions": sum(1 for s in self._sessions.values() if s.alive),
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "calls": self.calls,
+            "tools_cache_hits": self.tools_cache_hits,
+            "tools_cache_misses": self.tools_cache_misses,
+        }
+
+    async def _acquire(self, config: MCPServerConfig) -> _PooledSession:
+        key = config.key
+        await self._close_idle(exclude=key)
+        pooled = self._sessions.get(key)
+        if pooled is not None and pooled.alive:
+            return pooled
+
+        lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have connected while we waited
+            pooled = self._sessions.get(key)
+            if pooled is not None and pooled.alive:
+                return pooled
+            pooled = await self._connect(config)
+            self._sessions[key] = pooled
+            return pooled
+
+    async def _connect(self, config: MCPServerConfig) -> _PooledSession:
+        last_error: BaseException | None = None
+        delay = self._retry_delay
+        for attempt in range(self._max_retries):
+            pooled = _PooledSession(config)
+            try:
+                await pooled.start(
+                    self._opener, lambda key=config.key: self.invalidate_tools(key)
+                )
+                self.connects += 1
+                logger.info("Connected MCP session: %s", config.label)
+                return pooled
+            except Exception as e:
+                last_error = e
+                await pooled.close()
+                if attempt < self._max_retries - 1:
+                    logger.warning(
+                        "MCP connection failed (attempt %d/%d): %s. Retrying in %.1fs...",
+                        attempt + 1,
+                        self._max_retries,
+                        e,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                    delay *= RETRY_BACKOFF
+        error_msg = (
+            f"Failed to connect to MCP server '{config.label}' "
+            f"after {self._max_retries} attempts"
+        )
+        if last_error:
+            error_msg += f": {last_error}"
+        raise RuntimeError(error_msg) from last_error
+
+    async def _discard(self, key: str, pooled: _PooledSession) -> None:
+        if self._sessions.get(key) is pooled:
+            del self._sessions[key]
+        await pooled.close()
+
+    async def _close_idle(self, *, exclude: str) -> None:
+        now = time.monotonic()
+        for key, pooled in list(self._sessions.items()):
+            if (
+                key != exclude
+                and pooled.in_flight == 0
+                and now - pooled.last_used > self._idle_timeout
+            ):
+                await self._discard(key, pooled)
+
+
+_managers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionManager] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_mcp_session_manager() -> MCPSessionManager:
+    """Session manager of the running event loop."""
+    loop = asyncio.get_running_loop()
+    manager = _managers.get(loop)
+    if manager is None:
+        manager = MCPSessionManager()
+        _managers[loop] = manager
+    return manager
+
+
+async def close_mcp_sessions() -> None:
+    """Close the running loop's MCP sessions (app shutdown)."""
+    manager = _managers.pop(asyncio.get_running_loop(), None)
+    if manager is not None:
+        await manager.close_all()
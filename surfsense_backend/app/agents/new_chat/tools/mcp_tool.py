@@ -8,20 +8,27 @@ Supports both transport types:
 - streamable-http/http/sse: Remote HTTP-based MCP servers (url, headers)
 
 This implements real MCP protocol support similar to Cursor's implementation.
+
+Sessions and tool lists are shared through ``mcp_session_pool``, so a tool
+call reuses an initialized session instead of spawning/handshaking per call.
 """
 
+import hashlib
 import logging
 import json
 from typing import Any
 
 from langchain_core.tools import StructuredTool
-from mcp import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
 from pydantic import BaseModel, create_model
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.new_chat.tools.mcp_client import MCPClient, normalize_mcp_http_url
+from app.agents.new_chat.tools.mcp_client import normalize_mcp_http_url
+from app.agents.new_chat.tools.mcp_session_pool import (
+    MCPServerConfig,
+    MCPServerHandle,
+    get_mcp_session_manager,
+)
 from app.db import SearchSourceConnector, SearchSourceConnectorType
 
 logger = logging.getLogger(__name__)
@@ -122,7 +129,7 @@ def _looks_like_skolverket_count_404_error(text: str) -> bool:
 
 
 async def _fallback_count_adult_education_events(
-    session: ClientSession,
+    session: MCPServerHandle,
     *,
     arguments: dict[str, Any],
 ) -> str | None:
@@ -162,7 +169,7 @@ async def _fallback_count_adult_education_events(
 
 async def _create_mcp_tool_from_definition_stdio(
     tool_def: dict[str, Any],
-    mcp_client: MCPClient,
+    server: MCPServerHandle,
     *,
     connector_id: int | None = None,
     connector_name: str | None = None,
@@ -171,7 +178,7 @@ async def _create_mcp_tool_from_definition_stdio(
 
     Args:
         tool_def: Tool definition from MCP server with name, description, input_schema
-        mcp_client: MCP client instance for calling the tool
+        server: Pooled MCP server handle used for calling the tool
 
     Returns:
         LangChain StructuredTool instance
@@ -188,16 +195,26 @@ async def _create_mcp_tool_from_definition_stdio(
     input_model = _create_dynamic_input_model_from_schema(tool_name, input_schema)
 
     async def mcp_tool_call(**kwargs) -> str:
-        """Execute the MCP tool call via the client with retry support."""
+        """Execute the MCP tool call over the pooled session."""
         normalized_kwargs = _normalize_skolverket_adult_education_args(tool_name, kwargs)
         logger.info(f"MCP tool '{tool_name}' called with params: {normalized_kwargs}")
 
         try:
-            # Connect to server and call tool (connect has built-in retry logic)
-            async with mcp_client.connect():
-                result = await mcp_client.call_tool(tool_name, normalized_kwargs)
-                return str(result)
+            # The session pool connects (with retries) on first use and
+            # reconnects once if the server process went away.
+            response = await server.call_tool(tool_name, arguments=normalized_kwargs)
+            result_str = _extract_mcp_response_text(response)
+            logger.info(f"MCP tool '{tool_name}' succeeded: {result_str[:200]}")
+            return result_str
         except RuntimeError as e:
+            # Some MCP servers (like server-memory) return extra fields not in
+            # their schema
+            if "Invalid structured content" in str(e):
+                logger.warning(
+                    "MCP server returned data not matching its schema, but continuing: %s",
+                    e,
+                )
+                return "Operation completed (server returned unexpected format)"
             # Connection failures after all retries
             error_msg = f"MCP tool '{tool_name}' connection failed after retries: {e!s}"
             logger.error(error_msg)
@@ -233,8 +250,7 @@ async def _create_mcp_tool_from_definition_stdio(
 
 async def _create_mcp_tool_from_definition_http(
     tool_def: dict[str, Any],
-    url: str,
-    headers: dict[str, str],
+    server: MCPServerHandle,
     *,
     connector_id: int | None = None,
     connector_name: str | None = None,
@@ -243,8 +259,7 @@ async def _create_mcp_tool_from_definition_http(
 
     Args:
         tool_def: Tool definition from MCP server with name, description, input_schema
-        url: URL of the MCP server
-        headers: HTTP headers for authentication
+        server: Pooled MCP server handle used for calling the tool
 
     Returns:
         LangChain StructuredTool instance
@@ -261,42 +276,31 @@ async def _create_mcp_tool_from_definition_http(
     input_model = _create_dynamic_input_model_from_schema(tool_name, input_schema)
 
     async def mcp_http_tool_call(**kwargs) -> str:
-        """Execute the MCP tool call via HTTP transport."""
+        """Execute the MCP tool call over the pooled HTTP session."""
         normalized_kwargs = _normalize_skolverket_adult_education_args(tool_name, kwargs)
         logger.info(
             f"MCP HTTP tool '{tool_name}' called with params: {normalized_kwargs}"
         )
 
         try:
-            async with (
-                streamablehttp_client(url, headers=headers) as (read, write, _),
-                ClientSession(read, write) as session,
+            response = await server.call_tool(tool_name, arguments=normalized_kwargs)
+            result_str = _extract_mcp_response_text(response)
+            if (
+                tool_name == "count_adult_education_events"
+                and _looks_like_skolverket_count_404_error(result_str)
             ):
-                await session.initialize()
-
-                # Call the tool
-                response = await session.call_tool(
-                    tool_name, arguments=normalized_kwargs
+                fallback_result = await _fallback_count_adult_education_events(
+                    server,
+                    arguments=normalized_kwargs,
                 )
-                result_str = _extract_mcp_response_text(response)
-                if (
-                    tool_name == "count_adult_education_events"
-                    and _looks_like_skolverket_count_404_error(result_str)
-                ):
-                    fallback_result = await _fallback_count_adult_education_events(
-                        session,
-                        arguments=normalized_kwargs,
+                if fallback_result:
+                    logger.info(
+                        "Applied fallback for count_adult_education_events via search_adult_education"
                     )
-                    if fallback_result:
-                        logger.info(
-                            "Applied fallback for count_adult_education_events via search_adult_education"
-                        )
-                        return fallback_result
-
-                logger.info(
-                    f"MCP HTTP tool '{tool_name}' succeeded: {result_str[:200]}"
-                )
-                return result_str
+                    return fallback_result
+
+            logger.info(f"MCP HTTP tool '{tool_name}' succeeded: {result_str[:200]}")
+            return result_str
 
         except Exception as e:
             error_msg = f"MCP HTTP tool '{tool_name}' execution failed: {e!s}"
@@ -307,7 +311,7 @@ async def _create_mcp_tool_from_definition_http(
     metadata: dict[str, Any] = {
         "mcp_input_schema": input_schema,
         "mcp_transport": "http",
-        "mcp_url": url,
+        "mcp_url": server.config.url,
     }
     if connector_id is not None:
         metadata["mcp_connector_id"] = connector_id
@@ -367,24 +371,23 @@ async def _load_stdio_mcp_tools(
         )
         return tools
 
-    # Create MCP client
-    mcp_client = MCPClient(command, args, env)
-
-    # Connect and discover tools
-    async with mcp_client.connect():
-        tool_definitions = await mcp_client.list_tools()
+    # Discover tools over the pooled session (cached between graph builds)
+    server = get_mcp_session_manager().handle(
+        MCPServerConfig.stdio(command, args, env), connector_id=connector_id
+    )
+    tool_definitions = await server.list_tools()
 
-        logger.info(
-            f"Discovered {len(tool_definitions)} tools from stdio MCP server "
-            f"'{command}' (connector {connector_id})"
-        )
+    logger.info(
+        f"Discovered {len(tool_definitions)} tools from stdio MCP server "
+        f"'{command}' (connector {connector_id})"
+    )
 
     # Create LangChain tools from definitions
     for tool_def in tool_definitions:
         try:
             tool = await _create_mcp_tool_from_definition_stdio(
                 tool_def,
-                mcp_client,
+                server,
                 connector_id=connector_id,
                 connector_name=connector_name,
             )
@@ -439,40 +442,24 @@ async def _load_http_mcp_tools(
         )
         return tools
 
-    # Connect and discover tools via HTTP
+    # Discover tools over the pooled session (cached between graph builds)
     try:
-        async with (
-            streamablehttp_client(url, headers=headers) as (read, write, _),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
-
-            # List available tools
-            response = await session.list_tools()
-            tool_definitions = []
-            for tool in response.tools:
-                tool_definitions.append(
-                    {
-                        "name": tool.name,
-                        "description": tool.description or "",
-                        "input_schema": tool.inputSchema
-                        if hasattr(tool, "inputSchema")
-                        else {},
-                    }
-                )
+        server = get_mcp_session_manager().handle(
+            MCPServerConfig.http(url, headers), connector_id=connector_id
+        )
+        tool_definitions = await server.list_tools()
 
-            logger.info(
-                f"Discovered {len(tool_definitions)} tools from HTTP MCP server "
-                f"'{url}' (connector {connector_id})"
-            )
+        logger.info(
+            f"Discovered {len(tool_definitions)} tools from HTTP MCP server "
+            f"'{url}' (connector {connector_id})"
+        )
 
         # Create LangChain tools from definitions
         for tool_def in tool_definitions:
             try:
                 tool = await _create_mcp_tool_from_definition_http(
                     tool_def,
-                    url,
-                    headers,
+                    server,
                     connector_id=connector_id,
                     connector_name=connector_name,
                 )
@@ -491,6 +478,35 @@ async def _load_http_mcp_tools(
     return tools
 
 
+async def mcp_connectors_fingerprint(
+    session: AsyncSession,
+    search_space_id: int,
+) -> str:
+    """Return a digest of the search space's MCP connector configurations.
+
+    Changes whenever an MCP connector is added, removed, renamed or
+    reconfigured, so callers caching tools discovered by ``load_mcp_tools``
+    can tell when to rediscover them.
+    """
+    result = await session.execute(
+        select(
+            SearchSourceConnector.id,
+            SearchSourceConnector.name,
+            SearchSourceConnector.config,
+        )
+        .filter(
+            SearchSourceConnector.connector_type
+            == SearchSourceConnectorType.MCP_CONNECTOR,
+            SearchSourceConnector.search_space_id == search_space_id,
+        )
+        .order_by(SearchSourceConnector.id)
+    )
+    serialized = json.dumps(
+        [list(row) for row in result.all()], sort_keys=True, default=str
+    )
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
 async def load_mcp_tools(
     session: AsyncSession,
     search_space_id: int,
@@ -12,12 +12,15 @@ from app.agents.new_chat.checkpointer import (
     close_checkpointer,
     setup_checkpointer_tables,
 )
+from app.agents.new_chat.tools.mcp_session_pool import close_mcp_sessions
 from app.config import config, initialize_llm_router
 from app.db import User, create_db_and_tables, get_async_session
+from app.nexus.routing.routing_snapshot import RoutingSnapshotHolder
 from app.routes import router as crud_router
 from app.schemas import UserCreate, UserRead, UserUpdate
 from app.services.graph_holder import GraphHolder
 from app.services.graph_registry_service import RegistryCache
+from app.services.http_clients import close_http_clients
 from app.services.registry_events import listen_registry_changes
 from app.tasks.surfsense_docs_indexer import seed_surfsense_docs
 from app.users import SECRET, auth_backend, current_active_user, fastapi_users
@@ -33,6 +36,7 @@ async def _on_registry_changed(version: int) -> None:
     _logger.info("Registry change detected (version=%d) — invalidating caches", version)
     await RegistryCache.invalidate()
     await GraphHolder.invalidate()
+    await RoutingSnapshotHolder.invalidate()
 
 
 @asynccontextmanager
@@ -54,6 +58,10 @@ async def lifespan(app: FastAPI):
         _registry_listener_task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await _registry_listener_task
+    # Cleanup: close pooled MCP sessions (terminates stdio server processes)
+    await close_mcp_sessions()
+    # Cleanup: close pooled upstream HTTP clients
+    await close_http_clients()
     # Cleanup: close checkpointer connection on shutdown
     await close_checkpointer()
 
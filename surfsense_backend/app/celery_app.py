@@ -4,7 +4,7 @@ import os
 
 from celery import Celery
 from celery.schedules import crontab
-from celery.signals import worker_process_init
+from celery.signals import worker_process_init, worker_process_shutdown
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,8 +19,20 @@ def init_worker(**kwargs):
     like document summarization.
     """
     from app.config import initialize_llm_router
+    from app.tasks.celery_tasks.worker_runtime import init_worker_runtime
 
     initialize_llm_router()
+    # One event loop and one pooled DB engine per worker process, reused by
+    # every task instead of being created per task.
+    init_worker_runtime()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker(**kwargs):
+    """Dispose the worker process's pooled DB connections and event loop."""
+    from app.tasks.celery_tasks.worker_runtime import shutdown_worker_runtimes
+
+    shutdown_worker_runtimes()
 
 
 # Get Celery configuration from environment
@@ -163,6 +163,16 @@ class Config:
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL")
 
+    # Celery worker processes keep one event loop and one pooled engine each
+    # (see app.tasks.celery_tasks.worker_runtime); sized per worker process.
+    # A prefork child runs one task at a time, so keep these small: Postgres
+    # sees up to workers * (pool size + overflow) connections.
+    CELERY_DB_POOL_SIZE = int(os.getenv("CELERY_DB_POOL_SIZE", "1"))
+    CELERY_DB_MAX_OVERFLOW = int(os.getenv("CELERY_DB_MAX_OVERFLOW", "2"))
+    CELERY_DB_POOL_RECYCLE_SECONDS = int(
+        os.getenv("CELERY_DB_POOL_RECYCLE_SECONDS", "1800")
+    )
+
     NEXT_FRONTEND_URL = os.getenv("NEXT_FRONTEND_URL")
     # Backend URL to override the http to https in the OAuth redirect URI
     BACKEND_URL = os.getenv("BACKEND_URL")
@@ -321,6 +331,22 @@ class Config:
         EMBEDDING_MODEL,
         **embedding_kwargs,
     )
+    # Document chunk embedding: texts per embed_batch call and size of the
+    # worker pool that runs those calls off the event loop.
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_MAX_WORKERS = int(os.getenv("EMBEDDING_MAX_WORKERS", "2"))
+    # Persistent (model, sha256(text)) -> vector cache shared by indexers,
+    # NEXUS and the tool index. The default path lives on the /tmp volume
+    # shared by the backend and Celery containers.
+    EMBEDDING_CACHE_ENABLED = _is_truthy_env(
+        os.getenv("EMBEDDING_CACHE_ENABLED"), default=True
+    )
+    EMBEDDING_CACHE_PATH = os.getenv(
+        "EMBEDDING_CACHE_PATH", "/tmp/oneseek-embedding-cache.sqlite3"
+    )
+    EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000")
+    )
     chunker_instance = RecursiveChunker(
         chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
     )
@@ -340,6 +366,56 @@ class Config:
     else:
         reranker_instance = None
 
+    # Knowledge-base retrieval: run the chunk and document hybrid searches on
+    # their own short-lived sessions (concurrently), and cap how many
+    # connectors one request searches at the same time.
+    CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS = _is_truthy_env(
+        os.getenv("CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS"), default=True
+    )
+    CONNECTOR_SEARCH_MAX_CONCURRENCY = int(
+        os.getenv("CONNECTOR_SEARCH_MAX_CONCURRENCY", "4")
+    )
+
+    # Chat: reuse the compiled supervisor graph (tool registry, tool index and
+    # LangGraph) across turns until the graph registry version changes.
+    SUPERVISOR_GRAPH_CACHE_ENABLED = _is_truthy_env(
+        os.getenv("SUPERVISOR_GRAPH_CACHE_ENABLED"), default=False
+    )
+
+    # Chat traces: spans are persisted write-behind, in batches flushed every
+    # TRACE_FLUSH_INTERVAL_MS or once TRACE_FLUSH_MAX_SPANS spans are queued.
+    TRACE_FLUSH_INTERVAL_MS = int(os.getenv("TRACE_FLUSH_INTERVAL_MS", "250"))
+    TRACE_FLUSH_MAX_SPANS = int(os.getenv("TRACE_FLUSH_MAX_SPANS", "200"))
+    # Live span output is streamed as appended deltas, coalesced per span into
+    # one update every TRACE_SPAN_UPDATE_INTERVAL_MS.  FALSE re-sends the full
+    # accumulated output on every token.
+    TRACE_SPAN_DELTA_UPDATES = _is_truthy_env(
+        os.getenv("TRACE_SPAN_DELTA_UPDATES"), default=True
+    )
+    TRACE_SPAN_UPDATE_INTERVAL_MS = int(
+        os.getenv("TRACE_SPAN_UPDATE_INTERVAL_MS", "100")
+    )
+
+    # NEXUS routing: agents, hints and the tool embedding matrix are kept in a
+    # snapshot that is rebuilt on registry invalidation.  Processes without
+    # the PG LISTEN task re-read the registry version at most this often.
+    NEXUS_ROUTING_SNAPSHOT_ENABLED = _is_truthy_env(
+        os.getenv("NEXUS_ROUTING_SNAPSHOT_ENABLED"), default=True
+    )
+    NEXUS_ROUTING_SNAPSHOT_RECHECK_SECONDS = float(
+        os.getenv("NEXUS_ROUTING_SNAPSHOT_RECHECK_SECONDS", "30")
+    )
+
+    # Tool evaluation: cases run concurrently (bounded) and finished cases are
+    # persisted per case, so re-runs and interrupted runs skip unchanged cases.
+    TOOL_EVALUATION_CONCURRENCY = int(os.getenv("TOOL_EVALUATION_CONCURRENCY", "4"))
+    TOOL_EVALUATION_CASE_CACHE_ENABLED = _is_truthy_env(
+        os.getenv("TOOL_EVALUATION_CASE_CACHE_ENABLED"), default=True
+    )
+    TOOL_EVALUATION_CASE_CACHE_MAX_AGE_DAYS = int(
+        os.getenv("TOOL_EVALUATION_CASE_CACHE_MAX_AGE_DAYS", "30")
+    )
+
     # OAuth JWT
     SECRET_KEY = os.getenv("SECRET_KEY")
 
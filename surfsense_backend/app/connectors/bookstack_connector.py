@@ -11,7 +11,9 @@ import logging
 import time
 from typing import Any
 
-import requests
+import httpx
+
+from app.services.http_clients import get_sync_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -131,14 +133,15 @@ class BookStackConnector:
         headers = self.get_headers()
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            client = get_sync_http_client(url)
+            response = client.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
 
             if raw_response:
                 return response.text
             return response.json()
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
                 if _retry_count >= self.MAX_RATE_LIMIT_RETRIES:
                     raise Exception(
@@ -152,7 +155,7 @@ class BookStackConnector:
                     endpoint, params, raw_response, _retry_count + 1
                 )
             raise Exception(f"BookStack API request failed: {e!s}") from e
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"BookStack API request failed: {e!s}") from e
 
     def get_all_pages(self, count: int = 500) -> list[dict[str, Any]]:
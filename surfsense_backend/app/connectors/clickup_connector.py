@@ -7,7 +7,7 @@ Allows fetching tasks from workspaces and lists.
 
 from typing import Any
 
-import requests
+from app.services.http_clients import get_sync_http_client
 
 
 class ClickUpConnector:
@@ -77,7 +77,8 @@ class ClickUpConnector:
         url = f"{self.base_url}/{endpoint}"
         headers = self.get_headers()
 
-        response = requests.get(url, headers=headers, params=params, timeout=500)
+        client = get_sync_http_client(url)
+        response = client.get(url, headers=headers, params=params, timeout=500)
 
         if response.status_code == 200:
             return response.json()
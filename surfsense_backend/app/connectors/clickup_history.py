@@ -5,6 +5,7 @@ A module for retrieving data from ClickUp with OAuth support and backward compat
 Allows fetching tasks from workspaces and lists with automatic token refresh.
 """
 
+import asyncio
 import logging
 from typing import Any
 
@@ -263,7 +264,7 @@ class ClickUpHistoryConnector:
             Exception: If the API request fails
         """
         client = await self._get_client()
-        return client.get_authorized_workspaces()
+        return await asyncio.to_thread(client.get_authorized_workspaces)
 
     async def get_workspace_tasks(
         self, workspace_id: str, include_closed: bool = False
@@ -283,8 +284,10 @@ class ClickUpHistoryConnector:
             Exception: If the API request fails
         """
         client = await self._get_client()
-        return client.get_workspace_tasks(
-            workspace_id=workspace_id, include_closed=include_closed
+        return await asyncio.to_thread(
+            client.get_workspace_tasks,
+            workspace_id=workspace_id,
+            include_closed=include_closed,
         )
 
     async def get_tasks_in_date_range(
@@ -307,7 +310,8 @@ class ClickUpHistoryConnector:
             Tuple containing (tasks list, error message or None)
         """
         client = await self._get_client()
-        return client.get_tasks_in_date_range(
+        return await asyncio.to_thread(
+            client.get_tasks_in_date_range,
             workspace_id=workspace_id,
             start_date=start_date,
             end_date=end_date,
@@ -329,7 +333,7 @@ class ClickUpHistoryConnector:
             Exception: If the API request fails
         """
         client = await self._get_client()
-        return client.get_task_details(task_id)
+        return await asyncio.to_thread(client.get_task_details, task_id)
 
     async def get_task_comments(self, task_id: str) -> dict[str, Any]:
         """
@@ -346,4 +350,4 @@ class ClickUpHistoryConnector:
             Exception: If the API request fails
         """
         client = await self._get_client()
-        return client.get_task_comments(task_id)
+        return await asyncio.to_thread(client.get_task_comments, task_id)
@@ -8,7 +8,9 @@ Allows fetching pages and their comments from specified spaces.
 import base64
 from typing import Any
 
-import requests
+import httpx
+
+from app.services.http_clients import get_sync_http_client
 
 
 class ConfluenceConnector:
@@ -116,10 +118,11 @@ class ConfluenceConnector:
         headers = self.get_headers()
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            client = get_sync_http_client(url)
+            response = client.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Confluence API request failed: {e!s}") from e
 
     def get_all_spaces(self) -> list[dict[str, Any]]:
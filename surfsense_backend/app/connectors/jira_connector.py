@@ -10,7 +10,7 @@ import base64
 from datetime import datetime
 from typing import Any
 
-import requests
+from app.services.http_clients import get_sync_http_client
 
 
 class JiraConnector:
@@ -167,12 +167,11 @@ class JiraConnector:
             # Use direct base URL (works for both OAuth and legacy)
             url = f"{self.base_url}/rest/api/{self.api_version}/{endpoint}"
 
+        client = get_sync_http_client(url)
         if method.upper() == "POST":
-            response = requests.post(
-                url, headers=headers, json=json_payload, timeout=500
-            )
+            response = client.post(url, headers=headers, json=json_payload, timeout=500)
         else:
-            response = requests.get(url, headers=headers, params=params, timeout=500)
+            response = client.get(url, headers=headers, params=params, timeout=500)
 
         if response.status_code == 200:
             return response.json()
@@ -5,6 +5,7 @@ Handles OAuth-based authentication and token refresh for Jira API access.
 Supports both OAuth 2.0 (preferred) and legacy API token authentication.
 """
 
+import asyncio
 import logging
 from typing import Any
 
@@ -272,9 +273,10 @@ class JiraHistoryConnector:
         # Get client with valid credentials
         client = await self._get_jira_client()
 
-        # JiraConnector methods are synchronous, so we call them directly
+        # JiraConnector methods are blocking; run them off the event loop.
         # Token refresh has already been handled above
-        return client.get_issues_by_date_range(
+        return await asyncio.to_thread(
+            client.get_issues_by_date_range,
             start_date=start_date,
             end_date=end_date,
             include_comments=include_comments,
@@ -319,7 +321,7 @@ class JiraHistoryConnector:
 
     async def close(self):
         """Close any resources (currently no-op for JiraConnector)."""
-        # JiraConnector doesn't maintain persistent connections, so nothing to close
+        # Connections belong to the shared HTTP client registry, so nothing to close
         self._jira_client = None
 
     async def __aenter__(self):
@@ -9,14 +9,13 @@ import logging
 from datetime import datetime
 from typing import Any
 
-import httpx
-import requests
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.config import config
 from app.db import SearchSourceConnector
 from app.schemas.linear_auth_credentials import LinearAuthCredentialsBase
+from app.services.http_clients import get_http_client
 from app.utils.oauth_security import TokenEncryption
 
 logger = logging.getLogger(__name__)
@@ -43,26 +42,25 @@ async def fetch_linear_organization_name(access_token: str) -> str | None:
         Organization name or None if fetch fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                LINEAR_GRAPHQL_URL,
-                headers={
-                    "Authorization": access_token,
-                    "Content-Type": "application/json",
-                },
-                json={"query": ORGANIZATION_QUERY},
-                timeout=10.0,
-            )
+        response = await get_http_client(LINEAR_GRAPHQL_URL).post(
+            LINEAR_GRAPHQL_URL,
+            headers={
+                "Authorization": access_token,
+                "Content-Type": "application/json",
+            },
+            json={"query": ORGANIZATION_QUERY},
+            timeout=10.0,
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                org_name = data.get("data", {}).get("organization", {}).get("name")
-                if org_name:
-                    logger.debug(f"Fetched Linear organization name: {org_name}")
-                    return org_name
+        if response.status_code == 200:
+            data = response.json()
+            org_name = data.get("data", {}).get("organization", {}).get("name")
+            if org_name:
+                logger.debug(f"Fetched Linear organization name: {org_name}")
+                return org_name
 
-            logger.warning(f"Failed to fetch Linear org info: {response.status_code}")
-            return None
+        logger.warning(f"Failed to fetch Linear org info: {response.status_code}")
+        return None
 
     except Exception as e:
         logger.warning(f"Error fetching Linear organization name: {e!s}")
@@ -256,7 +254,9 @@ class LinearConnector:
         if variables:
             payload["variables"] = variables
 
-        response = requests.post(self.api_url, headers=headers, json=payload)
+        response = await get_http_client(self.api_url).post(
+            self.api_url, headers=headers, json=payload
+        )
 
         if response.status_code == 200:
             return response.json()
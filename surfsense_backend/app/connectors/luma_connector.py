@@ -8,7 +8,9 @@ Allows fetching event lists, event details, and guest information with date rang
 from datetime import datetime
 from typing import Any
 
-import requests
+import httpx
+
+from app.services.http_clients import get_sync_http_client
 
 
 class LumaConnector:
@@ -75,7 +77,8 @@ class LumaConnector:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
         try:
-            response = requests.get(url, headers=headers, params=params)
+            client = get_sync_http_client(url)
+            response = client.get(url, headers=headers, params=params, timeout=30)
 
             if response.status_code == 200:
                 return response.json()
@@ -92,7 +95,7 @@ class LumaConnector:
                     f"API request failed with status code {response.status_code}: {response.text}"
                 )
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Network error: {e}") from e
 
     def get_user_info(self) -> tuple[dict[str, Any] | None, str | None]:
@@ -21,11 +21,21 @@ from sqlalchemy import (
     UniqueConstraint,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    declared_attr,
+    deferred,
+    relationship,
+)
 
 from app.config import config
+from app.retriever.text_search import (
+    DEFAULT_TEXT_SEARCH_CONFIG,
+    SEARCH_VECTOR_TRIGGER_DDL,
+)
 
 if config.AUTH_TYPE == "GOOGLE":
     from fastapi_users.db import SQLAlchemyBaseOAuthAccountTableUUID
@@ -858,6 +868,9 @@ class Document(BaseModel, TimestampMixin):
     content_hash = Column(String, nullable=False, index=True, unique=True)
     unique_identifier_hash = Column(String, nullable=True, index=True, unique=True)
     embedding = Column(Vector(config.embedding_model_instance.dimension))
+    # to_tsvector(<search space text_search_config>, content), maintained by the
+    # documents_search_vector_trigger (see app/retriever/text_search.py)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     # BlockNote live editing state (NULL when never edited)
     blocknote_document = Column(JSONB, nullable=True)
@@ -904,6 +917,8 @@ class Chunk(BaseModel, TimestampMixin):
 
     content = Column(Text, nullable=False)
     embedding = Column(Vector(config.embedding_model_instance.dimension))
+    # Maintained by the chunks_search_vector_trigger (see app/retriever/text_search.py)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     document_id = Column(
         Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
@@ -998,6 +1013,14 @@ class SearchSpace(BaseModel, TimestampMixin):
     qna_custom_instructions = Column(
         Text, nullable=True, default=""
     )  # User's custom instructions
+    # PostgreSQL text search configuration for full-text ranking:
+    # "swedish", "english" or "simple"
+    text_search_config = Column(
+        String(32),
+        nullable=False,
+        default=DEFAULT_TEXT_SEARCH_CONFIG,
+        server_default=DEFAULT_TEXT_SEARCH_CONFIG,
+    )
 
     # Search space-level LLM preferences (shared by all members)
     # Note: ID values:
@@ -1577,6 +1600,33 @@ class GlobalToolEvaluationStageRun(BaseModel, TimestampMixin):
     updated_by = relationship("User")
 
 
+class GlobalToolEvaluationCaseResult(BaseModel, TimestampMixin):
+    """Memoized outcome of one evaluation case, keyed by everything it depends on."""
+
+    __tablename__ = "tool_evaluation_case_results_global"
+    __table_args__ = (
+        UniqueConstraint("cache_key", name="uq_tool_evaluation_case_results_cache_key"),
+    )
+
+    search_space_id = Column(
+        Integer,
+        ForeignKey("searchspaces.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    evaluation_kind = Column(String(40), nullable=False, index=True)
+    cache_key = Column(String(64), nullable=False)
+    test_id = Column(String(200), nullable=True)
+    outcome = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        index=True,
+    )
+
+
 class GlobalToolLifecycleStatus(BaseModel, TimestampMixin):
     """
     Manages lifecycle status for tools across the system.
@@ -2029,7 +2079,7 @@ async def setup_indexes():
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS document_search_index ON documents USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS document_search_vector_index ON documents USING gin (search_vector)"
             )
         )
         # Document Chuck Indexes
@@ -2040,9 +2090,12 @@ async def setup_indexes():
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS chucks_search_index ON chunks USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS chunks_search_vector_index ON chunks USING gin (search_vector)"
             )
         )
+        # Triggers that keep documents/chunks.search_vector in sync with content
+        for statement in SEARCH_VECTOR_TRIGGER_DDL:
+            await conn.execute(text(statement))
         # pg_trgm indexes for efficient ILIKE '%term%' searches on titles
         # Critical for document mention picker (@mentions) to scale
         await conn.execute(
@@ -2067,6 +2120,23 @@ async def setup_indexes():
                 "CREATE INDEX IF NOT EXISTS idx_surfsense_docs_title_trgm ON surfsense_docs_documents USING gin (title gin_trgm_ops)"
             )
         )
+        # Thread sidebar: trigram title search and keyset pagination per
+        # visibility branch (see thread_listing_service)
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_new_chat_threads_title_trgm ON new_chat_threads USING gin (title gin_trgm_ops)"
+            )
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_new_chat_threads_space_creator_updated ON new_chat_threads (search_space_id, archived, created_by_id, updated_at DESC, id DESC) INCLUDE (title, visibility, created_at)"
+            )
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_new_chat_threads_space_visibility_updated ON new_chat_threads (search_space_id, archived, visibility, updated_at DESC, id DESC) INCLUDE (title, created_by_id, created_at)"
+            )
+        )
 
 
 async def create_db_and_tables():
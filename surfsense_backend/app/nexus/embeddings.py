@@ -6,6 +6,8 @@ and reranker (flashrank ms-marco-MultiBERT-L-12) from the global app config.
 Performance: embeddings are cached in-process so repeated texts (e.g. tool
 descriptions across hundreds of test-case evaluations) only hit the GPU once.
 Batch helpers use `model.embed_batch()` for efficient GPU utilisation.
+Misses in the in-process cache fall through to the persistent embedding
+cache (app.services.embedding_cache) before reaching the model.
 """
 
 from __future__ import annotations
@@ -15,6 +17,8 @@ import threading
 
 import numpy as np
 
+from app.services.embedding_cache import embed_with_cache
+
 logger = logging.getLogger(__name__)
 
 # Cached instances
@@ -87,7 +91,7 @@ def _raw_embed(model, text: str) -> np.ndarray:
     if cached is not None:
         return cached
 
-    emb = model.embed(text)
+    emb = embed_with_cache([text], lambda batch: [model.embed(batch[0])])[0]
     if not isinstance(emb, np.ndarray):
         emb = np.array(emb)
 
@@ -116,7 +120,7 @@ def _raw_embed_many(model, texts: list[str]) -> list[np.ndarray]:
 
     if uncached_texts:
         # Use model.embed_batch for real GPU batching
-        raw = model.embed_batch(uncached_texts)
+        raw = embed_with_cache(uncached_texts, model.embed_batch)
         with _cache_lock:
             for idx, emb in zip(uncached_indices, raw, strict=False):
                 if not isinstance(emb, np.ndarray):
@@ -227,6 +231,43 @@ def nexus_batch_score(query: str, documents: list[str]) -> list[float] | None:
         return None
 
 
+def nexus_embed_matrix(texts: list[str]) -> np.ndarray | None:
+    """Embed texts into a row-normalized float32 matrix, one row per text.
+
+    Score queries against it with :func:`nexus_matrix_scores`; the matrix can
+    be kept and reused as long as the texts do not change.
+    """
+    model = _get_embedding_model()
+    if model is None or not texts:
+        return None
+
+    try:
+        doc_matrix = np.stack(_raw_embed_many(model, texts)).astype(
+            np.float32, copy=False
+        )
+        norms = np.linalg.norm(doc_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return doc_matrix / norms
+    except Exception as e:
+        logger.error("NEXUS: Embedding matrix failed: %s", e)
+        return None
+
+
+def nexus_matrix_scores(query: str, matrix: np.ndarray) -> np.ndarray | None:
+    """Cosine similarity of ``query`` against every row of an embedding matrix."""
+    model = _get_embedding_model()
+    if model is None:
+        return None
+
+    try:
+        q_emb = np.asarray(_raw_embed(model, query), dtype=matrix.dtype)
+        q = q_emb / (np.linalg.norm(q_emb) or 1.0)
+        return matrix @ q
+    except Exception as e:
+        logger.error("NEXUS: Matrix score failed: %s", e)
+        return None
+
+
 def nexus_precompute(texts: list[str]) -> int:
     """Pre-embed a list of texts into the cache using GPU batching.
 
@@ -245,7 +286,7 @@ def nexus_precompute(texts: list[str]) -> int:
         return 0
 
     try:
-        embeddings = model.embed_batch(new_texts)
+        embeddings = embed_with_cache(new_texts, model.embed_batch)
         with _cache_lock:
             for text, emb in zip(new_texts, embeddings, strict=False):
                 if not isinstance(emb, np.ndarray):
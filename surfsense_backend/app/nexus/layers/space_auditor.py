@@ -3,12 +3,17 @@
 Continuously measures how well-separated tools, intents, and agents are
 in the vector space. Computes UMAP 2D projections, silhouette scores,
 confusion pairs, and hubness detection.
+
+Pairwise work is done in row blocks of ``block_size`` points against the
+whole (normalized) catalog, so peak memory is O(block_size * n) instead of
+O(n²).  Per-label distance sums are segment reductions over label-sorted
+columns; confusion pairs are thresholded per block on the upper triangle.
 """
 
 from __future__ import annotations
 
 import logging
-from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 import numpy as np
@@ -73,18 +78,42 @@ class SeparationReport:
     inter_zone_distances: dict[str, float] = field(default_factory=dict)
 
 
-def _cosine_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
-    """Compute pairwise cosine similarity matrix."""
+# Rows per block in pairwise computations; peak memory is about
+# block_size * n * 12 bytes (float32 similarities plus float64 sums).
+DEFAULT_BLOCK_SIZE = 512
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
     norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
     # Avoid division by zero
     norms = np.maximum(norms, 1e-10)
-    normalized = embeddings / norms
+    return embeddings / norms
+
+
+def _cosine_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
+    """Compute pairwise cosine similarity matrix."""
+    normalized = _normalize_rows(embeddings)
     return normalized @ normalized.T
 
 
+def _group_by_label(labels: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Return label codes (first-occurrence order) and a code-sorted order."""
+    _, first, codes = np.unique(
+        np.asarray(labels, dtype=object), return_index=True, return_inverse=True
+    )
+    # Renumber codes by first occurrence so results do not depend on sorting.
+    rank = np.empty(len(first), dtype=np.intp)
+    rank[np.argsort(first, kind="stable")] = np.arange(len(first))
+    codes = rank[codes.reshape(-1)]
+    return codes, np.argsort(codes, kind="stable")
+
+
 def _silhouette_score_simple(
     embeddings: np.ndarray,
-    labels: list[str],
+    labels: Sequence[str],
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    normalized: bool = False,
 ) -> float:
     """Compute silhouette score without sklearn dependency.
 
@@ -93,52 +122,49 @@ def _silhouette_score_simple(
       b(i) = min mean distance to any other cluster
       s(i) = (b(i) - a(i)) / max(a(i), b(i))
 
-    Returns mean s(i).
+    Returns mean s(i).  Distance is 1 - cosine similarity.  Per-label
+    distance sums come from a segment reduction over label-sorted columns,
+    ``block_size`` rows at a time.
     """
     n = len(labels)
     if n < 2:
         return 0.0
 
-    unique_labels = list(set(labels))
-    if len(unique_labels) < 2:
+    codes, order = _group_by_label(labels)
+    counts = np.bincount(codes)
+    n_labels = len(counts)
+    if n_labels < 2:
         return 0.0
 
-    # Compute pairwise distances (1 - cosine similarity)
-    sim_matrix = _cosine_similarity_matrix(embeddings)
-    dist_matrix = 1.0 - sim_matrix
-
-    label_indices: dict[str, list[int]] = {}
-    for i, label in enumerate(labels):
-        label_indices.setdefault(label, []).append(i)
-
-    scores: list[float] = []
-    for i in range(n):
-        my_label = labels[i]
-        same_cluster = [j for j in label_indices[my_label] if j != i]
-
-        if not same_cluster:
-            scores.append(0.0)
-            continue
-
-        # a(i): mean distance to same-cluster points
-        a_i = float(np.mean([dist_matrix[i, j] for j in same_cluster]))
-
+    x = embeddings if normalized else _normalize_rows(embeddings)
+    x_sorted = x[order]
+    # Column position of each point in label-sorted order.
+    position = np.empty(n, dtype=np.intp)
+    position[order] = np.arange(n)
+    segment_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    scores = np.zeros(n)
+    for start in range(0, n, block_size):
+        rows = np.arange(start, min(start + block_size, n))
+        dist = 1.0 - x[rows] @ x_sorted.T
+        sums = np.add.reduceat(dist, segment_starts, axis=1, dtype=np.float64)
+        own = codes[rows]
+        own_count = counts[own]
+
+        # a(i): mean distance to the other points of its own cluster
+        self_dist = dist[np.arange(len(rows)), position[rows]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            a = (sums[np.arange(len(rows)), own] - self_dist) / (own_count - 1)
         # b(i): min mean distance to any other cluster
-        b_i = float("inf")
-        for other_label in unique_labels:
-            if other_label == my_label:
-                continue
-            other_indices = label_indices[other_label]
-            if not other_indices:
-                continue
-            mean_dist = float(np.mean([dist_matrix[i, j] for j in other_indices]))
-            b_i = min(b_i, mean_dist)
+        means = sums / counts
+        means[np.arange(len(rows)), own] = np.inf
+        b = means.min(axis=1)
 
-        if b_i == float("inf"):
-            scores.append(0.0)
-        else:
-            denom = max(a_i, b_i)
-            scores.append((b_i - a_i) / denom if denom > 0 else 0.0)
+        denom = np.maximum(a, b)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block_scores = np.where(denom > 0, (b - a) / denom, 0.0)
+        # Singleton clusters score 0
+        scores[rows] = np.where(own_count > 1, block_scores, 0.0)
 
     return float(np.mean(scores))
 
@@ -157,9 +183,12 @@ class SpaceAuditor:
         self,
         confusion_threshold: float = 0.85,
         hubness_threshold: float = 0.08,
+        block_size: int = DEFAULT_BLOCK_SIZE,
     ):
         self.confusion_threshold = confusion_threshold
         self.hubness_threshold = hubness_threshold
+        # Rows per block in pairwise computations; caps peak memory.
+        self.block_size = max(1, block_size)
 
     def compute_separation_matrix(self, tools: list[ToolPoint]) -> SeparationReport:
         """Compute full separation analysis.
@@ -177,7 +206,9 @@ class SpaceAuditor:
         zones = [t.zone for t in tools]
 
         # Global silhouette
-        global_sil = _silhouette_score_simple(embeddings, zones)
+        global_sil = _silhouette_score_simple(
+            embeddings, zones, block_size=self.block_size
+        )
 
         # Per-zone silhouette (zone as label within global space)
         per_zone = self._per_zone_silhouette(embeddings, tools)
@@ -210,23 +241,28 @@ class SpaceAuditor:
         tools: list[ToolPoint],
     ) -> dict[str, float]:
         """Compute silhouette score grouped by zone."""
-        zones = list({t.zone for t in tools})
+        normalized = _normalize_rows(embeddings)
+        codes, order = _group_by_label([t.zone for t in tools])
+        counts = np.bincount(codes)
         result: dict[str, float] = {}
 
-        for zone in zones:
-            zone_mask = [i for i, t in enumerate(tools) if t.zone == zone]
-            if len(zone_mask) < 2:
+        for zone_indices in np.split(order, np.cumsum(counts)[:-1]):
+            zone = tools[zone_indices[0]].zone
+            if len(zone_indices) < 2:
                 result[zone] = 0.0
                 continue
 
-            zone_embeddings = embeddings[zone_mask]
-            zone_namespaces = [tools[i].namespace for i in zone_mask]
-
+            zone_namespaces = [tools[i].namespace for i in zone_indices]
             if len(set(zone_namespaces)) < 2:
                 result[zone] = 1.0  # Single namespace = perfect separation
                 continue
 
-            result[zone] = _silhouette_score_simple(zone_embeddings, zone_namespaces)
+            result[zone] = _silhouette_score_simple(
+                normalized[zone_indices],
+                zone_namespaces,
+                block_size=self.block_size,
+                normalized=True,
+            )
 
         return result
 
@@ -234,32 +270,55 @@ class SpaceAuditor:
         self,
         embeddings: np.ndarray,
         tools: list[ToolPoint],
+        *,
+        limit: int = 20,
     ) -> list[ConfusionPair]:
-        """Find tool pairs that are dangerously similar."""
-        sim_matrix = _cosine_similarity_matrix(embeddings)
-        pairs: list[ConfusionPair] = []
-
-        for i in range(len(tools)):
-            for j in range(i + 1, len(tools)):
-                sim = float(sim_matrix[i, j])
-                if (
-                    sim >= self.confusion_threshold
-                    and tools[i].namespace != tools[j].namespace
-                ):
-                    pairs.append(
-                        ConfusionPair(
-                            tool_a=tools[i].tool_id,
-                            tool_b=tools[j].tool_id,
-                            similarity=sim,
-                            zone_a=tools[i].zone,
-                            zone_b=tools[j].zone,
-                            is_cross_zone=tools[i].zone != tools[j].zone,
-                        )
-                    )
+        """Find tool pairs that are dangerously similar.
 
+        Returns the ``limit`` most similar pairs from different namespaces,
+        ties in (i, j) order.
+        """
+        n = len(tools)
+        normalized = _normalize_rows(embeddings)
+        namespace_codes, _ = _group_by_label([t.namespace for t in tools])
+
+        best_i = np.empty(0, dtype=np.intp)
+        best_j = np.empty(0, dtype=np.intp)
+        best_sim = np.empty(0, dtype=np.float32)
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            # Upper triangle only: columns j > i, starting at the block.
+            sim = normalized[start:stop] @ normalized[start:].T
+            rows, cols = np.nonzero(np.triu(sim >= self.confusion_threshold, k=1))
+            i = rows + start
+            j = cols + start
+            keep = namespace_codes[i] != namespace_codes[j]
+            i, j = i[keep], j[keep]
+            best_i = np.concatenate((best_i, i))
+            best_j = np.concatenate((best_j, j))
+            best_sim = np.concatenate((best_sim, sim[rows[keep], cols[keep]]))
+            if len(best_sim) > limit:
+                # Similarity descending, then (i, j) ascending
+                top = np.lexsort((best_j, best_i, -best_sim))[:limit]
+                top.sort()
+                best_i, best_j, best_sim = best_i[top], best_j[top], best_sim[top]
+
+        pairs = [
+            ConfusionPair(
+                tool_a=tools[a].tool_id,
+                tool_b=tools[b].tool_id,
+                similarity=float(sim),
+                zone_a=tools[a].zone,
+                zone_b=tools[b].zone,
+                is_cross_zone=tools[a].zone != tools[b].zone,
+            )
+            for a, b, sim in zip(
+                best_i.tolist(), best_j.tolist(), best_sim.tolist(), strict=True
+            )
+        ]
         # Sort by similarity descending
         pairs.sort(key=lambda p: p.similarity, reverse=True)
-        return pairs[:20]  # Top 20 most confusing pairs
+        return pairs[:limit]  # Top 20 most confusing pairs
 
     def _detect_hubness(
         self,
@@ -275,18 +334,25 @@ class SpaceAuditor:
         if n < 3:
             return []
 
-        sim_matrix = _cosine_similarity_matrix(embeddings)
-        # Zero out self-similarity
-        np.fill_diagonal(sim_matrix, -1.0)
+        normalized = _normalize_rows(embeddings)
+        # Find nearest neighbor for each tool, excluding itself
+        nn_indices = np.empty(n, dtype=np.intp)
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            sim = normalized[start:stop] @ normalized.T
+            sim[np.arange(stop - start), np.arange(start, stop)] = -1.0
+            nn_indices[start:stop] = np.argmax(sim, axis=1)
 
-        # Find nearest neighbor for each tool
-        nn_indices = np.argmax(sim_matrix, axis=1)
-        nn_counts = Counter(int(idx) for idx in nn_indices)
+        nn_counts = np.bincount(nn_indices, minlength=n)
+        # Tools in the order they first appear as a nearest neighbor
+        hubs, first_seen = np.unique(nn_indices, return_index=True)
+        hubs = hubs[np.argsort(first_seen, kind="stable")]
 
         expected_rate = 1.0 / n
         alerts: list[HubnessAlert] = []
 
-        for idx, count in nn_counts.items():
+        for idx in hubs.tolist():
+            count = int(nn_counts[idx])
             actual_rate = count / n
             if actual_rate > self.hubness_threshold:
                 alerts.append(
@@ -308,25 +374,25 @@ class SpaceAuditor:
         tools: list[ToolPoint],
     ) -> dict[str, float]:
         """Compute mean distances between zone centroids."""
-        zones = list({t.zone for t in tools})
-        centroids: dict[str, np.ndarray] = {}
-
-        for zone in zones:
-            zone_mask = [i for i, t in enumerate(tools) if t.zone == zone]
-            if zone_mask:
-                centroids[zone] = np.mean(embeddings[zone_mask], axis=0)
+        codes, order = _group_by_label([t.zone for t in tools])
+        counts = np.bincount(codes)
+        segment_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        zone_names = [tools[i].zone for i in order[segment_starts]]
+        centroids = (
+            np.add.reduceat(embeddings[order], segment_starts, axis=0) / counts[:, None]
+        ).astype(embeddings.dtype)
+
+        norms = np.linalg.norm(centroids, axis=1)
+        sims = (centroids @ centroids.T) / (np.outer(norms, norms) + 1e-10)
+        by_name = {zone: k for k, zone in enumerate(zone_names)}
 
         distances: dict[str, float] = {}
-        zone_list = sorted(centroids.keys())
+        zone_list = sorted(zone_names)
 
         for i, z1 in enumerate(zone_list):
             for z2 in zone_list[i + 1 :]:
                 # Cosine distance
-                c1 = centroids[z1]
-                c2 = centroids[z2]
-                sim = float(
-                    np.dot(c1, c2) / (np.linalg.norm(c1) * np.linalg.norm(c2) + 1e-10)
-                )
+                sim = float(sims[by_name[z1], by_name[z2]])
                 distances[f"{z1}↔{z2}"] = 1.0 - sim
 
         return distances
@@ -118,6 +118,9 @@ def _zone_from_namespace(ns: tuple[str, ...]) -> str:
 # ---------------------------------------------------------------------------
 
 _CACHE: list[PlatformTool] | None = None
+# Bumped whenever the cached tools are dropped or patched in place, so
+# derived state (the NEXUS routing snapshot) knows to rebuild.
+_CACHE_GENERATION = 0
 
 
 def _load_from_registry() -> list[PlatformTool]:
@@ -303,8 +306,14 @@ def get_namespace_prefixes() -> list[str]:
 
 def invalidate_cache() -> None:
     """Clear cached tools (call after tool registry changes)."""
-    global _CACHE
+    global _CACHE, _CACHE_GENERATION
     _CACHE = None
+    _CACHE_GENERATION += 1
+
+
+def cache_generation() -> int:
+    """Counter that changes whenever the cached tools change."""
+    return _CACHE_GENERATION
 
 
 def apply_overrides_to_cache(
@@ -324,6 +333,7 @@ def apply_overrides_to_cache(
     Returns:
         Number of tools patched.
     """
+    global _CACHE_GENERATION
     tools = get_platform_tools()
     tool_by_id = {t.tool_id: t for t in tools}
     patched = 0
@@ -347,6 +357,7 @@ def apply_overrides_to_cache(
         patched += 1
 
     if patched:
+        _CACHE_GENERATION += 1
         logger.info("Platform bridge: patched %d tools in memory", patched)
     return patched
 
@@ -0,0 +1,110 @@
+"""Aho-Corasick keyword automaton for the Query Understanding Layer.
+
+Finds every occurrence of a fixed set of literal keywords in one pass over
+the text, independent of the number of keywords.  Each keyword carries one
+or more tags and a flag saying whether it must match as a whole word.
+Whole-word matches follow the semantics of ``re.search(rf"\\b{re.escape(kw)}\\b",
+text)``: a ``\\b`` holds where a word character (``\\w``) meets a non-word
+character or the start/end of the text.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Hashable, Iterable
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Equivalent of ``\\b`` at ``index`` in ``text``."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class KeywordAutomaton:
+    """Multi-pattern matcher over literal, case-sensitive keywords.
+
+    Args:
+        entries: ``(keyword, tag, word_bounded)`` triples.  A keyword may
+            appear several times with different tags.  An empty keyword
+            matches like ``\\b\\b`` when word-bounded and always otherwise.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, Hashable, bool]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Keywords ending in each state: (length, tags, word-bounded tags).
+        self._outputs: list[list[tuple[int, tuple, tuple]]] = [[]]
+        self._empty_tags: set[Hashable] = set()
+        self._empty_bounded_tags: set[Hashable] = set()
+        self.keyword_count = 0
+
+        grouped: dict[str, tuple[list[Hashable], list[Hashable]]] = {}
+        for keyword, tag, word_bounded in entries:
+            if not keyword:
+                (self._empty_bounded_tags if word_bounded else self._empty_tags).add(
+                    tag
+                )
+                continue
+            free, bounded = grouped.setdefault(keyword, ([], []))
+            (bounded if word_bounded else free).append(tag)
+
+        for keyword, (free, bounded) in grouped.items():
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((len(keyword), tuple(free), tuple(bounded)))
+            self.keyword_count += 1
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Keywords that are suffixes of this one end here too.
+                self._outputs[child] = (
+                    self._outputs[child] + self._outputs[self._fail[child]]
+                )
+
+    def match(self, text: str) -> set[Hashable]:
+        """Return the tags of every keyword found in ``text``."""
+        found: set[Hashable] = set(self._empty_tags)
+        if self._empty_bounded_tags and any(_is_word_char(ch) for ch in text):
+            found |= self._empty_bounded_tags
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            for length, free, bounded in outputs[state]:
+                found.update(free)
+                if (
+                    bounded
+                    and _at_word_boundary(text, end - length)
+                    and _at_word_boundary(text, end)
+                ):
+                    found.update(bounded)
+        return found
@@ -2,12 +2,20 @@
 
 Pre-routing analysis of queries: entity extraction, multi-intent detection,
 Swedish normalization, domain hint scoring. Runs in <5ms, no LLM calls.
+
+Gazetteer, region, abbreviation and hint keywords are matched with
+Aho-Corasick automata (see ``keyword_automaton``) in one pass over the
+query instead of one regex search per keyword.  The automaton that covers
+the hint maps is rebuilt only when their contents change.
 """
 
 from __future__ import annotations
 
+import functools
 import logging
 import re
+from collections import OrderedDict
+from collections.abc import Hashable
 from dataclasses import dataclass, field
 
 from app.nexus.config import (
@@ -16,6 +24,7 @@ from app.nexus.config import (
     MULTI_INTENT_MARGIN_THRESHOLD,
     SWEDISH_NORMALIZATION_BANK,
 )
+from app.nexus.routing.keyword_automaton import KeywordAutomaton
 from app.services.scb_regions import ALL_REGIONS, normalize_diacritik
 
 logger = logging.getLogger(__name__)
@@ -155,6 +164,51 @@ _MULTI_INTENT_CONJUNCTIONS = re.compile(
 )
 
 
+# ---------------------------------------------------------------------------
+# Keyword automata
+# ---------------------------------------------------------------------------
+
+# Compiled matchers kept per QUL instance, one per distinct pair of hint maps.
+_MAX_KEYWORD_MATCHERS = 8
+
+_HintsFingerprint = tuple[tuple[str, tuple[str, ...]], ...]
+
+
+def _hints_fingerprint(hints_map: dict[str, list[str]]) -> _HintsFingerprint:
+    return tuple((key, tuple(keywords)) for key, keywords in hints_map.items())
+
+
+def _build_keyword_automaton(
+    domain_hints: dict[str, list[str]],
+    category_hints: dict[str, list[str]],
+) -> KeywordAutomaton:
+    """Automaton over the lower-cased query for abbreviations, gazetteer and hints.
+
+    Tags are ``("abbrev", abbreviation)``, ``("location", gazetteer_key)``,
+    ``("domain", zone)`` and ``("category", category)``.  Multi-word hint
+    keywords match as substrings, everything else as whole words.
+    """
+    entries: list[tuple[str, Hashable, bool]] = []
+    entries.extend(
+        (abbrev, ("abbrev", abbrev), True) for abbrev in SWEDISH_NORMALIZATION_BANK
+    )
+    entries.extend((key, ("location", key), True) for key in MUNICIPALITY_GAZETTEER)
+    for kind, hints_map in (("domain", domain_hints), ("category", category_hints)):
+        for name, keywords in hints_map.items():
+            entries.extend((kw, (kind, name), " " not in kw) for kw in keywords)
+    return KeywordAutomaton(entries)
+
+
+@functools.cache
+def _region_automaton() -> KeywordAutomaton:
+    """Automaton over the diacritic-normalized query for SCB region names."""
+    return KeywordAutomaton(
+        (normalize_diacritik(region.name), region.name, True)
+        for region in ALL_REGIONS
+        if region.type != "country"  # Skip "Riket" — too generic
+    )
+
+
 # ---------------------------------------------------------------------------
 # QUL Class
 # ---------------------------------------------------------------------------
@@ -163,6 +217,11 @@ _MULTI_INTENT_CONJUNCTIONS = re.compile(
 class QueryUnderstandingLayer:
     """Pre-routing query analysis — no LLM, <5ms target."""
 
+    def __init__(self) -> None:
+        self._keyword_automata: OrderedDict[
+            tuple[_HintsFingerprint, _HintsFingerprint], KeywordAutomaton
+        ] = OrderedDict()
+
     def analyze(
         self,
         query: str,
@@ -170,11 +229,13 @@ class QueryUnderstandingLayer:
         domain_hints_map: dict[str, list[str]] | None = None,
         category_hints_map: dict[str, list[str]] | None = None,
     ) -> QueryAnalysisResult:
-        # 1. Swedish normalization
-        normalized = self._normalize_swedish(query)
+        automaton = self._keyword_automaton(domain_hints_map, category_hints_map)
+
+        # 1. Swedish normalization (also finds all keywords in the result)
+        normalized, keyword_tags = self._normalize_swedish(query, automaton)
 
         # 2. Entity extraction (rule-based)
-        entities = self._extract_entities(normalized)
+        entities = self._extract_entities(normalized, keyword_tags)
 
         # 3. Multi-intent detection
         sub_queries = self._detect_and_split_intents(normalized)
@@ -184,6 +245,7 @@ class QueryUnderstandingLayer:
         domain_hints = self._score_domain_hints(
             normalized,
             entities,
+            keyword_tags,
             domain_hints_map=domain_hints_map,
             category_hints_map=category_hints_map,
         )
@@ -227,21 +289,56 @@ class QueryUnderstandingLayer:
 
     # ----- Internal methods -----
 
-    def _normalize_swedish(self, query: str) -> str:
-        """Expand abbreviations and normalize Swedish text."""
+    def _keyword_automaton(
+        self,
+        domain_hints_map: dict[str, list[str]] | None,
+        category_hints_map: dict[str, list[str]] | None,
+    ) -> KeywordAutomaton:
+        """Return the automaton for these hint maps, building it on first use."""
+        domain_hints = (
+            domain_hints_map if domain_hints_map is not None else DOMAIN_HINTS
+        )
+        category_hints = (
+            category_hints_map if category_hints_map is not None else CATEGORY_HINTS
+        )
+        # Hint maps from the DB are fresh dicts per request, so key on content.
+        key = (_hints_fingerprint(domain_hints), _hints_fingerprint(category_hints))
+        automaton = self._keyword_automata.get(key)
+        if automaton is not None:
+            self._keyword_automata.move_to_end(key)
+            return automaton
+        automaton = _build_keyword_automaton(domain_hints, category_hints)
+        self._keyword_automata[key] = automaton
+        if len(self._keyword_automata) > _MAX_KEYWORD_MATCHERS:
+            self._keyword_automata.popitem(last=False)
+        logger.debug(
+            "QUL keyword automaton built: %d keywords", automaton.keyword_count
+        )
+        return automaton
+
+    def _normalize_swedish(
+        self, query: str, automaton: KeywordAutomaton
+    ) -> tuple[str, set[Hashable]]:
+        """Expand abbreviations and normalize Swedish text.
+
+        Returns the normalized query and the keyword tags found in it.
+        """
         normalized = query.strip()
-        lower = normalized.lower()
+        tags = automaton.match(normalized.lower())
 
         for abbrev, expansion in SWEDISH_NORMALIZATION_BANK.items():
             # Only replace if it's a whole word match
-            pattern = rf"\b{re.escape(abbrev)}\b"
-            if re.search(pattern, lower):
+            if ("abbrev", abbrev) in tags:
+                pattern = rf"\b{re.escape(abbrev)}\b"
                 normalized = re.sub(pattern, expansion, normalized, flags=re.IGNORECASE)
-                lower = normalized.lower()
+                # The expansion may add or remove keywords; rescan.
+                tags = automaton.match(normalized.lower())
 
-        return normalized
+        return normalized, tags
 
-    def _extract_entities(self, query: str) -> QueryEntities:
+    def _extract_entities(
+        self, query: str, keyword_tags: set[Hashable]
+    ) -> QueryEntities:
         """Rule-based entity extraction: locations, times, organizations.
 
         Uses the full SCB region registry (290 municipalities + 21 counties)
@@ -252,24 +349,22 @@ class QueryUnderstandingLayer:
 
         # Location extraction via gazetteer (exact match, fast path)
         for key, canonical in MUNICIPALITY_GAZETTEER.items():
-            if (
-                re.search(rf"\b{re.escape(key)}\b", lower)
-                and canonical not in entities.locations
-            ):
+            if canonical in entities.locations:
+                continue
+            if ("location", key) in keyword_tags:
                 entities.locations.append(canonical)
 
         # Extended location extraction via full SCB registry + diacritik normalization
         # This catches "goteborg", "jonkoping", "vaxjo" etc. without diacritics
-        query_norm = normalize_diacritik(query)
-        for region in ALL_REGIONS:
-            if region.type == "country":
-                continue  # Skip "Riket" — too generic
-            region_norm = normalize_diacritik(region.name)
-            if (
-                re.search(rf"\b{re.escape(region_norm)}\b", query_norm)
-                and region.name not in entities.locations
-            ):
-                entities.locations.append(region.name)
+        region_names = _region_automaton().match(normalize_diacritik(query))
+        if region_names:
+            for region in ALL_REGIONS:
+                if (
+                    region.name in region_names
+                    and region.type != "country"
+                    and region.name not in entities.locations
+                ):
+                    entities.locations.append(region.name)
 
         # Time extraction via patterns
         for pattern in _TIME_PATTERNS:
@@ -320,6 +415,7 @@ class QueryUnderstandingLayer:
         self,
         query: str,
         entities: QueryEntities,
+        keyword_tags: set[Hashable],
         *,
         domain_hints_map: dict[str, list[str]] | None = None,
         category_hints_map: dict[str, list[str]] | None = None,
@@ -342,33 +438,18 @@ class QueryUnderstandingLayer:
             category_hints_map if category_hints_map is not None else CATEGORY_HINTS
         )
 
-        lower = query.lower()
         hints: list[str] = []
 
-        # Zone-level hints (word-boundary matching to avoid partial hits)
-        for zone, keywords in _domain_hints.items():
-            for kw in keywords:
-                # Multi-word keywords use substring, single words use \b
-                if " " in kw:
-                    matched = kw in lower
-                else:
-                    matched = bool(re.search(rf"\b{re.escape(kw)}\b", lower))
-                if matched:
-                    if zone not in hints:
-                        hints.append(zone)
-                    break
+        # Zone-level hints (word-boundary matching to avoid partial hits;
+        # multi-word keywords match as substrings)
+        for zone in _domain_hints:
+            if ("domain", zone) in keyword_tags and zone not in hints:
+                hints.append(zone)
 
         # Category-level hints (agent-granular, same word-boundary logic)
-        for category, keywords in _category_hints.items():
-            for kw in keywords:
-                if " " in kw:
-                    matched = kw in lower
-                else:
-                    matched = bool(re.search(rf"\b{re.escape(kw)}\b", lower))
-                if matched:
-                    if category not in hints:
-                        hints.append(category)
-                    break
+        for category in _category_hints:
+            if ("category", category) in keyword_tags and category not in hints:
+                hints.append(category)
 
         return hints
 
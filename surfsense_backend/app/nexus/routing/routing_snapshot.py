@@ -0,0 +1,381 @@
+"""Routing snapshot — registry-versioned state for ``NexusService.route_query``.
+
+Everything ``route_query`` needs that does not depend on the query is built
+once into an immutable :class:`RoutingSnapshot`:
+
+- agent maps and domain/category hints from the admin flow (DB);
+- a :class:`ToolIndex` over the platform tools: a row-normalized float32
+  embedding matrix of the tool texts, zone and category masks, an exact
+  keyword → tools index and an automaton for substring keyword and
+  tool-name matches.
+
+Scoring a query is then one query embedding, one matrix-vector product and a
+few vectorized bonuses, with no database access.  :class:`RoutingSnapshotHolder`
+keeps the current snapshot for the process and swaps in a new one when
+
+- the graph registry version changes (``invalidate()`` from the PG NOTIFY
+  listener, or a version check at most every
+  ``NEXUS_ROUTING_SNAPSHOT_RECHECK_SECONDS`` for processes without one), or
+- the platform tool cache is dropped or patched in place
+  (``platform_bridge.cache_generation()``), as the auto-loop optimizer does.
+
+A snapshot whose tools could not be embedded although a model is configured
+(e.g. a transient model error at startup) is rebuilt at the next version
+check instead of scoring lexically until the registry changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.nexus.routing.keyword_automaton import KeywordAutomaton
+
+logger = logging.getLogger(__name__)
+
+# Number of best-scoring tools returned before agent-namespace backfill.
+_TOP_TOOLS = 20
+
+AgentMaps = tuple[dict | None, dict | None, dict | None, dict | None]
+
+
+def _tool_indices(index: dict[Any, list[int]]) -> dict[Any, np.ndarray]:
+    return {key: np.array(ids, dtype=np.intp) for key, ids in index.items()}
+
+
+@dataclass(frozen=True)
+class ToolIndex:
+    """Query-independent scoring data for the platform tools."""
+
+    entries: tuple[dict[str, str], ...]
+    embeddings: np.ndarray | None
+    zone_prefixes: dict[str, str]
+    zone_tools: dict[str, np.ndarray]
+    category_tools: dict[str, np.ndarray]
+    keyword_tools: dict[str, np.ndarray]
+    substring_tools: dict[tuple[str, str], np.ndarray]
+    substring_automaton: KeywordAutomaton
+
+    @classmethod
+    def build(cls, tools: Iterable[Any], zone_prefixes: dict[str, str]) -> ToolIndex:
+        from app.nexus.embeddings import nexus_embed_matrix
+
+        entries: list[dict[str, str]] = []
+        texts: list[str] = []
+        zone_tools: dict[str, list[int]] = {}
+        category_tools: dict[str, list[int]] = {}
+        keyword_tools: dict[str, list[int]] = {}
+        substring_tools: dict[tuple[str, str], list[int]] = {}
+
+        for pt in tools:
+            if pt.category == "external_model":
+                continue
+            i = len(entries)
+            entries.append(
+                {
+                    "tool_id": pt.tool_id,
+                    "namespace": "/".join(pt.namespace),
+                    "zone": pt.zone,
+                    "description": pt.description,
+                }
+            )
+            # Include keywords and example queries for better intra-category
+            # discrimination (e.g. störningar vs olyckor vs köer)
+            zone_prefix = zone_prefixes.get(pt.zone, "")
+            kw_text = " ".join(pt.keywords[:8]) if pt.keywords else ""
+            ex_text = " | ".join(pt.example_queries[:2]) if pt.example_queries else ""
+            texts.append(
+                f"{zone_prefix}{pt.tool_id} {pt.description} {kw_text} {ex_text}"
+            )
+            zone_tools.setdefault(pt.zone, []).append(i)
+            category_tools.setdefault(pt.category, []).append(i)
+            for kw in {k.lower() for k in pt.keywords}:
+                keyword_tools.setdefault(kw, []).append(i)
+                if len(kw) >= 4:
+                    substring_tools.setdefault(("keyword", kw), []).append(i)
+            for tok in set(pt.tool_id.lower().replace("_", " ").split()):
+                if len(tok) > 3:
+                    substring_tools.setdefault(("name", tok), []).append(i)
+
+        return cls(
+            entries=tuple(entries),
+            embeddings=nexus_embed_matrix(texts),
+            zone_prefixes=dict(zone_prefixes),
+            zone_tools=_tool_indices(zone_tools),
+            category_tools=_tool_indices(category_tools),
+            keyword_tools=_tool_indices(keyword_tools),
+            substring_tools=_tool_indices(substring_tools),
+            substring_automaton=KeywordAutomaton(
+                (tag[1], tag, False) for tag in substring_tools
+            ),
+        )
+
+    @property
+    def embeddings_missing(self) -> bool:
+        """Whether embedding the tools failed although a model is configured."""
+        from app.nexus.embeddings import get_embedding_info
+
+        return (
+            self.embeddings is None
+            and bool(self.entries)
+            and get_embedding_info()["status"] == "available"
+        )
+
+    def score(
+        self,
+        normalized_query: str,
+        zone_candidates: list[str],
+        domain_hints: list[str],
+        *,
+        agent_namespaces: list[str] | None = None,
+    ) -> list[dict]:
+        """Score every tool for a query; see ``_build_tool_entries_from_platform``."""
+        from app.nexus.embeddings import nexus_matrix_scores
+
+        n_tools = len(self.entries)
+        if not n_tools:
+            return []
+
+        query_lower = normalized_query.lower()
+        query_tokens = set(query_lower.split())
+
+        # Zone-prefixed query for embedding (vision: prefix trick)
+        zone_hint = zone_candidates[0] if zone_candidates else None
+        prefixed_query = query_lower
+        if zone_hint and zone_hint in self.zone_prefixes:
+            prefixed_query = f"{self.zone_prefixes[zone_hint]}{query_lower}"
+
+        # PRIMARY SIGNAL: embedding cosine similarity, 0.20 when unavailable
+        emb_scores = None
+        if self.embeddings is not None:
+            emb_scores = nexus_matrix_scores(prefixed_query, self.embeddings)
+        if emb_scores is None:
+            scores = np.full(n_tools, 0.20)
+        else:
+            emb = emb_scores.astype(np.float64)
+            scores = np.where(emb > 0, emb, 0.20)
+
+        # BONUS: zone match (+0.05)
+        zone_match = np.zeros(n_tools, dtype=bool)
+        for zone in set(zone_candidates):
+            ids = self.zone_tools.get(zone)
+            if ids is not None:
+                zone_match[ids] = True
+        scores = scores + np.where(zone_match, 0.05, 0.0)
+
+        # BONUS: exact keyword overlap (+0.05 per hit, max +0.15)
+        keyword_hits = np.zeros(n_tools)
+        for token in query_tokens:
+            ids = self.keyword_tools.get(token)
+            if ids is not None:
+                keyword_hits[ids] += 1
+        scores = scores + np.where(
+            keyword_hits > 0, np.minimum(0.15, keyword_hits * 0.05), 0.0
+        )
+
+        # BONUS: substring keyword match for Swedish compounds (+0.04 per hit,
+        # max +0.12), skipping keywords already matched exactly
+        substring_hits = np.zeros(n_tools)
+        name_match = np.zeros(n_tools, dtype=bool)
+        for tag in self.substring_automaton.match(query_lower):
+            kind, text = tag
+            if kind == "name":
+                name_match[self.substring_tools[tag]] = True
+            elif text not in query_tokens:
+                substring_hits[self.substring_tools[tag]] += 1
+        scores = scores + np.where(
+            substring_hits > 0, np.minimum(0.12, substring_hits * 0.04), 0.0
+        )
+
+        # BONUS: domain hint match (+0.10)
+        hint_match = np.zeros(n_tools, dtype=bool)
+        for hint in set(domain_hints):
+            ids = self.category_tools.get(hint)
+            if ids is not None:
+                hint_match[ids] = True
+        scores = scores + np.where(hint_match, 0.10, 0.0)
+
+        # BONUS: name/ID direct match (+0.05)
+        scores = scores + np.where(name_match, 0.05, 0.0)
+
+        # Cap at 1.0
+        scores = np.minimum(1.0, scores)
+
+        # Sort by score descending (ties keep registry order), take top 20
+        order = np.argsort(-scores, kind="stable").tolist()
+        selected = order[:_TOP_TOOLS]
+
+        # Ensure ALL tools in resolved agent namespaces are included
+        if agent_namespaces:
+            for i in order[_TOP_TOOLS:]:
+                ns = self.entries[i]["namespace"]
+                if any(ns.startswith(prefix) for prefix in agent_namespaces):
+                    selected.append(i)
+
+        return [
+            {**self.entries[i], "score": round(float(scores[i]), 4)} for i in selected
+        ]
+
+
+@dataclass(frozen=True)
+class RoutingSnapshot:
+    """Immutable routing state for one registry version and tool generation."""
+
+    registry_version: int
+    tools_generation: int
+    agent_by_name: dict | None
+    agents_by_zone: dict | None
+    domain_hints: dict | None
+    category_hints: dict | None
+    tool_index: ToolIndex
+    built_at: float
+    build_ms: float
+
+
+async def _registry_version(session: AsyncSession) -> int:
+    from app.services.graph_registry_service import _read_registry_version
+
+    return await _read_registry_version(session)
+
+
+async def build_routing_snapshot(
+    session: AsyncSession,
+    load_agents: Callable[[AsyncSession], Awaitable[AgentMaps]],
+) -> RoutingSnapshot:
+    """Load agents and hints and index the platform tools."""
+    from app.nexus.config import get_all_zone_prefixes
+    from app.nexus.platform_bridge import cache_generation, get_platform_tools
+
+    started = time.perf_counter()
+    try:
+        registry_version = await _registry_version(session)
+    except Exception as e:
+        logger.warning("Routing snapshot: could not read registry version: %s", e)
+        registry_version = 0
+    # Read before the tools so a concurrent patch leaves the snapshot stale.
+    tools_generation = cache_generation()
+    agent_by_name, agents_by_zone, domain_hints, category_hints = await load_agents(
+        session
+    )
+    tool_index = ToolIndex.build(get_platform_tools(), get_all_zone_prefixes())
+    return RoutingSnapshot(
+        registry_version=registry_version,
+        tools_generation=tools_generation,
+        agent_by_name=agent_by_name,
+        agents_by_zone=agents_by_zone,
+        domain_hints=domain_hints,
+        category_hints=category_hints,
+        tool_index=tool_index,
+        built_at=time.time(),
+        build_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+class RoutingSnapshotHolder:
+    """Process-wide holder of the current :class:`RoutingSnapshot`."""
+
+    _snapshot: RoutingSnapshot | None = None
+    _checked_at: float = 0.0
+    _locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+        weakref.WeakKeyDictionary()
+    )
+    _hits: int = 0
+    _builds: int = 0
+    _version_checks: int = 0
+
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = cls._locks.get(loop)
+        if lock is None:
+            lock = asyncio.Lock()
+            cls._locks[loop] = lock
+        return lock
+
+    @classmethod
+    async def _is_current(
+        cls, snapshot: RoutingSnapshot, session: AsyncSession
+    ) -> bool:
+        from app.nexus.platform_bridge import cache_generation
+
+        if snapshot.tools_generation != cache_generation():
+            return False
+        now = time.monotonic()
+        if now - cls._checked_at < config.NEXUS_ROUTING_SNAPSHOT_RECHECK_SECONDS:
+            return True
+        if snapshot.tool_index.embeddings_missing:
+            return False
+        cls._version_checks += 1
+        try:
+            version = await _registry_version(session)
+        except Exception:
+            # Keep serving the snapshot; the next call checks again.
+            return True
+        cls._checked_at = now
+        return version == snapshot.registry_version
+
+    @classmethod
+    async def get(
+        cls,
+        session: AsyncSession,
+        load_agents: Callable[[AsyncSession], Awaitable[AgentMaps]],
+    ) -> RoutingSnapshot:
+        """Return the current snapshot, building it if missing or stale."""
+        if not config.NEXUS_ROUTING_SNAPSHOT_ENABLED:
+            return await build_routing_snapshot(session, load_agents)
+
+        snapshot = cls._snapshot
+        if snapshot is not None and await cls._is_current(snapshot, session):
+            cls._hits += 1
+            return snapshot
+
+        async with cls._get_lock():
+            current = cls._snapshot
+            if current is not None and current is not snapshot:
+                # Another request rebuilt it while we waited.
+                cls._hits += 1
+                return current
+            snapshot = await build_routing_snapshot(session, load_agents)
+            cls._snapshot = snapshot
+            cls._checked_at = time.monotonic()
+            cls._builds += 1
+            logger.info(
+                "Routing snapshot built: %d tools, registry version %d (%.0f ms)",
+                len(snapshot.tool_index.entries),
+                snapshot.registry_version,
+                snapshot.build_ms,
+            )
+            return snapshot
+
+    @classmethod
+    async def invalidate(cls) -> None:
+        """Drop the snapshot; the next ``get()`` rebuilds it."""
+        cls._snapshot = None
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        snapshot = cls._snapshot
+        stats: dict[str, Any] = {
+            "enabled": config.NEXUS_ROUTING_SNAPSHOT_ENABLED,
+            "hits": cls._hits,
+            "builds": cls._builds,
+            "version_checks": cls._version_checks,
+        }
+        if snapshot is not None:
+            stats.update(
+                registry_version=snapshot.registry_version,
+                tools=len(snapshot.tool_index.entries),
+                has_embeddings=snapshot.tool_index.embeddings is not None,
+                build_ms=round(snapshot.build_ms, 1),
+                age_s=round(time.time() - snapshot.built_at, 1),
+            )
+        return stats
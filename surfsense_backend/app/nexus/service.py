@@ -39,6 +39,7 @@ from app.nexus.routing.confidence_bands import ConfidenceBandCascade
 from app.nexus.routing.hard_negative_bank import HardNegativeMiner
 from app.nexus.routing.ood_detector import DarkMatterDetector
 from app.nexus.routing.qul import QueryUnderstandingLayer
+from app.nexus.routing.routing_snapshot import RoutingSnapshotHolder, ToolIndex
 from app.nexus.routing.schema_verifier import SchemaVerifier
 from app.nexus.routing.select_then_route import SelectThenRoute
 from app.nexus.routing.shadow_observer import ShadowObserver
@@ -542,13 +543,13 @@ class NexusService:
 
         start_time = time.monotonic()
 
-        # Load dynamic agents and hints from DB (admin flow) if available
-        (
-            db_agent_by_name,
-            db_agents_by_zone,
-            db_domain_hints,
-            db_category_hints,
-        ) = await self._load_db_agents(session)
+        # Dynamic agents and hints from DB (admin flow) plus the tool index,
+        # built once per registry version
+        snapshot = await RoutingSnapshotHolder.get(session, self._load_db_agents)
+        db_agent_by_name = snapshot.agent_by_name
+        db_agents_by_zone = snapshot.agents_by_zone
+        db_domain_hints = snapshot.domain_hints
+        db_category_hints = snapshot.category_hints
 
         # Step 1: QUL — Intent/Zone resolution (with dynamic hints)
         analysis = self._analyze_query_with_hints(
@@ -586,7 +587,9 @@ class NexusService:
         # Auto-build tool_entries from platform registry if not provided
         if tool_entries is None:
             tool_entries = self._build_tool_entries_from_platform(
-                analysis, agent_namespaces=agent_namespaces
+                analysis,
+                agent_namespaces=agent_namespaces,
+                tool_index=snapshot.tool_index,
             )
 
         candidates: list[RoutingCandidate] = []
@@ -1584,6 +1587,7 @@ class NexusService:
         analysis: QueryAnalysis,
         *,
         agent_namespaces: list[str] | None = None,
+        tool_index: ToolIndex | None = None,
     ) -> list[dict]:
         """Build tool_entries from the platform registry with embedding-first scoring.
 
@@ -1593,132 +1597,30 @@ class NexusService:
         3. NO min-max normalization — scores must reflect real similarity
            so that band thresholds (0.95/0.80/0.60/0.40) work correctly.
 
-        Uses nexus_batch_score to embed the query once and score all tools
-        via vectorized cosine similarity in a single operation.
-        """
-        from app.nexus.config import get_all_zone_prefixes
-        from app.nexus.embeddings import nexus_batch_score
-        from app.nexus.platform_bridge import get_platform_tools
-
-        tools = get_platform_tools()
-        if not tools:
-            return []
-
-        all_prefixes = get_all_zone_prefixes()
-        query_lower = analysis.normalized_query.lower()
-        query_tokens = set(query_lower.split())
-        zone_candidates = set(analysis.zone_candidates)
-        domain_hints = set(analysis.domain_hints)
-
-        # Build zone-prefixed query for embedding (vision: prefix trick)
-        # Use all_prefixes so new domains (e.g. trafik-och-transport) get prefixed too
-        zone_hint = analysis.zone_candidates[0] if analysis.zone_candidates else None
-        prefixed_query = query_lower
-        if zone_hint and zone_hint in all_prefixes:
-            prefixed_query = f"{all_prefixes[zone_hint]}{query_lower}"
-
-        # Filter tools and build tool texts for batch scoring
-        # Include keywords and example queries for better intra-category
-        # discrimination (e.g. störningar vs olyckor vs köer)
-        filtered_tools = [pt for pt in tools if pt.category != "external_model"]
-        tool_texts = []
-        for pt in filtered_tools:
-            zone_prefix = all_prefixes.get(pt.zone, "")
-            kw_text = " ".join(pt.keywords[:8]) if pt.keywords else ""
-            ex_text = " | ".join(pt.example_queries[:2]) if pt.example_queries else ""
-            tool_texts.append(
-                f"{zone_prefix}{pt.tool_id} {pt.description} {kw_text} {ex_text}"
-            )
-
-        # Batch score: embed query once, all tool texts in one pass,
-        # vectorized cosine similarity
-        emb_scores = nexus_batch_score(prefixed_query, tool_texts)
-
-        raw_entries: list[tuple[dict, float]] = []
-        for i, pt in enumerate(filtered_tools):
-            # PRIMARY SIGNAL: Embedding cosine similarity (0.0-1.0)
-            emb_score = emb_scores[i] if emb_scores is not None else None
-
-            # Fallback to 0.20 when embedding model is unavailable
-            score = emb_score if emb_score is not None and emb_score > 0 else 0.20
-
-            # BONUS: Zone match (+0.05 — modest boost for matching zone)
-            if pt.zone in zone_candidates:
-                score += 0.05
-
-            # BONUS: Keyword overlap (+0.05 per exact hit, max +0.15)
-            # Strong enough to discriminate between similar tools in same category
-            # (e.g. störningar vs olyckor vs köer within trafikverket_trafikinfo)
-            tool_keywords = {k.lower() for k in pt.keywords}
-            keyword_hits = query_tokens & tool_keywords
-            if keyword_hits:
-                score += min(0.15, len(keyword_hits) * 0.05)
-
-            # BONUS: Substring keyword match for Swedish compound words (+0.04 per hit, max +0.12)
-            # Handles cases like "signalproblem" matching keyword "signal",
-            # "trafikstockning" matching "stockning", "vägavstängningar" matching "avstängning"
-            substring_hits = 0
-            for kw in tool_keywords - keyword_hits:  # skip already-matched
-                if len(kw) >= 4 and kw in query_lower:
-                    substring_hits += 1
-            if substring_hits:
-                score += min(0.12, substring_hits * 0.04)
-
-            # BONUS: Domain hint match (+0.10)
-            if pt.category in domain_hints:
-                score += 0.10
-
-            # BONUS: Name/ID direct match (+0.05)
-            tool_name_lower = pt.tool_id.lower().replace("_", " ")
-            if any(
-                tok in query_lower for tok in tool_name_lower.split() if len(tok) > 3
-            ):
-                score += 0.05
+        Bonuses: zone match +0.05, exact keyword hits +0.05 each (max
+        +0.15), substring keyword hits for Swedish compounds +0.04 each (max
+        +0.12), domain hint match +0.10 and tool name match +0.05; capped at
+        1.0.  Returns the top 20 tools plus every tool in ``agent_namespaces``.
 
-            # Cap at 1.0
-            score = min(1.0, score)
-
-            raw_entries.append(
-                (
-                    {
-                        "tool_id": pt.tool_id,
-                        "namespace": "/".join(pt.namespace),
-                        "zone": pt.zone,
-                        "description": pt.description,
-                    },
-                    score,
-                )
-            )
-
-        if not raw_entries:
-            return []
-
-        # Sort by score descending, take top 20
-        raw_entries.sort(key=lambda e: e[1], reverse=True)
-        top_entries = raw_entries[:20]
-
-        # Ensure ALL tools in resolved agent namespaces are included,
-        # even if they scored below the top-20 cutoff.  This prevents
-        # the eval loop and LLM judge from missing relevant tools.
-        if agent_namespaces:
-            top_ids = {e[0]["tool_id"] for e in top_entries}
-            for entry_dict, score in raw_entries[20:]:
-                ns = entry_dict.get("namespace", "")
-                if (
-                    any(ns.startswith(prefix) for prefix in agent_namespaces)
-                    and entry_dict["tool_id"] not in top_ids
-                ):
-                    top_entries.append((entry_dict, score))
-                    top_ids.add(entry_dict["tool_id"])
+        ``tool_index`` is the precomputed index of the routing snapshot
+        (tool embedding matrix, masks and keyword sets); without it the
+        index is built from the platform tools for this call.
+        """
+        if tool_index is None:
+            from app.nexus.config import get_all_zone_prefixes
+            from app.nexus.platform_bridge import get_platform_tools
 
-        # NO normalization — scores are already in [0, 1] from cosine similarity.
-        # Band thresholds (0.95/0.80/0.60/0.40) are designed for this scale.
-        entries: list[dict] = []
-        for entry_dict, raw_score in top_entries:
-            entry_dict["score"] = round(raw_score, 4)
-            entries.append(entry_dict)
+            tools = get_platform_tools()
+            if not tools:
+                return []
+            tool_index = ToolIndex.build(tools, get_all_zone_prefixes())
 
-        return entries
+        return tool_index.score(
+            analysis.normalized_query,
+            analysis.zone_candidates,
+            analysis.domain_hints,
+            agent_namespaces=agent_namespaces,
+        )
 
     def _build_tool_points_from_platform(self) -> list[ToolPoint]:
         """Build ToolPoints from the live platform registry for space analysis.
@@ -16,10 +16,13 @@ logger = logging.getLogger(__name__)
 
 def _run_async(coro):
     """Run an async coroutine from a sync Celery task."""
+    from app.services.http_clients import close_loop_http_clients
+
     loop = asyncio.new_event_loop()
     try:
         return loop.run_until_complete(coro)
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
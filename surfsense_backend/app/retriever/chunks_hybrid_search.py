@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from app.retriever.text_search import search_space_tsquery
+
 
 class ChucksHybridSearchRetriever:
     def __init__(self, db_session):
@@ -35,12 +37,11 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
+        from app.agents.new_chat.query_embeddings import embed_query
         from app.db import Chunk, Document
 
         # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        query_embedding = await embed_query(query_text)
 
         # Build the query filtered by search space
         query = (
@@ -91,9 +92,9 @@ class ChucksHybridSearchRetriever:
 
         from app.db import Chunk, Document
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
-        tsquery = func.plainto_tsquery("english", query_text)
+        # Stored tsvector and a tsquery in the search space's text search config
+        tsvector = Chunk.search_vector
+        tsquery = search_space_tsquery(search_space_id, query_text)
 
         # Build the query filtered by search space
         query = (
@@ -129,6 +130,7 @@ class ChucksHybridSearchRetriever:
         document_type: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list:
         """
         Hybrid search that returns **documents** (not individual chunks).
@@ -143,6 +145,8 @@ class ChucksHybridSearchRetriever:
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
             start_date: Optional start date for filtering documents by updated_at
             end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text; when
+                omitted the query is embedded here
 
         Returns:
             List of dictionaries containing document data and relevance scores. Each dict contains:
@@ -154,20 +158,20 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import func, select, text
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
+        from app.agents.new_chat.query_embeddings import embed_query
         from app.db import Chunk, Document, DocumentType
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (unless the caller already embedded it)
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
 
         # RRF constants
         k = 60
         n_results = top_k * 5  # Fetch extra chunks for better document-level fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
-        tsquery = func.plainto_tsquery("english", query_text)
+        # Stored tsvector and a tsquery in the search space's text search config
+        tsvector = Chunk.search_vector
+        tsquery = search_space_tsquery(search_space_id, query_text)
 
         # Base conditions for chunk filtering - search space is required
         base_conditions = [Document.search_space_id == search_space_id]
@@ -262,41 +266,7 @@ class ChucksHybridSearchRetriever:
         if not chunks_with_scores:
             return []
 
-        # Convert to serializable dictionaries
-        serialized_chunk_results: list[dict] = []
-        for chunk, score in chunks_with_scores:
-            serialized_chunk_results.append(
-                {
-                    "chunk_id": chunk.id,
-                    "content": chunk.content,
-                    "score": float(score),  # Ensure score is a Python float
-                    "document": {
-                        "id": chunk.document.id,
-                        "title": chunk.document.title,
-                        "document_type": chunk.document.document_type.value
-                        if hasattr(chunk.document, "document_type")
-                        else None,
-                        "metadata": chunk.document.document_metadata,
-                    },
-                }
-            )
-
-        # Group by document, preserving ranking order by best chunk rank
-        doc_scores: dict[int, float] = {}
-        doc_order: list[int] = []
-        for item in serialized_chunk_results:
-            doc_id = item.get("document", {}).get("id")
-            if doc_id is None:
-                continue
-            if doc_id not in doc_scores:
-                doc_scores[doc_id] = item.get("score", 0.0)
-                doc_order.append(doc_id)
-            else:
-                # Use the best score as doc score
-                doc_scores[doc_id] = max(doc_scores[doc_id], item.get("score", 0.0))
-
-        # Keep only top_k documents by initial rank order.
-        doc_ids = doc_order[:top_k]
+        doc_ids, doc_scores = self._rank_documents(chunks_with_scores, top_k)
         if not doc_ids:
             return []
 
@@ -313,7 +283,248 @@ class ChucksHybridSearchRetriever:
         chunks_result = await self.db_session.execute(chunk_query)
         all_chunks = chunks_result.scalars().all()
 
-        # Assemble final doc-grouped results in the same order as doc_ids
+        return self._assemble_documents(doc_ids, doc_scores, all_chunks)
+
+    async def hybrid_search_by_document_type(
+        self,
+        query_text: str,
+        top_k: int,
+        search_space_id: int,
+        document_types: list[str],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list]:
+        """
+        Run `hybrid_search` for several document types in one ranking statement.
+
+        For every requested type, a LATERAL subquery takes the n_results
+        nearest (semantic) or best matching (keyword) chunks with ORDER BY ...
+        LIMIT, the same bounded query the indexes serve for a single type.
+        Ranks and the fused RRF cut to top_k per type are computed over those
+        candidates only, so the per-type results match what
+        `hybrid_search(document_type=...)` returns for each type while the
+        database is queried twice in total (ranking + chunk fetch) instead of
+        twice per type.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of documents to return per document type
+            search_space_id: The search space ID to search within
+            document_types: Document types to search (e.g., ["FILE", "SLACK_CONNECTOR"])
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text; when
+                omitted the query is embedded here
+
+        Returns:
+            Mapping of each requested document type to a list shaped like the
+            `hybrid_search` result. Unknown document types map to an empty list.
+        """
+        from sqlalchemy import cast, column, func, select, true, values
+        from sqlalchemy.orm import joinedload
+
+        from app.agents.new_chat.query_embeddings import embed_query
+        from app.db import Chunk, Document, DocumentType
+
+        results: dict[str, list] = {}
+        type_keys: dict[DocumentType, str] = {}
+        for document_type in document_types:
+            type_key = (
+                document_type.name
+                if isinstance(document_type, DocumentType)
+                else str(document_type)
+            )
+            results[type_key] = []
+            try:
+                type_keys[DocumentType[type_key]] = type_key
+            except KeyError:
+                # Unknown document types yield empty results, as in hybrid_search
+                continue
+        if not type_keys:
+            return results
+
+        # Get embedding for the query (unless the caller already embedded it)
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
+
+        # RRF constants
+        k = 60
+        n_results = top_k * 5  # Fetch extra chunks for better document-level fusion
+
+        # Stored tsvector and a tsquery in the search space's text search config
+        tsvector = Chunk.search_vector
+        tsquery = search_space_tsquery(search_space_id, query_text)
+
+        # One row per requested type; every candidate subquery is bounded to
+        # its type through LATERAL.
+        document_type_enum = Document.document_type.type
+        requested_types = values(
+            column("document_type", document_type_enum), name="requested_types"
+        ).data([(document_type,) for document_type in type_keys])
+        requested_type = cast(requested_types.c.document_type, document_type_enum)
+
+        base_conditions = [
+            Document.search_space_id == search_space_id,
+            Document.document_type == requested_type,
+        ]
+        if start_date is not None:
+            base_conditions.append(Document.updated_at >= start_date)
+        if end_date is not None:
+            base_conditions.append(Document.updated_at <= end_date)
+
+        # Semantic: the n_results nearest chunks of each type
+        distance = Chunk.embedding.op("<=>")(query_embedding)
+        semantic_candidates = (
+            select(Chunk.id, distance.label("distance"))
+            .join(Document, Chunk.document_id == Document.id)
+            .where(*base_conditions)
+            .order_by(distance)
+            .limit(n_results)
+            .lateral("semantic_candidates")
+        )
+        semantic_search_cte = (
+            select(
+                semantic_candidates.c.id,
+                requested_type.label("document_type"),
+                func.rank()
+                .over(
+                    partition_by=requested_type,
+                    order_by=semantic_candidates.c.distance,
+                )
+                .label("rank"),
+            )
+            .select_from(requested_types.join(semantic_candidates, true()))
+            .cte("semantic_search")
+        )
+
+        # Keyword: the n_results best matching chunks of each type
+        keyword_score = func.ts_rank_cd(tsvector, tsquery)
+        keyword_candidates = (
+            select(Chunk.id, keyword_score.label("keyword_score"))
+            .join(Document, Chunk.document_id == Document.id)
+            .where(*base_conditions)
+            .where(tsvector.op("@@")(tsquery))
+            .order_by(keyword_score.desc())
+            .limit(n_results)
+            .lateral("keyword_candidates")
+        )
+        keyword_search_cte = (
+            select(
+                keyword_candidates.c.id,
+                requested_type.label("document_type"),
+                func.rank()
+                .over(
+                    partition_by=requested_type,
+                    order_by=keyword_candidates.c.keyword_score.desc(),
+                )
+                .label("rank"),
+            )
+            .select_from(requested_types.join(keyword_candidates, true()))
+            .cte("keyword_search")
+        )
+
+        # RRF fusion, then keep the top_k chunks of every document type
+        score = (
+            func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
+            + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+        ).label("score")
+        fused_document_type = func.coalesce(
+            semantic_search_cte.c.document_type, keyword_search_cte.c.document_type
+        )
+        fused = (
+            select(
+                func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id).label(
+                    "id"
+                ),
+                score,
+                func.row_number()
+                .over(partition_by=fused_document_type, order_by=score.desc())
+                .label("partition_row"),
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .subquery("fused")
+        )
+        final_query = (
+            select(Chunk, fused.c.score)
+            .join(fused, Chunk.id == fused.c.id)
+            .where(fused.c.partition_row <= top_k)
+            .options(joinedload(Chunk.document))
+            .order_by(fused.c.score.desc())
+        )
+
+        result = await self.db_session.execute(final_query)
+        rows_by_type: dict[str, list] = {}
+        for chunk, chunk_score in result.all():
+            type_key = type_keys.get(chunk.document.document_type)
+            if type_key is not None:
+                rows_by_type.setdefault(type_key, []).append((chunk, chunk_score))
+        if not rows_by_type:
+            return results
+
+        ranked_by_type = {
+            type_key: self._rank_documents(rows, top_k)
+            for type_key, rows in rows_by_type.items()
+        }
+        all_doc_ids = [
+            doc_id for doc_ids, _ in ranked_by_type.values() for doc_id in doc_ids
+        ]
+
+        # Fetch ALL chunks for the selected documents of every type at once;
+        # the ranking above already applied the search space and date filters.
+        chunk_query = (
+            select(Chunk)
+            .options(joinedload(Chunk.document))
+            .where(Chunk.document_id.in_(all_doc_ids))
+            .order_by(Chunk.document_id, Chunk.id)
+        )
+        chunks_result = await self.db_session.execute(chunk_query)
+        all_chunks = chunks_result.scalars().all()
+
+        for type_key, (doc_ids, doc_scores) in ranked_by_type.items():
+            results[type_key] = self._assemble_documents(
+                doc_ids, doc_scores, all_chunks
+            )
+        return results
+
+    @staticmethod
+    def _rank_documents(
+        chunks_with_scores, top_k: int
+    ) -> tuple[list[int], dict[int, float]]:
+        """
+        Group ranked (chunk, score) rows by document.
+
+        Returns:
+            tuple: (top_k document ids in best-chunk order, best score per document)
+        """
+        doc_scores: dict[int, float] = {}
+        doc_order: list[int] = []
+        for chunk, score in chunks_with_scores:
+            doc_id = chunk.document.id if chunk.document is not None else None
+            if doc_id is None:
+                continue
+            score = float(score)  # Ensure score is a Python float
+            if doc_id not in doc_scores:
+                doc_scores[doc_id] = score
+                doc_order.append(doc_id)
+            else:
+                # Use the best score as doc score
+                doc_scores[doc_id] = max(doc_scores[doc_id], score)
+
+        # Keep only top_k documents by initial rank order.
+        return doc_order[:top_k], doc_scores
+
+    @staticmethod
+    def _assemble_documents(
+        doc_ids: list[int], doc_scores: dict[int, float], all_chunks
+    ) -> list[dict]:
+        """Build doc-grouped results (in `doc_ids` order) from fetched chunks."""
         doc_map: dict[int, dict] = {
             doc_id: {
                 "document_id": doc_id,
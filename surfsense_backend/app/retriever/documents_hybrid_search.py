@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from app.retriever.text_search import search_space_tsquery
+
 
 class DocumentHybridSearchRetriever:
     def __init__(self, db_session):
@@ -35,12 +37,11 @@ class DocumentHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
+        from app.agents.new_chat.query_embeddings import embed_query
         from app.db import Document
 
         # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        query_embedding = await embed_query(query_text)
 
         # Build the query filtered by search space
         query = (
@@ -92,9 +93,9 @@ class DocumentHybridSearchRetriever:
 
         from app.db import Document
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
-        tsquery = func.plainto_tsquery("english", query_text)
+        # Stored tsvector and a tsquery in the search space's text search config
+        tsvector = Document.search_vector
+        tsquery = search_space_tsquery(search_space_id, query_text)
 
         # Build the query filtered by search space
         query = (
@@ -129,6 +130,7 @@ class DocumentHybridSearchRetriever:
         document_type: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list:
         """
         Hybrid search that returns **documents** (not individual chunks).
@@ -143,25 +145,27 @@ class DocumentHybridSearchRetriever:
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
             start_date: Optional start date for filtering documents by updated_at
             end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text; when
+                omitted the query is embedded here
 
         """
         from sqlalchemy import func, select, text
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
+        from app.agents.new_chat.query_embeddings import embed_query
         from app.db import Chunk, Document, DocumentType
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (unless the caller already embedded it)
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
 
         # RRF constants
         k = 60
         n_results = top_k * 2  # Fetch extra documents for better fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
-        tsquery = func.plainto_tsquery("english", query_text)
+        # Stored tsvector and a tsquery in the search space's text search config
+        tsvector = Document.search_vector
+        tsquery = search_space_tsquery(search_space_id, query_text)
 
         # Base conditions for document filtering - search space is required
         base_conditions = [Document.search_space_id == search_space_id]
@@ -264,7 +268,207 @@ class DocumentHybridSearchRetriever:
         chunks_result = await self.db_session.execute(chunks_query)
         chunks = chunks_result.scalars().all()
 
-        # Assemble doc-grouped results
+        return self._assemble_documents(documents_with_scores, chunks)
+
+    async def hybrid_search_by_document_type(
+        self,
+        query_text: str,
+        top_k: int,
+        search_space_id: int,
+        document_types: list[str],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list]:
+        """
+        Run `hybrid_search` for several document types in one ranking statement.
+
+        For every requested type, a LATERAL subquery takes the n_results
+        nearest (semantic) or best matching (keyword) documents with ORDER BY ...
+        LIMIT, the same bounded query the indexes serve for a single type.
+        Ranks and the fused RRF cut to top_k per type are computed over those
+        candidates only, so the per-type results match what
+        `hybrid_search(document_type=...)` returns for each type while the
+        database is queried twice in total (ranking + chunk fetch) instead of
+        twice per type.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of documents to return per document type
+            search_space_id: The search space ID to search within
+            document_types: Document types to search (e.g., ["FILE", "SLACK_CONNECTOR"])
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text; when
+                omitted the query is embedded here
+
+        Returns:
+            Mapping of each requested document type to a list shaped like the
+            `hybrid_search` result. Unknown document types map to an empty list.
+        """
+        from sqlalchemy import cast, column, func, select, true, values
+        from sqlalchemy.orm import joinedload
+
+        from app.agents.new_chat.query_embeddings import embed_query
+        from app.db import Chunk, Document, DocumentType
+
+        results: dict[str, list] = {}
+        type_keys: dict[DocumentType, str] = {}
+        for document_type in document_types:
+            type_key = (
+                document_type.name
+                if isinstance(document_type, DocumentType)
+                else str(document_type)
+            )
+            results[type_key] = []
+            try:
+                type_keys[DocumentType[type_key]] = type_key
+            except KeyError:
+                # Unknown document types yield empty results, as in hybrid_search
+                continue
+        if not type_keys:
+            return results
+
+        # Get embedding for the query (unless the caller already embedded it)
+        if query_embedding is None:
+            query_embedding = await embed_query(query_text)
+
+        # RRF constants
+        k = 60
+        n_results = top_k * 2  # Fetch extra documents for better fusion
+
+        # Stored tsvector and a tsquery in the search space's text search config
+        tsvector = Document.search_vector
+        tsquery = search_space_tsquery(search_space_id, query_text)
+
+        # One row per requested type; every candidate subquery is bounded to
+        # its type through LATERAL.
+        document_type_enum = Document.document_type.type
+        requested_types = values(
+            column("document_type", document_type_enum), name="requested_types"
+        ).data([(document_type,) for document_type in type_keys])
+        requested_type = cast(requested_types.c.document_type, document_type_enum)
+
+        base_conditions = [
+            Document.search_space_id == search_space_id,
+            Document.document_type == requested_type,
+        ]
+        if start_date is not None:
+            base_conditions.append(Document.updated_at >= start_date)
+        if end_date is not None:
+            base_conditions.append(Document.updated_at <= end_date)
+
+        # Semantic: the n_results nearest documents of each type
+        distance = Document.embedding.op("<=>")(query_embedding)
+        semantic_candidates = (
+            select(Document.id, distance.label("distance"))
+            .where(*base_conditions)
+            .order_by(distance)
+            .limit(n_results)
+            .lateral("semantic_candidates")
+        )
+        semantic_search_cte = (
+            select(
+                semantic_candidates.c.id,
+                requested_type.label("document_type"),
+                func.rank()
+                .over(
+                    partition_by=requested_type,
+                    order_by=semantic_candidates.c.distance,
+                )
+                .label("rank"),
+            )
+            .select_from(requested_types.join(semantic_candidates, true()))
+            .cte("semantic_search")
+        )
+
+        # Keyword: the n_results best matching documents of each type
+        keyword_score = func.ts_rank_cd(tsvector, tsquery)
+        keyword_candidates = (
+            select(Document.id, keyword_score.label("keyword_score"))
+            .where(*base_conditions)
+            .where(tsvector.op("@@")(tsquery))
+            .order_by(keyword_score.desc())
+            .limit(n_results)
+            .lateral("keyword_candidates")
+        )
+        keyword_search_cte = (
+            select(
+                keyword_candidates.c.id,
+                requested_type.label("document_type"),
+                func.rank()
+                .over(
+                    partition_by=requested_type,
+                    order_by=keyword_candidates.c.keyword_score.desc(),
+                )
+                .label("rank"),
+            )
+            .select_from(requested_types.join(keyword_candidates, true()))
+            .cte("keyword_search")
+        )
+
+        # RRF fusion, then keep the top_k documents of every document type
+        score = (
+            func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
+            + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+        ).label("score")
+        fused_document_type = func.coalesce(
+            semantic_search_cte.c.document_type, keyword_search_cte.c.document_type
+        )
+        fused = (
+            select(
+                func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id).label(
+                    "id"
+                ),
+                score,
+                func.row_number()
+                .over(partition_by=fused_document_type, order_by=score.desc())
+                .label("partition_row"),
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .subquery("fused")
+        )
+        final_query = (
+            select(Document, fused.c.score)
+            .join(fused, Document.id == fused.c.id)
+            .where(fused.c.partition_row <= top_k)
+            .options(joinedload(Document.search_space))
+            .order_by(fused.c.score.desc())
+        )
+
+        result = await self.db_session.execute(final_query)
+        rows_by_type: dict[str, list] = {}
+        for doc, doc_score in result.all():
+            type_key = type_keys.get(doc.document_type)
+            if type_key is not None:
+                rows_by_type.setdefault(type_key, []).append((doc, doc_score))
+        if not rows_by_type:
+            return results
+
+        # Fetch ALL chunks for the selected documents of every type at once
+        doc_ids = [doc.id for rows in rows_by_type.values() for doc, _score in rows]
+        chunks_query = (
+            select(Chunk)
+            .options(joinedload(Chunk.document))
+            .where(Chunk.document_id.in_(doc_ids))
+            .order_by(Chunk.document_id, Chunk.id)
+        )
+        chunks_result = await self.db_session.execute(chunks_query)
+        chunks = chunks_result.scalars().all()
+
+        for type_key, rows in rows_by_type.items():
+            results[type_key] = self._assemble_documents(rows, chunks)
+        return results
+
+    @staticmethod
+    def _assemble_documents(documents_with_scores, chunks) -> list[dict]:
+        """Build doc-grouped results (in ranked order) from documents and their chunks."""
         doc_map: dict[int, dict] = {
             doc.id: {
                 "document_id": doc.id,
@@ -296,8 +500,8 @@ class DocumentHybridSearchRetriever:
 
         # Fill concatenated content (useful for reranking)
         final_docs: list[dict] = []
-        for doc_id in doc_ids:
-            entry = doc_map[doc_id]
+        for doc, _score in documents_with_scores:
+            entry = doc_map[doc.id]
             entry["content"] = "\n\n".join(
                 c["content"] for c in entry.get("chunks", []) if c.get("content")
             )
@@ -0,0 +1,184 @@
+"""
+Language-aware full-text search over the stored `search_vector` columns.
+
+`documents.search_vector` and `chunks.search_vector` hold
+`to_tsvector(<config>, content)`, where `<config>` is the search space's
+`text_search_config` (`swedish`, `english` or `simple`). The vectors are kept
+up to date by BEFORE INSERT/UPDATE triggers (a generated column cannot look up
+the search space) and indexed with GIN, so queries rank with `ts_rank_cd` on
+the stored column instead of re-running `to_tsvector` for every row.
+
+When a search space switches configuration, `refresh_search_vectors` rewrites
+its vectors in small batches.
+"""
+
+from sqlalchemy import cast, func, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+TEXT_SEARCH_CONFIGS: tuple[str, ...] = ("swedish", "english", "simple")
+DEFAULT_TEXT_SEARCH_CONFIG = "swedish"
+
+# Rows rewritten per statement by refresh_search_vectors
+REFRESH_BATCH_SIZE = 1000
+
+# Trigger functions and triggers that maintain the stored vectors. Each entry
+# is a single statement so it can run through asyncpg and Alembic alike.
+SEARCH_VECTOR_TRIGGER_DDL: tuple[str, ...] = (
+    f"""
+    CREATE OR REPLACE FUNCTION documents_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector(
+            COALESCE(
+                (SELECT s.text_search_config FROM searchspaces s
+                 WHERE s.id = NEW.search_space_id),
+                '{DEFAULT_TEXT_SEARCH_CONFIG}'
+            )::regconfig,
+            COALESCE(NEW.content, '')
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION chunks_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector(
+            COALESCE(
+                (SELECT s.text_search_config FROM documents d
+                 JOIN searchspaces s ON s.id = d.search_space_id
+                 WHERE d.id = NEW.document_id),
+                '{DEFAULT_TEXT_SEARCH_CONFIG}'
+            )::regconfig,
+            COALESCE(NEW.content, '')
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = 'documents_search_vector_trigger'
+        ) THEN
+            CREATE TRIGGER documents_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF content, search_space_id ON documents
+            FOR EACH ROW EXECUTE FUNCTION documents_search_vector_update();
+        END IF;
+    END;
+    $$
+    """,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = 'chunks_search_vector_trigger'
+        ) THEN
+            CREATE TRIGGER chunks_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF content, document_id ON chunks
+            FOR EACH ROW EXECUTE FUNCTION chunks_search_vector_update();
+        END IF;
+    END;
+    $$
+    """,
+)
+
+
+def search_space_text_search_config(search_space_id: int):
+    """SQL expression for the search space's text search configuration."""
+    from app.db import SearchSpace
+
+    return cast(
+        select(SearchSpace.text_search_config)
+        .where(SearchSpace.id == search_space_id)
+        .scalar_subquery(),
+        REGCONFIG,
+    )
+
+
+def search_space_tsquery(search_space_id: int, query_text: str):
+    """`plainto_tsquery` using the same configuration as the stored vectors."""
+    return func.plainto_tsquery(
+        search_space_text_search_config(search_space_id), query_text
+    )
+
+
+async def refresh_search_vectors(
+    session,
+    search_space_id: int,
+    batch_size: int = REFRESH_BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Rebuild the stored vectors of one search space with its current configuration.
+
+    Rows are rewritten in keyset-ordered batches, committing after each batch,
+    so no statement holds row locks for long.
+
+    Args:
+        session: AsyncSession to run the updates on
+        search_space_id: The search space whose documents and chunks to refresh
+        batch_size: Rows rewritten per statement
+
+    Returns:
+        Number of refreshed documents and chunks
+    """
+    from app.db import SearchSpace
+
+    result = await session.execute(
+        select(SearchSpace.text_search_config).where(SearchSpace.id == search_space_id)
+    )
+    text_search_config = result.scalar()
+    if text_search_config is None:
+        return {"documents": 0, "chunks": 0}
+
+    statements = {
+        "documents": text(
+            """
+            UPDATE documents
+            SET search_vector = to_tsvector(CAST(:config AS regconfig), content)
+            WHERE id IN (
+                SELECT id FROM documents
+                WHERE search_space_id = :search_space_id AND id > :last_id
+                ORDER BY id
+                LIMIT :batch_size
+            )
+            RETURNING id
+            """
+        ),
+        "chunks": text(
+            """
+            UPDATE chunks
+            SET search_vector = to_tsvector(CAST(:config AS regconfig), content)
+            WHERE id IN (
+                SELECT c.id FROM chunks c
+                JOIN documents d ON d.id = c.document_id
+                WHERE d.search_space_id = :search_space_id AND c.id > :last_id
+                ORDER BY c.id
+                LIMIT :batch_size
+            )
+            RETURNING id
+            """
+        ),
+    }
+
+    refreshed: dict[str, int] = {}
+    for table, statement in statements.items():
+        last_id = 0
+        refreshed[table] = 0
+        while True:
+            result = await session.execute(
+                statement,
+                {
+                    "config": text_search_config,
+                    "search_space_id": search_space_id,
+                    "last_id": last_id,
+                    "batch_size": batch_size,
+                },
+            )
+            ids = [row[0] for row in result.all()]
+            await session.commit()
+            if not ids:
+                break
+            refreshed[table] += len(ids)
+            last_id = max(ids)
+    return refreshed
@@ -5,8 +5,10 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.new_chat.bigtool_store import clear_tool_caches
+from app.agents.new_chat.sandbox_runtime import sandbox_pool_stats
 from app.agents.new_chat.supervisor_cache import clear_agent_combo_cache
 from app.db import AgentComboCache, SearchSpaceMembership, User, get_async_session
+from app.nexus.routing.routing_snapshot import RoutingSnapshotHolder
 from app.schemas.admin_cache import (
     CacheClearResponse,
     CacheStateResponse,
@@ -17,6 +19,14 @@ from app.services.cache_control import (
     is_cache_disabled,
     set_cache_disabled,
 )
+from app.services.embedding_cache import (
+    clear_embedding_cache,
+    get_embedding_cache_stats,
+)
+from app.services.graph_holder import GraphHolder
+from app.services.http_clients import http_client_stats
+from app.services.response_cache import response_cache_stats
+from app.services.trace_writer import trace_writer_stats
 from app.users import current_active_user
 
 logger = logging.getLogger(__name__)
@@ -52,7 +62,16 @@ async def get_cache_state(
     user: User = Depends(current_active_user),
 ):
     await _require_admin(session, user)
-    return {"disabled": is_cache_disabled()}
+    return {
+        "disabled": is_cache_disabled(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "http_clients": http_client_stats(),
+        "nexus_routing_snapshot": RoutingSnapshotHolder.stats(),
+        "sandbox_pool": sandbox_pool_stats(),
+        "service_response_caches": response_cache_stats(),
+        "supervisor_graphs": GraphHolder.stats(),
+        "trace_writer": trace_writer_stats(),
+    }
 
 
 @router.post(
@@ -82,13 +101,25 @@ async def clear_cache(
 
     clear_agent_combo_cache()
     clear_tool_caches()
+    await GraphHolder.invalidate()
+    await RoutingSnapshotHolder.invalidate()
     cleared["in_memory_agent_combo"] = 1
     cleared["in_memory_tool_embed"] = 1
+    cleared["in_memory_supervisor_graphs"] = 1
+    cleared["in_memory_nexus_routing_snapshot"] = 1
 
-    # Flush all registered service TTL caches (SCB, Elpris, Riksbank, etc.)
+    # Flush all registered service caches (SCB, Elpris, Riksbank, etc.).
+    # Each response cache also deletes its own Redis namespace; the shared
+    # Redis database holds other data and is never flushed.
     service_flushed = clear_all_service_caches()
     cleared["service_ttl_caches"] = service_flushed
 
+    try:
+        cleared["embedding_cache_rows"] = clear_embedding_cache()
+    except Exception as exc:
+        logger.exception("Failed to clear embedding cache")
+        cleared["embedding_cache_error"] = str(exc)
+
     try:
         result = await session.execute(delete(AgentComboCache))
         await session.commit()
@@ -98,17 +129,4 @@ async def clear_cache(
         logger.exception("Failed to clear agent combo cache")
         cleared["agent_combo_db_error"] = str(exc)
 
-    try:
-        from app.services.trafikverket_service import TrafikverketService
-
-        service = TrafikverketService()
-        redis_client = service._get_redis()
-        if redis_client:
-            cleared["redis_flushed"] = int(redis_client.flushdb())
-        else:
-            cleared["redis_flushed"] = 0
-    except Exception as exc:
-        logger.exception("Failed to flush redis cache")
-        cleared["redis_error"] = str(exc)
-
     return {"cleared": cleared}
@@ -99,7 +99,10 @@ from app.services.agent_prompt_service import (
     upsert_global_prompt_overrides,
 )
 from app.services.connector_service import ConnectorService
+from app.services.graph_holder import GraphHolder
+from app.services.graph_registry_service import RegistryCache
 from app.services.llm_service import get_agent_llm
+from app.services.tool_evaluation_runner import default_case_store
 from app.services.tool_evaluation_service import (
     compute_metadata_version_hash,
     generate_tool_metadata_suggestions,
@@ -148,6 +151,7 @@ from app.services.intent_definition_service import (
     normalize_intent_definition_payload,
     upsert_global_intent_definition_overrides,
 )
+from app.services.registry_events import bump_registry_version, notify_registry_changed
 from app.services.tool_retrieval_tuning_service import (
     get_metadata_separation_lock_registry,
     get_global_tool_retrieval_tuning,
@@ -281,6 +285,23 @@ _SKOLVERKET_TOOL_CATEGORY_BY_ID: dict[str, str] = {
 _SKOLVERKET_TOOL_IDS = set(_SKOLVERKET_TOOL_CATEGORY_BY_ID.keys())
 
 
+async def _invalidate_compiled_graphs(session: AsyncSession) -> None:
+    """Bump the registry version so cached supervisor graphs are rebuilt.
+
+    Cached graphs embed tool metadata, agent metadata and retrieval tuning
+    loaded at build time.  Failures are logged; the saved settings stand.
+    """
+    try:
+        new_version = await bump_registry_version(session)
+        await session.commit()
+        await notify_registry_changed(session, new_version)
+    except Exception:
+        await session.rollback()
+        logger.exception("Failed to bump graph registry version")
+    await RegistryCache.invalidate()
+    await GraphHolder.invalidate()
+
+
 def _utcnow_iso() -> str:
     return datetime.now(UTC).isoformat()
 
@@ -3691,6 +3712,9 @@ async def _execute_tool_evaluation(
         prompt_overrides=current_prompts,
         intent_definitions=effective_intent_definitions,
         progress_callback=progress_callback,
+        case_store=default_case_store(
+            search_space_id=resolved_search_space_id, evaluation_kind="tool"
+        ),
     )
     suggestions = await generate_tool_metadata_suggestions(
         evaluation_results=evaluation["results"],
@@ -3843,6 +3867,9 @@ async def _execute_api_input_evaluation(
         retrieval_limit=payload.retrieval_limit,
         retrieval_tuning=effective_tuning,
     )
+    api_case_store = default_case_store(
+        search_space_id=resolved_search_space_id, evaluation_kind="tool_api_input"
+    )
     evaluation = await run_tool_api_input_evaluation(
         tests=normalized_api_tests,
         tool_index=tool_index,
@@ -3854,6 +3881,7 @@ async def _execute_api_input_evaluation(
         prompt_overrides=current_prompts,
         intent_definitions=effective_intent_definitions,
         progress_callback=progress_callback,
+        case_store=api_case_store,
     )
     holdout_evaluation: dict[str, Any] | None = None
     if payload.holdout_tests:
@@ -3877,6 +3905,7 @@ async def _execute_api_input_evaluation(
             prompt_overrides=current_prompts,
             intent_definitions=effective_intent_definitions,
             progress_callback=None,
+            case_store=api_case_store,
         )
     prompt_suggestions = await suggest_agent_prompt_improvements_for_api_input(
         evaluation_results=evaluation["results"],
@@ -3959,6 +3988,7 @@ async def _apply_tool_metadata_updates(
         )
         await session.commit()
         clear_tool_caches()
+        await _invalidate_compiled_graphs(session)
     except Exception as exc:
         await session.rollback()
         logger.exception("Failed to update tool metadata")
@@ -4455,6 +4485,7 @@ async def update_tool_settings_metadata_catalog(
             )
         await session.commit()
         clear_tool_caches()
+        await _invalidate_compiled_graphs(session)
         if agent_update_rows:
             try:
                 from app.agents.new_chat.supervisor_cache import clear_agent_combo_cache
@@ -4552,6 +4583,7 @@ async def reset_metadata_catalog(
 
         await session.commit()
         clear_tool_caches()
+        await _invalidate_compiled_graphs(session)
         try:
             from app.agents.new_chat.supervisor_cache import clear_agent_combo_cache
 
@@ -5848,6 +5880,7 @@ async def update_tool_retrieval_tuning(
         )
         await session.commit()
         clear_tool_caches()
+        await _invalidate_compiled_graphs(session)
     except Exception as exc:
         await session.rollback()
         logger.exception("Failed to update retrieval tuning")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -222,7 +223,7 @@ async def test_luma_connector(
         luma = LumaConnector(api_key=api_key)
 
         # Test the connection by fetching user info
-        user_info, error = luma.get_user_info()
+        user_info, error = await asyncio.to_thread(luma.get_user_info)
         if error:
             raise HTTPException(
                 status_code=400,
@@ -230,7 +231,7 @@ async def test_luma_connector(
             )
 
         # Try to fetch events
-        events, events_error = luma.get_all_events(limit=10)
+        events, events_error = await asyncio.to_thread(luma.get_all_events, limit=10)
 
         return {
             "message": "Luma connector is working correctly",
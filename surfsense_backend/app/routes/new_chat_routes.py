@@ -20,7 +20,7 @@ from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import StreamingResponse
-from sqlalchemy import func, or_
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -55,6 +55,11 @@ from app.schemas.new_chat import (
     ThreadListResponse,
 )
 from app.schemas.chat_trace import TraceSessionAttachRequest, TraceSessionRead
+from app.services.thread_listing_service import (
+    InvalidThreadCursorError,
+    fetch_all_threads,
+    fetch_thread_page,
+)
 from app.tasks.chat.stream_new_chat import stream_new_chat
 from app.users import current_active_user
 from app.utils.rbac import check_permission
@@ -168,6 +173,16 @@ async def check_thread_access(
     )
 
 
+async def _is_search_space_owner(
+    session: AsyncSession, search_space_id: int, user: User
+) -> bool:
+    """Check if user owns the search space (for legacy thread visibility)."""
+    result = await session.execute(
+        select(SearchSpace.user_id).filter(SearchSpace.id == search_space_id)
+    )
+    return result.scalar_one_or_none() == user.id
+
+
 # =============================================================================
 # Thread Endpoints
 # =============================================================================
@@ -177,11 +192,16 @@ async def check_thread_access(
 async def list_threads(
     search_space_id: int,
     limit: int | None = None,
+    cursor: str | None = None,
+    archived_limit: int | None = None,
+    archived_cursor: str | None = None,
+    archived: bool | None = None,
+    visibility: ChatVisibility | None = None,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
 ):
     """
-    List all accessible threads for the current user in a search space.
+    List accessible threads for the current user in a search space.
     Returns threads and archived_threads for ThreadListPrimitive.
 
     A user can see threads that are:
@@ -189,9 +209,18 @@ async def list_threads(
     - Shared with the search space (visibility = SEARCH_SPACE)
     - Legacy threads with no creator (created_by_id is NULL) - only if user is search space owner
 
+    Active and archived threads are paged independently with keyset cursors on
+    (updated_at, id); pass next_cursor / archived_next_cursor from the previous
+    response to fetch the following page.
+
     Args:
         search_space_id: The search space to list threads for
-        limit: Optional limit on number of threads to return (applies to active threads only)
+        limit: Page size for active threads (default 50, max 200)
+        cursor: Cursor for the next page of active threads
+        archived_limit: Page size for archived threads (default 50, max 200)
+        archived_cursor: Cursor for the next page of archived threads
+        archived: Only return archived (True) or active (False) threads; both when omitted
+        visibility: Only return threads with this visibility
 
     Requires CHATS_READ permission.
     """
@@ -204,71 +233,49 @@ async def list_threads(
             "You don't have permission to read chats in this search space",
         )
 
-        # Check if user is the search space owner (for legacy thread visibility)
-        search_space_query = select(SearchSpace).filter(
-            SearchSpace.id == search_space_id
+        is_search_space_owner = await _is_search_space_owner(
+            session, search_space_id, user
         )
-        search_space_result = await session.execute(search_space_query)
-        search_space = search_space_result.scalar_one_or_none()
-        is_search_space_owner = search_space and search_space.user_id == user.id
-
-        # Build filter conditions:
-        # 1. Created by the current user (any visibility)
-        # 2. Shared with the search space (visibility = SEARCH_SPACE)
-        # 3. Legacy threads (created_by_id is NULL) - only visible to search space owner
-        filter_conditions = [
-            NewChatThread.created_by_id == user.id,
-            NewChatThread.visibility == ChatVisibility.SEARCH_SPACE,
-        ]
-
-        # Only include legacy threads for the search space owner
-        if is_search_space_owner:
-            filter_conditions.append(NewChatThread.created_by_id.is_(None))
-
-        query = (
-            select(NewChatThread)
-            .filter(
-                NewChatThread.search_space_id == search_space_id,
-                or_(*filter_conditions),
-            )
-            .order_by(NewChatThread.updated_at.desc())
-        )
-
-        result = await session.execute(query)
-        all_threads = result.scalars().all()
-
-        # Separate active and archived threads
-        threads = []
-        archived_threads = []
 
-        for thread in all_threads:
-            # Legacy threads (no creator) are treated as own threads for owner
-            is_own_thread = thread.created_by_id == user.id or (
-                thread.created_by_id is None and is_search_space_owner
+        threads: list[ThreadListItem] = []
+        archived_threads: list[ThreadListItem] = []
+        next_cursor = None
+        archived_next_cursor = None
+
+        if archived is not True:
+            threads, next_cursor = await fetch_thread_page(
+                session,
+                search_space_id=search_space_id,
+                user_id=user.id,
+                is_search_space_owner=is_search_space_owner,
+                archived=False,
+                limit=limit,
+                cursor=cursor,
+                visibility=visibility,
             )
-            item = ThreadListItem(
-                id=thread.id,
-                title=thread.title,
-                archived=thread.archived,
-                visibility=thread.visibility,
-                created_by_id=thread.created_by_id,
-                is_own_thread=is_own_thread,
-                created_at=thread.created_at,
-                updated_at=thread.updated_at,
+        if archived is not False:
+            archived_threads, archived_next_cursor = await fetch_thread_page(
+                session,
+                search_space_id=search_space_id,
+                user_id=user.id,
+                is_search_space_owner=is_search_space_owner,
+                archived=True,
+                limit=archived_limit,
+                cursor=archived_cursor,
+                visibility=visibility,
             )
-            if thread.archived:
-                archived_threads.append(item)
-            else:
-                threads.append(item)
-
-        # Apply limit to active threads if specified
-        if limit is not None and limit > 0:
-            threads = threads[:limit]
 
-        return ThreadListResponse(threads=threads, archived_threads=archived_threads)
+        return ThreadListResponse(
+            threads=threads,
+            archived_threads=archived_threads,
+            next_cursor=next_cursor,
+            archived_next_cursor=archived_next_cursor,
+        )
 
     except HTTPException:
         raise
+    except InvalidThreadCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
     except OperationalError:
         raise HTTPException(
             status_code=503, detail="Database operation failed. Please try again later."
@@ -284,6 +291,7 @@ async def list_threads(
 async def search_threads(
     search_space_id: int,
     title: str,
+    limit: int | None = None,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
 ):
@@ -295,9 +303,12 @@ async def search_threads(
     - Shared with the search space (visibility = SEARCH_SPACE)
     - Legacy threads with no creator (created_by_id is NULL) - only if user is search space owner
 
+    The title match is served by a pg_trgm GIN index on new_chat_threads.title.
+
     Args:
         search_space_id: The search space to search in
         title: The search query (case-insensitive partial match)
+        limit: Maximum number of most recently updated matches (max 200); all matches when omitted
 
     Requires CHATS_READ permission.
     """
@@ -310,55 +321,30 @@ async def search_threads(
             "You don't have permission to read chats in this search space",
         )
 
-        # Check if user is the search space owner (for legacy thread visibility)
-        search_space_query = select(SearchSpace).filter(
-            SearchSpace.id == search_space_id
+        is_search_space_owner = await _is_search_space_owner(
+            session, search_space_id, user
         )
-        search_space_result = await session.execute(search_space_query)
-        search_space = search_space_result.scalar_one_or_none()
-        is_search_space_owner = search_space and search_space.user_id == user.id
-
-        # Build filter conditions
-        filter_conditions = [
-            NewChatThread.created_by_id == user.id,
-            NewChatThread.visibility == ChatVisibility.SEARCH_SPACE,
-        ]
 
-        # Only include legacy threads for the search space owner
-        if is_search_space_owner:
-            filter_conditions.append(NewChatThread.created_by_id.is_(None))
-
-        # Search accessible threads by title (case-insensitive)
-        query = (
-            select(NewChatThread)
-            .filter(
-                NewChatThread.search_space_id == search_space_id,
-                NewChatThread.title.ilike(f"%{title}%"),
-                or_(*filter_conditions),
+        if limit is None:
+            return await fetch_all_threads(
+                session,
+                search_space_id=search_space_id,
+                user_id=user.id,
+                is_search_space_owner=is_search_space_owner,
+                archived=None,
+                title=title,
             )
-            .order_by(NewChatThread.updated_at.desc())
-        )
 
-        result = await session.execute(query)
-        threads = result.scalars().all()
-
-        return [
-            ThreadListItem(
-                id=thread.id,
-                title=thread.title,
-                archived=thread.archived,
-                visibility=thread.visibility,
-                created_by_id=thread.created_by_id,
-                # Legacy threads (no creator) are treated as own threads for owner
-                is_own_thread=(
-                    thread.created_by_id == user.id
-                    or (thread.created_by_id is None and is_search_space_owner)
-                ),
-                created_at=thread.created_at,
-                updated_at=thread.updated_at,
-            )
-            for thread in threads
-        ]
+        threads, _ = await fetch_thread_page(
+            session,
+            search_space_id=search_space_id,
+            user_id=user.id,
+            is_search_space_owner=is_search_space_owner,
+            archived=None,
+            limit=limit,
+            title=title,
+        )
+        return threads
 
     except HTTPException:
         raise
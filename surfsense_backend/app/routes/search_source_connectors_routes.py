@@ -32,6 +32,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.agents.new_chat.tools.mcp_session_pool import get_mcp_session_manager
 from app.connectors.github_connector import GitHubConnector
 from app.db import (
     Permission,
@@ -2863,6 +2864,9 @@ async def update_mcp_connector(
         await session.commit()
         await session.refresh(connector)
 
+        # Drop the pooled session and cached tool list of the old config
+        await get_mcp_session_manager().invalidate_connector(connector_id)
+
         logger.info(f"Updated MCP connector {connector_id}")
 
         connector_read = SearchSourceConnectorRead.model_validate(connector)
@@ -2918,6 +2922,8 @@ async def delete_mcp_connector(
         await session.delete(connector)
         await session.commit()
 
+        await get_mcp_session_manager().invalidate_connector(connector_id)
+
         logger.info(f"Deleted MCP connector {connector_id}")
 
     except HTTPException:
@@ -176,6 +176,7 @@ async def read_search_spaces(
                     user_id=space.user_id,
                     citations_enabled=space.citations_enabled,
                     qna_custom_instructions=space.qna_custom_instructions,
+                    text_search_config=space.text_search_config,
                     member_count=member_count,
                     is_owner=is_owner,
                 )
@@ -250,10 +251,24 @@ async def update_search_space(
             raise HTTPException(status_code=404, detail="Search space not found")
 
         update_data = search_space_update.model_dump(exclude_unset=True)
+        new_text_search_config = update_data.get("text_search_config")
+        text_search_config_changed = (
+            new_text_search_config is not None
+            and new_text_search_config != db_search_space.text_search_config
+        )
         for key, value in update_data.items():
             setattr(db_search_space, key, value)
         await session.commit()
         await session.refresh(db_search_space)
+
+        if text_search_config_changed:
+            # Re-vectorize existing documents/chunks with the new configuration
+            from app.tasks.celery_tasks.document_reindex_tasks import (
+                refresh_search_vectors_task,
+            )
+
+            refresh_search_vectors_task.delay(search_space_id)
+
         return db_search_space
     except HTTPException:
         raise
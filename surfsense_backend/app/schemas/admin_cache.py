@@ -7,6 +7,13 @@ from pydantic import BaseModel
 
 class CacheStateResponse(BaseModel):
     disabled: bool
+    embedding_cache: dict[str, Any] | None = None
+    http_clients: dict[str, Any] | None = None
+    nexus_routing_snapshot: dict[str, Any] | None = None
+    sandbox_pool: dict[str, Any] | None = None
+    service_response_caches: dict[str, Any] | None = None
+    supervisor_graphs: dict[str, Any] | None = None
+    trace_writer: dict[str, Any] | None = None
 
 
 class CacheToggleRequest(BaseModel):
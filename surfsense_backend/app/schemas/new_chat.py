@@ -145,6 +145,9 @@ class ThreadListResponse(BaseModel):
 
     threads: list[ThreadListItem]
     archived_threads: list[ThreadListItem]
+    # Opaque keyset cursors for the next page of each list (None on the last page)
+    next_cursor: str | None = None
+    archived_next_cursor: str | None = None
 
 
 # =============================================================================
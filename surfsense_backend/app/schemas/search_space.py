@@ -1,10 +1,14 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict
 
 from .base import IDModel, TimestampModel
 
+# PostgreSQL text search configurations available for full-text ranking
+TextSearchConfig = Literal["swedish", "english", "simple"]
+
 
 class SearchSpaceBase(BaseModel):
     name: str
@@ -15,6 +19,7 @@ class SearchSpaceCreate(SearchSpaceBase):
     # Optional on create, will use defaults if not provided
     citations_enabled: bool = True
     qna_custom_instructions: str | None = None
+    text_search_config: TextSearchConfig = "swedish"
 
 
 class SearchSpaceUpdate(BaseModel):
@@ -23,6 +28,7 @@ class SearchSpaceUpdate(BaseModel):
     description: str | None = None
     citations_enabled: bool | None = None
     qna_custom_instructions: str | None = None
+    text_search_config: TextSearchConfig | None = None
 
 
 class SearchSpaceRead(SearchSpaceBase, IDModel, TimestampModel):
@@ -32,6 +38,7 @@ class SearchSpaceRead(SearchSpaceBase, IDModel, TimestampModel):
     # QnA configuration
     citations_enabled: bool
     qna_custom_instructions: str | None = None
+    text_search_config: str = "swedish"
 
     model_config = ConfigDict(from_attributes=True)
 
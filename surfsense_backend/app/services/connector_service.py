@@ -1,6 +1,7 @@
 import asyncio
 import json
 import uuid
+from collections.abc import Awaitable, Callable, Sequence
 from datetime import UTC, datetime
 from typing import Any
 from urllib.parse import urljoin
@@ -13,6 +14,7 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from tavily import TavilyClient
 
+from app.agents.new_chat.query_embeddings import embed_query
 from app.config import config
 from app.db import (
     Chunk,
@@ -23,6 +25,7 @@ from app.db import (
     SearchSpace,
     SearchSpaceMembership,
     SearchSpaceRole,
+    async_session_maker,
     get_default_roles_config,
 )
 from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
@@ -38,6 +41,13 @@ SEARCH_HISTORY_NAME = "Search History"
 SEARCH_HISTORY_DESCRIPTION = "System workspace for external search history"
 TOOL_OUTPUT_MAX_CHARS = 12000
 
+# Connectors whose search methods read and write through the request's shared
+# AsyncSession (connector lookup + search-history upserts). They are never run
+# concurrently with each other during a multi-connector fan-out.
+SHARED_SESSION_CONNECTORS = frozenset(
+    {"TAVILY_API", "SEARXNG_API", "LINKUP_API", "BAIDU_SEARCH_API"}
+)
+
 
 class ConnectorService:
     def __init__(
@@ -45,8 +55,11 @@ class ConnectorService:
         session: AsyncSession,
         search_space_id: int | None = None,
         user_id: str | None = None,
+        session_factory: Callable[[], AsyncSession] | None = None,
     ):
         self.session = session
+        # Factory for the short-lived sessions used by concurrent retrieval.
+        self.session_factory = session_factory or async_session_maker
         self.chunk_retriever = ChucksHybridSearchRetriever(session)
         self.document_retriever = DocumentHybridSearchRetriever(session)
         self.search_space_id = search_space_id
@@ -57,6 +70,10 @@ class ConnectorService:
         self.counter_lock = (
             asyncio.Lock()
         )  # Lock to protect counter in multithreaded environments
+        # Serializes searches that use the shared session during a fan-out
+        self.shared_session_lock = asyncio.Lock()
+        # Results of prefetch_combined_rrf_searches, keyed by search arguments
+        self._prefetched_rrf_results: dict[tuple, list[dict[str, Any]]] = {}
 
     async def initialize_counter(self):
         """
@@ -254,9 +271,14 @@ class ConnectorService:
         Returned results are **document-grouped** objects that contain a list of chunks
         with real chunk IDs (used for downstream `[citation:<chunk_id>]`).
 
+        Results batched ahead of time by `prefetch_combined_rrf_searches` are
+        returned without querying the database again.
+
         This method:
-        1. Runs chunk-level hybrid search (vector + keyword on chunks)
-        2. Runs document-level hybrid search (vector + keyword on documents, returns chunks)
+        1. Embeds the query once
+        2. Runs chunk-level hybrid search (vector + keyword on chunks) and
+           document-level hybrid search (vector + keyword on documents, returns
+           chunks) concurrently, see `_run_hybrid_retrievers`
         3. Combines results using RRF based on their ranks in each result set
         4. Returns top-k deduplicated results
 
@@ -271,35 +293,104 @@ class ConnectorService:
         Returns:
             List of combined and deduplicated document results
         """
-        # RRF constant
-        k = 60
+        prefetch_key = (
+            query_text,
+            search_space_id,
+            document_type,
+            top_k,
+            start_date,
+            end_date,
+        )
+        prefetched = self._prefetched_rrf_results.pop(prefetch_key, None)
+        if prefetched is not None:
+            return prefetched
 
         # Get more results from each retriever for better fusion
         retriever_top_k = top_k * 2
 
-        # IMPORTANT:
-        # These retrievers share the same AsyncSession. AsyncSession does not permit
-        # concurrent awaits that require DB IO on the same session/connection.
-        # Running these in parallel can raise:
-        # "This session is provisioning a new connection; concurrent operations are not permitted"
-        #
-        # So we run them sequentially.
-        chunk_results = await self.chunk_retriever.hybrid_search(
-            query_text=query_text,
-            top_k=retriever_top_k,
-            search_space_id=search_space_id,
-            document_type=document_type,
-            start_date=start_date,
-            end_date=end_date,
-        )
-        doc_results = await self.document_retriever.hybrid_search(
-            query_text=query_text,
-            top_k=retriever_top_k,
-            search_space_id=search_space_id,
-            document_type=document_type,
-            start_date=start_date,
-            end_date=end_date,
-        )
+        search_kwargs = {
+            "query_text": query_text,
+            "top_k": retriever_top_k,
+            "search_space_id": search_space_id,
+            "document_type": document_type,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        chunk_results, doc_results = await self._run_hybrid_retrievers(search_kwargs)
+        return self._fuse_rrf_results(chunk_results, doc_results, top_k)
+
+    async def prefetch_combined_rrf_searches(
+        self,
+        query_text: str,
+        search_space_id: int,
+        document_types: Sequence[str],
+        top_k: int = 20,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> None:
+        """
+        Run `_combined_rrf_search` for several document types in one batch.
+
+        Both retrievers rank every requested document type in a single
+        statement (window functions partitioned by `document_type`), so a
+        multi-connector search costs one chunk-level and one document-level
+        ranking query instead of one of each per type. The fused per-type
+        results are kept on this (request-scoped) service and handed out by
+        the next `_combined_rrf_search` call with the same arguments, which
+        keeps the connector-specific `search_*` formatting unchanged.
+
+        Args:
+            query_text: The search query text
+            search_space_id: The search space ID to search within
+            document_types: Document types to search (e.g., ["FILE", "SLACK_CONNECTOR"])
+            top_k: Number of results to return per document type
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+        """
+        document_types = list(dict.fromkeys(document_types))
+        if not document_types:
+            return
+
+        search_kwargs = {
+            "query_text": query_text,
+            "top_k": top_k * 2,
+            "search_space_id": search_space_id,
+            "document_types": document_types,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        chunk_results, doc_results = await self._run_hybrid_retrievers(
+            search_kwargs, method="hybrid_search_by_document_type"
+        )
+        for document_type in document_types:
+            prefetch_key = (
+                query_text,
+                search_space_id,
+                document_type,
+                top_k,
+                start_date,
+                end_date,
+            )
+            self._prefetched_rrf_results[prefetch_key] = self._fuse_rrf_results(
+                chunk_results.get(document_type, []),
+                doc_results.get(document_type, []),
+                top_k,
+            )
+
+    @staticmethod
+    def _fuse_rrf_results(
+        chunk_results: list[dict[str, Any]],
+        doc_results: list[dict[str, Any]],
+        top_k: int,
+    ) -> list[dict[str, Any]]:
+        """
+        Merge chunk-level and document-level results with Reciprocal Rank Fusion.
+
+        Returns:
+            Top-k document-grouped results, best RRF score first
+        """
+        # RRF constant
+        k = 60
 
         # Helper to extract document_id from our doc-grouped result
         def _doc_id(item: dict[str, Any]) -> int | None:
@@ -362,6 +453,97 @@ class ConnectorService:
 
         return combined_results
 
+    async def _run_hybrid_retrievers(
+        self, search_kwargs: dict[str, Any], method: str = "hybrid_search"
+    ) -> tuple[Any, Any]:
+        """
+        Run the chunk and document hybrid searches for one query.
+
+        `method` names the retriever method to call (`hybrid_search`, or
+        `hybrid_search_by_document_type` for a multi-type batch).
+
+        The query is embedded once per chat turn (off the event loop, through
+        the turn's query embeddings and the embedding cache) and the vector is
+        handed to both retrievers.
+
+        AsyncSession does not permit concurrent operations on one session, so
+        when `CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS` is enabled each retriever
+        gets its own short-lived session from `session_factory` and the two
+        searches run concurrently. Otherwise they run one after the other on
+        the request session.
+
+        Returns:
+            tuple: (chunk_results, doc_results)
+        """
+        query_embedding = await embed_query(search_kwargs["query_text"])
+        search_kwargs = {**search_kwargs, "query_embedding": query_embedding}
+
+        if not config.CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS:
+            chunk_results = await getattr(self.chunk_retriever, method)(**search_kwargs)
+            doc_results = await getattr(self.document_retriever, method)(
+                **search_kwargs
+            )
+            return chunk_results, doc_results
+
+        async def _search_isolated(retriever_cls) -> Any:
+            async with self.session_factory() as session:
+                return await getattr(retriever_cls(session), method)(**search_kwargs)
+
+        chunk_results, doc_results = await asyncio.gather(
+            _search_isolated(ChucksHybridSearchRetriever),
+            _search_isolated(DocumentHybridSearchRetriever),
+        )
+        return chunk_results, doc_results
+
+    async def search_connectors_concurrently(
+        self,
+        connectors: Sequence[str],
+        search_fn: Callable[[str], Awaitable[list[dict[str, Any]]]],
+        max_concurrency: int | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Fan out one search per connector with a per-request concurrency cap.
+
+        Connectors in `SHARED_SESSION_CONNECTORS` still use the request session,
+        so they are serialized behind `shared_session_lock`. Without isolated
+        retrieval sessions every connector uses the request session and the
+        searches run one at a time.
+
+        A connector whose search raises is logged and yields an empty list, so
+        one failing connector does not fail the whole request.
+
+        Args:
+            connectors: Connector types to search
+            search_fn: Coroutine function returning the documents for one connector
+            max_concurrency: Maximum connectors searched at once
+                (defaults to `CONNECTOR_SEARCH_MAX_CONCURRENCY`)
+
+        Returns:
+            Mapping of connector type to its documents, in the order of `connectors`
+        """
+        if config.CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS:
+            limit = max_concurrency or config.CONNECTOR_SEARCH_MAX_CONCURRENCY
+        else:
+            limit = 1
+        semaphore = asyncio.Semaphore(max(1, int(limit)))
+
+        async def _search_one(connector: str) -> list[dict[str, Any]]:
+            async with semaphore:
+                try:
+                    if connector in SHARED_SESSION_CONNECTORS:
+                        async with self.shared_session_lock:
+                            return await search_fn(connector)
+                    return await search_fn(connector)
+                except Exception as e:
+                    print(f"Error searching connector {connector}: {e}")
+                    return []
+
+        unique_connectors = list(dict.fromkeys(connectors))
+        results = await asyncio.gather(
+            *(_search_one(connector) for connector in unique_connectors)
+        )
+        return dict(zip(unique_connectors, results, strict=True))
+
     def _get_doc_url(self, metadata: dict[str, Any]) -> str:
         return (
             metadata.get("url")
@@ -2,26 +2,67 @@
 """
 Docling Document Processing Service for SurfSense
 SSL-safe implementation with pre-downloaded models
+
+PDF conversion is CPU-bound and can take minutes, so it never runs on the
+event loop. By default conversions run in a dedicated process pool
+(``DOCLING_PROCESS_WORKERS``, default 1) whose workers load the Docling models
+once. At most ``DOCLING_MAX_QUEUED_JOBS`` conversions wait for a worker;
+further callers wait for a queue slot. Each job is bounded by
+``DOCLING_CONVERSION_TIMEOUT_SECONDS``; a timed-out job's workers are
+terminated and the pool is restarted. Inside a daemonic process such as a
+Celery prefork worker (which may not start child processes), the pool loads the
+models once in-process and converts in a worker thread. With
+``DOCLING_PROCESS_WORKERS=0`` each service loads its own in-process converter.
+
+Large documents are summarized map-reduce style: chunk summaries run
+concurrently (``DOCLING_SUMMARY_CONCURRENCY``, default 4), then summaries
+are combined level by level in groups that fit the model context until a
+single summary remains.
 """
 
+import asyncio
 import logging
+import multiprocessing
 import os
 import ssl
+import threading
+import weakref
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+DOCLING_PROCESS_WORKERS = int(os.getenv("DOCLING_PROCESS_WORKERS", "1"))
+DOCLING_MAX_QUEUED_JOBS = int(os.getenv("DOCLING_MAX_QUEUED_JOBS", "8"))
+DOCLING_CONVERSION_TIMEOUT_SECONDS = float(
+    os.getenv("DOCLING_CONVERSION_TIMEOUT_SECONDS", "900")
+)
+DOCLING_SUMMARY_CONCURRENCY = int(os.getenv("DOCLING_SUMMARY_CONCURRENCY", "4"))
+
+# Large document threshold (100K characters ≈ 25K tokens). Also the budget of
+# one reduce call, so every combine prompt stays within the same context size
+# that direct summarization already uses.
+LARGE_DOCUMENT_THRESHOLD = 100_000
+
 
 class DoclingService:
     """Docling service for enhanced document processing with SSL fixes."""
 
-    def __init__(self):
-        """Initialize Docling service with SSL, model fixes, and GPU acceleration."""
+    def __init__(self, load_converter: bool = True):
+        """Initialize Docling service with SSL, model fixes, and GPU acceleration.
+
+        Args:
+            load_converter: Load the Docling models in this process. When False,
+                conversions are sent to the shared conversion process pool.
+        """
         self.converter = None
         self.use_gpu = False
-        self._configure_ssl_environment()
-        self._check_wsl2_gpu_support()
-        self._initialize_docling()
+        if load_converter:
+            self._configure_ssl_environment()
+            self._check_wsl2_gpu_support()
+            self._initialize_docling()
 
     def _configure_ssl_environment(self):
         """Configure SSL environment for secure model downloads."""
@@ -128,55 +169,50 @@ class DoclingService:
             logger.error(f"❌ Docling initialization failed: {e}")
             raise RuntimeError(f"Docling initialization failed: {e}") from e
 
+    def convert_to_markdown(self, file_path: str) -> str:
+        """Convert a file with the in-process converter (blocking)."""
+        if self.converter is None:
+            raise RuntimeError("Docling converter not initialized")
+
+        # Process document with local models
+        result = self.converter.convert(file_path)
+        return _extract_content(result)
+
     async def process_document(
         self, file_path: str, filename: str | None = None
     ) -> dict[str, Any]:
         """Process document with Docling using pre-downloaded models."""
-
-        if self.converter is None:
-            raise RuntimeError("Docling converter not initialized")
-
         try:
             logger.info(
                 f"🔄 Processing {filename} with Docling (using local models)..."
             )
 
-            # Process document with local models
-            result = self.converter.convert(file_path)
-
-            # Extract content using version-safe methods
-            content = None
-            if hasattr(result, "document") and result.document:
-                # Try different export methods (version compatibility)
-                if hasattr(result.document, "export_to_markdown"):
-                    content = result.document.export_to_markdown()
-                    logger.info("📄 Used export_to_markdown method")
-                elif hasattr(result.document, "to_markdown"):
-                    content = result.document.to_markdown()
-                    logger.info("📄 Used to_markdown method")
-                elif hasattr(result.document, "text"):
-                    content = result.document.text
-                    logger.info("📄 Used text property")
-                elif hasattr(result.document, "__str__"):
-                    content = str(result.document)
-                    logger.info("📄 Used string conversion")
-
-                if content:
-                    logger.info(
-                        f"✅ Docling SUCCESS - {filename}: {len(content)} chars (local models)"
+            if self.converter is not None:
+                # The worker thread cannot be interrupted; the timeout only
+                # frees the caller.
+                try:
+                    content = await asyncio.wait_for(
+                        asyncio.to_thread(self.convert_to_markdown, file_path),
+                        timeout=DOCLING_CONVERSION_TIMEOUT_SECONDS,
                     )
-
-                    return {
-                        "content": content,
-                        "full_text": content,
-                        "service_used": "docling",
-                        "status": "success",
-                        "processing_notes": "Processed with Docling using pre-downloaded models",
-                    }
-                else:
-                    raise ValueError("No content could be extracted from document")
+                except TimeoutError:
+                    raise TimeoutError(
+                        f"Conversion exceeded {DOCLING_CONVERSION_TIMEOUT_SECONDS:.0f}s"
+                    ) from None
             else:
-                raise ValueError("No document object returned by Docling")
+                content = await get_conversion_pool().convert(file_path)
+
+            logger.info(
+                f"✅ Docling SUCCESS - {filename}: {len(content)} chars (local models)"
+            )
+
+            return {
+                "content": content,
+                "full_text": content,
+                "service_used": "docling",
+                "status": "success",
+                "processing_notes": "Processed with Docling using pre-downloaded models",
+            }
 
         except Exception as e:
             logger.error(f"❌ Docling processing failed for {filename}: {e}")
@@ -190,7 +226,11 @@ class DoclingService:
         self, content: str, llm, document_title: str = "Document"
     ) -> str:
         """
-        Process large documents using chunked LLM summarization.
+        Process large documents using chunked map-reduce LLM summarization.
+
+        Chunk summaries run concurrently (bounded by DOCLING_SUMMARY_CONCURRENCY)
+        and are then combined hierarchically, so every combine prompt stays
+        within LARGE_DOCUMENT_THRESHOLD characters however large the input is.
 
         Args:
             content: The full document content
@@ -200,10 +240,7 @@ class DoclingService:
         Returns:
             Final summary of the document
         """
-        # Large document threshold (100K characters ≈ 25K tokens)
-        large_document_threshold = 100_000
-
-        if len(content) <= large_document_threshold:
+        if len(content) <= LARGE_DOCUMENT_THRESHOLD:
             # For smaller documents, use direct processing
             logger.info(
                 f"📄 Document size: {len(content)} chars - using direct processing"
@@ -221,7 +258,6 @@ class DoclingService:
         # Import chunker from config
         # Create LLM-optimized chunks (8K tokens max for safety)
         from chonkie import OverlapRefinery, RecursiveChunker
-        from langchain_core.prompts import PromptTemplate
 
         llm_chunker = RecursiveChunker(
             chunk_size=8000  # Conservative for most LLMs
@@ -236,14 +272,20 @@ class DoclingService:
         # First chunk the content, then apply overlap refinery
         initial_chunks = llm_chunker.chunk(content)
         chunks = overlap_refinery.refine(initial_chunks)
-        total_chunks = len(chunks)
 
-        logger.info(f"📄 Split into {total_chunks} chunks for LLM processing")
+        return await map_reduce_summarize(
+            [chunk.text for chunk in chunks],
+            summarize_chunk=lambda text, number, total: _summarize_chunk(
+                llm, text, number, total
+            ),
+            combine=lambda summaries, title: _combine_summaries(llm, summaries, title),
+            document_title=document_title,
+            concurrency=DOCLING_SUMMARY_CONCURRENCY,
+            reduce_budget_chars=LARGE_DOCUMENT_THRESHOLD,
+        )
+
 
-        # Template for chunk processing
-        chunk_template = PromptTemplate(
-            input_variables=["chunk", "chunk_number", "total_chunks"],
-            template="""<INSTRUCTIONS>
+_CHUNK_SUMMARY_TEMPLATE = """<INSTRUCTIONS>
 You are summarizing chunk {chunk_number} of {total_chunks} from a large document.
 
 Create a comprehensive summary of this document chunk. Focus on:
@@ -257,42 +299,9 @@ Chunk {chunk_number}/{total_chunks}:
 <document_chunk>
 {chunk}
 </document_chunk>
-</INSTRUCTIONS>""",
-        )
-
-        # Process each chunk individually
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks, 1):
-            try:
-                logger.info(
-                    f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk.text)} chars)"
-                )
-
-                chunk_chain = chunk_template | llm
-                chunk_result = await chunk_chain.ainvoke(
-                    {
-                        "chunk": chunk.text,
-                        "chunk_number": i,
-                        "total_chunks": total_chunks,
-                    }
-                )
+</INSTRUCTIONS>"""
 
-                chunk_summary = chunk_result.content
-                chunk_summaries.append(f"=== Section {i} ===\n{chunk_summary}")
-
-                logger.info(f"✅ Completed chunk {i}/{total_chunks}")
-
-            except Exception as e:
-                logger.error(f"❌ Failed to process chunk {i}/{total_chunks}: {e}")
-                chunk_summaries.append(f"=== Section {i} ===\n[Processing failed]")
-
-        # Combine summaries into final document summary
-        logger.info(f"🔄 Combining {len(chunk_summaries)} chunk summaries")
-
-        try:
-            combine_template = PromptTemplate(
-                input_variables=["summaries", "document_title"],
-                template="""<INSTRUCTIONS>
+_COMBINE_SUMMARIES_TEMPLATE = """<INSTRUCTIONS>
 You are combining multiple section summaries into a final comprehensive document summary.
 
 Create a unified, coherent summary from the following section summaries of "{document_title}".
@@ -305,31 +314,350 @@ Ensure:
 <section_summaries>
 {summaries}
 </section_summaries>
-</INSTRUCTIONS>""",
-            )
+</INSTRUCTIONS>"""
+
+
+async def _summarize_chunk(
+    llm, chunk: str, chunk_number: int, total_chunks: int
+) -> str:
+    from langchain_core.prompts import PromptTemplate
+
+    chunk_template = PromptTemplate(
+        input_variables=["chunk", "chunk_number", "total_chunks"],
+        template=_CHUNK_SUMMARY_TEMPLATE,
+    )
+    chunk_chain = chunk_template | llm
+    chunk_result = await chunk_chain.ainvoke(
+        {"chunk": chunk, "chunk_number": chunk_number, "total_chunks": total_chunks}
+    )
+    return chunk_result.content
+
+
+async def _combine_summaries(llm, summaries: str, document_title: str) -> str:
+    from langchain_core.prompts import PromptTemplate
+
+    combine_template = PromptTemplate(
+        input_variables=["summaries", "document_title"],
+        template=_COMBINE_SUMMARIES_TEMPLATE,
+    )
+    combine_chain = combine_template | llm
+    final_result = await combine_chain.ainvoke(
+        {"summaries": summaries, "document_title": document_title}
+    )
+    return final_result.content
+
+
+def _group_for_reduce(sections: list[str], budget_chars: int) -> list[list[str]]:
+    """Split sections, in order, into groups whose joined text fits the budget.
+
+    Every group holds at least two sections (when two remain), so each reduce
+    level strictly shrinks the number of sections.
+    """
+    groups: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+    for section in sections:
+        added = len(section) + (2 if current else 0)
+        if current and size + added > budget_chars and len(current) >= 2:
+            groups.append(current)
+            current, size = [], 0
+            added = len(section)
+        current.append(section)
+        size += added
+    if current:
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        else:
+            groups.append(current)
+    return groups
+
+
+async def map_reduce_summarize(
+    chunks: list[str],
+    *,
+    summarize_chunk: Callable[[str, int, int], Awaitable[str]],
+    combine: Callable[[str, str], Awaitable[str]],
+    document_title: str,
+    concurrency: int = DOCLING_SUMMARY_CONCURRENCY,
+    reduce_budget_chars: int = LARGE_DOCUMENT_THRESHOLD,
+) -> str:
+    """
+    Summarize chunks concurrently, then combine the summaries hierarchically.
+
+    A failed chunk is kept as a "[Processing failed]" section. A failed
+    intermediate combine keeps its sections concatenated, and a failed final
+    combine returns the concatenated sections, as the sequential version did.
+    """
+    total_chunks = len(chunks)
+    logger.info(f"📄 Split into {total_chunks} chunks for LLM processing")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _map(i: int, chunk: str) -> str:
+        async with semaphore:
+            try:
+                logger.info(
+                    f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk)} chars)"
+                )
+                chunk_summary = await summarize_chunk(chunk, i, total_chunks)
+                logger.info(f"✅ Completed chunk {i}/{total_chunks}")
+                return f"=== Section {i} ===\n{chunk_summary}"
+            except Exception as e:
+                logger.error(f"❌ Failed to process chunk {i}/{total_chunks}: {e}")
+                return f"=== Section {i} ===\n[Processing failed]"
 
-            combined_summaries = "\n\n".join(chunk_summaries)
-            combine_chain = combine_template | llm
+    sections = list(
+        await asyncio.gather(*(_map(i, chunk) for i, chunk in enumerate(chunks, 1)))
+    )
 
-            final_result = await combine_chain.ainvoke(
-                {"summaries": combined_summaries, "document_title": document_title}
-            )
+    # Reduce: combine groups that fit the budget until one prompt holds them all
+    level = 0
+    while len("\n\n".join(sections)) > reduce_budget_chars and len(sections) > 2:
+        level += 1
+        groups = _group_for_reduce(sections, reduce_budget_chars)
+        logger.info(
+            f"🔄 Reduce level {level}: combining {len(sections)} summaries "
+            f"in {len(groups)} groups"
+        )
 
-            final_summary = final_result.content
-            logger.info(
-                f"✅ Large document processing complete: {len(final_summary)} chars summary"
+        async def _reduce(index: int, group: list[str]) -> str:
+            joined = "\n\n".join(group)
+            async with semaphore:
+                try:
+                    combined = await combine(joined, f"{document_title} (part {index})")
+                except Exception as e:
+                    logger.error(f"❌ Failed to combine summary group {index}: {e}")
+                    return joined
+            return f"=== Part {index} ===\n{combined}"
+
+        sections = list(
+            await asyncio.gather(
+                *(_reduce(i, group) for i, group in enumerate(groups, 1))
             )
+        )
 
-            return final_summary
-
-        except Exception as e:
-            logger.error(f"❌ Failed to combine summaries: {e}")
-            # Fallback: return concatenated chunk summaries
-            fallback_summary = "\n\n".join(chunk_summaries)
-            logger.warning("⚠️ Using fallback combined summary")
-            return fallback_summary
+    # Combine summaries into final document summary
+    logger.info(f"🔄 Combining {len(sections)} chunk summaries")
+    combined_summaries = "\n\n".join(sections)
+    try:
+        final_summary = await combine(combined_summaries, document_title)
+        logger.info(
+            f"✅ Large document processing complete: {len(final_summary)} chars summary"
+        )
+        return final_summary
+    except Exception as e:
+        logger.error(f"❌ Failed to combine summaries: {e}")
+        # Fallback: return concatenated chunk summaries
+        logger.warning("⚠️ Using fallback combined summary")
+        return combined_summaries
+
+
+def _extract_content(result) -> str:
+    """Extract markdown from a Docling conversion result (version-safe)."""
+    content = None
+    if hasattr(result, "document") and result.document:
+        # Try different export methods (version compatibility)
+        if hasattr(result.document, "export_to_markdown"):
+            content = result.document.export_to_markdown()
+            logger.info("📄 Used export_to_markdown method")
+        elif hasattr(result.document, "to_markdown"):
+            content = result.document.to_markdown()
+            logger.info("📄 Used to_markdown method")
+        elif hasattr(result.document, "text"):
+            content = result.document.text
+            logger.info("📄 Used text property")
+        elif hasattr(result.document, "__str__"):
+            content = str(result.document)
+            logger.info("📄 Used string conversion")
+
+        if content:
+            return content
+        raise ValueError("No content could be extracted from document")
+    raise ValueError("No document object returned by Docling")
+
+
+# =============================================================================
+# Conversion process pool
+# =============================================================================
+
+# Set in each pool worker by _init_conversion_worker
+_worker_service: DoclingService | None = None
+
+
+def _init_conversion_worker() -> None:
+    global _worker_service
+    _worker_service = DoclingService(load_converter=True)
+
+
+def _convert_in_worker(file_path: str) -> str:
+    # Only the markdown crosses the process boundary.
+    return _worker_service.convert_to_markdown(file_path)
+
+
+def _can_start_workers() -> bool:
+    """Daemonic processes (e.g. Celery prefork children) cannot have children."""
+    return not multiprocessing.current_process().daemon
+
+
+class DoclingConversionPool:
+    """Process pool for Docling conversions with a bounded queue and timeouts."""
+
+    def __init__(
+        self,
+        max_workers: int = DOCLING_PROCESS_WORKERS,
+        max_queued: int = DOCLING_MAX_QUEUED_JOBS,
+        timeout: float = DOCLING_CONVERSION_TIMEOUT_SECONDS,
+        *,
+        initializer: Callable[[], None] | None = _init_conversion_worker,
+        convert_fn: Callable[[str], str] = _convert_in_worker,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self.timeout = timeout
+        self._initializer = initializer
+        self._convert_fn = convert_fn
+        self._executor: ProcessPoolExecutor | None = None
+        # One no-op job per worker; done once the initializer has loaded models
+        self._warmup: list[Future] = []
+        # In-process fallback for daemonic processes
+        self._local_lock = threading.Lock()
+        self._local_ready = False
+        # Queue slots per event loop (Celery tasks may each run their own loop)
+        self._slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self.completed = 0
+        self.timed_out = 0
+        self.restarts = 0
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the parent runs an event loop, threads and possibly CUDA,
+            # none of which survive fork safely.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self._initializer,
+            )
+            self._warmup = [
+                self._executor.submit(os.getpid) for _ in range(self.max_workers)
+            ]
+        return self._executor
+
+    async def _wait_until_ready(self) -> None:
+        """Wait for worker start-up so it does not count against job timeouts."""
+        warmup = self._warmup
+        # Shielded: the warm-up futures are shared by every waiting job, and
+        # cancelling one job must not cancel them for the others.
+        await asyncio.shield(asyncio.wait([asyncio.wrap_future(f) for f in warmup]))
+        for future in warmup:
+            if future.cancelled():
+                # Another job's timeout restarted the pool meanwhile
+                raise BrokenProcessPool("Conversion pool restarted during start-up")
+            future.result()
+
+    def _init_local(self) -> None:
+        with self._local_lock:
+            if not self._local_ready:
+                if self._initializer is not None:
+                    self._initializer()
+                self._local_ready = True
+
+    async def _convert_locally(self, file_path: str) -> str:
+        """Convert in a worker thread of this process (no pool workers)."""
+        # Model loading does not count against the job timeout
+        await asyncio.to_thread(self._init_local)
+        # The worker thread cannot be interrupted; the timeout only frees the
+        # caller.
+        try:
+            content = await asyncio.wait_for(
+                asyncio.to_thread(self._convert_fn, file_path), timeout=self.timeout
+            )
+        except TimeoutError:
+            self.timed_out += 1
+            raise TimeoutError(f"Conversion exceeded {self.timeout:g}s") from None
+        self.completed += 1
+        return content
+
+    def _restart(self) -> None:
+        """Terminate the workers (a stuck conversion cannot be cancelled)."""
+        executor, self._executor = self._executor, None
+        self._warmup = []
+        if executor is None:
+            return
+        self.restarts += 1
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    async def convert(self, file_path: str) -> str:
+        """Convert ``file_path`` to markdown in a pool worker.
+
+        Inside a daemonic process the conversion runs in a worker thread
+        instead, since such processes cannot start pool workers.
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            # Running jobs plus the ones allowed to wait for a worker
+            slots = asyncio.Semaphore(self.max_workers + self.max_queued)
+            self._slots[loop] = slots
+        async with slots:
+            if not _can_start_workers():
+                return await self._convert_locally(file_path)
+            retried = False
+            while True:
+                executor = self._ensure_executor()
+                try:
+                    await self._wait_until_ready()
+                    future = executor.submit(self._convert_fn, file_path)
+                    content = await asyncio.wait_for(
+                        asyncio.wrap_future(future), timeout=self.timeout
+                    )
+                except TimeoutError:
+                    self.timed_out += 1
+                    if self._executor is executor:
+                        self._restart()
+                    raise TimeoutError(
+                        f"Conversion exceeded {self.timeout:g}s"
+                    ) from None
+                except BrokenProcessPool:
+                    # Another job's timeout (or a crashed worker) took the
+                    # pool down; retry once on a fresh pool.
+                    if self._executor is executor:
+                        self._restart()
+                    if retried:
+                        raise
+                    retried = True
+                    continue
+                self.completed += 1
+                return content
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        self._warmup = []
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_conversion_pool: DoclingConversionPool | None = None
+
+
+def get_conversion_pool() -> DoclingConversionPool:
+    """Process-wide conversion pool, created on first use."""
+    global _conversion_pool
+    if _conversion_pool is None:
+        _conversion_pool = DoclingConversionPool()
+    return _conversion_pool
 
 
 def create_docling_service() -> DoclingService:
-    """Create a Docling service instance."""
-    return DoclingService()
+    """Create a Docling service instance.
+
+    The models are only loaded in this process when the conversion process
+    pool is disabled (DOCLING_PROCESS_WORKERS=0). Inside a daemonic process,
+    as Celery prefork workers are, the pool converts in-process itself and
+    loads the models once per process.
+    """
+    return DoclingService(load_converter=DOCLING_PROCESS_WORKERS <= 0)
@@ -18,7 +18,8 @@ from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
-from cachetools import TTLCache
+
+from app.services.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -57,19 +58,10 @@ class ElprisService:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
         self._client: httpx.AsyncClient | None = None
-        self._cache_lock = asyncio.Lock()
-        self._today_cache: TTLCache[str, list[dict[str, Any]]] = TTLCache(
-            maxsize=50, ttl=ELPRIS_CACHE_TTL_TODAY,
-        )
-        self._history_cache: TTLCache[str, list[dict[str, Any]]] = TTLCache(
-            maxsize=500, ttl=ELPRIS_CACHE_TTL_HISTORY,
+        self._cache = ResponseCache(
+            "elpris", default_ttl=ELPRIS_CACHE_TTL_HISTORY, max_entries=550
         )
 
-        from app.services.cache_control import register_service_cache
-
-        register_service_cache(self._today_cache)
-        register_service_cache(self._history_cache)
-
     # -- Lifecycle -----------------------------------------------------------
 
     def _get_client(self) -> httpx.AsyncClient:
@@ -108,26 +100,23 @@ class ElprisService:
         zone = self._validate_zone(zone)
         cache_key = f"{date_str}:{zone}"
 
-        # Check if today
+        # Today's prices can still change; past days are final
         today = datetime.now().strftime("%Y-%m-%d")
-        is_today = date_str == today
-        cache = self._today_cache if is_today else self._history_cache
-
-        async with self._cache_lock:
-            if cache_key in cache:
-                return list(cache[cache_key])
+        ttl = ELPRIS_CACHE_TTL_TODAY if date_str == today else ELPRIS_CACHE_TTL_HISTORY
 
         url = self._build_url(date_str, zone)
-        client = self._get_client()
-        response = await client.get(url)
-        response.raise_for_status()
-        data = response.json()
 
+        async def request(headers: dict[str, str]) -> httpx.Response:
+            return await self._get_client().get(url, headers=headers)
+
+        data, _ = await self._cache.get_or_fetch_http(
+            cache_key,
+            request,
+            lambda response: response.json(),
+            ttl=ttl,
+        )
         if not isinstance(data, list):
             return []
-
-        async with self._cache_lock:
-            cache[cache_key] = data
         return list(data)
 
     @staticmethod
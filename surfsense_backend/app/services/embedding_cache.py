@@ -0,0 +1,318 @@
+"""Persistent content-hash embedding cache.
+
+Re-indexing a connector re-embeds every chunk even when most chunk texts are
+unchanged, and tool / NEXUS embeddings are recomputed on every process start.
+This cache stores vectors keyed by ``(embedding model name, sha256(text))``
+in a local SQLite file opened with memory-mapped I/O, so it survives restarts
+and is shared by every process that opens the same file.  Celery workers
+only share it with the API when they see the same ``EMBEDDING_CACHE_PATH``:
+run them in the backend container, or mount the same volume (the
+``celery_worker`` template in docker-compose.yml mounts ``shared_temp:/tmp``).
+
+* Lookups are reads: ``last_used`` is only refreshed for hits whose stamp is
+  older than ``_LAST_USED_REFRESH_SECONDS``, so concurrent readers rarely
+  take the SQLite write lock.
+
+* Entries are evicted least-recently-used once ``EMBEDDING_CACHE_MAX_ENTRIES``
+  is exceeded.
+* Entries written by another embedding model are purged the first time the
+  cache is opened with a new ``EMBEDDING_MODEL``; the model name is part of
+  the key, so stale vectors are never returned even before that purge.
+* Hit / miss / write / eviction counters are kept per process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.services.cache_control import is_cache_disabled
+
+logger = logging.getLogger(__name__)
+
+_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+_EVICTION_FRACTION = 0.1
+_SQLITE_MAX_VARIABLES = 900
+# LRU order only needs to be approximate
+_LAST_USED_REFRESH_SECONDS = 600.0
+
+
+def embedding_cache_key(text: str) -> str:
+    """Content hash used as the per-model cache key."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def as_cached_vector(vector: Any) -> np.ndarray:
+    """The form vectors are stored and returned in: flat ``float32`` arrays."""
+    return np.asarray(vector, dtype=np.float32).ravel()
+
+
+class EmbeddingCache:
+    """SQLite-backed ``(model, text hash) -> float32 vector`` store."""
+
+    def __init__(self, path: str | Path, *, max_entries: int = 500_000):
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "last_used_refreshes": 0,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used "
+                "ON embeddings (last_used)"
+            )
+        self._approx_entries = self._count()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={_MMAP_SIZE_BYTES}")
+            self._local.connection = connection
+        return connection
+
+    def _count(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return int(row[0] if row else 0)
+
+    def get_many(self, model: str, text_hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        """Return cached vectors for the given hashes (misses are omitted)."""
+        found: dict[str, np.ndarray] = {}
+        stale: list[str] = []
+        now = time.time()
+        unique_hashes = list(dict.fromkeys(text_hashes))
+        connection = self._connection()
+        for start in range(0, len(unique_hashes), _SQLITE_MAX_VARIABLES):
+            chunk = unique_hashes[start : start + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT text_hash, vector, last_used FROM embeddings "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                (model, *chunk),
+            ).fetchall()
+            for text_hash, blob, last_used in rows:
+                found[text_hash] = np.frombuffer(blob, dtype=np.float32).copy()
+                if now - last_used >= _LAST_USED_REFRESH_SECONDS:
+                    stale.append(text_hash)
+        if stale:
+            with connection:
+                connection.executemany(
+                    "UPDATE embeddings SET last_used = ? "
+                    "WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in stale],
+                )
+        with self._lock:
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(unique_hashes) - len(found)
+            self._stats["last_used_refreshes"] += len(stale)
+        return found
+
+    def put_many(self, model: str, vectors: dict[str, Any]) -> None:
+        """Store vectors keyed by text hash for *model*."""
+        if not vectors:
+            return
+        now = time.time()
+        rows = []
+        for text_hash, vector in vectors.items():
+            array = as_cached_vector(vector)
+            rows.append((model, text_hash, int(array.size), array.tobytes(), now))
+        connection = self._connection()
+        with connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, text_hash, dimension, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            written = connection.total_changes - before
+        with self._lock:
+            self._stats["writes"] += written
+            self._approx_entries += written
+            needs_eviction = self._approx_entries > self.max_entries
+        if needs_eviction:
+            self._evict()
+
+    def _evict(self) -> None:
+        connection = self._connection()
+        total = self._count()
+        target = int(self.max_entries * (1.0 - _EVICTION_FRACTION))
+        excess = total - target
+        if total > self.max_entries and excess > 0:
+            with connection:
+                connection.execute(
+                    "DELETE FROM embeddings WHERE (model, text_hash) IN ("
+                    "SELECT model, text_hash FROM embeddings "
+                    "ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+            with self._lock:
+                self._stats["evictions"] += excess
+            total -= excess
+        with self._lock:
+            self._approx_entries = total
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Delete entries for *model*, or every entry when *model* is None."""
+        connection = self._connection()
+        with connection:
+            if model is None:
+                cursor = connection.execute("DELETE FROM embeddings")
+            else:
+                cursor = connection.execute(
+                    "DELETE FROM embeddings WHERE model = ?", (model,)
+                )
+        removed = int(cursor.rowcount or 0)
+        with self._lock:
+            self._approx_entries = max(0, self._approx_entries - removed)
+        return removed
+
+    def invalidate_other_models(self, model: str) -> int:
+        """Delete entries written by any model other than *model*."""
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM embeddings WHERE model != ?", (model,)
+            )
+        removed = int(cursor.rowcount or 0)
+        if removed:
+            logger.info(
+                "Embedding cache: purged %d vectors from previous models", removed
+            )
+        with self._lock:
+            self._approx_entries = max(0, self._approx_entries - removed)
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["entries"] = self._approx_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["path"] = str(self.path)
+        return stats
+
+
+_cache: EmbeddingCache | None = None
+_cache_failed = False
+_cache_init_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide cache, or None when disabled or unavailable."""
+    global _cache, _cache_failed
+    if _cache is not None or _cache_failed:
+        return _cache
+    from app.config import config
+
+    if not getattr(config, "EMBEDDING_CACHE_ENABLED", False):
+        return None
+    with _cache_init_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                cache = EmbeddingCache(
+                    config.EMBEDDING_CACHE_PATH,
+                    max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+                )
+                cache.invalidate_other_models(_current_model_name())
+                _cache = cache
+            except Exception as exc:
+                logger.warning("Embedding cache unavailable: %s", exc)
+                _cache_failed = True
+    return _cache
+
+
+def _current_model_name() -> str:
+    from app.config import config
+
+    return str(getattr(config, "EMBEDDING_MODEL", None) or "unknown")
+
+
+def embed_with_cache(
+    texts: Sequence[str],
+    embed_batch: Callable[[list[str]], Sequence[Any]],
+) -> list[Any]:
+    """Embed *texts*, serving repeats from the persistent cache.
+
+    Only texts that miss the cache are passed to *embed_batch* (in one call),
+    and their vectors are written back.  Every vector is returned as a flat
+    ``float32`` array, whether it was cached or computed.  Falls through to
+    *embed_batch* for every text when the cache is disabled or unavailable.
+    """
+    texts = list(texts)
+    cache = None if is_cache_disabled() else get_embedding_cache()
+    if cache is None or not texts:
+        return list(embed_batch(texts)) if texts else []
+    model = _current_model_name()
+    keys = [embedding_cache_key(text) for text in texts]
+    try:
+        cached = cache.get_many(model, keys)
+    except Exception as exc:
+        logger.warning("Embedding cache lookup failed: %s", exc)
+        cached = {}
+    missing: dict[str, str] = {}
+    for key, text in zip(keys, texts, strict=True):
+        if key not in cached:
+            missing.setdefault(key, text)
+    if missing:
+        computed = list(embed_batch(list(missing.values())))
+        if len(computed) != len(missing):
+            raise ValueError(
+                f"Embedding model returned {len(computed)} vectors "
+                f"for a batch of {len(missing)} texts"
+            )
+        fresh = {
+            key: as_cached_vector(vector)
+            for key, vector in zip(missing, computed, strict=True)
+        }
+        try:
+            cache.put_many(model, fresh)
+        except Exception as exc:
+            logger.warning("Embedding cache write failed: %s", exc)
+        cached.update(fresh)
+    return [cached[key] for key in keys]
+
+
+def get_embedding_cache_stats() -> dict[str, Any]:
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "model": _current_model_name(), **cache.stats()}
+
+
+def clear_embedding_cache() -> int:
+    """Remove every cached vector. Returns the number of deleted entries."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return 0
+    return cache.invalidate()
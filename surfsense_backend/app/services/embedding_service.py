@@ -0,0 +1,128 @@
+"""Batched, off-loop embedding of document texts.
+
+Connector indexers and file processors run inside ``async`` tasks, but the
+embedding model is synchronous.  Calling ``embed`` once per chunk on the
+event loop blocks it for the whole document and gets no batching.
+
+This module collects texts into ``embed_batch`` calls of
+``config.EMBEDDING_BATCH_SIZE`` and runs them on a bounded thread pool
+(``config.EMBEDDING_MAX_WORKERS``) so the event loop stays responsive.
+Identical texts within one request are embedded once (keyed by content hash),
+and texts embedded before are served from the persistent embedding cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.config import config
+from app.services.embedding_cache import embed_with_cache, embedding_cache_key
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, int(config.EMBEDDING_MAX_WORKERS)),
+                thread_name_prefix="embedding",
+            )
+        return _executor
+
+
+def shutdown_embedding_executor() -> None:
+    """Stop the embedding worker pool (a new one is created on next use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _embed_batch_uncached(texts: list[str]) -> list[Any]:
+    model = config.embedding_model_instance
+    embed_batch = getattr(model, "embed_batch", None)
+    if embed_batch is None:
+        return [model.embed(text) for text in texts]
+    return list(embed_batch(texts))
+
+
+def embed_texts_sync(texts: list[str]) -> list[Any]:
+    """Embed *texts* with one model call, falling back to per-text ``embed``.
+
+    Texts already in the persistent embedding cache are not re-embedded.
+    """
+    return embed_with_cache(texts, _embed_batch_uncached)
+
+
+async def embed_texts(
+    texts: list[str],
+    *,
+    batch_size: int | None = None,
+) -> list[Any]:
+    """Embed *texts* in batches on the embedding worker pool.
+
+    Args:
+        texts: Texts to embed. Duplicates are embedded once.
+        batch_size: Texts per ``embed_batch`` call
+            (defaults to ``config.EMBEDDING_BATCH_SIZE``).
+
+    Returns:
+        One embedding per input text, in input order.
+    """
+    if not texts:
+        return []
+    text_hashes = [embedding_cache_key(text) for text in texts]
+    unique_texts: dict[str, str] = {}
+    for text_hash, text in zip(text_hashes, texts, strict=True):
+        unique_texts.setdefault(text_hash, text)
+
+    size = max(1, int(batch_size or config.EMBEDDING_BATCH_SIZE))
+    unique_hashes = list(unique_texts)
+    batches = [
+        unique_hashes[start : start + size]
+        for start in range(0, len(unique_hashes), size)
+    ]
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor,
+                embed_texts_sync,
+                [unique_texts[text_hash] for text_hash in batch],
+            )
+            for batch in batches
+        )
+    )
+
+    embedding_by_hash: dict[str, Any] = {}
+    for batch, embeddings in zip(batches, results, strict=True):
+        if len(embeddings) != len(batch):
+            raise ValueError(
+                f"Embedding model returned {len(embeddings)} vectors "
+                f"for a batch of {len(batch)} texts"
+            )
+        embedding_by_hash.update(zip(batch, embeddings, strict=True))
+    if len(unique_hashes) < len(texts):
+        logger.debug(
+            "Embedded %d unique texts for %d inputs",
+            len(unique_hashes),
+            len(texts),
+        )
+    return [embedding_by_hash[text_hash] for text_hash in text_hashes]
+
+
+async def embed_text(text: str) -> Any:
+    """Embed a single text on the embedding worker pool."""
+    embeddings = await embed_texts([text])
+    return embeddings[0]
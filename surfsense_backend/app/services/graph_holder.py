@@ -9,6 +9,11 @@ from the new registry snapshot before being returned.
 This is intentionally separate from ``RegistryCache`` because the
 compiled graph is an expensive artifact that should only be rebuilt
 when the registry actually changes.
+
+Callers whose graph depends on more than the registry (for example the
+chat supervisor, whose tools and prompts are per search space) pass a
+hashable ``key``; the holder then keeps one graph per key, bounded by an
+LRU, and drops all of them when the registry version moves.
 """
 
 from __future__ import annotations
@@ -16,26 +21,34 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections import OrderedDict
+from collections.abc import Hashable
 from typing import Any
 
 from app.services.graph_registry_service import GraphRegistry, RegistryCache
 
 logger = logging.getLogger(__name__)
 
+_MAX_GRAPHS = 32
+
 
 class GraphHolder:
-    """Process-level singleton for the compiled LangGraph graph.
+    """Process-level singleton for compiled LangGraph graphs.
 
-    The holder stores a ``(graph, registry_version)`` pair.  When a
-    caller requests the graph and the registry has been bumped, the
-    holder recompiles from the latest ``GraphRegistry`` snapshot.
+    The holder stores one graph per key for the registry version it was
+    built from.  When a caller requests a graph and the registry has been
+    bumped, every held graph is discarded and the requested one is
+    recompiled from the latest ``GraphRegistry`` snapshot.
     """
 
-    _graph: Any | None = None
+    _graphs: OrderedDict[Hashable, Any] = OrderedDict()
     _registry_version: int = 0
     _built_at: float = 0.0
     _lock: asyncio.Lock | None = None
     _build_fn: Any | None = None
+    _hits: int = 0
+    _builds: int = 0
+    _last_build_seconds: float = 0.0
 
     @classmethod
     def _get_lock(cls) -> asyncio.Lock:
@@ -49,21 +62,33 @@ class GraphHolder:
 
         The function must accept ``(registry: GraphRegistry, **kwargs)``
         and return a compiled graph object.  It is called whenever the
-        registry version changes.
+        registry version changes or a key has no graph yet.
         """
         cls._build_fn = fn
         logger.info("GraphHolder build function registered")
 
+    @classmethod
+    def _lookup(cls, key: Hashable, version: int) -> Any | None:
+        if version != cls._registry_version:
+            return None
+        graph = cls._graphs.get(key)
+        if graph is not None:
+            cls._graphs.move_to_end(key)
+        return graph
+
     @classmethod
     async def get(
         cls,
         session: Any,
+        key: Hashable = None,
         **build_kwargs: Any,
     ) -> Any:
-        """Return the current compiled graph, rebuilding if needed.
+        """Return the compiled graph for ``key``, rebuilding if needed.
 
         Args:
             session: SQLAlchemy ``AsyncSession`` for registry lookup.
+            key: Hashable cache key for graphs that depend on more than
+                the registry.  ``None`` holds a single process-wide graph.
             **build_kwargs: Extra keyword arguments forwarded to the
                 build function (LLM, dependencies, etc.).
 
@@ -74,20 +99,25 @@ class GraphHolder:
             RuntimeError: If no build function has been registered.
         """
         registry = await RegistryCache.get(session)
-        if cls._graph is not None and registry.version == cls._registry_version:
-            return cls._graph
+        graph = cls._lookup(key, registry.version)
+        if graph is not None:
+            cls._hits += 1
+            return graph
 
         async with cls._get_lock():
             # Double-check after lock acquisition
             registry = await RegistryCache.get(session)
-            if cls._graph is not None and registry.version == cls._registry_version:
-                return cls._graph
-            return await cls._rebuild(registry, **build_kwargs)
+            graph = cls._lookup(key, registry.version)
+            if graph is not None:
+                cls._hits += 1
+                return graph
+            return await cls._rebuild(registry, key, **build_kwargs)
 
     @classmethod
     async def _rebuild(
         cls,
         registry: GraphRegistry,
+        key: Hashable = None,
         **build_kwargs: Any,
     ) -> Any:
         """Compile a new graph from the given registry snapshot."""
@@ -100,9 +130,16 @@ class GraphHolder:
         start = time.monotonic()
         graph = await cls._build_fn(registry=registry, **build_kwargs)
         elapsed = time.monotonic() - start
-        cls._graph = graph
-        cls._registry_version = registry.version
+        if registry.version != cls._registry_version:
+            cls._graphs.clear()
+            cls._registry_version = registry.version
+        cls._graphs[key] = graph
+        cls._graphs.move_to_end(key)
+        while len(cls._graphs) > _MAX_GRAPHS:
+            cls._graphs.popitem(last=False)
         cls._built_at = time.monotonic()
+        cls._builds += 1
+        cls._last_build_seconds = elapsed
         logger.info(
             "GraphHolder rebuilt graph in %.2fs (version=%d)",
             elapsed,
@@ -116,16 +153,29 @@ class GraphHolder:
 
         Typically called from the PG LISTEN callback.
         """
-        cls._graph = None
+        cls._graphs.clear()
         cls._registry_version = 0
         logger.info("GraphHolder invalidated — will rebuild on next access")
 
     @classmethod
     def current_version(cls) -> int:
-        """Return the registry version of the currently held graph."""
+        """Return the registry version of the currently held graphs."""
         return cls._registry_version
 
     @classmethod
     def is_ready(cls) -> bool:
         """Return True if a compiled graph is available."""
-        return cls._graph is not None
+        return bool(cls._graphs)
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        """Return hit/build counters for the admin cache endpoint."""
+        lookups = cls._hits + cls._builds
+        return {
+            "graphs": len(cls._graphs),
+            "registry_version": cls._registry_version,
+            "hits": cls._hits,
+            "builds": cls._builds,
+            "hit_rate": round(cls._hits / lookups, 4) if lookups else 0.0,
+            "last_build_seconds": round(cls._last_build_seconds, 3),
+        }
@@ -0,0 +1,248 @@
+"""Process-wide pooled HTTP clients, one per upstream origin.
+
+Services and connectors that used to open an ``httpx.AsyncClient`` (or call
+``requests``) per request paid a TCP + TLS handshake on every call; a single
+SMHI observation lookup made three.  :func:`get_http_client` instead returns
+one long-lived client per ``scheme://host[:port]``:
+
+* HTTP/2 is negotiated when ``HTTP_CLIENT_HTTP2`` is on and ``h2`` is
+  installed, otherwise HTTP/1.1 keep-alive is used.
+* Keep-alive limits and default timeouts are shared (``HTTP_CLIENT_*``).
+  Callers can still pass ``timeout=`` per request.
+* The transport retries failed connects (``HTTP_CLIENT_CONNECT_RETRIES``).
+  Status-based retries (429 backoff) stay in the services, which know each
+  API's rules.
+* Async clients are bound to the event loop that created them, so each loop
+  (API process, Celery worker runtime, ``asyncio.run`` in scripts) gets its
+  own set.  :func:`get_sync_http_client` serves blocking code such as the
+  Jira, Confluence, ClickUp, BookStack and Luma connectors, which run on
+  worker threads.
+
+Per-origin request, connection and TLS handshake counters are reported by
+:func:`http_client_stats`; ``connections_reused`` is the number of requests
+that did not need a new connection.  Clients are closed from the app
+lifespan and the Celery worker shutdown via :func:`close_http_clients`;
+tasks that still run on a throwaway loop close that loop's clients with
+:func:`close_loop_http_clients`.  Redirects are followed.
+
+The clients never store cookies: they are shared by every user of an
+origin, so a session cookie one user's request received (Jira or
+Confluence ``JSESSIONID``, BookStack's session) must not be sent with
+another user's credentials.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.cookiejar
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "TRUE").upper() == "TRUE"
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "20"))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "10"))
+HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "60"))
+HTTP_CLIENT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "30"))
+HTTP_CLIENT_CONNECT_TIMEOUT = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT", "10"))
+HTTP_CLIENT_CONNECT_RETRIES = int(os.getenv("HTTP_CLIENT_CONNECT_RETRIES", "2"))
+
+_HTTP2_ENABLED = HTTP_CLIENT_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+class HttpClientStats:
+    """Request and connection counters for one upstream origin."""
+
+    FIELDS = ("requests", "connections_opened", "tls_handshakes")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            self._counts[field] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        requests = counts["requests"]
+        reused = max(requests - counts["connections_opened"], 0)
+        counts["connections_reused"] = reused
+        counts["reuse_ratio"] = round(reused / requests, 4) if requests else 0.0
+        return counts
+
+
+_stats: dict[str, HttpClientStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _stats_for(origin: str) -> HttpClientStats:
+    with _stats_lock:
+        stats = _stats.get(origin)
+        if stats is None:
+            stats = _stats[origin] = HttpClientStats()
+        return stats
+
+
+def http_client_stats() -> dict[str, dict[str, Any]]:
+    """Counters per upstream origin, for the admin cache endpoint."""
+    with _stats_lock:
+        items = list(_stats.items())
+    return {origin: stats.snapshot() for origin, stats in sorted(items)}
+
+
+def _origin(url: str | httpx.URL) -> str:
+    parsed = httpx.URL(url)
+    if not parsed.host:
+        raise ValueError(f"Absolute URL required for a pooled HTTP client: {url!r}")
+    origin = f"{parsed.scheme}://{parsed.host}"
+    if parsed.port is not None:
+        origin += f":{parsed.port}"
+    return origin
+
+
+def _count_event(stats: HttpClientStats, event: str) -> None:
+    # httpcore trace events, see httpcore._async.connection
+    if event == "connection.connect_tcp.complete":
+        stats.incr("connections_opened")
+    elif event == "connection.start_tls.complete":
+        stats.incr("tls_handshakes")
+
+
+def _transport_options() -> dict[str, Any]:
+    return {
+        "http2": _HTTP2_ENABLED,
+        "limits": httpx.Limits(
+            max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+        "retries": HTTP_CLIENT_CONNECT_RETRIES,
+    }
+
+
+def _cookie_jar() -> http.cookiejar.CookieJar:
+    """A jar whose policy accepts no cookies, so responses cannot set any."""
+    return http.cookiejar.CookieJar(
+        policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+    )
+
+
+_DEFAULT_TIMEOUT = httpx.Timeout(
+    HTTP_CLIENT_TIMEOUT, connect=HTTP_CLIENT_CONNECT_TIMEOUT
+)
+
+
+def _build_async_client(origin: str) -> httpx.AsyncClient:
+    stats = _stats_for(origin)
+
+    async def on_request(request: httpx.Request) -> None:
+        stats.incr("requests")
+        previous = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            _count_event(stats, event)
+            if previous is not None:
+                await previous(event, info)
+
+        request.extensions["trace"] = trace
+
+    # Redirects are followed like the ``requests`` calls these clients replaced
+    return httpx.AsyncClient(
+        timeout=_DEFAULT_TIMEOUT,
+        follow_redirects=True,
+        cookies=_cookie_jar(),
+        transport=httpx.AsyncHTTPTransport(**_transport_options()),
+        event_hooks={"request": [on_request]},
+    )
+
+
+def _build_sync_client(origin: str) -> httpx.Client:
+    stats = _stats_for(origin)
+
+    def on_request(request: httpx.Request) -> None:
+        stats.incr("requests")
+        previous = request.extensions.get("trace")
+
+        def trace(event: str, info: dict[str, Any]) -> None:
+            _count_event(stats, event)
+            if previous is not None:
+                previous(event, info)
+
+        request.extensions["trace"] = trace
+
+    return httpx.Client(
+        timeout=_DEFAULT_TIMEOUT,
+        follow_redirects=True,
+        cookies=_cookie_jar(),
+        transport=httpx.HTTPTransport(**_transport_options()),
+        event_hooks={"request": [on_request]},
+    )
+
+
+# Async clients hold connections bound to the loop that created them
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+_sync_clients: dict[str, httpx.Client] = {}
+_sync_lock = threading.Lock()
+
+
+def get_http_client(url: str | httpx.URL) -> httpx.AsyncClient:
+    """Return the shared async client for the origin of ``url``.
+
+    Must be called from a coroutine.  The client is owned by the registry:
+    do not close it or use it as a context manager.
+    """
+    origin = _origin(url)
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(origin)
+    if client is None or client.is_closed:
+        client = clients[origin] = _build_async_client(origin)
+    return client
+
+
+def get_sync_http_client(url: str | httpx.URL) -> httpx.Client:
+    """Return the shared blocking client for the origin of ``url`` (thread-safe)."""
+    origin = _origin(url)
+    with _sync_lock:
+        client = _sync_clients.get(origin)
+        if client is None or client.is_closed:
+            client = _sync_clients[origin] = _build_sync_client(origin)
+        return client
+
+
+async def close_loop_http_clients() -> None:
+    """Close the async clients of the running loop.
+
+    Code that runs coroutines on a short-lived loop (``new_event_loop`` per
+    Celery task) must await this before closing the loop.
+    """
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for origin, client in clients.items():
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.warning("Error closing HTTP client for %s: %s", origin, exc)
+
+
+async def close_http_clients() -> None:
+    """Close the async clients of the running loop and all blocking clients."""
+    await close_loop_http_clients()
+
+    with _sync_lock:
+        sync_clients = list(_sync_clients.items())
+        _sync_clients.clear()
+    for origin, client in sync_clients:
+        try:
+            client.close()
+        except Exception as exc:
+            logger.warning("Error closing HTTP client for %s: %s", origin, exc)
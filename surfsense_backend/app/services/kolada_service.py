@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import re
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
+from app.services.cache_control import register_service_cache
+from app.services.http_clients import get_http_client
+from app.services.response_cache import ResponseCache, build_cache_key
+
 KOLADA_BASE_URL = "https://api.kolada.se/v3"
+# Kolada publishes yearly/monthly statistics; values change rarely
+KOLADA_CACHE_TTL = int(os.getenv("KOLADA_CACHE_TTL", "3600"))
 
 _DIACRITIC_MAP = str.maketrans(
     {
@@ -128,10 +135,19 @@ class KoladaService:
         self.max_retries = max_retries
         self._kpi_cache: dict[str, KoladaKpi] = {}
         self._municipality_cache: dict[str, KoladaMunicipality] = {}
+        self._cache = ResponseCache("kolada", default_ttl=KOLADA_CACHE_TTL)
+
+        # Flushes the parsed KPI / municipality objects; the response cache
+        # registers itself
+        register_service_cache(self)
+
+    def clear(self) -> None:
+        self._kpi_cache.clear()
+        self._municipality_cache.clear()
 
     async def _get_json(self, endpoint: str, params: dict[str, Any] | None = None) -> Any:
         """
-        Make GET request with exponential backoff on HTTP 429.
+        Make a cached GET request with exponential backoff on HTTP 429.
         
         Args:
             endpoint: API endpoint (e.g., "/kpi")
@@ -144,24 +160,40 @@ class KoladaService:
             httpx.HTTPStatusError: On non-retryable errors
         """
         url = f"{self.base_url}{endpoint}"
+        data, _ = await self._cache.get_or_fetch_http(
+            build_cache_key(url, params),
+            lambda validators: self._get_with_retry(url, params, validators),
+            lambda response: response.json(),
+        )
+        return data
+
+    async def _get_with_retry(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str],
+    ) -> httpx.Response:
         # Track last response for error reporting if all retries are exhausted
         last_response = None
         
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url, params=params)
-                    last_response = response
-                    
-                    if response.status_code == 429:
-                        # Rate limited - exponential backoff
-                        if attempt < self.max_retries - 1:
-                            wait_time = 2 ** attempt
-                            await asyncio.sleep(wait_time)
-                            continue
-                    
-                    response.raise_for_status()
-                    return response.json()
+                response = await get_http_client(url).get(
+                    url, params=params, headers=headers, timeout=self.timeout
+                )
+                last_response = response
+                
+                if response.status_code == 429:
+                    # Rate limited - exponential backoff
+                    if attempt < self.max_retries - 1:
+                        wait_time = 2 ** attempt
+                        await asyncio.sleep(wait_time)
+                        continue
+                
+                if response.status_code == 304:
+                    return response
+                response.raise_for_status()
+                return response
             except httpx.HTTPStatusError as e:
                 last_response = e.response
                 if e.response.status_code == 429 and attempt < self.max_retries - 1:
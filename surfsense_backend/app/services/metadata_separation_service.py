@@ -25,6 +25,7 @@ from app.services.metadata_audit_service import (
     generate_intent_metadata_suggestions_from_annotations,
     run_layered_metadata_audit,
 )
+from app.services.metadata_separation_space import SeparationSpace
 from app.services.tool_evaluation_service import generate_tool_metadata_suggestions
 
 _TOKEN_RE = re.compile(r"[a-z0-9åäö]{3,}", re.IGNORECASE)
@@ -166,24 +167,6 @@ def _normalize_vector(value: Any) -> list[float] | None:
         return None
 
 
-def _mean_vector(vectors: list[list[float] | None]) -> list[float] | None:
-    usable = [vector for vector in vectors if vector]
-    if not usable:
-        return None
-    dim = len(usable[0])
-    if dim <= 0:
-        return None
-    for vector in usable:
-        if len(vector) != dim:
-            return None
-    sums = [0.0] * dim
-    for vector in usable:
-        for index, value in enumerate(vector):
-            sums[index] += float(value)
-    count = float(len(usable))
-    return [value / count for value in sums]
-
-
 def _cosine_similarity(left: list[float] | None, right: list[float] | None) -> float:
     if not left or not right or len(left) != len(right):
         return 0.0
@@ -217,6 +200,31 @@ def _embed_text(text: str) -> list[float] | None:
     return vector
 
 
+def _embed_texts(texts: list[str]) -> list[list[float] | None]:
+    """Batch counterpart of ``_embed_text``: one ``embed_batch`` call for all misses."""
+    normalized = [_normalize_text(text) for text in texts]
+    keys = [
+        hashlib.sha1(text.encode("utf-8")).hexdigest() if text else ""
+        for text in normalized
+    ]
+    missing: dict[str, str] = {}
+    for key, text in zip(keys, normalized, strict=True):
+        if key and key not in _EMBED_CACHE:
+            missing.setdefault(key, text)
+    if missing:
+        try:
+            from app.services.embedding_service import embed_texts_sync
+
+            vectors = embed_texts_sync(list(missing.values()))
+        except Exception:
+            vectors = [None] * len(missing)
+        for key, vector in zip(missing, vectors, strict=True):
+            normalized_vector = _normalize_vector(vector)
+            if normalized_vector is not None:
+                _EMBED_CACHE[key] = normalized_vector
+    return [_EMBED_CACHE.get(key) if key else None for key in keys]
+
+
 def _intent_text(payload: dict[str, Any]) -> str:
     return " ".join(
         [
@@ -835,61 +843,16 @@ def _fused_tool_similarity(
     return ((sem * sem_w) + (struct * struct_w)) / total
 
 
-def _similarity_matrix(
-    *,
-    layer: str,
-    labels: list[str],
-    intent_map: dict[str, dict[str, Any]],
-    agent_map: dict[str, dict[str, Any]],
-    tool_map: dict[str, dict[str, Any]],
-    tool_struct_map: dict[str, list[float] | None],
-    semantic_weight: float,
-    structural_weight: float,
-) -> list[list[float]]:
-    matrix: list[list[float]] = []
-    for left_id in labels:
-        row: list[float] = []
-        for right_id in labels:
-            if layer == "intent":
-                left_vec = _embed_text(_intent_text(intent_map.get(left_id, {})))
-                right_vec = _embed_text(_intent_text(intent_map.get(right_id, {})))
-                row.append(round(_cosine_similarity(left_vec, right_vec), 4))
-            elif layer == "agent":
-                left_vec = _embed_text(_agent_text(agent_map.get(left_id, {})))
-                right_vec = _embed_text(_agent_text(agent_map.get(right_id, {})))
-                row.append(round(_cosine_similarity(left_vec, right_vec), 4))
-            else:
-                left_sem = _embed_text(_tool_semantic_text(tool_map.get(left_id, {})))
-                right_sem = _embed_text(_tool_semantic_text(tool_map.get(right_id, {})))
-                left_struct = tool_struct_map.get(left_id)
-                right_struct = tool_struct_map.get(right_id)
-                row.append(
-                    round(
-                        _fused_tool_similarity(
-                            left_sem=left_sem,
-                            left_struct=left_struct,
-                            right_sem=right_sem,
-                            right_struct=right_struct,
-                            semantic_weight=semantic_weight,
-                            structural_weight=structural_weight,
-                        ),
-                        4,
-                    )
-                )
-        matrix.append(row)
-    return matrix
+def _similarity_matrix(*, labels: list[str], space: SeparationSpace) -> list[list[float]]:
+    return [[round(float(value), 4) for value in row] for row in space.matrix(labels)]
 
 
 def _build_stage_matrices(
     *,
     layer: str,
     processed_item_ids: list[str],
-    intent_map: dict[str, dict[str, Any]],
-    agent_map: dict[str, dict[str, Any]],
     tool_map: dict[str, dict[str, Any]],
-    tool_struct_map: dict[str, list[float] | None],
-    semantic_weight: float,
-    structural_weight: float,
+    space: SeparationSpace,
 ) -> list[dict[str, Any]]:
     if not processed_item_ids:
         return []
@@ -899,16 +862,7 @@ def _build_stage_matrices(
             {
                 "scope_id": "global",
                 "labels": ids,
-                "values": _similarity_matrix(
-                    layer=layer,
-                    labels=ids,
-                    intent_map=intent_map,
-                    agent_map=agent_map,
-                    tool_map=tool_map,
-                    tool_struct_map=tool_struct_map,
-                    semantic_weight=semantic_weight,
-                    structural_weight=structural_weight,
-                ),
+                "values": _similarity_matrix(labels=ids, space=space),
             }
         ]
     by_category: dict[str, list[str]] = defaultdict(list)
@@ -921,16 +875,7 @@ def _build_stage_matrices(
             {
                 "scope_id": category,
                 "labels": labels,
-                "values": _similarity_matrix(
-                    layer=layer,
-                    labels=labels,
-                    intent_map=intent_map,
-                    agent_map=agent_map,
-                    tool_map=tool_map,
-                    tool_struct_map=tool_struct_map,
-                    semantic_weight=semantic_weight,
-                    structural_weight=structural_weight,
-                ),
+                "values": _similarity_matrix(labels=labels, space=space),
             }
         )
     return matrices
@@ -945,139 +890,46 @@ def _extract_tool_struct_map(
     }
 
 
-def _cluster_balance_score(
+def _layer_space(
     *,
     layer: str,
-    components: list[list[str]],
     intent_map: dict[str, dict[str, Any]],
     agent_map: dict[str, dict[str, Any]],
     tool_map: dict[str, dict[str, Any]],
     tool_struct_map: dict[str, list[float] | None],
     semantic_weight: float,
     structural_weight: float,
-) -> float | None:
-    if len(components) < 2:
-        return None
-    centroids: list[tuple[list[float] | None, list[float] | None]] = []
-    for component in components:
-        labels = [item_id for item_id in component if _normalized_key(item_id)]
-        if not labels:
-            continue
-        if layer == "intent":
-            semantic_centroid = _mean_vector(
-                [_embed_text(_intent_text(intent_map.get(item_id, {}))) for item_id in labels]
-            )
-            centroids.append((semantic_centroid, None))
-            continue
-        if layer == "agent":
-            semantic_centroid = _mean_vector(
-                [_embed_text(_agent_text(agent_map.get(item_id, {}))) for item_id in labels]
-            )
-            centroids.append((semantic_centroid, None))
-            continue
-        semantic_centroid = _mean_vector(
-            [_embed_text(_tool_semantic_text(tool_map.get(item_id, {}))) for item_id in labels]
+) -> SeparationSpace:
+    if layer == "intent":
+        return SeparationSpace(
+            payloads=intent_map, text_of=_intent_text, embed_many=_embed_texts
         )
-        structural_centroid = _mean_vector([tool_struct_map.get(item_id) for item_id in labels])
-        centroids.append((semantic_centroid, structural_centroid))
-    if len(centroids) < 2:
-        return None
-    distances: list[float] = []
-    for left_index in range(len(centroids)):
-        for right_index in range(left_index + 1, len(centroids)):
-            left_sem, left_struct = centroids[left_index]
-            right_sem, right_struct = centroids[right_index]
-            if layer == "tool":
-                similarity = _fused_tool_similarity(
-                    left_sem=left_sem,
-                    left_struct=left_struct,
-                    right_sem=right_sem,
-                    right_struct=right_struct,
-                    semantic_weight=semantic_weight,
-                    structural_weight=structural_weight,
-                )
-            else:
-                similarity = _cosine_similarity(left_sem, right_sem)
-            distances.append(1.0 - similarity)
-    if not distances:
-        return None
-    return float(sum(distances) / len(distances))
-
-
-def _compute_alignment_semantic(
-    *,
-    queries: list[str],
-    embedding: list[float] | None,
-) -> float:
-    if not embedding:
-        return 0.0
-    scores: list[float] = []
-    for query in queries[:32]:
-        query_embedding = _embed_text(query)
-        if not query_embedding:
-            continue
-        scores.append(_cosine_similarity(query_embedding, embedding))
-    if not scores:
-        return 0.0
-    return float(sum(scores) / len(scores))
+    if layer == "agent":
+        return SeparationSpace(
+            payloads=agent_map, text_of=_agent_text, embed_many=_embed_texts
+        )
+    return SeparationSpace(
+        payloads=tool_map,
+        text_of=_tool_semantic_text,
+        embed_many=_embed_texts,
+        structural=tool_struct_map,
+        semantic_weight=semantic_weight,
+        structural_weight=structural_weight,
+    )
 
 
-def _pick_primary_competitor_from_similarity(
+def _cluster_balance_score(
     *,
-    layer: str,
-    item_id: str,
-    scope_ids: list[str],
-    intent_map: dict[str, dict[str, Any]],
-    agent_map: dict[str, dict[str, Any]],
-    tool_map: dict[str, dict[str, Any]],
-    tool_struct_map: dict[str, list[float] | None],
-    semantic_weight: float,
-    structural_weight: float,
-) -> str | None:
-    candidates = [value for value in scope_ids if value != item_id]
-    if not candidates:
+    components: list[list[str]],
+    space: SeparationSpace,
+) -> float | None:
+    if len(components) < 2:
         return None
-    if layer == "intent":
-        item_vec = _embed_text(_intent_text(intent_map.get(item_id, {})))
-        best_score = -2.0
-        best_id: str | None = None
-        for candidate_id in candidates:
-            candidate_vec = _embed_text(_intent_text(intent_map.get(candidate_id, {})))
-            score = _cosine_similarity(item_vec, candidate_vec)
-            if score > best_score:
-                best_score = score
-                best_id = candidate_id
-        return best_id
-    if layer == "agent":
-        item_vec = _embed_text(_agent_text(agent_map.get(item_id, {})))
-        best_score = -2.0
-        best_id: str | None = None
-        for candidate_id in candidates:
-            candidate_vec = _embed_text(_agent_text(agent_map.get(candidate_id, {})))
-            score = _cosine_similarity(item_vec, candidate_vec)
-            if score > best_score:
-                best_score = score
-                best_id = candidate_id
-        return best_id
-    item_sem = _embed_text(_tool_semantic_text(tool_map.get(item_id, {})))
-    item_struct = tool_struct_map.get(item_id)
-    best_score = -2.0
-    best_id = None
-    for candidate_id in candidates:
-        candidate_sem = _embed_text(_tool_semantic_text(tool_map.get(candidate_id, {})))
-        candidate_struct = tool_struct_map.get(candidate_id)
-        score = _fused_tool_similarity(
-            left_sem=item_sem,
-            left_struct=item_struct,
-            right_sem=candidate_sem,
-            right_struct=candidate_struct,
-            semantic_weight=semantic_weight,
-            structural_weight=structural_weight,
-        )
-        if score > best_score:
-            best_score = score
-            best_id = candidate_id
-    return best_id
+    labelled = [
+        [item_id for item_id in component if _normalized_key(item_id)]
+        for component in components
+    ]
+    return space.centroid_distance([labels for labels in labelled if labels])
 
 
 def _evaluate_candidate(
@@ -1090,88 +942,32 @@ def _evaluate_candidate(
     scope_ids: list[str],
     query_alignment_source: list[str],
     cfg: _LayerConfig,
-    intent_map: dict[str, dict[str, Any]],
-    agent_map: dict[str, dict[str, Any]],
-    tool_map: dict[str, dict[str, Any]],
-    tool_struct_map: dict[str, list[float] | None],
-    semantic_weight: float,
-    structural_weight: float,
+    space: SeparationSpace,
 ) -> dict[str, Any]:
-    if layer == "intent":
-        old_vec = _embed_text(_intent_text(current))
-        new_vec = _embed_text(_intent_text(candidate))
-        item_embedding_old = old_vec
-        item_embedding_new = new_vec
-    elif layer == "agent":
-        old_vec = _embed_text(_agent_text(current))
-        new_vec = _embed_text(_agent_text(candidate))
-        item_embedding_old = old_vec
-        item_embedding_new = new_vec
-    else:
-        old_sem = _embed_text(_tool_semantic_text(current))
-        new_sem = _embed_text(_tool_semantic_text(candidate))
-        old_struct = tool_struct_map.get(item_id)
-        new_struct = old_struct
-        item_embedding_old = old_sem
-        item_embedding_new = new_sem
+    item_embedding_old = space.semantic_vector(current, item_id=item_id)
+    item_embedding_new = space.semantic_vector(candidate, item_id=item_id)
 
     other_ids = [value for value in scope_ids if value != item_id]
-    nearest_old = -1.0
-    nearest_new = -1.0
-    similarity_to_primary_old: float | None = None
-    similarity_to_primary_new: float | None = None
-    similarity_old_by_other: dict[str, float] = {}
-    similarity_new_by_other: dict[str, float] = {}
-
-    for other_id in other_ids:
-        if layer == "intent":
-            other_vec = _embed_text(_intent_text(intent_map.get(other_id, {})))
-            sim_old = _cosine_similarity(item_embedding_old, other_vec)
-            sim_new = _cosine_similarity(item_embedding_new, other_vec)
-        elif layer == "agent":
-            other_vec = _embed_text(_agent_text(agent_map.get(other_id, {})))
-            sim_old = _cosine_similarity(item_embedding_old, other_vec)
-            sim_new = _cosine_similarity(item_embedding_new, other_vec)
-        else:
-            other_sem = _embed_text(_tool_semantic_text(tool_map.get(other_id, {})))
-            other_struct = tool_struct_map.get(other_id)
-            sim_old = _fused_tool_similarity(
-                left_sem=item_embedding_old,
-                left_struct=old_struct,
-                right_sem=other_sem,
-                right_struct=other_struct,
-                semantic_weight=semantic_weight,
-                structural_weight=structural_weight,
-            )
-            sim_new = _fused_tool_similarity(
-                left_sem=item_embedding_new,
-                left_struct=new_struct,
-                right_sem=other_sem,
-                right_struct=other_struct,
-                semantic_weight=semantic_weight,
-                structural_weight=structural_weight,
-            )
-        nearest_old = max(nearest_old, sim_old)
-        nearest_new = max(nearest_new, sim_new)
-        similarity_old_by_other[other_id] = float(sim_old)
-        similarity_new_by_other[other_id] = float(sim_new)
-        if other_id == primary_competitor:
-            similarity_to_primary_old = sim_old
-            similarity_to_primary_new = sim_new
+    similarities_old = space.similarities(item_embedding_old, item_id, other_ids)
+    similarities_new = space.similarities(item_embedding_new, item_id, other_ids)
+    nearest_old = max(-1.0, float(similarities_old.max())) if other_ids else -1.0
+    nearest_new = max(-1.0, float(similarities_new.max())) if other_ids else -1.0
+    similarity_old_by_other = dict(
+        zip(other_ids, similarities_old.tolist(), strict=True)
+    )
+    similarity_new_by_other = dict(
+        zip(other_ids, similarities_new.tolist(), strict=True)
+    )
+    similarity_to_primary_old = similarity_old_by_other.get(primary_competitor or "")
+    similarity_to_primary_new = similarity_new_by_other.get(primary_competitor or "")
 
     if nearest_old < -0.5:
         nearest_old = 0.0
     if nearest_new < -0.5:
         nearest_new = 0.0
 
-    alignment_old = _compute_alignment_semantic(
-        queries=query_alignment_source,
-        embedding=item_embedding_old,
-    )
-    alignment_new = _compute_alignment_semantic(
-        queries=query_alignment_source,
-        embedding=item_embedding_new,
-    )
+    alignment_old = space.alignment(query_alignment_source[:32], item_embedding_old)
+    alignment_new = space.alignment(query_alignment_source[:32], item_embedding_new)
 
     local_pass = True
     if primary_competitor and similarity_to_primary_old is not None and similarity_to_primary_new is not None:
@@ -1569,16 +1365,21 @@ async def run_bottom_up_metadata_separation(
             return stage_report, (perf_counter() - stage_started_at) * 1000
 
         components = _conflict_components(layer_stats=layer_stats)
-        baseline_cluster_balance = _cluster_balance_score(
+        tool_struct_map = _extract_tool_struct_map(current_tool_index)
+        # Embedded once per stage; rows are refreshed as candidates are applied.
+        layer_space = _layer_space(
             layer=layer,
-            components=components,
             intent_map=current_intent_map,
             agent_map=current_agent_map,
             tool_map=current_tool_map,
-            tool_struct_map=_extract_tool_struct_map(current_tool_index),
+            tool_struct_map=tool_struct_map,
             semantic_weight=semantic_weight,
             structural_weight=structural_weight,
         )
+        baseline_cluster_balance = _cluster_balance_score(
+            components=components,
+            space=layer_space,
+        )
         ordered_ids: list[str] = []
         for component in components:
             sorted_component = sorted(
@@ -1604,11 +1405,6 @@ async def run_bottom_up_metadata_separation(
                 retrieval_tuning=retrieval_tuning,
             )
 
-        if layer == "tool":
-            tool_struct_map = _extract_tool_struct_map(current_tool_index)
-        else:
-            tool_struct_map = _extract_tool_struct_map(current_tool_index)
-
         pre_stage_tool_patch = _copy_tool_patch_map(current_tool_patch_map)
         pre_stage_intent_patch = _copy_simple_patch_map(current_intent_patch_map)
         pre_stage_agent_patch = _copy_simple_patch_map(current_agent_patch_map)
@@ -1639,17 +1435,7 @@ async def run_bottom_up_metadata_separation(
             )
             primary_competitor = _normalized_key(stats.get("primary_competitor"))
             if not primary_competitor:
-                primary_competitor = _pick_primary_competitor_from_similarity(
-                    layer=layer,
-                    item_id=item_id,
-                    scope_ids=scope_ids,
-                    intent_map=current_intent_map,
-                    agent_map=current_agent_map,
-                    tool_map=current_tool_map,
-                    tool_struct_map=tool_struct_map,
-                    semantic_weight=semantic_weight,
-                    structural_weight=structural_weight,
-                )
+                primary_competitor = layer_space.nearest(item_id, scope_ids)
             competitor_payload = (
                 current_intent_map.get(primary_competitor)
                 if layer == "intent"
@@ -1761,12 +1547,7 @@ async def run_bottom_up_metadata_separation(
                     scope_ids=scope_ids,
                     query_alignment_source=list(stats.get("queries") or []),
                     cfg=cfg,
-                    intent_map=current_intent_map,
-                    agent_map=current_agent_map,
-                    tool_map=current_tool_map,
-                    tool_struct_map=tool_struct_map,
-                    semantic_weight=semantic_weight,
-                    structural_weight=structural_weight,
+                    space=layer_space,
                 )
                 if not bool(eval_payload.get("local_pass")):
                     decision_payload["rejection_reasons"].append(
@@ -1837,6 +1618,7 @@ async def run_bottom_up_metadata_separation(
                 agent_patch_map=current_agent_patch_map,
                 tool_patch_map=current_tool_patch_map,
             )
+            layer_space.refresh(item_id, selected_candidate)
             stage_report["candidate_decisions"].append(decision_payload)
             candidate_count_selected += 1
             stage_report["applied_changes"] += 1
@@ -1864,12 +1646,8 @@ async def run_bottom_up_metadata_separation(
         stage_report["similarity_matrices"] = _build_stage_matrices(
             layer=layer,
             processed_item_ids=processed_ids,
-            intent_map=current_intent_map,
-            agent_map=current_agent_map,
             tool_map=current_tool_map,
-            tool_struct_map=tool_struct_map,
-            semantic_weight=semantic_weight,
-            structural_weight=structural_weight,
+            space=layer_space,
         )
 
         if stage_report["applied_changes"] <= 0:
@@ -1908,16 +1686,20 @@ async def run_bottom_up_metadata_separation(
         after_summary = dict(mini_audit.get("summary") or {})
         after_metric = _layer_metric(layer, after_summary)
         delta = after_metric - before_metric
-        after_tool_struct_map = _extract_tool_struct_map(current_tool_index)
+        if layer == "tool":
+            # The rebuilt index changes tool texts and structural embeddings.
+            layer_space = _layer_space(
+                layer=layer,
+                intent_map=current_intent_map,
+                agent_map=current_agent_map,
+                tool_map=current_tool_map,
+                tool_struct_map=_extract_tool_struct_map(current_tool_index),
+                semantic_weight=semantic_weight,
+                structural_weight=structural_weight,
+            )
         after_cluster_balance = _cluster_balance_score(
-            layer=layer,
             components=components,
-            intent_map=current_intent_map,
-            agent_map=current_agent_map,
-            tool_map=current_tool_map,
-            tool_struct_map=after_tool_struct_map,
-            semantic_weight=semantic_weight,
-            structural_weight=structural_weight,
+            space=layer_space,
         )
         upstream_ok, upstream_notes = _upstream_ok(
             layer=layer,
@@ -0,0 +1,253 @@
+"""Embedding matrices for bottom-up metadata separation.
+
+A ``SeparationSpace`` holds one layer's items (intents, agents or tools) for
+one separation stage.  The semantic text of every item is embedded in one
+batch when the space is built and kept as a row-normalized NumPy matrix.
+Tools also carry their structural embedding.  Semantic and structural
+similarity are fused into one matrix product: both parts are scaled by the
+square root of their normalized weight and concatenated, so
+``fused @ fused.T`` is the weighted average of the two cosine similarities.
+
+When a candidate is applied to an item, ``refresh`` re-embeds that item's
+row only.  Similarities follow ``_cosine_similarity`` and
+``_fused_tool_similarity`` in ``metadata_separation_service``: a missing or
+zero vector has similarity 0 to everything.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+EmbedMany = Callable[[list[str]], Sequence[Sequence[float] | None]]
+
+
+def _vectors_to_matrix(
+    vectors: Sequence[Sequence[float] | None], dim: int | None
+) -> tuple[np.ndarray, np.ndarray, int | None]:
+    """Stack *vectors* into ``(raw, present, dim)``; missing rows are zero.
+
+    A vector whose length differs from the first one is treated as missing,
+    as the pairwise cosine treated mismatched lengths as similarity 0.
+    """
+    if dim is None:
+        dim = next((len(vector) for vector in vectors if vector), None)
+    if not dim:
+        return np.zeros((len(vectors), 0)), np.zeros(len(vectors), dtype=bool), dim
+    raw = np.zeros((len(vectors), dim), dtype=np.float64)
+    present = np.zeros(len(vectors), dtype=bool)
+    for row, vector in enumerate(vectors):
+        if vector and len(vector) == dim:
+            raw[row] = vector
+            present[row] = True
+    return raw, present, dim
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class SeparationSpace:
+    """Normalized semantic (and structural) embedding rows of one layer.
+
+    Args:
+        payloads: Item metadata keyed by item id.
+        text_of: Builds the semantic text of an item payload.
+        embed_many: Embeds a list of texts in one call; ``None`` for a text
+            that could not be embedded.
+        structural: Structural embedding per item id (tools only).  When
+            given, similarities are fused with the weights below.
+        semantic_weight: Weight of the semantic similarity.
+        structural_weight: Weight of the structural similarity.
+    """
+
+    def __init__(
+        self,
+        *,
+        payloads: dict[str, dict[str, Any]],
+        text_of: Callable[[dict[str, Any]], str],
+        embed_many: EmbedMany,
+        structural: dict[str, Sequence[float] | None] | None = None,
+        semantic_weight: float = 1.0,
+        structural_weight: float = 0.0,
+    ):
+        self._text_of = text_of
+        self._embed_many = embed_many
+        self.ids = list(payloads)
+        self._index = {item_id: row for row, item_id in enumerate(self.ids)}
+        self._texts = [text_of(payloads[item_id]) for item_id in self.ids]
+        self._semantic, self._semantic_present, self._dim = _vectors_to_matrix(
+            list(embed_many(self._texts)) if self._texts else [], None
+        )
+        self._semantic_unit = _unit_rows(self._semantic)
+
+        self._fused_mode = structural is not None
+        sem_w = max(0.0, float(semantic_weight))
+        struct_w = max(0.0, float(structural_weight))
+        total = sem_w + struct_w
+        if not self._fused_mode or total <= 0.0:
+            self._scales = (1.0, 0.0)
+        else:
+            self._scales = (
+                float(np.sqrt(sem_w / total)),
+                float(np.sqrt(struct_w / total)),
+            )
+        structural = structural or {}
+        self._structural, self._structural_present, _ = _vectors_to_matrix(
+            [structural.get(item_id) for item_id in self.ids], None
+        )
+        self._structural_unit = _unit_rows(self._structural)
+        self._fused = self._combine(self._semantic_unit, self._structural_unit)
+        self._query_rows: dict[str, np.ndarray | None] = {}
+
+    def _combine(self, semantic: np.ndarray, structural: np.ndarray) -> np.ndarray:
+        sem_scale, struct_scale = self._scales
+        if struct_scale == 0.0:
+            return semantic
+        return np.concatenate(
+            [semantic * sem_scale, structural * struct_scale], axis=-1
+        )
+
+    def _rows(self, item_ids: Iterable[str]) -> np.ndarray:
+        return np.fromiter(
+            (self._index.get(item_id, -1) for item_id in item_ids), dtype=np.intp
+        )
+
+    def _gather(self, matrix: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Rows of *matrix*; unknown items (row -1) become zero rows."""
+        if not len(matrix):
+            return np.zeros((len(rows), matrix.shape[1]))
+        gathered = matrix[np.where(rows >= 0, rows, 0)]
+        gathered[rows < 0] = 0.0
+        return gathered
+
+    def semantic_vector(
+        self, payload: dict[str, Any], *, item_id: str | None = None
+    ) -> np.ndarray:
+        """Unit semantic vector of *payload* (zero when it cannot be embedded).
+
+        The stored row of *item_id* is reused when its text is unchanged.
+        """
+        text = self._text_of(payload)
+        row = self._index.get(item_id) if item_id is not None else None
+        if row is not None and self._texts[row] == text:
+            return self._semantic_unit[row]
+        raw = self._embed_raw(text)
+        if raw is None:
+            return np.zeros(self._semantic.shape[1])
+        return _unit_rows(raw[None, :])[0]
+
+    def _embed_raw(self, text: str) -> np.ndarray | None:
+        raw, present, _ = _vectors_to_matrix(list(self._embed_many([text])), self._dim)
+        if self._dim is None and raw.shape[1]:
+            # Every stored row was missing; widen the empty semantic matrix.
+            self._dim = raw.shape[1]
+            self._semantic = np.zeros((len(self.ids), self._dim))
+            self._semantic_unit = np.zeros((len(self.ids), self._dim))
+            self._fused = self._combine(self._semantic_unit, self._structural_unit)
+        return raw[0] if present[0] else None
+
+    def refresh(self, item_id: str, payload: dict[str, Any]) -> bool:
+        """Re-embed *item_id* after its metadata changed.
+
+        Returns ``True`` when the item's semantic text changed.  Items that
+        were not in the space are ignored.
+        """
+        row = self._index.get(item_id)
+        text = self._text_of(payload)
+        if row is None or self._texts[row] == text:
+            return False
+        raw = self._embed_raw(text)
+        self._texts[row] = text
+        self._semantic[row] = 0.0 if raw is None else raw
+        self._semantic_present[row] = raw is not None
+        self._semantic_unit[row] = _unit_rows(self._semantic[row : row + 1])[0]
+        self._fused[row] = self._combine(
+            self._semantic_unit[row], self._structural_unit[row]
+        )
+        return True
+
+    def similarities(
+        self, semantic: np.ndarray, item_id: str, other_ids: Sequence[str]
+    ) -> np.ndarray:
+        """Similarity of *semantic* (with *item_id*'s structure) to *other_ids*."""
+        row = self._index.get(item_id)
+        structural = (
+            self._structural_unit[row]
+            if row is not None
+            else np.zeros(self._structural_unit.shape[1])
+        )
+        vector = self._combine(semantic, structural)
+        return self._gather(self._fused, self._rows(other_ids)) @ vector
+
+    def matrix(self, labels: Sequence[str]) -> np.ndarray:
+        """Square similarity matrix between *labels*."""
+        fused = self._gather(self._fused, self._rows(labels))
+        return fused @ fused.T
+
+    def nearest(self, item_id: str, candidate_ids: Sequence[str]) -> str | None:
+        """The most similar of *candidate_ids* (first one on ties)."""
+        candidates = [value for value in candidate_ids if value != item_id]
+        if not candidates:
+            return None
+        row = self._index.get(item_id)
+        semantic = (
+            self._semantic_unit[row]
+            if row is not None
+            else np.zeros(self._semantic_unit.shape[1])
+        )
+        scores = self.similarities(semantic, item_id, candidates)
+        return candidates[int(np.argmax(scores))]
+
+    def alignment(self, queries: Sequence[str], semantic: np.ndarray) -> float:
+        """Mean similarity between *semantic* and the embeddable *queries*."""
+        missing = [
+            query for query in dict.fromkeys(queries) if query not in self._query_rows
+        ]
+        if missing:
+            raw, present, _ = _vectors_to_matrix(
+                list(self._embed_many(missing)), self._dim
+            )
+            unit = _unit_rows(raw)
+            for position, query in enumerate(missing):
+                usable = present[position] and raw.shape[1] == semantic.shape[0]
+                self._query_rows[query] = unit[position] if usable else None
+        rows = [self._query_rows[query] for query in queries]
+        rows = [row for row in rows if row is not None]
+        if not rows:
+            return 0.0
+        return float(np.mean(np.stack(rows) @ semantic))
+
+    def centroid_distance(self, components: Sequence[Sequence[str]]) -> float | None:
+        """Mean pairwise ``1 - similarity`` between component centroids.
+
+        A centroid is the mean of the raw (unnormalized) vectors present in
+        its component.
+        """
+        centroids: list[np.ndarray] = []
+        for component in components:
+            rows = self._rows(component)
+            rows = rows[rows >= 0]
+            semantic = self._centroid(self._semantic, self._semantic_present, rows)
+            structural = self._centroid(
+                self._structural, self._structural_present, rows
+            )
+            centroids.append(self._combine(semantic, structural))
+        if len(centroids) < 2:
+            return None
+        stacked = np.stack(centroids)
+        similarity = stacked @ stacked.T
+        upper = np.triu_indices(len(centroids), k=1)
+        return float(np.mean(1.0 - similarity[upper]))
+
+    @staticmethod
+    def _centroid(
+        matrix: np.ndarray, present: np.ndarray, rows: np.ndarray
+    ) -> np.ndarray:
+        rows = rows[present[rows]] if len(rows) else rows
+        if not len(rows):
+            return np.zeros(matrix.shape[1])
+        return _unit_rows(matrix[rows].mean(axis=0, keepdims=True))[0]
@@ -468,6 +468,41 @@ class VercelStreamingService:
             },
         )
 
+    def format_trace_span_delta(
+        self,
+        trace_session_id: str,
+        span_id: str,
+        offset: int,
+        delta: str,
+    ) -> str:
+        """
+        Format an incremental output update for a running trace span.
+
+        Unlike ``format_trace_span`` with ``event="update"``, only the text
+        appended since the previous update is sent.  ``offset`` is the length
+        (in characters) of the output the client should already hold; a
+        client that sees ``offset == 0`` replaces the output with ``delta``.
+        The span's ``end`` event carries the full output.
+
+        Args:
+            trace_session_id: The trace session the span belongs to.
+            span_id: Id of the running span.
+            offset: Output length before this delta.
+            delta: Appended output text.
+
+        Returns:
+            str: SSE formatted ``data-trace-span-delta`` event.
+        """
+        return self.format_data(
+            "trace-span-delta",
+            {
+                "trace_session_id": trace_session_id,
+                "span_id": span_id,
+                "offset": offset,
+                "delta": delta,
+            },
+        )
+
     def format_node_reasoning(
         self,
         step_id: str,
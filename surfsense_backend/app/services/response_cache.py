@@ -0,0 +1,504 @@
+"""Two-tier response cache for the public-data services.
+
+Each service (SCB, Elpris, Riksbank, Trafikverket, SMHI, Riksdagen, Kolada)
+owns a :class:`ResponseCache` with its own namespace:
+
+* **Tier 1** is an in-process LRU (``max_entries``) in front of
+* **tier 2**, Redis (``RESPONSE_CACHE_REDIS_URL``, default ``REDIS_APP_URL``),
+  which is shared by every API process and Celery worker.  Redis is optional;
+  when it is not configured or unreachable the cache runs memory-only.
+* Every lookup passes its own TTL, so endpoints with different freshness
+  (today's spot prices vs. historical prices, metadata vs. observations)
+  share one cache.
+* Concurrent misses for the same key are coalesced into one upstream call
+  (single-flight), which is what compare / fan-out modes produce.
+* For ``stale_ttl`` seconds after expiry an entry is served as-is while one
+  background refresh runs (stale-while-revalidate).  If that refresh fails
+  the stale entry keeps being served until the window closes.
+* Entries fetched through :meth:`ResponseCache.get_or_fetch_http` keep the
+  upstream ``ETag`` / ``Last-Modified`` and are revalidated with a
+  conditional request; a ``304 Not Modified`` only refreshes the TTL.
+
+Caches register with :mod:`app.services.cache_control`, so
+``clear_all_service_caches`` flushes them and ``is_cache_disabled`` bypasses
+both tiers (concurrent identical requests are still coalesced).  Per-service
+counters, hit ratio and avoided upstream calls are reported by
+:func:`response_cache_stats`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.services.cache_control import is_cache_disabled, register_service_cache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL") or os.getenv(
+    "REDIS_APP_URL", ""
+)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_STALE_SECONDS = int(os.getenv("RESPONSE_CACHE_STALE_SECONDS", "300"))
+
+_REDIS_KEY_PREFIX = "response_cache"
+_REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+    ttl: float
+    stale_ttl: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.stored_at + self.ttl
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stored_at + self.ttl + self.stale_ttl
+
+    @property
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "v": self.value,
+                "s": self.stored_at,
+                "t": self.ttl,
+                "w": self.stale_ttl,
+                "e": self.etag,
+                "m": self.last_modified,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> _Entry:
+        data = json.loads(raw)
+        return cls(
+            value=data["v"],
+            stored_at=float(data["s"]),
+            ttl=float(data["t"]),
+            stale_ttl=float(data["w"]),
+            etag=data.get("e"),
+            last_modified=data.get("m"),
+        )
+
+
+@dataclass
+class _Fetched:
+    """Result of one upstream call."""
+
+    value: Any = None
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+
+
+class ResponseCacheStats:
+    """Counters of one service namespace, summed over its cache instances."""
+
+    _FIELDS = (
+        "lookups",
+        "memory_hits",
+        "redis_hits",
+        "stale_hits",
+        "coalesced",
+        "upstream_calls",
+        "not_modified",
+        "upstream_errors",
+        "background_refreshes",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self._FIELDS, 0)
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._counts)
+        lookups = stats["lookups"]
+        hits = stats["memory_hits"] + stats["redis_hits"] + stats["stale_hits"]
+        # Background refreshes are upstream calls no caller waited for
+        saved = max(
+            0, lookups - (stats["upstream_calls"] - stats["background_refreshes"])
+        )
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["upstream_calls_saved"] = saved
+        stats["upstream_savings_ratio"] = round(saved / lookups, 4) if lookups else 0.0
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(self._FIELDS, 0)
+
+
+_STATS: dict[str, ResponseCacheStats] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def _stats_for(namespace: str) -> ResponseCacheStats:
+    with _STATS_LOCK:
+        stats = _STATS.get(namespace)
+        if stats is None:
+            stats = _STATS[namespace] = ResponseCacheStats()
+        return stats
+
+
+def response_cache_stats() -> dict[str, dict[str, Any]]:
+    """Per-service cache counters, hit ratio and saved upstream calls."""
+    with _STATS_LOCK:
+        items = list(_STATS.items())
+    return {namespace: stats.snapshot() for namespace, stats in sorted(items)}
+
+
+# Async Redis clients hold connections bound to the loop that created them
+_redis_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]] = (
+    weakref.WeakKeyDictionary()
+)
+_redis_down_until: dict[str, float] = {}
+
+
+def _get_redis(url: str):
+    if not url or time.monotonic() < _redis_down_until.get(url, 0.0):
+        return None
+    loop = asyncio.get_running_loop()
+    clients = _redis_clients.setdefault(loop, {})
+    client = clients.get(url)
+    if client is None:
+        try:
+            import redis.asyncio as redis_asyncio
+
+            client = redis_asyncio.from_url(url)
+        except Exception as exc:
+            logger.warning("Response cache: Redis unavailable (%s)", exc)
+            _redis_down_until[url] = time.monotonic() + _REDIS_RETRY_SECONDS
+            return None
+        clients[url] = client
+    return client
+
+
+def _mark_redis_down(url: str, exc: Exception) -> None:
+    logger.warning(
+        "Response cache: Redis error (%s); memory-only for %.0fs",
+        exc,
+        _REDIS_RETRY_SECONDS,
+    )
+    _redis_down_until[url] = time.monotonic() + _REDIS_RETRY_SECONDS
+
+
+def _validator(response: httpx.Response, header: str) -> str | None:
+    value = response.headers.get(header)
+    return value if isinstance(value, str) and value else None
+
+
+class ResponseCache:
+    """In-process LRU in front of Redis, with single-flight and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        default_ttl: float,
+        stale_ttl: float = RESPONSE_CACHE_STALE_SECONDS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        redis_url: str | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self.default_ttl = float(default_ttl)
+        self.stale_ttl = float(stale_ttl)
+        self.max_entries = max(1, int(max_entries))
+        self._redis_url = RESPONSE_CACHE_REDIS_URL if redis_url is None else redis_url
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._background: set[asyncio.Task] = set()
+        self._refreshing: set[str] = set()
+        self.stats = _stats_for(namespace)
+        register_service_cache(self)
+
+    # -- Public API ----------------------------------------------------------
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        ttl: float | None = None,
+    ) -> tuple[Any, bool]:
+        """Return ``(value, cache_hit)`` for ``key``, calling ``fetch`` on a miss.
+
+        ``fetch`` must return a JSON-serializable value.
+        """
+
+        async def load(_validators: dict[str, str]) -> _Fetched:
+            return _Fetched(value=await fetch())
+
+        return await self._lookup(key, load, ttl)
+
+    async def get_or_fetch_http(
+        self,
+        key: str,
+        request: Callable[[dict[str, str]], Awaitable[httpx.Response]],
+        decode: Callable[[httpx.Response], Any],
+        *,
+        ttl: float | None = None,
+    ) -> tuple[Any, bool]:
+        """Like :meth:`get_or_fetch`, with conditional revalidation.
+
+        ``request`` performs the HTTP call with the extra headers it is given
+        (``If-None-Match`` / ``If-Modified-Since`` when revalidating an
+        entry); ``decode`` turns a successful response into the cached value.
+        """
+
+        async def load(validators: dict[str, str]) -> _Fetched:
+            response = await request(validators)
+            if validators and response.status_code == 304:
+                return _Fetched(not_modified=True)
+            response.raise_for_status()
+            return _Fetched(
+                value=decode(response),
+                etag=_validator(response, "etag"),
+                last_modified=_validator(response, "last-modified"),
+            )
+
+        return await self._lookup(key, load, ttl)
+
+    def clear(self) -> None:
+        """Drop every entry of this cache (memory now, Redis in the background)."""
+        self._entries.clear()
+        if not self._redis_url:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._spawn(loop, self._clear_redis())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- Lookup ----------------------------------------------------------------
+
+    async def _lookup(
+        self,
+        key: str,
+        load: Callable[[dict[str, str]], Awaitable[_Fetched]],
+        ttl: float | None,
+    ) -> tuple[Any, bool]:
+        ttl = self.default_ttl if ttl is None else float(ttl)
+        self.stats.incr("lookups")
+        if is_cache_disabled():
+            return await self._single_flight(key, load, ttl, None, store=False), False
+
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.is_fresh(now):
+                self._entries.move_to_end(key)
+                self.stats.incr("memory_hits")
+                return entry.value, True
+        else:
+            entry = await self._redis_get(key)
+            if entry is not None:
+                self._remember(key, entry)
+                if entry.is_fresh(now):
+                    self.stats.incr("redis_hits")
+                    return entry.value, True
+
+        if entry is not None and entry.is_usable(now):
+            self.stats.incr("stale_hits")
+            if key not in self._inflight and key not in self._refreshing:
+                self._refreshing.add(key)
+                self.stats.incr("background_refreshes")
+                self._spawn(
+                    asyncio.get_running_loop(),
+                    self._refresh_quietly(key, load, ttl, entry),
+                )
+            return entry.value, True
+
+        return await self._single_flight(key, load, ttl, entry, store=True), False
+
+    async def _single_flight(
+        self,
+        key: str,
+        load: Callable[[dict[str, str]], Awaitable[_Fetched]],
+        ttl: float,
+        previous: _Entry | None,
+        *,
+        store: bool,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] is loop and not inflight[1].done():
+            self.stats.incr("coalesced")
+            return await asyncio.shield(inflight[1])
+
+        task = loop.create_task(self._fetch(key, load, ttl, previous, store=store))
+        self._inflight[key] = (loop, task)
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and self._inflight.get(key, (None, None))[1] is task:
+                del self._inflight[key]
+
+    async def _fetch(
+        self,
+        key: str,
+        load: Callable[[dict[str, str]], Awaitable[_Fetched]],
+        ttl: float,
+        previous: _Entry | None,
+        *,
+        store: bool,
+    ) -> Any:
+        validators = previous.validators if previous is not None and store else {}
+        self.stats.incr("upstream_calls")
+        try:
+            fetched = await load(validators)
+        except Exception:
+            self.stats.incr("upstream_errors")
+            raise
+        finally:
+            # Waiters that joined late must not find a finished task
+            task = self._inflight.get(key)
+            if task is not None and task[1] is asyncio.current_task():
+                del self._inflight[key]
+
+        if fetched.not_modified and previous is not None:
+            self.stats.incr("not_modified")
+            entry = _Entry(
+                value=previous.value,
+                stored_at=time.time(),
+                ttl=ttl,
+                stale_ttl=self.stale_ttl,
+                etag=previous.etag,
+                last_modified=previous.last_modified,
+            )
+        else:
+            entry = _Entry(
+                value=fetched.value,
+                stored_at=time.time(),
+                ttl=ttl,
+                stale_ttl=self.stale_ttl,
+                etag=fetched.etag,
+                last_modified=fetched.last_modified,
+            )
+        if store and ttl > 0:
+            self._remember(key, entry)
+            await self._redis_set(key, entry)
+        return entry.value
+
+    async def _refresh_quietly(
+        self,
+        key: str,
+        load: Callable[[dict[str, str]], Awaitable[_Fetched]],
+        ttl: float,
+        previous: _Entry,
+    ) -> None:
+        try:
+            await self._single_flight(key, load, ttl, previous, store=True)
+        except Exception as exc:
+            logger.warning(
+                "Response cache %s: background refresh failed: %s",
+                self.namespace,
+                exc,
+            )
+        finally:
+            self._refreshing.discard(key)
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _spawn(self, loop: asyncio.AbstractEventLoop, coro) -> None:
+        task = loop.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # -- Redis tier ------------------------------------------------------------
+
+    def _redis_key(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return f"{_REDIS_KEY_PREFIX}:{self.namespace}:{digest}"
+
+    async def _redis_get(self, key: str) -> _Entry | None:
+        client = _get_redis(self._redis_url)
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self._redis_key(key))
+        except Exception as exc:
+            _mark_redis_down(self._redis_url, exc)
+            return None
+        if not raw:
+            return None
+        try:
+            return _Entry.from_json(raw)
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    async def _redis_set(self, key: str, entry: _Entry) -> None:
+        client = _get_redis(self._redis_url)
+        if client is None:
+            return
+        try:
+            payload = entry.to_json()
+        except (TypeError, ValueError):
+            return
+        try:
+            await client.set(
+                self._redis_key(key),
+                payload,
+                ex=max(1, int(entry.ttl + entry.stale_ttl)),
+            )
+        except Exception as exc:
+            _mark_redis_down(self._redis_url, exc)
+
+    async def _clear_redis(self) -> None:
+        client = _get_redis(self._redis_url)
+        if client is None:
+            return
+        try:
+            pattern = f"{_REDIS_KEY_PREFIX}:{self.namespace}:*"
+            batch: list[Any] = []
+            async for redis_key in client.scan_iter(match=pattern, count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    await client.delete(*batch)
+                    batch.clear()
+            if batch:
+                await client.delete(*batch)
+        except Exception as exc:
+            _mark_redis_down(self._redis_url, exc)
+
+
+def build_cache_key(*parts: Any) -> str:
+    """Stable cache key from URL / params / payload parts."""
+    return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
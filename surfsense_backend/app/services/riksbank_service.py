@@ -13,13 +13,13 @@ Source: Sveriges Riksbank — https://developer.api.riksbank.se/
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
 from typing import Any
 
 import httpx
-from cachetools import TTLCache
+
+from app.services.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -76,20 +76,11 @@ class RiksbankService:
         self._timeout = timeout
         self._client: httpx.AsyncClient | None = None
 
-        # Caches
-        self._cache_lock = asyncio.Lock()
-        self._rate_cache: TTLCache[str, Any] = TTLCache(
-            maxsize=500, ttl=RIKSBANK_CACHE_TTL_RATES,
-        )
-        self._meta_cache: TTLCache[str, Any] = TTLCache(
-            maxsize=200, ttl=RIKSBANK_CACHE_TTL_META,
+        # Rates and metadata share one cache with per-endpoint TTLs
+        self._cache = ResponseCache(
+            "riksbank", default_ttl=RIKSBANK_CACHE_TTL_RATES, max_entries=700
         )
 
-        from app.services.cache_control import register_service_cache
-
-        register_service_cache(self._rate_cache)
-        register_service_cache(self._meta_cache)
-
     # -- Lifecycle -----------------------------------------------------------
 
     def _get_client(self) -> httpx.AsyncClient:
@@ -120,14 +111,10 @@ class RiksbankService:
     async def _cached_get(
         self, cache_key: str, url: str, *, use_meta_cache: bool = False
     ) -> tuple[Any, bool]:
-        cache = self._meta_cache if use_meta_cache else self._rate_cache
-        async with self._cache_lock:
-            if cache_key in cache:
-                return cache[cache_key], True
-        data = await self._get_json(url)
-        async with self._cache_lock:
-            cache[cache_key] = data
-        return data, False
+        ttl = RIKSBANK_CACHE_TTL_META if use_meta_cache else RIKSBANK_CACHE_TTL_RATES
+        return await self._cache.get_or_fetch(
+            cache_key, lambda: self._get_json(url), ttl=ttl
+        )
 
     # =========================================================================
     # SWEA API — Interest rates & Exchange rates
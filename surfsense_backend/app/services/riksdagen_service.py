@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import re
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
@@ -8,10 +9,15 @@ from typing import Any
 
 import httpx
 
+from app.services.http_clients import get_http_client
+from app.services.response_cache import ResponseCache, build_cache_key
+
 RIKSDAGEN_BASE_URL = "https://data.riksdagen.se"
 RIKSDAGEN_SOURCE = "Riksdagens öppna data"
 RIKSDAGEN_SOURCE_URL = "https://data.riksdagen.se"
 RIKSDAGEN_DEFAULT_TIMEOUT = 30.0
+RIKSDAGEN_CACHE_TTL = int(os.getenv("RIKSDAGEN_CACHE_TTL", "900"))
+RIKSDAGEN_CACHE_TTL_META = int(os.getenv("RIKSDAGEN_CACHE_TTL_META", "86400"))
 
 _DIACRITIC_MAP = str.maketrans(
     {
@@ -262,20 +268,51 @@ class RiksdagenService:
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self._cache = ResponseCache("riksdagen", default_ttl=RIKSDAGEN_CACHE_TTL)
 
-    async def _get_json(self, url: str, params: dict[str, Any] | None = None) -> Any:
-        """Make GET request and return JSON response."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params or {})
-            response.raise_for_status()
-            return response.json()
+    async def _cached_get(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        *,
+        as_text: bool,
+        cache_ttl: float | None,
+    ) -> Any:
+        async def request(validators: dict[str, str]) -> httpx.Response:
+            return await get_http_client(url).get(
+                url, params=params or {}, headers=validators, timeout=self.timeout
+            )
 
-    async def _get_text(self, url: str, params: dict[str, Any] | None = None) -> str:
-        """Make GET request and return raw text response."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params or {})
-            response.raise_for_status()
-            return response.text
+        def decode(response: httpx.Response) -> Any:
+            return response.text if as_text else response.json()
+
+        data, _ = await self._cache.get_or_fetch_http(
+            build_cache_key(url, params or {}, as_text),
+            request,
+            decode,
+            ttl=cache_ttl,
+        )
+        return data
+
+    async def _get_json(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        *,
+        cache_ttl: float | None = None,
+    ) -> Any:
+        """Make GET request and return JSON response (cached)."""
+        return await self._cached_get(url, params, as_text=False, cache_ttl=cache_ttl)
+
+    async def _get_text(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        *,
+        cache_ttl: float | None = None,
+    ) -> str:
+        """Make GET request and return raw text response (cached)."""
+        return await self._cached_get(url, params, as_text=True, cache_ttl=cache_ttl)
 
     async def search_documents(
         self,
@@ -666,7 +703,7 @@ class RiksdagenService:
         url = f"{self.base_url}/organ/"
 
         try:
-            data = await self._get_json(url, params)
+            data = await self._get_json(url, params, cache_ttl=RIKSDAGEN_CACHE_TTL_META)
 
             if isinstance(data, dict):
                 items = data.get("organlista", {}).get("organ", [])
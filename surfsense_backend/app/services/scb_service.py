@@ -12,8 +12,8 @@ from typing import Any
 from urllib.parse import quote as url_quote
 
 import httpx
-from cachetools import TTLCache
 
+from app.services.response_cache import ResponseCache
 from app.utils.text import (
     normalize_text as _normalize_text,
     score_text as _score_text,
@@ -48,6 +48,11 @@ SCB_OUTPUT_FORMATS = frozenset({
     "json-stat2", "csv", "xlsx", "parquet", "html", "px", "json-px",
 })
 
+
+class _UnexpectedScbResponseError(ValueError):
+    """Raised inside cached fetches so a malformed body is not cached."""
+
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
@@ -273,7 +278,8 @@ class ScbService:
 
     Changes from v1-only implementation:
     - Persistent httpx.AsyncClient with connection pooling (OPT-1)
-    - asyncio.Lock on caches to prevent race conditions (BUG-1)
+    - Shared two-tier response cache with single-flight (replaces the
+      lock-guarded per-instance TTL caches of BUG-1 / OPT-4)
     - v2 table search via GET /tables?query= (OPT-3)
     - v2 metadata via GET /tables/{id}/metadata
     - v2 data via POST /tables/{id}/data with selection[] format
@@ -293,23 +299,9 @@ class ScbService:
         self.max_cells = max_cells
         self._is_v2 = "/api/v2" in self.base_url
         self._client: httpx.AsyncClient | None = None
-        # TTL caches with lock (OPT-4 + BUG-1 fix)
-        self._cache_lock = asyncio.Lock()
-        self._node_cache: TTLCache[str, list[dict[str, Any]]] = TTLCache(
-            maxsize=1000, ttl=cache_ttl,
-        )
-        self._metadata_cache: TTLCache[str, dict[str, Any]] = TTLCache(
-            maxsize=500, ttl=cache_ttl,
-        )
-        self._codelist_cache: TTLCache[str, dict[str, Any]] = TTLCache(
-            maxsize=200, ttl=cache_ttl,
-        )
-
-        from app.services.cache_control import register_service_cache
-
-        register_service_cache(self._node_cache)
-        register_service_cache(self._metadata_cache)
-        register_service_cache(self._codelist_cache)
+        # Tree nodes, table metadata and codelists (OPT-4); concurrent
+        # identical lookups share one request (BUG-1)
+        self._cache = ResponseCache("scb", default_ttl=cache_ttl, max_entries=1700)
 
     # -- Lifecycle -----------------------------------------------------------
 
@@ -348,6 +340,21 @@ class ScbService:
         response.raise_for_status()
         return self._decode_json_response(response)
 
+    async def _get_json_of_type(
+        self,
+        url: str,
+        expected: type[list] | type[dict],
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """GET ``url`` and raise ``_UnexpectedScbResponseError`` on the wrong shape."""
+        data = await self._get_json(url, params=params)
+        if not isinstance(data, expected):
+            raise _UnexpectedScbResponseError(
+                f"Expected {expected.__name__} from {url}, got {type(data).__name__}"
+            )
+        return data
+
     async def _post_json(
         self,
         url: str,
@@ -446,14 +453,13 @@ class ScbService:
 
     async def list_nodes(self, path: str) -> list[dict[str, Any]]:
         url = self._build_url(path, trailing=True)
-        async with self._cache_lock:
-            if url in self._node_cache:
-                return list(self._node_cache[url])
-        data = await self._get_json(url)
-        if not isinstance(data, list):
+        try:
+            data, _ = await self._cache.get_or_fetch(
+                f"nodes:{url}", lambda: self._get_json_of_type(url, list)
+            )
+        except _UnexpectedScbResponseError as exc:
+            logger.warning("%s", exc)
             return []
-        async with self._cache_lock:
-            self._node_cache[url] = data
         return list(data)
 
     async def collect_tables(
@@ -604,12 +610,15 @@ class ScbService:
             return {"error": "Codelists only available with v2 API."}
         url = f"{self.base_url}codelists/{url_quote(codelist_id, safe='')}"
         try:
-            data = await self._get_json(url, params={"lang": "sv"})
+            data, _ = await self._cache.get_or_fetch(
+                f"codelist:{url}",
+                lambda: self._get_json_of_type(url, dict, params={"lang": "sv"}),
+            )
+        except _UnexpectedScbResponseError:
+            return {"error": "Unexpected codelist response format."}
         except Exception as exc:
             return {"error": f"Failed to fetch codelist: {exc!s}"}
-        if not isinstance(data, dict):
-            return {"error": "Unexpected codelist response format."}
-        return data
+        return dict(data)
 
     def auto_complete_selection(
         self,
@@ -700,39 +709,34 @@ class ScbService:
 
     async def _get_table_metadata_v2(self, table_id: str) -> dict[str, Any]:
         """Fetch metadata via v2 /tables/{id}/metadata."""
-        cache_key = f"v2:{table_id}"
-        async with self._cache_lock:
-            if cache_key in self._metadata_cache:
-                return dict(self._metadata_cache[cache_key])
-
         clean_id = table_id.strip("/")
         url = f"{self.base_url}tables/{url_quote(clean_id, safe='')}/metadata"
+
+        async def fetch() -> dict[str, Any]:
+            data = await self._get_json_of_type(url, dict, params={"lang": "sv"})
+            # Normalize v2 metadata to match the internal format expected by
+            # _build_selections and _score_table_metadata.
+            return self._normalize_v2_metadata(data)
+
         try:
-            data = await self._get_json(url, params={"lang": "sv"})
+            metadata, _ = await self._cache.get_or_fetch(f"metadata:v2:{table_id}", fetch)
         except httpx.HTTPError:
             return {}
-
-        if not isinstance(data, dict):
+        except _UnexpectedScbResponseError as exc:
+            logger.warning("%s", exc)
             return {}
-
-        # Normalize v2 metadata to match the internal format expected by
-        # _build_selections and _score_table_metadata.
-        metadata = self._normalize_v2_metadata(data)
-        async with self._cache_lock:
-            self._metadata_cache[cache_key] = metadata
-        return metadata
+        return dict(metadata)
 
     async def _get_table_metadata_v1(self, table_path: str) -> dict[str, Any]:
         url = self._build_url(table_path, trailing=False)
-        async with self._cache_lock:
-            if url in self._metadata_cache:
-                return dict(self._metadata_cache[url])
-        data = await self._get_json(url)
-        if isinstance(data, dict):
-            async with self._cache_lock:
-                self._metadata_cache[url] = data
-            return data
-        return {}
+        try:
+            data, _ = await self._cache.get_or_fetch(
+                f"metadata:{url}", lambda: self._get_json_of_type(url, dict)
+            )
+        except _UnexpectedScbResponseError as exc:
+            logger.warning("%s", exc)
+            return {}
+        return dict(data)
 
     @staticmethod
     def _normalize_v2_metadata(data: dict[str, Any]) -> dict[str, Any]:
@@ -4,11 +4,16 @@ import csv
 import io
 import logging
 import math
+import os
+from collections.abc import Callable
 from typing import Any
 from urllib.parse import urlencode
 
 import httpx
 
+from app.services.http_clients import get_http_client
+from app.services.response_cache import ResponseCache, build_cache_key
+
 SMHI_SOURCE = "SMHI Open Data"
 
 SMHI_METFCST_BASE_URL = "https://opendata-download-metfcst.smhi.se/api"
@@ -19,6 +24,11 @@ SMHI_OCOBS_BASE_URL = "https://opendata-download-ocobs.smhi.se/api"
 SMHI_STRANG_BASE_URL = "https://strang.smhi.se/api"
 
 _DEFAULT_USER_AGENT = "SurfSense/1.0 (+https://surfsense.ai)"
+
+# Forecasts and observations are republished about hourly; catalogs,
+# parameter and station lists change rarely.
+SMHI_CACHE_TTL = int(os.getenv("SMHI_CACHE_TTL", "600"))
+SMHI_CACHE_TTL_META = int(os.getenv("SMHI_CACHE_TTL_META", "21600"))
 _OBS_PERIOD_PRIORITY = (
     "latest-hour",
     "latest-day",
@@ -58,6 +68,32 @@ class SmhiService:
     def __init__(self, *, timeout: float = 15.0, user_agent: str = _DEFAULT_USER_AGENT):
         self.timeout = timeout
         self.user_agent = user_agent
+        self._cache = ResponseCache("smhi", default_ttl=SMHI_CACHE_TTL)
+
+    async def _cached_get(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any] | None,
+        headers: dict[str, str],
+        decode: Callable[[httpx.Response], Any],
+        cache_ttl: float | None,
+    ) -> Any:
+        async def request(validators: dict[str, str]) -> httpx.Response:
+            return await get_http_client(url).get(
+                url,
+                params=params,
+                headers={**headers, **validators},
+                timeout=self.timeout,
+            )
+
+        payload, _ = await self._cache.get_or_fetch_http(
+            build_cache_key(url, params, headers),
+            request,
+            decode,
+            ttl=cache_ttl,
+        )
+        return payload
 
     async def _fetch_json(
         self,
@@ -65,13 +101,13 @@ class SmhiService:
         *,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        cache_ttl: float | None = None,
     ) -> Any:
         request_headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
         if headers:
             request_headers.update(headers)
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params, headers=request_headers)
-            response.raise_for_status()
+
+        def decode(response: httpx.Response) -> Any:
             if not _is_json_content_type(response.headers.get("content-type", "")):
                 sample = response.text[:120].replace("\n", " ")
                 raise RuntimeError(
@@ -80,20 +116,32 @@ class SmhiService:
                 )
             return response.json()
 
+        return await self._cached_get(
+            url,
+            params=params,
+            headers=request_headers,
+            decode=decode,
+            cache_ttl=cache_ttl,
+        )
+
     async def _fetch_text(
         self,
         url: str,
         *,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        cache_ttl: float | None = None,
     ) -> str:
         request_headers = {"User-Agent": self.user_agent}
         if headers:
             request_headers.update(headers)
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params, headers=request_headers)
-            response.raise_for_status()
-            return response.text
+        return await self._cached_get(
+            url,
+            params=params,
+            headers=request_headers,
+            decode=lambda response: response.text,
+            cache_ttl=cache_ttl,
+        )
 
     async def fetch_grid_point_data(
         self,
@@ -152,14 +200,14 @@ class SmhiService:
             f"{base_url.rstrip('/')}/category/{category}/version/{version}"
             f"{period_part}/parameter.json"
         )
-        payload = await self._fetch_json(url)
+        payload = await self._fetch_json(url, cache_ttl=SMHI_CACHE_TTL_META)
         if not isinstance(payload, dict):
             raise RuntimeError("SMHI parameter endpoint returned non-object JSON payload.")
         return payload
 
     async def fetch_latest_catalog(self, *, base_url: str) -> dict[str, Any]:
         url = f"{base_url.rstrip('/')}/version/latest.json"
-        payload = await self._fetch_json(url)
+        payload = await self._fetch_json(url, cache_ttl=SMHI_CACHE_TTL_META)
         if not isinstance(payload, dict):
             raise RuntimeError("SMHI catalog endpoint returned non-object JSON payload.")
         return payload
@@ -308,7 +356,9 @@ class SmhiService:
         parameter_url = (
             f"{base_url.rstrip('/')}/version/latest/parameter/{parameter_key}.json"
         )
-        parameter_payload = await self._fetch_json(parameter_url)
+        parameter_payload = await self._fetch_json(
+            parameter_url, cache_ttl=SMHI_CACHE_TTL_META
+        )
         if not isinstance(parameter_payload, dict):
             raise RuntimeError("SMHI parameter payload was not a JSON object.")
 
@@ -332,7 +382,9 @@ class SmhiService:
             f"{base_url.rstrip('/')}/version/latest/parameter/{parameter_key}"
             f"/station/{resolved_station_key}.json"
         )
-        station_payload = await self._fetch_json(station_url)
+        station_payload = await self._fetch_json(
+            station_url, cache_ttl=SMHI_CACHE_TTL_META
+        )
         if not isinstance(station_payload, dict):
             raise RuntimeError("SMHI station payload was not a JSON object.")
 
@@ -352,7 +404,9 @@ class SmhiService:
             f"{base_url.rstrip('/')}/version/1.0/parameter/{parameter_key}"
             f"/station/{resolved_station_key}/period/{resolved_period_key}.json"
         )
-        period_payload = await self._fetch_json(period_url)
+        period_payload = await self._fetch_json(
+            period_url, cache_ttl=SMHI_CACHE_TTL_META
+        )
         if not isinstance(period_payload, dict):
             raise RuntimeError("SMHI period payload was not a JSON object.")
 
@@ -467,11 +521,13 @@ class SmhiService:
             params["from"] = from_date
         if to_date:
             params["to"] = to_date
-        request_headers = {"User-Agent": self.user_agent}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params, headers=request_headers)
-            response.raise_for_status()
-            payload = response.json()
+        payload = await self._cached_get(
+            url,
+            params=params,
+            headers={"User-Agent": self.user_agent},
+            decode=lambda response: response.json(),
+            cache_ttl=None,
+        )
         if not isinstance(payload, dict):
             raise RuntimeError("STRÅNG endpoint returned non-object JSON payload.")
         return payload
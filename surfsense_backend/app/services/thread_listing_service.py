@@ -0,0 +1,243 @@
+"""
+Keyset-paginated thread listing for the chat sidebar.
+
+Threads are ordered by ``(updated_at DESC, id DESC)`` and paged with an opaque
+cursor that encodes the last row of the previous page, so every page is an
+index range scan instead of a scan of the whole search space.
+
+The visibility rule (own threads, shared threads, and legacy threads for the
+search space owner) is an ``OR`` that PostgreSQL cannot walk in index order.
+Each branch is therefore queried separately against the composite indexes
+created in migration 115, limited to one page, and the branches are merged
+with ``UNION``. The work per page is bounded by ``3 * (limit + 1)`` rows no
+matter how many threads the search space holds.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, select, tuple_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import ChatVisibility, NewChatThread
+from app.schemas.new_chat import ThreadListItem
+
+DEFAULT_THREAD_PAGE_SIZE = 50
+MAX_THREAD_PAGE_SIZE = 200
+
+# Only the columns the sidebar renders; the composite indexes INCLUDE them so
+# the first page can be served from the index.
+_THREAD_LIST_COLUMNS = (
+    NewChatThread.id,
+    NewChatThread.title,
+    NewChatThread.archived,
+    NewChatThread.visibility,
+    NewChatThread.created_by_id,
+    NewChatThread.created_at,
+    NewChatThread.updated_at,
+)
+
+
+class InvalidThreadCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_thread_cursor(updated_at: datetime, thread_id: int) -> str:
+    """Encode the last row of a page as an opaque, URL-safe cursor."""
+    payload = json.dumps(
+        {"u": updated_at.isoformat(), "i": int(thread_id)}, separators=(",", ":")
+    )
+    encoded = base64.urlsafe_b64encode(payload.encode("utf-8"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_thread_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by :func:`encode_thread_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        updated_at = datetime.fromisoformat(payload["u"])
+        thread_id = int(payload["i"])
+    except (
+        binascii.Error,
+        UnicodeError,
+        ValueError,
+        KeyError,
+        TypeError,
+    ) as e:
+        raise InvalidThreadCursorError("Invalid thread cursor") from e
+    return updated_at, thread_id
+
+
+def clamp_thread_page_size(limit: int | None) -> int:
+    """Return a page size within ``[1, MAX_THREAD_PAGE_SIZE]``."""
+    if limit is None or limit <= 0:
+        return DEFAULT_THREAD_PAGE_SIZE
+    return min(limit, MAX_THREAD_PAGE_SIZE)
+
+
+def _visibility_branches(user_id: UUID, is_search_space_owner: bool) -> list:
+    # 1. Created by the current user (any visibility)
+    # 2. Shared with the search space (visibility = SEARCH_SPACE)
+    # 3. Legacy threads (created_by_id is NULL) - only visible to search space owner
+    branches = [
+        NewChatThread.created_by_id == user_id,
+        NewChatThread.visibility == ChatVisibility.SEARCH_SPACE,
+    ]
+    if is_search_space_owner:
+        branches.append(NewChatThread.created_by_id.is_(None))
+    return branches
+
+
+def build_thread_page_query(
+    *,
+    search_space_id: int,
+    user_id: UUID,
+    is_search_space_owner: bool,
+    archived: bool | None,
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    title: str | None = None,
+    visibility: ChatVisibility | None = None,
+) -> Select:
+    """
+    Build the statement for one page of accessible threads.
+
+    The statement returns up to ``limit + 1`` rows; the extra row only tells
+    the caller whether another page exists.
+
+    Args:
+        search_space_id: The search space to list threads for
+        user_id: The requesting user
+        is_search_space_owner: Whether legacy threads without a creator are visible
+        archived: Restrict to active (False) or archived (True) threads, or None for both
+        limit: Page size
+        cursor: Decoded ``(updated_at, id)`` of the last row of the previous page
+        title: Optional case-insensitive substring filter on the title
+        visibility: Optional filter on the thread visibility
+    """
+    common = [NewChatThread.search_space_id == search_space_id]
+    if archived is not None:
+        common.append(NewChatThread.archived == archived)
+    if visibility is not None:
+        common.append(NewChatThread.visibility == visibility)
+    if cursor is not None:
+        common.append(
+            tuple_(NewChatThread.updated_at, NewChatThread.id) < tuple_(*cursor)
+        )
+    if title:
+        # Served by the pg_trgm GIN index idx_new_chat_threads_title_trgm
+        common.append(NewChatThread.title.ilike(f"%{title}%"))
+
+    branch_queries = [
+        select(*_THREAD_LIST_COLUMNS)
+        .where(*common, condition)
+        .order_by(NewChatThread.updated_at.desc(), NewChatThread.id.desc())
+        .limit(limit + 1)
+        for condition in _visibility_branches(user_id, is_search_space_owner)
+    ]
+    merged = union(*branch_queries).subquery("accessible_threads")
+    return (
+        select(merged)
+        .order_by(merged.c.updated_at.desc(), merged.c.id.desc())
+        .limit(limit + 1)
+    )
+
+
+async def fetch_thread_page(
+    session: AsyncSession,
+    *,
+    search_space_id: int,
+    user_id: UUID,
+    is_search_space_owner: bool,
+    archived: bool | None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    title: str | None = None,
+    visibility: ChatVisibility | None = None,
+) -> tuple[list[ThreadListItem], str | None]:
+    """
+    Fetch one page of accessible threads.
+
+    Returns:
+        The page items and the cursor for the next page (None on the last page)
+
+    Raises:
+        InvalidThreadCursorError: If ``cursor`` is malformed
+    """
+    page_size = clamp_thread_page_size(limit)
+    decoded_cursor = decode_thread_cursor(cursor) if cursor else None
+    query = build_thread_page_query(
+        search_space_id=search_space_id,
+        user_id=user_id,
+        is_search_space_owner=is_search_space_owner,
+        archived=archived,
+        limit=page_size,
+        cursor=decoded_cursor,
+        title=title,
+        visibility=visibility,
+    )
+    rows = (await session.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_thread_cursor(last.updated_at, last.id)
+
+    items = [
+        ThreadListItem(
+            id=row.id,
+            title=row.title,
+            archived=row.archived,
+            visibility=row.visibility,
+            created_by_id=row.created_by_id,
+            # Legacy threads (no creator) are treated as own threads for owner
+            is_own_thread=(
+                row.created_by_id == user_id
+                or (row.created_by_id is None and is_search_space_owner)
+            ),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        for row in rows
+    ]
+    return items, next_cursor
+
+
+async def fetch_all_threads(
+    session: AsyncSession,
+    *,
+    search_space_id: int,
+    user_id: UUID,
+    is_search_space_owner: bool,
+    archived: bool | None,
+    title: str | None = None,
+    visibility: ChatVisibility | None = None,
+) -> list[ThreadListItem]:
+    """
+    Fetch every accessible thread matching the filters, newest first.
+
+    Walks the keyset pages with the largest page size, for callers that need
+    the complete result rather than one page.
+    """
+    threads: list[ThreadListItem] = []
+    cursor = None
+    while True:
+        page, cursor = await fetch_thread_page(
+            session,
+            search_space_id=search_space_id,
+            user_id=user_id,
+            is_search_space_owner=is_search_space_owner,
+            archived=archived,
+            limit=MAX_THREAD_PAGE_SIZE,
+            cursor=cursor,
+            title=title,
+            visibility=visibility,
+        )
+        threads.extend(page)
+        if cursor is None:
+            return threads
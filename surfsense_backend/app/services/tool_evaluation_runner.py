@@ -0,0 +1,199 @@
+"""
+Concurrent, memoized execution of tool-evaluation cases.
+
+``run_tool_evaluation`` and ``run_tool_api_input_evaluation`` evaluate every
+case with several LLM calls (intent planning, agent choice, tool choice and
+supervisor review).  Cases are independent, so they are run through a
+``ForgePool`` bounded by ``TOOL_EVALUATION_CONCURRENCY``; each case reports
+its own progress events, so callers see them in completion order, while the
+returned outcomes keep the order of the test list.
+
+A finished case is stored under ``evaluation_case_key`` - a hash of the case,
+the prompt overrides, the intent definitions, the model and the metadata
+version hash of the tools the case retrieved.  Re-running a suite after a
+metadata change only re-evaluates cases whose candidate tools changed, and
+an interrupted run resumes from the cases it already persisted.  Failed
+cases are never stored.  Stored outcomes older than
+``TOOL_EVALUATION_CASE_CACHE_MAX_AGE_DAYS`` are deleted when a run starts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.agents.new_chat.forge_pool import ForgePool
+from app.config import config
+from app.db import GlobalToolEvaluationCaseResult, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+def evaluation_case_key(**parts: Any) -> str:
+    """Stable hash of everything a case result depends on."""
+    encoded = json.dumps(parts, ensure_ascii=True, sort_keys=True, default=str)
+    return sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def llm_identity(llm: Any) -> str | None:
+    """Model name of *llm*, so results of different models are kept apart."""
+    if llm is None:
+        return None
+    for attribute in ("model_name", "model", "model_id"):
+        value = getattr(llm, attribute, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(llm).__name__
+
+
+class EvaluationCaseStore:
+    """In-process case outcome store; also the interface of persistent stores."""
+
+    def __init__(self) -> None:
+        self._outcomes: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        outcome = await self._load(key)
+        if outcome is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return outcome
+
+    async def put(self, key: str, *, test_id: str, outcome: dict[str, Any]) -> None:
+        # Round-trip through JSON so callers get the same copy a database
+        # store would return.
+        self._outcomes[key] = json.loads(json.dumps(outcome, default=str))
+
+    async def _load(self, key: str) -> dict[str, Any] | None:
+        return self._outcomes.get(key)
+
+    async def prune_expired(self) -> int:
+        """Delete outcomes past the retention period; returns the count."""
+        return 0
+
+
+class DatabaseEvaluationCaseStore(EvaluationCaseStore):
+    """Case outcomes persisted in ``tool_evaluation_case_results_global``.
+
+    Each read and write uses its own short session, so cases finishing
+    concurrently do not share a connection.  Storage errors are logged and
+    treated as misses: the case is simply evaluated again.
+
+    Outcomes are kept for ``max_age_days`` after they were last written
+    (``0`` keeps them forever); an expired case is evaluated and stored again
+    on its next run.
+    """
+
+    def __init__(
+        self,
+        *,
+        search_space_id: int,
+        evaluation_kind: str,
+        max_age_days: int | None = None,
+        session_factory: Callable[[], Any] = async_session_maker,
+    ) -> None:
+        super().__init__()
+        self.search_space_id = search_space_id
+        self.evaluation_kind = evaluation_kind
+        self.max_age_days = (
+            config.TOOL_EVALUATION_CASE_CACHE_MAX_AGE_DAYS
+            if max_age_days is None
+            else max_age_days
+        )
+        self._session_factory = session_factory
+
+    async def _load(self, key: str) -> dict[str, Any] | None:
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(GlobalToolEvaluationCaseResult.outcome).where(
+                        GlobalToolEvaluationCaseResult.cache_key == key
+                    )
+                )
+                outcome = result.scalar_one_or_none()
+        except Exception:
+            logger.warning("[tool_eval] Case result lookup failed", exc_info=True)
+            return None
+        return outcome if isinstance(outcome, dict) else None
+
+    async def put(self, key: str, *, test_id: str, outcome: dict[str, Any]) -> None:
+        statement = insert(GlobalToolEvaluationCaseResult).values(
+            search_space_id=self.search_space_id,
+            evaluation_kind=self.evaluation_kind,
+            cache_key=key,
+            test_id=test_id[:200],
+            outcome=outcome,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[GlobalToolEvaluationCaseResult.cache_key],
+            # Refreshing the timestamp keeps re-stored outcomes out of
+            # prune_expired.
+            set_={"outcome": statement.excluded.outcome, "updated_at": func.now()},
+        )
+        try:
+            async with self._session_factory() as session:
+                await session.execute(statement)
+                await session.commit()
+        except Exception:
+            logger.warning("[tool_eval] Failed to persist case result", exc_info=True)
+
+    async def prune_expired(self) -> int:
+        if self.max_age_days <= 0:
+            return 0
+        cutoff = datetime.now(UTC) - timedelta(days=self.max_age_days)
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    delete(GlobalToolEvaluationCaseResult).where(
+                        GlobalToolEvaluationCaseResult.updated_at < cutoff
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("[tool_eval] Failed to prune case results", exc_info=True)
+            return 0
+        return int(result.rowcount or 0)
+
+
+def default_case_store(
+    *, search_space_id: int, evaluation_kind: str
+) -> EvaluationCaseStore | None:
+    """The persistent case store, or ``None`` when memoization is disabled."""
+    if not config.TOOL_EVALUATION_CASE_CACHE_ENABLED:
+        return None
+    return DatabaseEvaluationCaseStore(
+        search_space_id=search_space_id, evaluation_kind=evaluation_kind
+    )
+
+
+async def run_evaluation_cases[T](
+    tests: Sequence[dict[str, Any]],
+    evaluate_case: Callable[[int, dict[str, Any]], Awaitable[T]],
+    *,
+    concurrency: int | None = None,
+    label: str = "tool_eval",
+) -> list[T]:
+    """Evaluate every test concurrently and return outcomes in test order.
+
+    ``evaluate_case`` must handle its own errors; an exception escaping it
+    aborts the run.
+    """
+    limit = (
+        concurrency if concurrency is not None else config.TOOL_EVALUATION_CONCURRENCY
+    )
+    pool = ForgePool(max(1, int(limit)))
+    return await pool.gather(
+        [evaluate_case(index, test) for index, test in enumerate(tests)],
+        return_exceptions=False,
+        label=label,
+    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from collections import Counter
+from dataclasses import dataclass, field, fields
 import json
 import re
 from hashlib import sha256
@@ -42,6 +43,12 @@ from app.agents.new_chat.nodes.execution_router import (
 )
 from app.agents.new_chat.routing import Route
 from app.agents.new_chat.skolverket_tools import SKOLVERKET_TOOL_DEFINITIONS
+from app.services.tool_evaluation_runner import (
+    EvaluationCaseStore,
+    evaluation_case_key,
+    llm_identity,
+    run_evaluation_cases,
+)
 
 _SUGGESTION_STOPWORDS = {
     "a",
@@ -370,6 +377,96 @@ def _build_difficulty_breakdown(
     return rows
 
 
+@dataclass
+class _CaseAccumulators:
+    """Checks and scores collected while evaluating cases.
+
+    Each case fills its own instance and persists it with ``to_outcome``;
+    the run folds the outcomes together in test order with ``merged``.
+    """
+
+    results: list[dict[str, Any]] = field(default_factory=list)
+    intent_checks: list[bool] = field(default_factory=list)
+    route_checks: list[bool] = field(default_factory=list)
+    sub_route_checks: list[bool] = field(default_factory=list)
+    graph_complexity_checks: list[bool] = field(default_factory=list)
+    execution_strategy_checks: list[bool] = field(default_factory=list)
+    agent_checks: list[bool] = field(default_factory=list)
+    gated_scores: list[float] = field(default_factory=list)
+    plan_checks: list[bool] = field(default_factory=list)
+    supervisor_review_scores: list[float] = field(default_factory=list)
+    supervisor_review_pass_checks: list[bool] = field(default_factory=list)
+    category_checks: list[bool] = field(default_factory=list)
+    tool_checks: list[bool] = field(default_factory=list)
+    retrieval_checks: list[bool] = field(default_factory=list)
+    schema_checks: list[bool] = field(default_factory=list)
+    required_field_recalls: list[float] = field(default_factory=list)
+    field_value_checks: list[bool] = field(default_factory=list)
+    clarification_checks: list[bool] = field(default_factory=list)
+    difficulty_buckets: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def to_outcome(self) -> dict[str, Any]:
+        """Return the JSON outcome of a single evaluated case."""
+        outcome: dict[str, Any] = {"result": self.results[0]}
+        for item in fields(self):
+            if item.name != "results":
+                outcome[item.name] = getattr(self, item.name)
+        return outcome
+
+    @classmethod
+    def merged(cls, outcomes: list[dict[str, Any]]) -> _CaseAccumulators:
+        """Fold per-case outcomes into run totals, in test order."""
+        totals = cls()
+        list_names = [
+            item.name
+            for item in fields(cls)
+            if item.name not in ("results", "difficulty_buckets")
+        ]
+        for outcome in outcomes:
+            totals.results.append(outcome["result"])
+            for name in list_names:
+                getattr(totals, name).extend(outcome.get(name) or [])
+            for difficulty, case_bucket in (
+                outcome.get("difficulty_buckets") or {}
+            ).items():
+                bucket = totals.difficulty_buckets.setdefault(
+                    difficulty,
+                    {"total_tests": 0, "passed_tests": 0, "gated_scores": []},
+                )
+                bucket["total_tests"] += int(case_bucket.get("total_tests") or 0)
+                bucket["passed_tests"] += int(case_bucket.get("passed_tests") or 0)
+                bucket["gated_scores"].extend(case_bucket.get("gated_scores") or [])
+        return totals
+
+
+async def _emit_cached_case_completed(
+    progress_callback, result: dict[str, Any], idx: int
+) -> None:
+    if progress_callback is None:
+        return
+    event = {
+        "type": "test_completed",
+        "test_id": result.get("test_id"),
+        "index": idx,
+        "selected_intent": result.get("selected_intent"),
+        "selected_route": result.get("selected_route"),
+        "selected_sub_route": result.get("selected_sub_route"),
+        "selected_graph_complexity": result.get("selected_graph_complexity"),
+        "selected_execution_strategy": result.get("selected_execution_strategy"),
+        "selected_agent": result.get("selected_agent"),
+        "agent_selection_analysis": result.get("agent_selection_analysis"),
+        "selected_tool": result.get("selected_tool"),
+        "selected_category": result.get("selected_category"),
+        "consistency_warnings": result.get("consistency_warnings") or [],
+        "expected_normalized": bool(result.get("expected_normalized")),
+        "passed": result.get("passed"),
+        "cached": True,
+    }
+    maybe_result = progress_callback(event)
+    if hasattr(maybe_result, "__await__"):
+        await maybe_result
+
+
 # ---------------------------------------------------------------------------
 # Per-namespace confusion matrix
 # ---------------------------------------------------------------------------
@@ -2346,15 +2443,15 @@ def _enrich_metadata_suggestion_fields(
         merged["example_queries"] = proposed_examples
 
     # Propagate identity fields from proposed or fallback
-    for field in ("main_identifier", "core_activity", "unique_scope", "geographic_scope"):
-        current_val = str(current.get(field) or "").strip()
-        proposed_val = str(merged.get(field) or "").strip()
-        fallback_val = str(fallback.get(field) or "").strip()
+    for identity_field in ("main_identifier", "core_activity", "unique_scope", "geographic_scope"):
+        current_val = str(current.get(identity_field) or "").strip()
+        proposed_val = str(merged.get(identity_field) or "").strip()
+        fallback_val = str(fallback.get(identity_field) or "").strip()
         if proposed_val == current_val and fallback_val and fallback_val != current_val:
-            merged[field] = fallback_val
+            merged[identity_field] = fallback_val
             enriched = True
         elif proposed_val:
-            merged[field] = proposed_val
+            merged[identity_field] = proposed_val
 
     current_excludes = _safe_string_list(current.get("excludes"))
     proposed_excludes = _safe_string_list(merged.get("excludes"))
@@ -2384,28 +2481,17 @@ async def run_tool_evaluation(
     prompt_overrides: dict[str, str] | None = None,
     intent_definitions: list[dict[str, Any]] | None = None,
     progress_callback=None,
+    concurrency: int | None = None,
+    case_store: EvaluationCaseStore | None = None,
 ) -> dict[str, Any]:
     retrieval_limit = max(1, min(int(retrieval_limit or 5), 15))
     normalized_tuning = normalize_retrieval_tuning(retrieval_tuning)
     index_by_id = {entry.tool_id: entry for entry in tool_index}
-    results: list[dict[str, Any]] = []
-
-    intent_checks: list[bool] = []
-    route_checks: list[bool] = []
-    sub_route_checks: list[bool] = []
-    graph_complexity_checks: list[bool] = []
-    execution_strategy_checks: list[bool] = []
-    agent_checks: list[bool] = []
-    gated_scores: list[float] = []
-    plan_checks: list[bool] = []
-    supervisor_review_scores: list[float] = []
-    supervisor_review_pass_checks: list[bool] = []
-    category_checks: list[bool] = []
-    tool_checks: list[bool] = []
-    retrieval_checks: list[bool] = []
-    difficulty_buckets: dict[str, dict[str, Any]] = {}
-
-    for idx, test in enumerate(tests):
+    model_identity = llm_identity(llm)
+
+    async def _evaluate_case(idx: int, test: dict[str, Any]) -> dict[str, Any]:
+        case = _CaseAccumulators()
+        case_key: str | None = None
         test_id = str(test.get("id") or f"case-{idx + 1}")
         question = str(test.get("question") or "").strip()
         difficulty = _normalize_difficulty_value(test.get("difficulty"))
@@ -2499,6 +2585,48 @@ async def run_tool_evaluation(
         supervisor_review_rubric: list[dict[str, Any]] = []
 
         try:
+            retrieved_ids, retrieval_breakdown = smart_retrieve_tools_with_breakdown(
+                question,
+                tool_index=tool_index,
+                primary_namespaces=[("tools",)],
+                fallback_namespaces=[],
+                limit=max(retrieval_limit, 8),
+                trace_key=None,
+                tuning=normalized_tuning,
+            )
+            retrieved_entries = [
+                index_by_id[tool_id]
+                for tool_id in retrieved_ids
+                if tool_id in index_by_id
+            ]
+            if case_store is not None:
+                case_key = evaluation_case_key(
+                    kind="tool",
+                    test=test,
+                    metadata_hash=compute_metadata_version_hash(
+                        [
+                            *retrieved_entries,
+                            *(
+                                index_by_id[tool_id]
+                                for tool_id in allowed_tools
+                                if tool_id in index_by_id
+                            ),
+                        ]
+                    ),
+                    retrieved_ids=retrieved_ids,
+                    retrieval_breakdown=retrieval_breakdown[:retrieval_limit],
+                    prompt_overrides=prompt_overrides,
+                    intent_definitions=intent_definitions,
+                    model=model_identity,
+                    retrieval_limit=retrieval_limit,
+                    use_llm_supervisor_review=use_llm_supervisor_review,
+                )
+                cached = await case_store.get(case_key)
+                if cached is not None:
+                    await _emit_cached_case_completed(
+                        progress_callback, cached["result"], idx
+                    )
+                    return cached
             (
                 selected_route,
                 selected_sub_route,
@@ -2550,20 +2678,6 @@ async def run_tool_evaluation(
                 if expected_acceptable_agents
                 else (selected_agent == expected_agent if expected_agent is not None else None)
             )
-            retrieved_ids, retrieval_breakdown = smart_retrieve_tools_with_breakdown(
-                question,
-                tool_index=tool_index,
-                primary_namespaces=[("tools",)],
-                fallback_namespaces=[],
-                limit=max(retrieval_limit, 8),
-                trace_key=None,
-                tuning=normalized_tuning,
-            )
-            retrieved_entries = [
-                index_by_id[tool_id]
-                for tool_id in retrieved_ids
-                if tool_id in index_by_id
-            ]
             planning = await _plan_tool_choice(
                 question=question,
                 candidates=retrieved_entries[:8],
@@ -2664,14 +2778,16 @@ async def run_tool_evaluation(
             )
             if supervisor_review_score is not None:
                 supervisor_review_score = max(0.0, min(1.0, supervisor_review_score))
-                supervisor_review_scores.append(supervisor_review_score)
+                case.supervisor_review_scores.append(supervisor_review_score)
             supervisor_review_passed = (
                 bool(supervisor_review.get("passed"))
                 if isinstance(supervisor_review.get("passed"), bool)
                 else None
             )
             if supervisor_review_passed is not None:
-                supervisor_review_pass_checks.append(bool(supervisor_review_passed))
+                case.supervisor_review_pass_checks.append(
+                    bool(supervisor_review_passed)
+                )
             supervisor_review_rationale = str(
                 supervisor_review.get("rationale") or ""
             ).strip() or None
@@ -2724,28 +2840,28 @@ async def run_tool_evaluation(
                 else None
             )
             if agent_gate_score is not None:
-                gated_scores.append(float(agent_gate_score))
+                case.gated_scores.append(float(agent_gate_score))
 
             if passed_intent is not None:
-                intent_checks.append(bool(passed_intent))
+                case.intent_checks.append(bool(passed_intent))
             if passed_route is not None:
-                route_checks.append(bool(passed_route))
+                case.route_checks.append(bool(passed_route))
             if passed_sub_route is not None:
-                sub_route_checks.append(bool(passed_sub_route))
+                case.sub_route_checks.append(bool(passed_sub_route))
             if passed_graph_complexity is not None:
-                graph_complexity_checks.append(bool(passed_graph_complexity))
+                case.graph_complexity_checks.append(bool(passed_graph_complexity))
             if passed_execution_strategy is not None:
-                execution_strategy_checks.append(bool(passed_execution_strategy))
+                case.execution_strategy_checks.append(bool(passed_execution_strategy))
             if passed_agent is not None:
-                agent_checks.append(bool(passed_agent))
+                case.agent_checks.append(bool(passed_agent))
             if passed_plan is not None:
-                plan_checks.append(bool(passed_plan))
+                case.plan_checks.append(bool(passed_plan))
             if passed_category is not None:
-                category_checks.append(bool(passed_category))
+                case.category_checks.append(bool(passed_category))
             if passed_tool is not None:
-                tool_checks.append(bool(passed_tool))
+                case.tool_checks.append(bool(passed_tool))
             if retrieval_hit_expected_tool is not None:
-                retrieval_checks.append(bool(retrieval_hit_expected_tool))
+                case.retrieval_checks.append(bool(retrieval_hit_expected_tool))
 
             case_result = {
                 "test_id": test_id,
@@ -2804,12 +2920,12 @@ async def run_tool_evaluation(
                 "passed": passed,
             }
             _update_difficulty_bucket(
-                difficulty_buckets=difficulty_buckets,
+                difficulty_buckets=case.difficulty_buckets,
                 difficulty=difficulty,
                 passed=bool(passed),
                 gated_score=agent_gate_score,
             )
-            results.append(case_result)
+            case.results.append(case_result)
             if progress_callback is not None:
                 event = {
                     "type": "test_completed",
@@ -2832,6 +2948,7 @@ async def run_tool_evaluation(
                 if hasattr(maybe_result, "__await__"):
                     await maybe_result
         except Exception as exc:
+            case_key = None
             failed_supervisor_trace = _build_supervisor_trace(
                 question=question,
                 expected_intent=expected_intent,
@@ -2856,7 +2973,7 @@ async def run_tool_evaluation(
             failed_supervisor_review = _fallback_supervisor_trace_review(
                 supervisor_trace=failed_supervisor_trace
             )
-            results.append(
+            case.results.append(
                 {
                     "test_id": test_id,
                     "question": question,
@@ -2917,33 +3034,33 @@ async def run_tool_evaluation(
                 }
             )
             _update_difficulty_bucket(
-                difficulty_buckets=difficulty_buckets,
+                difficulty_buckets=case.difficulty_buckets,
                 difficulty=difficulty,
                 passed=False,
                 gated_score=0.0,
             )
-            gated_scores.append(0.0)
-            supervisor_review_scores.append(0.0)
-            supervisor_review_pass_checks.append(False)
+            case.gated_scores.append(0.0)
+            case.supervisor_review_scores.append(0.0)
+            case.supervisor_review_pass_checks.append(False)
             if expected_intent is not None:
-                intent_checks.append(False)
+                case.intent_checks.append(False)
             if expected_route is not None:
-                route_checks.append(False)
+                case.route_checks.append(False)
             if expected_sub_route is not None:
-                sub_route_checks.append(False)
+                case.sub_route_checks.append(False)
             if expected_graph_complexity is not None:
-                graph_complexity_checks.append(False)
+                case.graph_complexity_checks.append(False)
             if expected_execution_strategy is not None:
-                execution_strategy_checks.append(False)
+                case.execution_strategy_checks.append(False)
             if expected_agent is not None:
-                agent_checks.append(False)
+                case.agent_checks.append(False)
             if plan_requirements:
-                plan_checks.append(False)
+                case.plan_checks.append(False)
             if expected_category is not None:
-                category_checks.append(False)
+                case.category_checks.append(False)
             if expected_tool is not None:
-                tool_checks.append(False)
-                retrieval_checks.append(False)
+                case.tool_checks.append(False)
+                case.retrieval_checks.append(False)
             if progress_callback is not None:
                 event = {
                     "type": "test_failed",
@@ -2957,84 +3074,100 @@ async def run_tool_evaluation(
                 if hasattr(maybe_result, "__await__"):
                     await maybe_result
 
-    total_tests = len(results)
-    passed_count = sum(1 for item in results if item.get("passed"))
+        outcome = case.to_outcome()
+        if case_store is not None and case_key is not None:
+            await case_store.put(case_key, test_id=test_id, outcome=outcome)
+        return outcome
+
+    if case_store is not None:
+        await case_store.prune_expired()
+    outcomes = await run_evaluation_cases(
+        tests, _evaluate_case, concurrency=concurrency, label="tool_eval"
+    )
+    totals = _CaseAccumulators.merged(outcomes)
+
+    total_tests = len(totals.results)
+    passed_count = sum(1 for item in totals.results if item.get("passed"))
     metrics = {
         "total_tests": total_tests,
         "passed_tests": passed_count,
         "success_rate": (passed_count / total_tests) if total_tests else 0.0,
         "gated_success_rate": (
-            sum(gated_scores) / len(gated_scores)
-            if gated_scores
+            sum(totals.gated_scores) / len(totals.gated_scores)
+            if totals.gated_scores
             else None
         ),
         "intent_accuracy": (
-            sum(1 for check in intent_checks if check) / len(intent_checks)
-            if intent_checks
+            sum(1 for check in totals.intent_checks if check)
+            / len(totals.intent_checks)
+            if totals.intent_checks
             else None
         ),
         "route_accuracy": (
-            sum(1 for check in route_checks if check) / len(route_checks)
-            if route_checks
+            sum(1 for check in totals.route_checks if check) / len(totals.route_checks)
+            if totals.route_checks
             else None
         ),
         "sub_route_accuracy": (
-            sum(1 for check in sub_route_checks if check) / len(sub_route_checks)
-            if sub_route_checks
+            sum(1 for check in totals.sub_route_checks if check)
+            / len(totals.sub_route_checks)
+            if totals.sub_route_checks
             else None
         ),
         "graph_complexity_accuracy": (
-            sum(1 for check in graph_complexity_checks if check)
-            / len(graph_complexity_checks)
-            if graph_complexity_checks
+            sum(1 for check in totals.graph_complexity_checks if check)
+            / len(totals.graph_complexity_checks)
+            if totals.graph_complexity_checks
             else None
         ),
         "execution_strategy_accuracy": (
-            sum(1 for check in execution_strategy_checks if check)
-            / len(execution_strategy_checks)
-            if execution_strategy_checks
+            sum(1 for check in totals.execution_strategy_checks if check)
+            / len(totals.execution_strategy_checks)
+            if totals.execution_strategy_checks
             else None
         ),
         "agent_accuracy": (
-            sum(1 for check in agent_checks if check) / len(agent_checks)
-            if agent_checks
+            sum(1 for check in totals.agent_checks if check) / len(totals.agent_checks)
+            if totals.agent_checks
             else None
         ),
         "plan_accuracy": (
-            sum(1 for check in plan_checks if check) / len(plan_checks)
-            if plan_checks
+            sum(1 for check in totals.plan_checks if check) / len(totals.plan_checks)
+            if totals.plan_checks
             else None
         ),
         "supervisor_review_score": (
-            sum(supervisor_review_scores) / len(supervisor_review_scores)
-            if supervisor_review_scores
+            sum(totals.supervisor_review_scores) / len(totals.supervisor_review_scores)
+            if totals.supervisor_review_scores
             else None
         ),
         "supervisor_review_pass_rate": (
-            sum(1 for check in supervisor_review_pass_checks if check)
-            / len(supervisor_review_pass_checks)
-            if supervisor_review_pass_checks
+            sum(1 for check in totals.supervisor_review_pass_checks if check)
+            / len(totals.supervisor_review_pass_checks)
+            if totals.supervisor_review_pass_checks
             else None
         ),
         "category_accuracy": (
-            sum(1 for check in category_checks if check) / len(category_checks)
-            if category_checks
+            sum(1 for check in totals.category_checks if check)
+            / len(totals.category_checks)
+            if totals.category_checks
             else None
         ),
         "tool_accuracy": (
-            sum(1 for check in tool_checks if check) / len(tool_checks)
-            if tool_checks
+            sum(1 for check in totals.tool_checks if check) / len(totals.tool_checks)
+            if totals.tool_checks
             else None
         ),
         "retrieval_recall_at_k": (
-            sum(1 for check in retrieval_checks if check) / len(retrieval_checks)
-            if retrieval_checks
+            sum(1 for check in totals.retrieval_checks if check)
+            / len(totals.retrieval_checks)
+            if totals.retrieval_checks
             else None
         ),
-        "difficulty_breakdown": _build_difficulty_breakdown(difficulty_buckets),
-        "namespace_confusion": build_namespace_confusion_matrix(results),
+        "difficulty_breakdown": _build_difficulty_breakdown(totals.difficulty_buckets),
+        "namespace_confusion": build_namespace_confusion_matrix(totals.results),
     }
-    return {"metrics": metrics, "results": results}
+    return {"metrics": metrics, "results": totals.results}
 
 
 async def generate_tool_metadata_suggestions(
@@ -3864,31 +3997,17 @@ async def run_tool_api_input_evaluation(
     prompt_overrides: dict[str, str] | None = None,
     intent_definitions: list[dict[str, Any]] | None = None,
     progress_callback=None,
+    concurrency: int | None = None,
+    case_store: EvaluationCaseStore | None = None,
 ) -> dict[str, Any]:
     retrieval_limit = max(1, min(int(retrieval_limit or 5), 15))
     normalized_tuning = normalize_retrieval_tuning(retrieval_tuning)
     index_by_id = {entry.tool_id: entry for entry in tool_index}
-    results: list[dict[str, Any]] = []
-
-    intent_checks: list[bool] = []
-    route_checks: list[bool] = []
-    sub_route_checks: list[bool] = []
-    graph_complexity_checks: list[bool] = []
-    execution_strategy_checks: list[bool] = []
-    agent_checks: list[bool] = []
-    gated_scores: list[float] = []
-    plan_checks: list[bool] = []
-    supervisor_review_scores: list[float] = []
-    supervisor_review_pass_checks: list[bool] = []
-    category_checks: list[bool] = []
-    tool_checks: list[bool] = []
-    schema_checks: list[bool] = []
-    required_field_recalls: list[float] = []
-    field_value_checks: list[bool] = []
-    clarification_checks: list[bool] = []
-    difficulty_buckets: dict[str, dict[str, Any]] = {}
-
-    for idx, test in enumerate(tests):
+    model_identity = llm_identity(llm)
+
+    async def _evaluate_case(idx: int, test: dict[str, Any]) -> dict[str, Any]:
+        case = _CaseAccumulators()
+        case_key: str | None = None
         test_id = str(test.get("id") or f"case-{idx + 1}")
         question = str(test.get("question") or "").strip()
         difficulty = _normalize_difficulty_value(test.get("difficulty"))
@@ -3990,6 +4109,53 @@ async def run_tool_api_input_evaluation(
         supervisor_review_rubric: list[dict[str, Any]] = []
 
         try:
+            retrieved_ids, retrieval_breakdown = smart_retrieve_tools_with_breakdown(
+                question,
+                tool_index=tool_index,
+                primary_namespaces=[("tools",)],
+                fallback_namespaces=[],
+                limit=max(retrieval_limit, 8),
+                trace_key=None,
+                tuning=normalized_tuning,
+            )
+            retrieved_entries = [
+                index_by_id[tool_id]
+                for tool_id in retrieved_ids
+                if tool_id in index_by_id
+            ]
+            if case_store is not None:
+                case_key = evaluation_case_key(
+                    kind="tool_api_input",
+                    test=test,
+                    metadata_hash=compute_metadata_version_hash(
+                        [
+                            *retrieved_entries,
+                            *(
+                                index_by_id[tool_id]
+                                for tool_id in allowed_tools
+                                if tool_id in index_by_id
+                            ),
+                        ]
+                    ),
+                    retrieved_ids=retrieved_ids,
+                    retrieval_breakdown=retrieval_breakdown[:retrieval_limit],
+                    tool_schemas={
+                        tool_id: _tool_json_schema(tool_registry[tool_id])
+                        for tool_id in [*retrieved_ids[:8], *allowed_tools]
+                        if tool_id in tool_registry
+                    },
+                    prompt_overrides=prompt_overrides,
+                    intent_definitions=intent_definitions,
+                    model=model_identity,
+                    retrieval_limit=retrieval_limit,
+                    use_llm_supervisor_review=use_llm_supervisor_review,
+                )
+                cached = await case_store.get(case_key)
+                if cached is not None:
+                    await _emit_cached_case_completed(
+                        progress_callback, cached["result"], idx
+                    )
+                    return cached
             (
                 selected_route,
                 selected_sub_route,
@@ -4041,20 +4207,6 @@ async def run_tool_api_input_evaluation(
                 if expected_acceptable_agents
                 else (selected_agent == expected_agent if expected_agent is not None else None)
             )
-            retrieved_ids, retrieval_breakdown = smart_retrieve_tools_with_breakdown(
-                question,
-                tool_index=tool_index,
-                primary_namespaces=[("tools",)],
-                fallback_namespaces=[],
-                limit=max(retrieval_limit, 8),
-                trace_key=None,
-                tuning=normalized_tuning,
-            )
-            retrieved_entries = [
-                index_by_id[tool_id]
-                for tool_id in retrieved_ids
-                if tool_id in index_by_id
-            ]
             planning = await _plan_tool_api_input(
                 question=question,
                 candidates=retrieved_entries[:8],
@@ -4161,14 +4313,16 @@ async def run_tool_api_input_evaluation(
             )
             if supervisor_review_score is not None:
                 supervisor_review_score = max(0.0, min(1.0, supervisor_review_score))
-                supervisor_review_scores.append(supervisor_review_score)
+                case.supervisor_review_scores.append(supervisor_review_score)
             supervisor_review_passed = (
                 bool(supervisor_review.get("passed"))
                 if isinstance(supervisor_review.get("passed"), bool)
                 else None
             )
             if supervisor_review_passed is not None:
-                supervisor_review_pass_checks.append(bool(supervisor_review_passed))
+                case.supervisor_review_pass_checks.append(
+                    bool(supervisor_review_passed)
+                )
             supervisor_review_rationale = str(
                 supervisor_review.get("rationale") or ""
             ).strip() or None
@@ -4195,7 +4349,7 @@ async def run_tool_api_input_evaluation(
             ]
             if required_fields:
                 recall = (len(required_fields) - len(missing_required_fields)) / len(required_fields)
-                required_field_recalls.append(recall)
+                case.required_field_recalls.append(recall)
             unexpected_fields = (
                 [field for field in proposed_arguments if field not in schema_properties]
                 if schema_properties
@@ -4219,7 +4373,7 @@ async def run_tool_api_input_evaluation(
                         "Missing required fields for target tool input validation."
                     ]
             if schema_valid is not None:
-                schema_checks.append(bool(schema_valid))
+                case.schema_checks.append(bool(schema_valid))
 
             field_checks: list[dict[str, Any]] = []
             for field_name, expected_value in expected_field_values.items():
@@ -4233,7 +4387,7 @@ async def run_tool_api_input_evaluation(
                         "passed": passed_value_check,
                     }
                 )
-                field_value_checks.append(bool(passed_value_check))
+                case.field_value_checks.append(bool(passed_value_check))
 
             selected_category_norm = _normalize_category_name(selected_category)
             expected_category_norm = _normalize_category_name(expected_category)
@@ -4248,28 +4402,28 @@ async def run_tool_api_input_evaluation(
                 else None
             )
             if passed_category is not None:
-                category_checks.append(bool(passed_category))
+                case.category_checks.append(bool(passed_category))
             if passed_tool is not None:
-                tool_checks.append(bool(passed_tool))
+                case.tool_checks.append(bool(passed_tool))
             if passed_intent is not None:
-                intent_checks.append(bool(passed_intent))
+                case.intent_checks.append(bool(passed_intent))
             if passed_route is not None:
-                route_checks.append(bool(passed_route))
+                case.route_checks.append(bool(passed_route))
             if passed_sub_route is not None:
-                sub_route_checks.append(bool(passed_sub_route))
+                case.sub_route_checks.append(bool(passed_sub_route))
             if passed_graph_complexity is not None:
-                graph_complexity_checks.append(bool(passed_graph_complexity))
+                case.graph_complexity_checks.append(bool(passed_graph_complexity))
             if passed_execution_strategy is not None:
-                execution_strategy_checks.append(bool(passed_execution_strategy))
+                case.execution_strategy_checks.append(bool(passed_execution_strategy))
             if passed_agent is not None:
-                agent_checks.append(bool(passed_agent))
+                case.agent_checks.append(bool(passed_agent))
             if passed_plan is not None:
-                plan_checks.append(bool(passed_plan))
+                case.plan_checks.append(bool(passed_plan))
 
             clarification_ok: bool | None = None
             if allow_clarification is not None:
                 clarification_ok = bool(needs_clarification) == bool(allow_clarification)
-                clarification_checks.append(bool(clarification_ok))
+                case.clarification_checks.append(bool(clarification_ok))
 
             has_api_expectation = bool(
                 target_tool_for_validation
@@ -4323,7 +4477,7 @@ async def run_tool_api_input_evaluation(
                 downstream_checks=[passed_category, passed_tool, passed_api_input],
             )
             if agent_gate_score is not None:
-                gated_scores.append(float(agent_gate_score))
+                case.gated_scores.append(float(agent_gate_score))
             case_result = {
                 "test_id": test_id,
                 "question": question,
@@ -4392,12 +4546,12 @@ async def run_tool_api_input_evaluation(
                 "passed": passed,
             }
             _update_difficulty_bucket(
-                difficulty_buckets=difficulty_buckets,
+                difficulty_buckets=case.difficulty_buckets,
                 difficulty=difficulty,
                 passed=bool(passed),
                 gated_score=agent_gate_score,
             )
-            results.append(case_result)
+            case.results.append(case_result)
             if progress_callback is not None:
                 event = {
                     "type": "test_completed",
@@ -4420,6 +4574,7 @@ async def run_tool_api_input_evaluation(
                 if hasattr(maybe_result, "__await__"):
                     await maybe_result
         except Exception as exc:
+            case_key = None
             failed_supervisor_trace = _build_supervisor_trace(
                 question=question,
                 expected_intent=expected_intent,
@@ -4513,42 +4668,42 @@ async def run_tool_api_input_evaluation(
                 "agent_gate_score": 0.0,
                 "passed": False,
             }
-            results.append(case_result)
+            case.results.append(case_result)
             _update_difficulty_bucket(
-                difficulty_buckets=difficulty_buckets,
+                difficulty_buckets=case.difficulty_buckets,
                 difficulty=difficulty,
                 passed=False,
                 gated_score=0.0,
             )
-            gated_scores.append(0.0)
-            supervisor_review_scores.append(0.0)
-            supervisor_review_pass_checks.append(False)
+            case.gated_scores.append(0.0)
+            case.supervisor_review_scores.append(0.0)
+            case.supervisor_review_pass_checks.append(False)
             if expected_intent is not None:
-                intent_checks.append(False)
+                case.intent_checks.append(False)
             if expected_route is not None:
-                route_checks.append(False)
+                case.route_checks.append(False)
             if expected_sub_route is not None:
-                sub_route_checks.append(False)
+                case.sub_route_checks.append(False)
             if expected_graph_complexity is not None:
-                graph_complexity_checks.append(False)
+                case.graph_complexity_checks.append(False)
             if expected_execution_strategy is not None:
-                execution_strategy_checks.append(False)
+                case.execution_strategy_checks.append(False)
             if expected_agent is not None:
-                agent_checks.append(False)
+                case.agent_checks.append(False)
             if plan_requirements:
-                plan_checks.append(False)
+                case.plan_checks.append(False)
             if expected_category is not None:
-                category_checks.append(False)
+                case.category_checks.append(False)
             if expected_tool is not None:
-                tool_checks.append(False)
-            schema_checks.append(False)
+                case.tool_checks.append(False)
+            case.schema_checks.append(False)
             if expected_required_fields:
-                required_field_recalls.append(0.0)
+                case.required_field_recalls.append(0.0)
             if expected_field_values:
                 for _key in expected_field_values.keys():
-                    field_value_checks.append(False)
+                    case.field_value_checks.append(False)
             if allow_clarification is not None:
-                clarification_checks.append(False)
+                case.clarification_checks.append(False)
             if progress_callback is not None:
                 event = {
                     "type": "test_failed",
@@ -4562,98 +4717,116 @@ async def run_tool_api_input_evaluation(
                 if hasattr(maybe_result, "__await__"):
                     await maybe_result
 
-    total_tests = len(results)
-    passed_count = sum(1 for item in results if item.get("passed"))
+        outcome = case.to_outcome()
+        if case_store is not None and case_key is not None:
+            await case_store.put(case_key, test_id=test_id, outcome=outcome)
+        return outcome
+
+    if case_store is not None:
+        await case_store.prune_expired()
+    outcomes = await run_evaluation_cases(
+        tests, _evaluate_case, concurrency=concurrency, label="tool_api_input_eval"
+    )
+    totals = _CaseAccumulators.merged(outcomes)
+
+    total_tests = len(totals.results)
+    passed_count = sum(1 for item in totals.results if item.get("passed"))
     metrics = {
         "total_tests": total_tests,
         "passed_tests": passed_count,
         "success_rate": (passed_count / total_tests) if total_tests else 0.0,
         "gated_success_rate": (
-            sum(gated_scores) / len(gated_scores)
-            if gated_scores
+            sum(totals.gated_scores) / len(totals.gated_scores)
+            if totals.gated_scores
             else None
         ),
         "intent_accuracy": (
-            sum(1 for check in intent_checks if check) / len(intent_checks)
-            if intent_checks
+            sum(1 for check in totals.intent_checks if check)
+            / len(totals.intent_checks)
+            if totals.intent_checks
             else None
         ),
         "route_accuracy": (
-            sum(1 for check in route_checks if check) / len(route_checks)
-            if route_checks
+            sum(1 for check in totals.route_checks if check) / len(totals.route_checks)
+            if totals.route_checks
             else None
         ),
         "sub_route_accuracy": (
-            sum(1 for check in sub_route_checks if check) / len(sub_route_checks)
-            if sub_route_checks
+            sum(1 for check in totals.sub_route_checks if check)
+            / len(totals.sub_route_checks)
+            if totals.sub_route_checks
             else None
         ),
         "graph_complexity_accuracy": (
-            sum(1 for check in graph_complexity_checks if check)
-            / len(graph_complexity_checks)
-            if graph_complexity_checks
+            sum(1 for check in totals.graph_complexity_checks if check)
+            / len(totals.graph_complexity_checks)
+            if totals.graph_complexity_checks
             else None
         ),
         "execution_strategy_accuracy": (
-            sum(1 for check in execution_strategy_checks if check)
-            / len(execution_strategy_checks)
-            if execution_strategy_checks
+            sum(1 for check in totals.execution_strategy_checks if check)
+            / len(totals.execution_strategy_checks)
+            if totals.execution_strategy_checks
             else None
         ),
         "agent_accuracy": (
-            sum(1 for check in agent_checks if check) / len(agent_checks)
-            if agent_checks
+            sum(1 for check in totals.agent_checks if check) / len(totals.agent_checks)
+            if totals.agent_checks
             else None
         ),
         "plan_accuracy": (
-            sum(1 for check in plan_checks if check) / len(plan_checks)
-            if plan_checks
+            sum(1 for check in totals.plan_checks if check) / len(totals.plan_checks)
+            if totals.plan_checks
             else None
         ),
         "supervisor_review_score": (
-            sum(supervisor_review_scores) / len(supervisor_review_scores)
-            if supervisor_review_scores
+            sum(totals.supervisor_review_scores) / len(totals.supervisor_review_scores)
+            if totals.supervisor_review_scores
             else None
         ),
         "supervisor_review_pass_rate": (
-            sum(1 for check in supervisor_review_pass_checks if check)
-            / len(supervisor_review_pass_checks)
-            if supervisor_review_pass_checks
+            sum(1 for check in totals.supervisor_review_pass_checks if check)
+            / len(totals.supervisor_review_pass_checks)
+            if totals.supervisor_review_pass_checks
             else None
         ),
         "category_accuracy": (
-            sum(1 for check in category_checks if check) / len(category_checks)
-            if category_checks
+            sum(1 for check in totals.category_checks if check)
+            / len(totals.category_checks)
+            if totals.category_checks
             else None
         ),
         "tool_accuracy": (
-            sum(1 for check in tool_checks if check) / len(tool_checks)
-            if tool_checks
+            sum(1 for check in totals.tool_checks if check) / len(totals.tool_checks)
+            if totals.tool_checks
             else None
         ),
         "schema_validity_rate": (
-            sum(1 for check in schema_checks if check) / len(schema_checks)
-            if schema_checks
+            sum(1 for check in totals.schema_checks if check)
+            / len(totals.schema_checks)
+            if totals.schema_checks
             else None
         ),
         "required_field_recall": (
-            sum(required_field_recalls) / len(required_field_recalls)
-            if required_field_recalls
+            sum(totals.required_field_recalls) / len(totals.required_field_recalls)
+            if totals.required_field_recalls
             else None
         ),
         "field_value_accuracy": (
-            sum(1 for check in field_value_checks if check) / len(field_value_checks)
-            if field_value_checks
+            sum(1 for check in totals.field_value_checks if check)
+            / len(totals.field_value_checks)
+            if totals.field_value_checks
             else None
         ),
         "clarification_accuracy": (
-            sum(1 for check in clarification_checks if check) / len(clarification_checks)
-            if clarification_checks
+            sum(1 for check in totals.clarification_checks if check)
+            / len(totals.clarification_checks)
+            if totals.clarification_checks
             else None
         ),
-        "difficulty_breakdown": _build_difficulty_breakdown(difficulty_buckets),
+        "difficulty_breakdown": _build_difficulty_breakdown(totals.difficulty_buckets),
     }
-    return {"metrics": metrics, "results": results}
+    return {"metrics": metrics, "results": totals.results}
 
 
 def _build_fallback_prompt_suggestion(
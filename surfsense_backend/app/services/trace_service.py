@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import time
+from collections.abc import AsyncIterator, Callable
 from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
@@ -10,15 +13,24 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import config
 from app.db import ChatTraceSession, ChatTraceSpan
 from app.utils.context_metrics import (
     estimate_tokens_from_text,
     serialize_context_payload,
 )
 from app.services.new_streaming_service import VercelStreamingService
+from app.services.trace_writer import (
+    TraceSpanWriter,
+    get_trace_span_writer,
+    span_row,
+)
 
 logger = logging.getLogger(__name__)
 
+# Pseudo event yielded by ``interleave_held_output`` for a delayed delta frame
+HELD_OUTPUT_EVENT = "trace_held_output"
+
 
 def _safe_payload(value: Any) -> Any | None:
     if value is None:
@@ -39,14 +51,31 @@ class TraceRecorder:
         root_input: Any | None = None,
         root_meta: dict[str, Any] | None = None,
         tokenizer_model: str | None = None,
+        span_writer: TraceSpanWriter | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
         self.db_session = db_session
+        self.span_writer = span_writer or get_trace_span_writer()
         self.trace_session = trace_session
         self.streaming_service = streaming_service
         self.sequence = 0
         self.lock = asyncio.Lock()
         self.span_cache: dict[str, ChatTraceSpan] = {}
-        self.span_output_buffers: dict[str, Any] = {}
+        # Output chunks per running span, joined once when the span ends (or
+        # on every update in cumulative mode).
+        self.span_output_buffers: dict[str, list[Any]] = {}
+        # Delta mode: characters already sent, chunks waiting for the next
+        # update window, and when the last update was sent.  Held-back chunks
+        # are flushed when their window closes even if no chunk follows: the
+        # timer queues the span id on ``held_output_due``.
+        self.delta_updates = config.TRACE_SPAN_DELTA_UPDATES
+        self.update_interval = config.TRACE_SPAN_UPDATE_INTERVAL_MS / 1000
+        self.clock = clock
+        self.span_output_sent: dict[str, int] = {}
+        self.span_output_unsent: dict[str, list[str]] = {}
+        self.span_last_update: dict[str, float] = {}
+        self.span_flush_timers: dict[str, asyncio.TimerHandle] = {}
+        self.held_output_due: asyncio.Queue[str] = asyncio.Queue()
         self.root_span_id = f"root-{uuid4().hex}"
         self.root_name = root_name
         self.root_input = root_input
@@ -98,37 +127,31 @@ class TraceRecorder:
             return None
         if span_id in self.span_cache:
             return None
-        async with self.lock:
-            self.sequence += 1
-            sequence = self.sequence
-            start_ts = datetime.now(UTC)
-            parent_span_id = parent_id
-            if parent_span_id is None and span_id != self.root_span_id:
-                parent_span_id = self.root_span_id
-            meta_payload = self._ensure_meta_dict(meta)
-            if input_data is not None:
-                meta_payload["input_tokens"] = self._estimate_tokens(input_data)
-            span = ChatTraceSpan(
-                session_id=self.trace_session.id,
-                span_id=span_id,
-                parent_span_id=parent_span_id,
-                name=name or "unknown",
-                kind=kind or "chain",
-                status="running",
-                sequence=sequence,
-                start_ts=start_ts,
-                input=_safe_payload(input_data),
-                meta=_safe_payload(meta_payload),
-            )
-            try:
-                self.db_session.add(span)
-                await self.db_session.commit()
-                await self.db_session.refresh(span)
-                self.span_cache[span_id] = span
-            except Exception:
-                await self.db_session.rollback()
-                logger.exception("[trace] Failed to persist span start")
-                return None
+        self.sequence += 1
+        parent_span_id = parent_id
+        if parent_span_id is None and span_id != self.root_span_id:
+            parent_span_id = self.root_span_id
+        meta_payload = self._ensure_meta_dict(meta)
+        if input_data is not None:
+            meta_payload["input_tokens"] = self._estimate_tokens(input_data)
+        # The span stays transient; the write-behind writer persists it.
+        span = ChatTraceSpan(
+            session_id=self.trace_session.id,
+            span_id=span_id,
+            parent_span_id=parent_span_id,
+            name=name or "unknown",
+            kind=kind or "chain",
+            status="running",
+            sequence=self.sequence,
+            start_ts=datetime.now(UTC),
+            end_ts=None,
+            duration_ms=None,
+            input=_safe_payload(input_data),
+            output=None,
+            meta=_safe_payload(meta_payload),
+        )
+        self.span_cache[span_id] = span
+        self.span_writer.enqueue(span_row(span))
         payload = self._serialize_span(span)
         return self.streaming_service.format_trace_span(
             trace_session_id=self.trace_session.session_id,
@@ -141,23 +164,15 @@ class TraceRecorder:
             return None
         if span_id not in self.span_cache:
             return None
-        current = self.span_output_buffers.get(span_id)
-        if isinstance(current, str) and isinstance(output_delta, str):
-            updated = current + output_delta
-        elif current is None:
-            updated = output_delta
-        else:
-            try:
-                updated = str(current) + str(output_delta)
-            except Exception:
-                updated = output_delta
-        self.span_output_buffers[span_id] = updated
+        self.span_output_buffers.setdefault(span_id, []).append(output_delta)
+        if self.delta_updates:
+            return self._span_output_delta(span_id, output_delta)
         span = self.span_cache.get(span_id)
         if not span:
             return None
         payload = self._serialize_span(
             span,
-            output_override=_safe_payload(updated),
+            output_override=_safe_payload(self._buffered_output(span_id)),
             status_override="running",
         )
         return self.streaming_service.format_trace_span(
@@ -166,6 +181,55 @@ class TraceRecorder:
             span=payload,
         )
 
+    def _span_output_delta(self, span_id: str, output_delta: Any) -> str | None:
+        unsent = self.span_output_unsent.setdefault(span_id, [])
+        unsent.append(
+            output_delta if isinstance(output_delta, str) else str(output_delta)
+        )
+        now = self.clock()
+        last_update = self.span_last_update.get(span_id)
+        if last_update is not None and now - last_update < self.update_interval:
+            if span_id not in self.span_flush_timers:
+                self.span_flush_timers[span_id] = asyncio.get_running_loop().call_later(
+                    last_update + self.update_interval - now,
+                    self.held_output_due.put_nowait,
+                    span_id,
+                )
+            return None
+        return self._send_unsent_output(span_id, now)
+
+    def flush_held_output(self, span_id: str) -> str | None:
+        """Send the chunks held back for ``span_id``, if it is still running."""
+        self.span_flush_timers.pop(span_id, None)
+        if span_id not in self.span_cache or not self.span_output_unsent.get(span_id):
+            return None
+        return self._send_unsent_output(span_id, self.clock())
+
+    def _send_unsent_output(self, span_id: str, now: float) -> str:
+        timer = self.span_flush_timers.pop(span_id, None)
+        if timer is not None:
+            timer.cancel()
+        unsent = self.span_output_unsent[span_id]
+        delta = "".join(unsent)
+        unsent.clear()
+        offset = self.span_output_sent.get(span_id, 0)
+        self.span_output_sent[span_id] = offset + len(delta)
+        self.span_last_update[span_id] = now
+        return self.streaming_service.format_trace_span_delta(
+            trace_session_id=self.trace_session.session_id,
+            span_id=span_id,
+            offset=offset,
+            delta=delta,
+        )
+
+    def _buffered_output(self, span_id: str) -> Any | None:
+        parts = self.span_output_buffers.get(span_id)
+        if not parts:
+            return None
+        if len(parts) == 1:
+            return parts[0]
+        return "".join(str(part) for part in parts)
+
     async def end_span(
         self,
         span_id: str,
@@ -181,10 +245,15 @@ class TraceRecorder:
         end_ts = datetime.now(UTC)
         duration_ms = int((end_ts - span.start_ts).total_seconds() * 1000)
         final_output = (
-            output_data
-            if output_data is not None
-            else self.span_output_buffers.get(span_id)
+            output_data if output_data is not None else self._buffered_output(span_id)
         )
+        self.span_output_buffers.pop(span_id, None)
+        self.span_output_sent.pop(span_id, None)
+        self.span_output_unsent.pop(span_id, None)
+        self.span_last_update.pop(span_id, None)
+        timer = self.span_flush_timers.pop(span_id, None)
+        if timer is not None:
+            timer.cancel()
         meta_payload = self._ensure_meta_dict(span.meta)
         if final_output is not None:
             meta_payload["output_tokens"] = self._estimate_tokens(final_output)
@@ -202,22 +271,12 @@ class TraceRecorder:
         if meta:
             meta_payload.update(self._ensure_meta_dict(meta))
             values["meta"] = _safe_payload(meta_payload)
-        async with self.lock:
-            try:
-                await self.db_session.execute(
-                    update(ChatTraceSpan)
-                    .where(ChatTraceSpan.id == span.id)
-                    .values(**values)
-                )
-                await self.db_session.commit()
-            except Exception:
-                await self.db_session.rollback()
-                logger.exception("[trace] Failed to persist span end")
         span.status = status
         span.end_ts = end_ts
         span.duration_ms = duration_ms
         span.output = values.get("output")
         span.meta = values.get("meta")
+        self.span_writer.enqueue(span_row(span))
         payload = self._serialize_span(span)
         return self.streaming_service.format_trace_span(
             trace_session_id=self.trace_session.session_id,
@@ -226,6 +285,7 @@ class TraceRecorder:
         )
 
     async def end_session(self) -> None:
+        await self.span_writer.flush()
         async with self.lock:
             try:
                 await self.db_session.execute(
@@ -259,3 +319,69 @@ class TraceRecorder:
             "output": output_override if output_override is not None else span.output,
             "meta": span.meta,
         }
+
+
+async def interleave_held_output(
+    events: AsyncIterator[dict[str, Any]], recorder: TraceRecorder | None
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield ``events``, plus ``HELD_OUTPUT_EVENT`` events for delayed deltas.
+
+    A span whose output stops mid-window (for example while a tool runs)
+    would otherwise keep its held-back chunks until the next chunk arrives
+    or the span ends.  The pseudo event carries the frame under ``"data"``.
+
+    ``events`` is consumed by a single pump task, so context variables set
+    while producing one event are still visible when producing the next.
+    """
+    if recorder is None or not recorder.delta_updates:
+        async for event in events:
+            yield event
+        return
+    iterator = aiter(events)
+    # Holds one event at a time, so the pump stays at most one event ahead
+    # like the plain ``async for`` does.
+    pumped: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(maxsize=1)
+
+    async def pump() -> None:
+        try:
+            async for event in iterator:
+                await pumped.put(("event", event))
+        except Exception as exc:
+            await pumped.put(("error", exc))
+        else:
+            await pumped.put(("end", None))
+
+    pump_task = asyncio.create_task(pump())
+    next_item: asyncio.Future | None = None
+    flush_due: asyncio.Future | None = None
+    try:
+        while True:
+            if next_item is None:
+                next_item = asyncio.ensure_future(pumped.get())
+            if flush_due is None:
+                flush_due = asyncio.ensure_future(recorder.held_output_due.get())
+            done, _ = await asyncio.wait(
+                {next_item, flush_due}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if flush_due in done:
+                frame = recorder.flush_held_output(flush_due.result())
+                flush_due = None
+                if frame:
+                    yield {"event": HELD_OUTPUT_EVENT, "data": frame}
+            if next_item in done:
+                kind, value = next_item.result()
+                next_item = None
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise value
+                yield value
+    finally:
+        for pending in (next_item, flush_due, pump_task):
+            if pending is not None and not pending.done():
+                pending.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pump_task
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,200 @@
+"""
+Write-behind persistence for chat trace spans.
+
+``TraceRecorder`` emits span start/end events on the SSE stream as soon as
+they happen and hands the span rows to a ``TraceSpanWriter`` instead of
+committing each one.  The writer keeps the latest state per
+``(session_id, span_id)`` in memory and flushes it on its own session with
+one multi-row ``INSERT ... ON CONFLICT (session_id, span_id) DO UPDATE`` every
+``flush_interval_ms`` milliseconds, or as soon as ``max_batch_spans`` spans
+are waiting.  A span that starts and ends between two flushes is written
+once.
+
+Asyncio primitives are bound to an event loop, so there is one writer per
+running loop (the API loop, or the loop of a Celery task).  Recorders drain
+their writer in ``end_session``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import config
+from app.db import ChatTraceSpan, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# Columns written for every span row; the mutable ones are updated on conflict.
+_SPAN_COLUMNS = (
+    "session_id",
+    "span_id",
+    "parent_span_id",
+    "name",
+    "kind",
+    "status",
+    "sequence",
+    "start_ts",
+    "end_ts",
+    "duration_ms",
+    "input",
+    "output",
+    "meta",
+)
+_UPDATED_COLUMNS = ("status", "end_ts", "duration_ms", "output", "meta")
+
+
+def span_row(span: ChatTraceSpan) -> dict[str, Any]:
+    """Snapshot the persisted columns of a (transient) span."""
+    return {column: getattr(span, column) for column in _SPAN_COLUMNS}
+
+
+class TraceSpanWriter:
+    """Buffers span rows and upserts them in batches on a dedicated session."""
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Any] = async_session_maker,
+        flush_interval_ms: int | None = None,
+        max_batch_spans: int | None = None,
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else config.TRACE_FLUSH_INTERVAL_MS
+        ) / 1000
+        self.max_batch_spans = max(
+            1,
+            max_batch_spans
+            if max_batch_spans is not None
+            else config.TRACE_FLUSH_MAX_SPANS,
+        )
+        self._pending: dict[tuple[int, str], dict[str, Any]] = {}
+        self._batch_full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._counters = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "flushed_spans": 0,
+            "failed_flushes": 0,
+            "dropped_spans": 0,
+            "max_queue_depth": 0,
+        }
+        self._flush_latencies: deque[float] = deque(maxlen=512)
+
+    def enqueue(self, row: dict[str, Any]) -> None:
+        """Queue the latest state of a span; replaces any unflushed state."""
+        key = (row["session_id"], row["span_id"])
+        if key in self._pending:
+            self._counters["coalesced"] += 1
+        self._pending[key] = row
+        self._counters["enqueued"] += 1
+        depth = len(self._pending)
+        if depth > self._counters["max_queue_depth"]:
+            self._counters["max_queue_depth"] = depth
+        if depth >= self.max_batch_spans:
+            self._batch_full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            if len(self._pending) < self.max_batch_spans:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._batch_full.wait(), timeout=self.flush_interval
+                    )
+            self._batch_full.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write every queued span now."""
+        async with self._flush_lock:
+            while self._pending:
+                rows = list(self._pending.values())[: self.max_batch_spans]
+                for row in rows:
+                    del self._pending[(row["session_id"], row["span_id"])]
+                await self._write(rows)
+
+    async def _write(self, rows: list[dict[str, Any]]) -> None:
+        statement = insert(ChatTraceSpan).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ChatTraceSpan.session_id, ChatTraceSpan.span_id],
+            set_={
+                column: getattr(statement.excluded, column)
+                for column in _UPDATED_COLUMNS
+            },
+        )
+        started = time.perf_counter()
+        try:
+            async with self._session_factory() as session:
+                await session.execute(statement)
+                await session.commit()
+        except Exception:
+            self._counters["failed_flushes"] += 1
+            self._counters["dropped_spans"] += len(rows)
+            logger.exception("[trace] Failed to persist %d spans", len(rows))
+            return
+        self._flush_latencies.append(time.perf_counter() - started)
+        self._counters["flushes"] += 1
+        self._counters["flushed_spans"] += len(rows)
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, flush latency and throughput counters."""
+        latencies = sorted(self._flush_latencies)
+        latency_ms: dict[str, float] = {}
+        if latencies:
+            latency_ms = {
+                "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2),
+            }
+        return {
+            **self._counters,
+            "queue_depth": len(self._pending),
+            "flush_latency_ms": latency_ms,
+        }
+
+
+_WRITERS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TraceSpanWriter] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_trace_span_writer() -> TraceSpanWriter:
+    """Return the span writer of the running event loop."""
+    loop = asyncio.get_running_loop()
+    writer = _WRITERS.get(loop)
+    if writer is None:
+        writer = TraceSpanWriter()
+        _WRITERS[loop] = writer
+    return writer
+
+
+def trace_writer_stats() -> dict[str, Any]:
+    """Trace span writer queue depth and flush latency, summed over loops."""
+    writers = list(_WRITERS.values())
+    if not writers:
+        return {}
+    if len(writers) == 1:
+        return writers[0].stats()
+    combined: dict[str, Any] = {"writers": len(writers)}
+    for writer in writers:
+        for name, value in writer.stats().items():
+            if name == "max_queue_depth":
+                combined[name] = max(combined.get(name, 0), value)
+            elif isinstance(value, int):
+                combined[name] = combined.get(name, 0) + value
+    return combined
@@ -12,6 +12,8 @@ import httpx
 from dotenv import load_dotenv
 
 from app.services.cache_control import is_cache_disabled
+from app.services.http_clients import get_http_client
+from app.services.response_cache import ResponseCache
 
 TRAFIKVERKET_BASE_URL = "https://api.trafikinfo.trafikverket.se/v2/data.json"
 TRAFIKVERKET_SOURCE = "Trafikverket Open API"
@@ -56,23 +58,13 @@ class TrafikverketService:
         ]
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self._redis_url = redis_url or os.getenv("REDIS_APP_URL") or ""
-        self._redis_client = None
-
-    def _get_redis(self):
-        if not self._redis_url:
-            return None
-        if self._redis_client is not None:
-            return self._redis_client
-        try:
-            import redis
-
-            self._redis_client = redis.from_url(
-                self._redis_url, decode_responses=True
-            )
-        except Exception:
-            self._redis_client = None
-        return self._redis_client
+        # Live traffic data: keep the stale window short
+        self._cache = ResponseCache(
+            "trafikverket",
+            default_ttl=TRAFIKVERKET_CACHE_TTL,
+            stale_ttl=60,
+            redis_url=redis_url,
+        )
 
     async def _request_xml(
         self,
@@ -84,48 +76,34 @@ class TrafikverketService:
             raise ValueError("Missing TRAFIKVERKET_API_KEY for Trafikverket API.")
 
         url = self.base_url
+        if not cache_ttl:
+            return await self._post_xml(url, xml_body), False
+        cache_key = _build_cache_key("POST", url, {"xml": xml_body})
+        return await self._cache.get_or_fetch(
+            cache_key, lambda: self._post_xml(url, xml_body), ttl=cache_ttl
+        )
+
+    async def _post_xml(self, url: str, xml_body: str) -> dict[str, Any]:
         headers = {
             "Content-Type": "application/xml",
             "Accept": "application/json",
         }
-        payload = {"xml": xml_body}
-        cache_key = None
-        cache_hit = False
-        use_cache = cache_ttl and not is_cache_disabled()
-
-        if use_cache:
-            cache_key = _build_cache_key("POST", url, payload)
-            client = self._get_redis()
-            if client:
-                cached = client.get(cache_key)
-                if cached:
-                    try:
-                        return json.loads(cached), True
-                    except json.JSONDecodeError:
-                        pass
-
         last_error: str | None = None
         for attempt in range(TRAFIKVERKET_MAX_RETRIES):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        url,
-                        headers=headers,
-                        content=xml_body.encode("utf-8"),
-                    )
+                response = await get_http_client(url).post(
+                    url,
+                    headers=headers,
+                    content=xml_body.encode("utf-8"),
+                    timeout=self.timeout,
+                )
                 if response.status_code == 429:
                     retry_after = response.headers.get("Retry-After")
                     delay = float(retry_after) if retry_after else (0.5 * (2**attempt))
                     await asyncio.sleep(delay)
                     continue
                 response.raise_for_status()
-                data = response.json()
-                if cache_key and use_cache:
-                    client = self._get_redis()
-                    if client:
-                        client.setex(cache_key, cache_ttl, json.dumps(data))
-                        cache_hit = False
-                return data, cache_hit
+                return response.json()
             except httpx.HTTPStatusError as exc:
                 last_error = f"{exc.response.status_code}: {exc.response.text}"
             except (httpx.RequestError, ValueError) as exc:
@@ -10,6 +10,7 @@ from sqlalchemy.pool import NullPool
 from app.celery_app import celery_app
 from app.config import config
 from app.db import Document
+from app.services.http_clients import close_loop_http_clients
 from app.utils.blocknote_converter import convert_markdown_to_blocknote
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,7 @@ def populate_blocknote_for_documents_task(
             _populate_blocknote_for_documents(document_ids, batch_size)
         )
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
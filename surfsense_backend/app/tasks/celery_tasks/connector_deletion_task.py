@@ -22,6 +22,7 @@ from sqlalchemy.pool import NullPool
 from app.celery_app import celery_app
 from app.config import config
 from app.db import Document, SearchSourceConnector
+from app.services.http_clients import close_loop_http_clients
 from app.services.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
@@ -83,6 +84,7 @@ def delete_connector_with_documents_task(
             )
         )
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
@@ -11,6 +11,8 @@ from sqlalchemy.pool import NullPool
 from app.celery_app import celery_app
 from app.config import config
 from app.db import Document
+from app.retriever.text_search import refresh_search_vectors
+from app.services.http_clients import close_loop_http_clients
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.blocknote_converter import convert_blocknote_to_markdown
@@ -49,9 +51,41 @@ def reindex_document_task(self, document_id: int, user_id: str):
     try:
         loop.run_until_complete(_reindex_document(document_id, user_id))
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
+@celery_app.task(name="refresh_search_vectors", bind=True)
+def refresh_search_vectors_task(self, search_space_id: int):
+    """
+    Celery task to rebuild the full-text search vectors of a search space
+    after its text search configuration changed.
+
+    Args:
+        search_space_id: ID of the search space to refresh
+    """
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        loop.run_until_complete(_refresh_search_vectors(search_space_id))
+    finally:
+        loop.run_until_complete(close_loop_http_clients())
+        loop.close()
+
+
+async def _refresh_search_vectors(search_space_id: int):
+    """Async function to refresh search vectors in batches."""
+    async with get_celery_session_maker()() as session:
+        refreshed = await refresh_search_vectors(session, search_space_id)
+    logger.info(
+        f"Refreshed search vectors for search space {search_space_id}: "
+        f"{refreshed['documents']} documents, {refreshed['chunks']} chunks"
+    )
+
+
 async def _reindex_document(document_id: int, user_id: str):
     """Async function to reindex a document."""
     async with get_celery_session_maker()() as session:
@@ -8,6 +8,7 @@ from sqlalchemy.pool import NullPool
 
 from app.celery_app import celery_app
 from app.config import config
+from app.services.http_clients import close_loop_http_clients
 from app.services.notification_service import NotificationService
 from app.services.task_logging_service import TaskLoggingService
 from app.tasks.document_processors import (
@@ -57,6 +58,7 @@ def process_extension_document_task(
             )
         )
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
@@ -204,6 +206,7 @@ def process_youtube_video_task(self, url: str, search_space_id: int, user_id: st
     try:
         loop.run_until_complete(_process_youtube_video(url, search_space_id, user_id))
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
@@ -363,6 +366,7 @@ def process_file_upload_task(
         )
         raise
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
@@ -575,6 +579,7 @@ def process_circleback_meeting_task(
             )
         )
     finally:
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
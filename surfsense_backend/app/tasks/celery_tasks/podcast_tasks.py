@@ -13,6 +13,7 @@ from app.agents.podcaster.state import State as PodcasterState
 from app.celery_app import celery_app
 from app.config import config
 from app.db import Podcast, PodcastStatus
+from app.services.http_clients import close_loop_http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +99,7 @@ def generate_content_podcast_task(
     finally:
         _clear_generating_podcast(search_space_id)
         asyncio.set_event_loop(None)
+        loop.run_until_complete(close_loop_http_clients())
         loop.close()
 
 
@@ -18,13 +18,14 @@ from datetime import UTC, datetime
 
 import redis
 from sqlalchemy import and_, text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.future import select
-from sqlalchemy.pool import NullPool
 
 from app.celery_app import celery_app
-from app.config import config
 from app.db import Notification
+from app.tasks.celery_tasks.worker_runtime import (
+    get_celery_session_maker,
+    run_in_worker_loop,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,16 +50,6 @@ def _get_heartbeat_key(notification_id: int) -> str:
     return f"indexing:heartbeat:{notification_id}"
 
 
-def get_celery_session_maker():
-    """Create async session maker for Celery tasks."""
-    engine = create_async_engine(
-        config.DATABASE_URL,
-        poolclass=NullPool,
-        echo=False,
-    )
-    return async_sessionmaker(engine, expire_on_commit=False)
-
-
 @celery_app.task(name="cleanup_stale_indexing_notifications")
 def cleanup_stale_indexing_notifications_task():
     """
@@ -71,15 +62,7 @@ def cleanup_stale_indexing_notifications_task():
 
     And marks them as failed with O(1) batch UPDATE.
     """
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(_cleanup_stale_notifications())
-    finally:
-        loop.close()
+    run_in_worker_loop(_cleanup_stale_notifications())
 
 
 async def _cleanup_stale_notifications():
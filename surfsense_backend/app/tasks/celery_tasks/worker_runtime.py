@@ -0,0 +1,226 @@
+"""
+Long-lived asyncio runtime for Celery worker processes.
+
+Celery tasks are synchronous, but almost all task bodies are coroutines.
+Creating a fresh event loop and a ``NullPool`` engine per task means every
+task pays loop setup plus new Postgres connections (and TLS) before doing any
+work, which dominates short tasks such as the schedule checker.
+
+A :class:`WorkerRuntime` owns one event loop and one pooled async engine for
+the thread that runs tasks. In the default prefork pool that is the main
+thread of each child process: the runtime is started from
+``worker_process_init`` and disposed from ``worker_process_shutdown``
+(see ``app.celery_app``). Pools that run tasks on several threads get one
+runtime per thread, created lazily on first use, because a loop and the
+asyncpg connections bound to it must not be shared across threads.
+
+Usage from a task::
+
+    @celery_app.task(name="...")
+    def my_task(...):
+        run_in_worker_loop(_my_task(...))
+
+    async def _my_task(...):
+        async with get_celery_session_maker()() as session:
+            ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.services.http_clients import close_http_clients
+
+logger = logging.getLogger(__name__)
+
+# A prefork child runs one task at a time, and every child holds its own pool
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_OVERFLOW = 2
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+
+
+class WorkerRuntime:
+    """One event loop and one pooled async engine, reused across tasks."""
+
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_overflow: int = DEFAULT_MAX_OVERFLOW,
+        pool_recycle: int = DEFAULT_POOL_RECYCLE_SECONDS,
+    ) -> None:
+        self._database_url = database_url
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_recycle = pool_recycle
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._owner_thread_id: int | None = None
+        self.tasks_run = 0
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self._ensure_started()
+        return self._loop
+
+    @property
+    def engine(self) -> AsyncEngine:
+        self._ensure_started()
+        return self._engine
+
+    @property
+    def session_maker(self) -> async_sessionmaker[AsyncSession]:
+        self._ensure_started()
+        return self._session_maker
+
+    def start(self) -> None:
+        """Create the loop and engine for the calling thread (idempotent)."""
+        if self.started:
+            return
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._owner_thread_id = threading.get_ident()
+        # pool_pre_ping: connections sit idle between tasks and may have been
+        # closed by Postgres or a proxy in the meantime.
+        self._engine = create_async_engine(
+            self._database_url,
+            pool_size=self._pool_size,
+            max_overflow=self._max_overflow,
+            pool_recycle=self._pool_recycle,
+            pool_pre_ping=True,
+            echo=False,
+        )
+        self._session_maker = async_sessionmaker(self._engine, expire_on_commit=False)
+
+    def run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run ``coro`` to completion on the runtime loop."""
+        self._ensure_started()
+        if threading.get_ident() != self._owner_thread_id:
+            coro.close()
+            raise RuntimeError("WorkerRuntime.run called from a foreign thread")
+        task = self._loop.create_task(coro)
+        try:
+            return self._loop.run_until_complete(task)
+        except BaseException:
+            # e.g. SoftTimeLimitExceeded raised while the loop was running:
+            # cancel the coroutine and let its cleanup (session close,
+            # CancelledError handlers) finish now, not inside the next task.
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(Exception):
+                    self._loop.run_until_complete(
+                        asyncio.gather(task, return_exceptions=True)
+                    )
+            raise
+        finally:
+            self.tasks_run += 1
+
+    def shutdown(self) -> None:
+        """Dispose pooled connections and close the loop."""
+        if not self.started:
+            return
+        loop = self._loop
+        try:
+            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.run_until_complete(close_http_clients())
+            if self._engine is not None:
+                loop.run_until_complete(self._engine.dispose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        except Exception as e:
+            logger.warning(f"Error shutting down Celery worker runtime: {e!s}")
+        finally:
+            loop.close()
+            self._loop = None
+            self._engine = None
+            self._session_maker = None
+            self._owner_thread_id = None
+
+    def _ensure_started(self) -> None:
+        if not self.started:
+            raise RuntimeError("WorkerRuntime has not been started")
+
+
+_local = threading.local()
+_runtimes: list[WorkerRuntime] = []
+_runtimes_lock = threading.Lock()
+
+
+def _build_runtime() -> WorkerRuntime:
+    from app.config import config
+
+    return WorkerRuntime(
+        config.DATABASE_URL,
+        pool_size=config.CELERY_DB_POOL_SIZE,
+        max_overflow=config.CELERY_DB_MAX_OVERFLOW,
+        pool_recycle=config.CELERY_DB_POOL_RECYCLE_SECONDS,
+    )
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    """Return the started runtime of the calling thread, creating it on first use."""
+    runtime: WorkerRuntime | None = getattr(_local, "runtime", None)
+    if runtime is None:
+        runtime = _build_runtime()
+        _local.runtime = runtime
+    if not runtime.started:
+        runtime.start()
+        with _runtimes_lock:
+            if runtime not in _runtimes:
+                _runtimes.append(runtime)
+    return runtime
+
+
+def init_worker_runtime() -> WorkerRuntime:
+    """Start the runtime for the worker process (``worker_process_init``)."""
+    runtime = get_worker_runtime()
+    logger.info("Celery worker runtime started")
+    return runtime
+
+
+def shutdown_worker_runtimes() -> None:
+    """Shut down every runtime of this process (``worker_process_shutdown``)."""
+    with _runtimes_lock:
+        runtimes = list(_runtimes)
+        _runtimes.clear()
+    for runtime in runtimes:
+        runtime.shutdown()
+    _local.__dict__.pop("runtime", None)
+
+
+def run_in_worker_loop[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run a task coroutine on the calling thread's worker runtime."""
+    return get_worker_runtime().run(coro)
+
+
+def get_celery_session_maker() -> async_sessionmaker[AsyncSession]:
+    """
+    Session maker bound to the pooled engine of the calling thread's runtime.
+
+    Sessions must be used from coroutines passed to :func:`run_in_worker_loop`,
+    since the pooled connections belong to the runtime loop.
+    """
+    return get_worker_runtime().session_maker
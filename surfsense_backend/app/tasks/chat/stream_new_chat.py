@@ -11,8 +11,10 @@ Supports loading LLM configurations from:
 
 import ast
 import json
+import logging
 import os
 import re
+import time
 import uuid
 from collections.abc import AsyncGenerator
 from dataclasses import replace
@@ -47,7 +49,10 @@ from app.agents.new_chat.compare_prompts import (
 from app.agents.new_chat.debate_prompts import (
     DEBATE_SUPERVISOR_INSTRUCTIONS,
 )
-from app.agents.new_chat.complete_graph import build_complete_graph
+from app.agents.new_chat.complete_graph import (
+    build_complete_graph,
+    get_or_build_complete_graph,
+)
 from app.agents.new_chat.incremental_json_parser import IncrementalSchemaParser
 from app.agents.new_chat.dispatcher import (
     DEFAULT_ROUTE_SYSTEM_PROMPT,
@@ -65,6 +70,11 @@ from app.agents.new_chat.marketplace_prompts import (
     build_marketplace_prompt,
 )
 from app.agents.new_chat.prompt_registry import resolve_prompt
+from app.agents.new_chat.query_embeddings import (
+    QUERY_EMBEDDINGS_KEY,
+    QueryEmbeddingContext,
+)
+from app.agents.new_chat.request_dependencies import REQUEST_DEPENDENCIES_KEY
 from app.agents.new_chat.riksdagen_prompts import DEFAULT_RIKSDAGEN_SYSTEM_PROMPT
 from app.agents.new_chat.routing import Route
 from app.agents.new_chat.structured_schemas import structured_output_enabled
@@ -96,6 +106,7 @@ from app.agents.new_chat.trafik_prompts import (
     DEFAULT_TRAFFIC_SYSTEM_PROMPT,
     build_trafik_prompt,
 )
+from app.config import config as app_config
 from app.db import (
     ChatTraceSession,
     Document,
@@ -116,7 +127,11 @@ from app.services.intent_definition_service import (
     get_effective_intent_definitions,
 )
 from app.services.new_streaming_service import VercelStreamingService
-from app.services.trace_service import TraceRecorder
+from app.services.trace_service import (
+    HELD_OUTPUT_EVENT,
+    TraceRecorder,
+    interleave_held_output,
+)
 from app.tasks.chat.context_formatters import (
     format_attachments_as_context,
     format_mentioned_documents_as_context,
@@ -132,6 +147,8 @@ from app.utils.context_metrics import (
     serialize_context_payload,
 )
 
+logger = logging.getLogger(__name__)
+
 DEBATE_PREFIX = "/debatt"
 DVOICE_PREFIX = "/dvoice"
 
@@ -1753,6 +1770,9 @@ async def stream_new_chat(
         str: SSE formatted response strings
     """
     streaming_service = VercelStreamingService()
+    turn_started_at = time.perf_counter()
+    first_text_logged = False
+    graph_cache_enabled = False
     external_model_tool_names = {spec.tool_name for spec in EXTERNAL_MODEL_SPECS}
     raw_user_query = user_query
     compare_mode = is_compare_request(user_query)
@@ -1770,6 +1790,8 @@ async def stream_new_chat(
     active_reasoning_id: str | None = None
     trace_recorder: TraceRecorder | None = None
     trace_db_session: AsyncSession | None = None
+    # Embeds each distinct query text once for the whole turn.
+    query_embeddings = QueryEmbeddingContext()
 
     try:
         # Mark AI as responding to this user for live collaboration
@@ -2413,23 +2435,31 @@ async def stream_new_chat(
             except Exception:
                 pass
 
-            agent = await build_complete_graph(
+            graph_cache_enabled = app_config.SUPERVISOR_GRAPH_CACHE_ENABLED
+            build_graph = (
+                get_or_build_complete_graph
+                if graph_cache_enabled
+                else build_complete_graph
+            )
+            graph_dependencies = {
+                "search_space_id": search_space_id,
+                "db_session": session,
+                "connector_service": connector_service,
+                "firecrawl_api_key": firecrawl_api_key,
+                "user_id": user_id,
+                "thread_id": chat_id,
+                "checkpoint_ns": checkpoint_ns,
+                "runtime_hitl": dict(runtime_hitl or {}),
+                "trace_recorder": trace_recorder,
+                "trace_parent_span_id": (
+                    trace_recorder.root_span_id if trace_recorder else None
+                ),
+                "graph_registry": _graph_registry,
+            }
+            graph_started_at = time.perf_counter()
+            agent = await build_graph(
                 llm=llm,
-                dependencies={
-                    "search_space_id": search_space_id,
-                    "db_session": session,
-                    "connector_service": connector_service,
-                    "firecrawl_api_key": firecrawl_api_key,
-                    "user_id": user_id,
-                    "thread_id": chat_id,
-                    "checkpoint_ns": checkpoint_ns,
-                    "runtime_hitl": dict(runtime_hitl or {}),
-                    "trace_recorder": trace_recorder,
-                    "trace_parent_span_id": (
-                        trace_recorder.root_span_id if trace_recorder else None
-                    ),
-                    "graph_registry": _graph_registry,
-                },
+                dependencies=graph_dependencies,
                 checkpointer=checkpointer,
                 knowledge_prompt=knowledge_worker_prompt,
                 action_prompt=action_worker_prompt,
@@ -2468,6 +2498,11 @@ async def stream_new_chat(
                 tool_prompt_overrides=prompt_overrides,
                 think_on_tool_calls=think_on_tool_calls,
             )
+            logger.info(
+                "Supervisor graph ready in %.0f ms (cached=%s)",
+                (time.perf_counter() - graph_started_at) * 1000,
+                graph_cache_enabled,
+            )
         else:
             smalltalk_system_prompt = append_datetime_context(
                 str(smalltalk_prompt or SMALLTALK_INSTRUCTIONS).strip()
@@ -2655,7 +2690,14 @@ async def stream_new_chat(
 
         # Configure LangGraph with thread_id for memory
         # If checkpoint_id is provided, fork from that checkpoint (for edit/reload)
-        configurable = {"thread_id": str(chat_id)}
+        configurable = {
+            "thread_id": str(chat_id),
+            QUERY_EMBEDDINGS_KEY: query_embeddings,
+        }
+        if graph_cache_enabled:
+            # The cached graph reads this turn's session, services and
+            # trace recorder from the run config.
+            configurable[REQUEST_DEPENDENCIES_KEY] = graph_dependencies
         if checkpoint_ns:
             configurable["checkpoint_ns"] = checkpoint_ns
         if checkpoint_id:
@@ -3144,10 +3186,14 @@ async def stream_new_chat(
             return output
 
         # Stream the agent response with thread config for memory
-        async for event in agent.astream_events(
-            input_state, config=config, version="v2"
+        async for event in interleave_held_output(
+            agent.astream_events(input_state, config=config, version="v2"),
+            trace_recorder,
         ):
             event_type = event.get("event", "")
+            if event_type == HELD_OUTPUT_EVENT:
+                yield event["data"]
+                continue
             run_id = str(event.get("run_id") or "")
             trace_parent = trace_parent_id(event)
 
@@ -3883,7 +3929,7 @@ async def stream_new_chat(
                             # --- Node-by-node think-box: stream per-node reasoning
                             # into the global rolling think-box (reasoning-delta). ---
                             # P1 Extra: when structured output is enabled, use
-                            # IncrementalSchemaParser (backed by partial-json-parser)
+                            # IncrementalSchemaParser (incremental JSON tokenizer)
                             # instead of ThinkStreamFilter.  The parser handles
                             # partial JSON robustly — no 30-char heuristic needed.
                             # Fallback to raw buffer happens at model_end if the
@@ -3935,7 +3981,7 @@ async def stream_new_chat(
                         if _structured_mode and run_id in _structured_parsers:
                             sp = _structured_parsers[run_id]
                             reasoning_chunk, content, _ = sp.feed_all(content)
-                            # partial-json-parser handles partial JSON robustly
+                            # The incremental tokenizer handles partial JSON robustly
                             # — no 30-char heuristic needed.  If the model isn't
                             # producing JSON, feed_all returns empty deltas and
                             # the model_end handler uses the raw buffer.
@@ -4041,6 +4087,13 @@ async def stream_new_chat(
 
                             current_text_id = streaming_service.generate_text_id()
                             yield streaming_service.format_text_start(current_text_id)
+                            if not first_text_logged:
+                                first_text_logged = True
+                                logger.info(
+                                    "Time to first token %.0f ms (graph_cache=%s)",
+                                    (time.perf_counter() - turn_started_at) * 1000,
+                                    graph_cache_enabled,
+                                )
 
                         # Stream the text delta
                         yield streaming_service.format_text_delta(
@@ -5654,7 +5707,10 @@ async def stream_new_chat(
         if trace_recorder:
             trace_end = await trace_recorder.end_span(
                 span_id=trace_recorder.root_span_id,
-                output_data={"status": "completed"},
+                output_data={
+                    "status": "completed",
+                    "query_embeddings": query_embeddings.stats(),
+                },
                 status="completed",
             )
             if trace_end:
@@ -5686,7 +5742,11 @@ async def stream_new_chat(
         if trace_recorder:
             trace_end = await trace_recorder.end_span(
                 span_id=trace_recorder.root_span_id,
-                output_data={"status": "error", "error": error_message},
+                output_data={
+                    "status": "error",
+                    "error": error_message,
+                    "query_embeddings": query_embeddings.stats(),
+                },
                 status="error",
             )
             if trace_end:
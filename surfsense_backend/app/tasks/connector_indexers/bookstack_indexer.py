@@ -2,6 +2,7 @@
 BookStack connector indexer.
 """
 
+import asyncio
 import time
 from collections.abc import Awaitable, Callable
 from datetime import datetime
@@ -142,8 +143,10 @@ async def index_bookstack_pages(
 
         # Get pages within date range
         try:
-            pages, error = bookstack_client.get_pages_by_date_range(
-                start_date=start_date_str, end_date=end_date_str
+            pages, error = await asyncio.to_thread(
+                bookstack_client.get_pages_by_date_range,
+                start_date=start_date_str,
+                end_date=end_date_str,
             )
 
             if error:
@@ -218,8 +221,10 @@ async def index_bookstack_pages(
 
                 # Fetch full page content (Markdown preferred)
                 try:
-                    page_detail, page_content = bookstack_client.get_page_with_content(
-                        page_id, use_markdown=True
+                    page_detail, page_content = await asyncio.to_thread(
+                        bookstack_client.get_page_with_content,
+                        page_id,
+                        use_markdown=True,
                     )
                 except Exception as e:
                     logger.warning(f"Failed to fetch content for page {page_name}: {e}")
@@ -0,0 +1,343 @@
+"""
+Bulk upsert pipeline for connectors that index one document per message.
+
+Slack, Discord and Teams turn every message into its own document.  Indexing
+them one at a time costs a lookup query and a synchronous embedding call per
+message.  This pipeline handles messages in batches instead:
+
+1. Loads the stored ``(unique_identifier_hash, content_hash)`` pairs for the
+   whole batch with a single query and drops unchanged messages in memory.
+2. Drops messages whose content is already indexed as another document.
+3. Embeds documents and chunks for the remaining messages with one
+   ``embed_texts`` call.
+4. Inserts new documents with ``INSERT ... ON CONFLICT DO NOTHING``, so a
+   message or content stored by a concurrent writer meanwhile is skipped
+   instead of failing the batch, and updates changed documents with
+   ``INSERT ... ON CONFLICT (unique_identifier_hash) DO UPDATE``.
+5. Replaces the chunks of the documents the writes returned with bulk
+   inserts.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db import Chunk, Document, DocumentType
+from app.services.embedding_service import embed_texts
+from app.utils.document_converters import (
+    generate_content_hash,
+    generate_unique_identifier_hash,
+)
+
+from .base import get_current_timestamp, logger
+
+# Messages handled per lookup/embed/upsert round trip (and per commit).
+BULK_UPSERT_BATCH_SIZE = 500
+
+# Chunk rows per INSERT statement; keeps the bind parameter count well below
+# the 32767 limit of the PostgreSQL wire protocol.
+CHUNK_INSERT_BATCH_SIZE = 5000
+
+
+@dataclass
+class IndexableMessage:
+    """One message to be stored as its own document."""
+
+    unique_identifier: str
+    title: str
+    content: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BulkUpsertResult:
+    """Counts produced by :func:`bulk_upsert_messages`."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicates: int = 0
+
+    @property
+    def indexed(self) -> int:
+        return self.created + self.updated
+
+    @property
+    def skipped(self) -> int:
+        return self.unchanged + self.duplicates
+
+
+@dataclass
+class _PendingDocument:
+    message: IndexableMessage
+    unique_identifier_hash: str
+    content_hash: str
+    existing_id: int | None
+
+
+async def load_existing_content_hashes(
+    session: AsyncSession,
+    unique_identifier_hashes: list[str],
+) -> dict[str, tuple[int, str]]:
+    """
+    Load stored documents for a set of unique identifier hashes in one query.
+
+    Args:
+        session: Database session
+        unique_identifier_hashes: Hashes to look up
+
+    Returns:
+        Mapping of unique identifier hash to ``(document_id, content_hash)``
+    """
+    if not unique_identifier_hashes:
+        return {}
+    result = await session.execute(
+        select(
+            Document.unique_identifier_hash, Document.id, Document.content_hash
+        ).where(Document.unique_identifier_hash.in_(unique_identifier_hashes))
+    )
+    return {row[0]: (row[1], row[2]) for row in result.all()}
+
+
+async def load_indexed_content_hashes(
+    session: AsyncSession,
+    content_hashes: list[str],
+) -> set[str]:
+    """
+    Return the content hashes that already belong to a stored document.
+
+    Args:
+        session: Database session
+        content_hashes: Hashes to look up
+
+    Returns:
+        The subset of *content_hashes* that is already indexed
+    """
+    if not content_hashes:
+        return set()
+    result = await session.execute(
+        select(Document.content_hash).where(Document.content_hash.in_(content_hashes))
+    )
+    return set(result.scalars().all())
+
+
+async def bulk_upsert_messages(
+    session: AsyncSession,
+    messages: list[IndexableMessage],
+    *,
+    document_type: DocumentType,
+    search_space_id: int,
+    user_id: str | None,
+    connector_id: int,
+    batch_size: int = BULK_UPSERT_BATCH_SIZE,
+) -> BulkUpsertResult:
+    """
+    Create or update one document per message, in batches.
+
+    Unchanged messages are skipped without embedding, and so are messages whose
+    content is already indexed by another document.  Each batch is committed
+    once it has been written.
+
+    Args:
+        session: Database session
+        messages: Messages to index
+        document_type: Document type of the connector
+        search_space_id: ID of the search space to store documents in
+        user_id: ID of the user
+        connector_id: ID of the connector the messages come from
+        batch_size: Messages per lookup/embed/upsert round trip
+
+    Returns:
+        Created, updated and skipped counts
+    """
+    result = BulkUpsertResult()
+    size = max(1, batch_size)
+    for start in range(0, len(messages), size):
+        await _upsert_batch(
+            session,
+            messages[start : start + size],
+            result,
+            document_type=document_type,
+            search_space_id=search_space_id,
+            user_id=user_id,
+            connector_id=connector_id,
+        )
+    return result
+
+
+async def _upsert_batch(
+    session: AsyncSession,
+    messages: list[IndexableMessage],
+    result: BulkUpsertResult,
+    *,
+    document_type: DocumentType,
+    search_space_id: int,
+    user_id: str | None,
+    connector_id: int,
+) -> None:
+    # The last occurrence of a message wins, as it did when each message
+    # overwrote the previous one in turn.
+    by_identifier: dict[str, IndexableMessage] = {}
+    for message in messages:
+        identifier_hash = generate_unique_identifier_hash(
+            document_type, message.unique_identifier, search_space_id
+        )
+        by_identifier.pop(identifier_hash, None)
+        by_identifier[identifier_hash] = message
+    result.unchanged += len(messages) - len(by_identifier)
+
+    existing = await load_existing_content_hashes(session, list(by_identifier))
+
+    candidates: list[_PendingDocument] = []
+    for identifier_hash, message in by_identifier.items():
+        content_hash = generate_content_hash(message.content, search_space_id)
+        stored = existing.get(identifier_hash)
+        if stored is not None and stored[1] == content_hash:
+            result.unchanged += 1
+            continue
+        candidates.append(
+            _PendingDocument(
+                message=message,
+                unique_identifier_hash=identifier_hash,
+                content_hash=content_hash,
+                existing_id=stored[0] if stored else None,
+            )
+        )
+
+    # content_hash is unique across documents: skip content that another
+    # document (or an earlier message in this batch) already holds.
+    indexed_hashes = await load_indexed_content_hashes(
+        session, [pending.content_hash for pending in candidates]
+    )
+    pending_documents: list[_PendingDocument] = []
+    for pending in candidates:
+        if pending.content_hash in indexed_hashes:
+            logger.info(
+                f"Message {pending.message.unique_identifier} already indexed "
+                "by another document. Skipping."
+            )
+            result.duplicates += 1
+            continue
+        indexed_hashes.add(pending.content_hash)
+        pending_documents.append(pending)
+
+    if not pending_documents:
+        return
+
+    chunk_texts = [
+        [chunk.text for chunk in config.chunker_instance.chunk(pending.message.content)]
+        for pending in pending_documents
+    ]
+    document_texts = [pending.message.content for pending in pending_documents]
+    embeddings = await embed_texts(
+        document_texts + [text for texts in chunk_texts for text in texts]
+    )
+    document_embeddings = embeddings[: len(document_texts)]
+    chunk_embeddings = iter(embeddings[len(document_texts) :])
+    chunks_by_identifier = {
+        pending.unique_identifier_hash: [
+            (text, next(chunk_embeddings)) for text in texts
+        ]
+        for pending, texts in zip(pending_documents, chunk_texts, strict=True)
+    }
+
+    now = get_current_timestamp()
+    rows = [
+        {
+            "search_space_id": search_space_id,
+            "title": pending.message.title,
+            "document_type": document_type,
+            "document_metadata": pending.message.metadata,
+            "content": pending.message.content,
+            "embedding": embedding,
+            "content_hash": pending.content_hash,
+            "unique_identifier_hash": pending.unique_identifier_hash,
+            "updated_at": now,
+            "created_by_id": user_id,
+            "connector_id": connector_id,
+        }
+        for pending, embedding in zip(
+            pending_documents, document_embeddings, strict=True
+        )
+    ]
+    new_rows = [
+        row
+        for pending, row in zip(pending_documents, rows, strict=True)
+        if pending.existing_id is None
+    ]
+    changed_rows = [
+        row
+        for pending, row in zip(pending_documents, rows, strict=True)
+        if pending.existing_id is not None
+    ]
+
+    # A concurrent writer may have stored the same message, or the same
+    # content under another identifier, since the lookups above.  Those rows
+    # are skipped: neither unique index may fail the whole batch.
+    created_ids: dict[str, int] = {}
+    if new_rows:
+        created_ids = dict(
+            (
+                await session.execute(
+                    insert(Document)
+                    .values(new_rows)
+                    .on_conflict_do_nothing()
+                    .returning(Document.unique_identifier_hash, Document.id)
+                )
+            ).all()
+        )
+    updated_ids: dict[str, int] = {}
+    if changed_rows:
+        statement = insert(Document).values(changed_rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Document.unique_identifier_hash],
+            set_={
+                "content": statement.excluded.content,
+                "content_hash": statement.excluded.content_hash,
+                "embedding": statement.excluded.embedding,
+                "document_metadata": statement.excluded.document_metadata,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ).returning(Document.unique_identifier_hash, Document.id)
+        updated_ids = dict((await session.execute(statement)).all())
+
+    for pending in pending_documents:
+        if (
+            pending.existing_id is None
+            and pending.unique_identifier_hash not in created_ids
+        ):
+            logger.info(
+                f"Message {pending.message.unique_identifier} was indexed "
+                "concurrently. Skipping."
+            )
+            result.duplicates += 1
+
+    # Replace the chunks of whatever row the upsert returned, not of the id
+    # seen by the lookup: the row may have been recreated since.
+    if updated_ids:
+        await session.execute(
+            delete(Chunk).where(Chunk.document_id.in_(list(updated_ids.values())))
+        )
+
+    document_ids = created_ids | updated_ids
+    chunk_rows = [
+        {"document_id": document_id, "content": text, "embedding": embedding}
+        for identifier_hash, document_id in document_ids.items()
+        for text, embedding in chunks_by_identifier[identifier_hash]
+    ]
+    for start in range(0, len(chunk_rows), CHUNK_INSERT_BATCH_SIZE):
+        await session.execute(
+            insert(Chunk).values(chunk_rows[start : start + CHUNK_INSERT_BATCH_SIZE])
+        )
+
+    await session.commit()
+    result.created += len(created_ids)
+    result.updated += len(updated_ids)
+    logger.info(
+        f"Bulk upserted {len(document_ids)} {document_type.value} documents "
+        f"({len(updated_ids)} updated, {len(chunk_rows)} chunks)"
+    )
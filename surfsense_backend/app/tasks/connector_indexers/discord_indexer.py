@@ -12,23 +12,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
 from app.connectors.discord_connector import DiscordConnector
-from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.db import DocumentType, SearchSourceConnectorType
 from app.services.task_logging_service import TaskLoggingService
-from app.utils.document_converters import (
-    create_document_chunks,
-    generate_content_hash,
-    generate_unique_identifier_hash,
-)
 
 from .base import (
     build_document_metadata_markdown,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
-    get_current_timestamp,
     logger,
     update_connector_last_indexed,
 )
+from .bulk_upsert import IndexableMessage, bulk_upsert_messages
 
 # Type hint for heartbeat callback
 HeartbeatCallbackType = Callable[[int], Awaitable[None]]
@@ -369,6 +362,7 @@ async def index_discord_messages(
                             continue
 
                         # Process each message as an individual document (like Slack)
+                        channel_messages = []
                         for msg in formatted_messages:
                             msg_id = msg.get("id", "")
                             msg_user_name = msg.get("author_name", "Unknown User")
@@ -399,60 +393,14 @@ async def index_discord_messages(
                                 ),
                             ]
 
-                            # Build the document string
-                            combined_document_string = build_document_metadata_markdown(
-                                metadata_sections
-                            )
-
-                            # Generate unique identifier hash for this Discord message
-                            unique_identifier = f"{channel_id}_{msg_id}"
-                            unique_identifier_hash = generate_unique_identifier_hash(
-                                DocumentType.DISCORD_CONNECTOR,
-                                unique_identifier,
-                                search_space_id,
-                            )
-
-                            # Generate content hash
-                            content_hash = generate_content_hash(
-                                combined_document_string, search_space_id
-                            )
-
-                            # Check if document with this unique identifier already exists
-                            existing_document = (
-                                await check_document_by_unique_identifier(
-                                    session, unique_identifier_hash
-                                )
-                            )
-
-                            if existing_document:
-                                # Document exists - check if content has changed
-                                if existing_document.content_hash == content_hash:
-                                    logger.info(
-                                        f"Document for Discord message {msg_id} in {guild_name}#{channel_name} unchanged. Skipping."
-                                    )
-                                    documents_skipped += 1
-                                    continue
-                                else:
-                                    # Content has changed - update the existing document
-                                    logger.info(
-                                        f"Content changed for Discord message {msg_id} in {guild_name}#{channel_name}. Updating document."
-                                    )
-
-                                    # Update chunks and embedding
-                                    chunks = await create_document_chunks(
-                                        combined_document_string
-                                    )
-                                    doc_embedding = (
-                                        config.embedding_model_instance.embed(
-                                            combined_document_string
-                                        )
-                                    )
-
-                                    # Update existing document
-                                    existing_document.content = combined_document_string
-                                    existing_document.content_hash = content_hash
-                                    existing_document.embedding = doc_embedding
-                                    existing_document.document_metadata = {
+                            channel_messages.append(
+                                IndexableMessage(
+                                    unique_identifier=f"{channel_id}_{msg_id}",
+                                    title=f"Discord - {guild_name}#{channel_name}",
+                                    content=build_document_metadata_markdown(
+                                        metadata_sections
+                                    ),
+                                    metadata={
                                         "guild_name": guild_name,
                                         "guild_id": guild_id,
                                         "channel_name": channel_name,
@@ -463,86 +411,26 @@ async def index_discord_messages(
                                         "indexed_at": datetime.now(UTC).strftime(
                                             "%Y-%m-%d %H:%M:%S"
                                         ),
-                                    }
-
-                                    # Delete old chunks and add new ones
-                                    existing_document.chunks = chunks
-                                    existing_document.updated_at = (
-                                        get_current_timestamp()
-                                    )
-
-                                    documents_indexed += 1
-                                    logger.info(
-                                        f"Successfully updated Discord message {msg_id}"
-                                    )
-                                    continue
-
-                            # Document doesn't exist by unique_identifier_hash
-                            # Check if a document with the same content_hash exists (from another connector)
-                            with session.no_autoflush:
-                                duplicate_by_content = (
-                                    await check_duplicate_document_by_hash(
-                                        session, content_hash
-                                    )
+                                    },
                                 )
-
-                            if duplicate_by_content:
-                                logger.info(
-                                    f"Discord message {msg_id} in {guild_name}#{channel_name} already indexed by another connector "
-                                    f"(existing document ID: {duplicate_by_content.id}, "
-                                    f"type: {duplicate_by_content.document_type}). Skipping."
-                                )
-                                documents_skipped += 1
-                                continue
-
-                            # Document doesn't exist - create new one
-                            # Process chunks
-                            chunks = await create_document_chunks(
-                                combined_document_string
-                            )
-                            doc_embedding = config.embedding_model_instance.embed(
-                                combined_document_string
                             )
 
-                            # Create and store new document
-                            document = Document(
-                                search_space_id=search_space_id,
-                                title=f"Discord - {guild_name}#{channel_name}",
-                                document_type=DocumentType.DISCORD_CONNECTOR,
-                                document_metadata={
-                                    "guild_name": guild_name,
-                                    "guild_id": guild_id,
-                                    "channel_name": channel_name,
-                                    "channel_id": channel_id,
-                                    "message_id": msg_id,
-                                    "message_timestamp": msg_timestamp,
-                                    "message_user_name": msg_user_name,
-                                    "indexed_at": datetime.now(UTC).strftime(
-                                        "%Y-%m-%d %H:%M:%S"
-                                    ),
-                                },
-                                content=combined_document_string,
-                                embedding=doc_embedding,
-                                chunks=chunks,
-                                content_hash=content_hash,
-                                unique_identifier_hash=unique_identifier_hash,
-                                updated_at=get_current_timestamp(),
-                                created_by_id=user_id,
-                                connector_id=connector_id,
-                            )
-
-                            session.add(document)
-                            documents_indexed += 1
-
-                            # Batch commit every 10 documents
-                            if documents_indexed % 10 == 0:
-                                logger.info(
-                                    f"Committing batch: {documents_indexed} Discord messages processed so far"
-                                )
-                                await session.commit()
+                        # Lookups, embeddings and writes happen in batches per channel
+                        upsert_result = await bulk_upsert_messages(
+                            session,
+                            channel_messages,
+                            document_type=DocumentType.DISCORD_CONNECTOR,
+                            search_space_id=search_space_id,
+                            user_id=user_id,
+                            connector_id=connector_id,
+                        )
+                        documents_indexed += upsert_result.indexed
+                        documents_skipped += upsert_result.skipped
 
                         logger.info(
-                            f"Successfully indexed channel {guild_name}#{channel_name} with {len(formatted_messages)} messages"
+                            f"Indexed channel {guild_name}#{channel_name}: "
+                            f"{upsert_result.created} new, {upsert_result.updated} updated, "
+                            f"{upsert_result.skipped} skipped of {len(formatted_messages)} messages"
                         )
 
                 except Exception as e:
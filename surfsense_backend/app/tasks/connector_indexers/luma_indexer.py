@@ -2,6 +2,7 @@
 Luma connector indexer.
 """
 
+import asyncio
 import time
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
@@ -185,8 +186,11 @@ async def index_luma_events(
 
         # Get events within date range from Luma
         try:
-            events, error = luma_client.get_events_by_date_range(
-                start_date_str, end_date_str, include_guests=False
+            events, error = await asyncio.to_thread(
+                luma_client.get_events_by_date_range,
+                start_date_str,
+                end_date_str,
+                include_guests=False,
             )
 
             if error:
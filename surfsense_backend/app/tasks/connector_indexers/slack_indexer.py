@@ -10,26 +10,18 @@ from slack_sdk.errors import SlackApiError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.slack_history import SlackHistory
-from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.db import DocumentType, SearchSourceConnectorType
 from app.services.task_logging_service import TaskLoggingService
-from app.utils.document_converters import (
-    create_document_chunks,
-    generate_content_hash,
-    generate_unique_identifier_hash,
-)
 
 from .base import (
     build_document_metadata_markdown,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
-    get_current_timestamp,
     logger,
     update_connector_last_indexed,
 )
+from .bulk_upsert import IndexableMessage, bulk_upsert_messages
 
 # Type hint for heartbeat callback
 HeartbeatCallbackType = Callable[[int], Awaitable[None]]
@@ -256,6 +248,7 @@ async def index_slack_messages(
                     documents_skipped += 1
                     continue  # Skip if no valid messages after filtering
 
+                channel_messages = []
                 for msg in formatted_messages:
                     timestamp = msg.get("datetime", "Unknown Time")
                     msg_ts = msg.get("ts", timestamp)  # Get original Slack timestamp
@@ -281,54 +274,12 @@ async def index_slack_messages(
                         ),
                     ]
 
-                    # Build the document string
-                    combined_document_string = build_document_metadata_markdown(
-                        metadata_sections
-                    )
-
-                    # Generate unique identifier hash for this Slack message
-                    unique_identifier = f"{channel_id}_{msg_ts}"
-                    unique_identifier_hash = generate_unique_identifier_hash(
-                        DocumentType.SLACK_CONNECTOR, unique_identifier, search_space_id
-                    )
-
-                    # Generate content hash
-                    content_hash = generate_content_hash(
-                        combined_document_string, search_space_id
-                    )
-
-                    # Check if document with this unique identifier already exists
-                    existing_document = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
-                    )
-
-                    if existing_document:
-                        # Document exists - check if content has changed
-                        if existing_document.content_hash == content_hash:
-                            logger.info(
-                                f"Document for Slack message {msg_ts} in channel {channel_name} unchanged. Skipping."
-                            )
-                            documents_skipped += 1
-                            continue
-                        else:
-                            # Content has changed - update the existing document
-                            logger.info(
-                                f"Content changed for Slack message {msg_ts} in channel {channel_name}. Updating document."
-                            )
-
-                            # Update chunks and embedding
-                            chunks = await create_document_chunks(
-                                combined_document_string
-                            )
-                            doc_embedding = config.embedding_model_instance.embed(
-                                combined_document_string
-                            )
-
-                            # Update existing document
-                            existing_document.content = combined_document_string
-                            existing_document.content_hash = content_hash
-                            existing_document.embedding = doc_embedding
-                            existing_document.document_metadata = {
+                    channel_messages.append(
+                        IndexableMessage(
+                            unique_identifier=f"{channel_id}_{msg_ts}",
+                            title=f"Slack - {channel_name}",
+                            content=build_document_metadata_markdown(metadata_sections),
+                            metadata={
                                 "channel_name": channel_name,
                                 "channel_id": channel_id,
                                 "start_date": start_date_str,
@@ -337,76 +288,27 @@ async def index_slack_messages(
                                 "indexed_at": datetime.now().strftime(
                                     "%Y-%m-%d %H:%M:%S"
                                 ),
-                            }
-
-                            # Delete old chunks and add new ones
-                            existing_document.chunks = chunks
-                            existing_document.updated_at = get_current_timestamp()
-
-                            documents_indexed += 1
-                            logger.info(f"Successfully updated Slack message {msg_ts}")
-                            continue
-
-                    # Document doesn't exist by unique_identifier_hash
-                    # Check if a document with the same content_hash exists (from another connector)
-                    with session.no_autoflush:
-                        duplicate_by_content = await check_duplicate_document_by_hash(
-                            session, content_hash
-                        )
-
-                    if duplicate_by_content:
-                        logger.info(
-                            f"Slack message {msg_ts} in channel {channel_name} already indexed by another connector "
-                            f"(existing document ID: {duplicate_by_content.id}, "
-                            f"type: {duplicate_by_content.document_type}). Skipping."
+                            },
                         )
-                        documents_skipped += 1
-                        continue
-
-                    # Document doesn't exist - create new one
-                    # Process chunks
-                    chunks = await create_document_chunks(combined_document_string)
-                    doc_embedding = config.embedding_model_instance.embed(
-                        combined_document_string
                     )
 
-                    # Create and store new document
-                    document = Document(
-                        search_space_id=search_space_id,
-                        title=f"Slack - {channel_name}",
-                        document_type=DocumentType.SLACK_CONNECTOR,
-                        document_metadata={
-                            "channel_name": channel_name,
-                            "channel_id": channel_id,
-                            "start_date": start_date_str,
-                            "end_date": end_date_str,
-                            "message_count": len(formatted_messages),
-                            "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        },
-                        content=combined_document_string,
-                        embedding=doc_embedding,
-                        chunks=chunks,
-                        content_hash=content_hash,
-                        unique_identifier_hash=unique_identifier_hash,
-                        updated_at=get_current_timestamp(),
-                        created_by_id=user_id,
-                        connector_id=connector_id,
-                    )
-
-                    session.add(document)
-                    documents_indexed += 1
-
-                    # Batch commit every 10 documents
-                    if documents_indexed % 10 == 0:
-                        logger.info(
-                            f"Committing batch: {documents_indexed} Slack channels processed so far"
-                        )
-                        await session.commit()
+                # Lookups, embeddings and writes happen in batches per channel
+                upsert_result = await bulk_upsert_messages(
+                    session,
+                    channel_messages,
+                    document_type=DocumentType.SLACK_CONNECTOR,
+                    search_space_id=search_space_id,
+                    user_id=user_id,
+                    connector_id=connector_id,
+                )
+                documents_indexed += upsert_result.indexed
+                documents_skipped += upsert_result.skipped
 
                 logger.info(
-                    f"Successfully indexed new channel {channel_name} with {len(formatted_messages)} messages"
+                    f"Indexed channel {channel_name}: {upsert_result.created} new, "
+                    f"{upsert_result.updated} updated, {upsert_result.skipped} skipped "
+                    f"of {len(formatted_messages)} messages"
                 )
-
             except SlackApiError as slack_error:
                 logger.error(
                     f"Slack API error for channel {channel_name}: {slack_error!s}"
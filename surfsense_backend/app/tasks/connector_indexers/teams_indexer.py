@@ -9,26 +9,18 @@ from datetime import UTC
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.teams_history import TeamsHistory
-from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.db import DocumentType, SearchSourceConnectorType
 from app.services.task_logging_service import TaskLoggingService
-from app.utils.document_converters import (
-    create_document_chunks,
-    generate_content_hash,
-    generate_unique_identifier_hash,
-)
 
 from .base import (
     build_document_metadata_markdown,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
-    get_current_timestamp,
     logger,
     update_connector_last_indexed,
 )
+from .bulk_upsert import IndexableMessage, bulk_upsert_messages
 
 # Type hint for heartbeat callback
 HeartbeatCallbackType = Callable[[int], Awaitable[None]]
@@ -243,6 +235,7 @@ async def index_teams_messages(
                             continue
 
                         # Process each message
+                        channel_messages = []
                         for msg in messages:
                             # Skip deleted messages or empty content
                             if msg.get("deletedDateTime"):
@@ -294,64 +287,14 @@ async def index_teams_messages(
                                 ),
                             ]
 
-                            # Build the document string
-                            combined_document_string = build_document_metadata_markdown(
-                                metadata_sections
-                            )
-
-                            # Generate unique identifier hash for this Teams message
-                            unique_identifier = f"{team_id}_{channel_id}_{message_id}"
-                            unique_identifier_hash = generate_unique_identifier_hash(
-                                DocumentType.TEAMS_CONNECTOR,
-                                unique_identifier,
-                                search_space_id,
-                            )
-
-                            # Generate content hash
-                            content_hash = generate_content_hash(
-                                combined_document_string, search_space_id
-                            )
-
-                            # Check if document with this unique identifier already exists
-                            existing_document = (
-                                await check_document_by_unique_identifier(
-                                    session, unique_identifier_hash
-                                )
-                            )
-
-                            if existing_document:
-                                # Document exists - check if content has changed
-                                if existing_document.content_hash == content_hash:
-                                    logger.info(
-                                        "Document for Teams message %s in channel %s unchanged. Skipping.",
-                                        message_id,
-                                        channel_name,
-                                    )
-                                    documents_skipped += 1
-                                    continue
-                                else:
-                                    # Content has changed - update the existing document
-                                    logger.info(
-                                        "Content changed for Teams message %s in channel %s. Updating document.",
-                                        message_id,
-                                        channel_name,
-                                    )
-
-                                    # Update chunks and embedding
-                                    chunks = await create_document_chunks(
-                                        combined_document_string
-                                    )
-                                    doc_embedding = (
-                                        config.embedding_model_instance.embed(
-                                            combined_document_string
-                                        )
-                                    )
-
-                                    # Update existing document
-                                    existing_document.content = combined_document_string
-                                    existing_document.content_hash = content_hash
-                                    existing_document.embedding = doc_embedding
-                                    existing_document.document_metadata = {
+                            channel_messages.append(
+                                IndexableMessage(
+                                    unique_identifier=f"{team_id}_{channel_id}_{message_id}",
+                                    title=f"Teams - {team_name} - {channel_name}",
+                                    content=build_document_metadata_markdown(
+                                        metadata_sections
+                                    ),
+                                    metadata={
                                         "team_name": team_name,
                                         "team_id": team_id,
                                         "channel_name": channel_name,
@@ -362,93 +305,29 @@ async def index_teams_messages(
                                         "indexed_at": datetime.now().strftime(
                                             "%Y-%m-%d %H:%M:%S"
                                         ),
-                                    }
-
-                                    # Delete old chunks and add new ones
-                                    existing_document.chunks = chunks
-                                    existing_document.updated_at = (
-                                        get_current_timestamp()
-                                    )
-
-                                    documents_indexed += 1
-                                    logger.info(
-                                        "Successfully updated Teams message %s",
-                                        message_id,
-                                    )
-                                    continue
-
-                            # Document doesn't exist by unique_identifier_hash
-                            # Check if a document with the same content_hash exists (from another connector)
-                            with session.no_autoflush:
-                                duplicate_by_content = (
-                                    await check_duplicate_document_by_hash(
-                                        session, content_hash
-                                    )
+                                    },
                                 )
-
-                            if duplicate_by_content:
-                                logger.info(
-                                    "Teams message %s in channel %s already indexed by another connector "
-                                    "(existing document ID: %s, type: %s). Skipping.",
-                                    message_id,
-                                    channel_name,
-                                    duplicate_by_content.id,
-                                    duplicate_by_content.document_type,
-                                )
-                                documents_skipped += 1
-                                continue
-
-                            # Document doesn't exist - create new one
-                            # Process chunks
-                            chunks = await create_document_chunks(
-                                combined_document_string
-                            )
-                            doc_embedding = config.embedding_model_instance.embed(
-                                combined_document_string
                             )
 
-                            # Create and store new document
-                            document = Document(
-                                search_space_id=search_space_id,
-                                title=f"Teams - {team_name} - {channel_name}",
-                                document_type=DocumentType.TEAMS_CONNECTOR,
-                                document_metadata={
-                                    "team_name": team_name,
-                                    "team_id": team_id,
-                                    "channel_name": channel_name,
-                                    "channel_id": channel_id,
-                                    "start_date": start_date_str,
-                                    "end_date": end_date_str,
-                                    "message_count": len(messages),
-                                    "indexed_at": datetime.now().strftime(
-                                        "%Y-%m-%d %H:%M:%S"
-                                    ),
-                                },
-                                content=combined_document_string,
-                                embedding=doc_embedding,
-                                chunks=chunks,
-                                content_hash=content_hash,
-                                unique_identifier_hash=unique_identifier_hash,
-                                updated_at=get_current_timestamp(),
-                                created_by_id=user_id,
-                                connector_id=connector_id,
-                            )
-
-                            session.add(document)
-                            documents_indexed += 1
-
-                            # Batch commit every 10 documents
-                            if documents_indexed % 10 == 0:
-                                logger.info(
-                                    "Committing batch: %s Teams messages processed so far",
-                                    documents_indexed,
-                                )
-                                await session.commit()
+                        # Lookups, embeddings and writes happen in batches per channel
+                        upsert_result = await bulk_upsert_messages(
+                            session,
+                            channel_messages,
+                            document_type=DocumentType.TEAMS_CONNECTOR,
+                            search_space_id=search_space_id,
+                            user_id=user_id,
+                            connector_id=connector_id,
+                        )
+                        documents_indexed += upsert_result.indexed
+                        documents_skipped += upsert_result.skipped
 
                         logger.info(
-                            "Successfully indexed channel %s in team %s with %s messages",
+                            "Indexed channel %s in team %s: %s new, %s updated, %s skipped of %s messages",
                             channel_name,
                             team_name,
+                            upsert_result.created,
+                            upsert_result.updated,
+                            upsert_result.skipped,
                             len(messages),
                         )
 
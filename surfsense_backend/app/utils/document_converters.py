@@ -5,6 +5,7 @@ from litellm import get_model_info, token_counter
 from app.config import config
 from app.db import Chunk, DocumentType
 from app.prompts import SUMMARY_PROMPT_TEMPLATE
+from app.services.embedding_service import embed_text, embed_texts
 
 
 def get_model_context_window(model_name: str) -> int:
@@ -146,7 +147,7 @@ async def generate_document_summary(
     else:
         enhanced_summary_content = summary_content
 
-    summary_embedding = config.embedding_model_instance.embed(enhanced_summary_content)
+    summary_embedding = await embed_text(enhanced_summary_content)
 
     return enhanced_summary_content, summary_embedding
 
@@ -161,12 +162,11 @@ async def create_document_chunks(content: str) -> list[Chunk]:
     Returns:
         List of Chunk objects with embeddings
     """
+    chunk_texts = [chunk.text for chunk in config.chunker_instance.chunk(content)]
+    embeddings = await embed_texts(chunk_texts)
     return [
-        Chunk(
-            content=chunk.text,
-            embedding=config.embedding_model_instance.embed(chunk.text),
-        )
-        for chunk in config.chunker_instance.chunk(content)
+        Chunk(content=text, embedding=embedding)
+        for text, embedding in zip(chunk_texts, embeddings, strict=True)
     ]
 
 
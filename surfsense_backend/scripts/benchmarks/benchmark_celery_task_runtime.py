@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark short Celery task bodies with and without the worker runtime.
+
+Each simulated task opens a session and runs ``SELECT 1``, which is roughly
+what the schedule checker does when nothing is due.  The ``per-task`` mode
+reproduces the previous pattern (new event loop plus a ``NullPool`` engine per
+task); the ``runtime`` mode runs every task on one ``WorkerRuntime``.  Tasks
+run in-process and back to back, so the numbers isolate per-task overhead
+from Celery's broker round trips.
+
+With ``--no-db`` the tasks only ``await asyncio.sleep(0)``, which measures
+event loop setup alone and needs no database.
+
+Usage
+-----
+    DATABASE_URL=postgresql+asyncpg://... \\
+        python scripts/benchmarks/benchmark_celery_task_runtime.py --tasks 200
+    python scripts/benchmarks/benchmark_celery_task_runtime.py --no-db --tasks 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.tasks.celery_tasks.worker_runtime import WorkerRuntime
+
+
+async def _db_task(session_maker) -> None:
+    async with session_maker() as session:
+        await session.execute(text("SELECT 1"))
+
+
+async def _noop_task() -> None:
+    await asyncio.sleep(0)
+
+
+def _per_task(database_url: str | None, tasks: int) -> float:
+    started = time.perf_counter()
+    for _ in range(tasks):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            if database_url is None:
+                loop.run_until_complete(_noop_task())
+            else:
+                engine = create_async_engine(database_url, poolclass=NullPool)
+                session_maker = async_sessionmaker(engine, expire_on_commit=False)
+                loop.run_until_complete(_db_task(session_maker))
+        finally:
+            loop.close()
+    return time.perf_counter() - started
+
+
+def _runtime(database_url: str | None, tasks: int, pool_size: int) -> float:
+    runtime = WorkerRuntime(
+        database_url or "postgresql+asyncpg://unused@localhost/unused",
+        pool_size=pool_size,
+    )
+    started = time.perf_counter()
+    runtime.start()
+    try:
+        for _ in range(tasks):
+            if database_url is None:
+                runtime.run(_noop_task())
+            else:
+                runtime.run(_db_task(runtime.session_maker))
+    finally:
+        runtime.shutdown()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--no-db", action="store_true")
+    args = parser.parse_args()
+
+    database_url = None if args.no_db else args.database_url
+    if not args.no_db and not database_url:
+        parser.error("set DATABASE_URL / --database-url, or pass --no-db")
+
+    print(f"{'mode':<9} {'tasks':>6} {'seconds':>9} {'tasks/s':>9} {'ms/task':>8}")
+    for mode, fn in (
+        ("per-task", lambda: _per_task(database_url, args.tasks)),
+        ("runtime", lambda: _runtime(database_url, args.tasks, args.pool_size)),
+    ):
+        elapsed = fn()
+        print(
+            f"{mode:<9} {args.tasks:>6} {elapsed:>9.3f} "
+            f"{args.tasks / elapsed:>9.0f} {1000 * elapsed / args.tasks:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Benchmark knowledge-base retrieval latency across 1, 5 and 15 connectors.
+
+Runs ``search_knowledge_base_async`` against a real search space in two modes:
+
+* **sequential** - ``CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS`` off: connectors
+  are searched one at a time and each connector runs its chunk and document
+  hybrid searches in series on the request session;
+* **concurrent** - isolated retrieval sessions: chunk and document searches
+  run in parallel on pooled sessions, the query is embedded once per
+  connector (cached after the first), and connectors fan out up to
+  ``CONNECTOR_SEARCH_MAX_CONCURRENCY`` at a time.
+
+Only connectors backed by indexed documents are used (no external web search
+APIs), so the numbers reflect database round trips. Each measurement reports
+p50 / p95 / max wall-clock latency over ``--repeats`` runs.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_connector_retrieval.py --search-space-id 1
+    python scripts/benchmarks/benchmark_connector_retrieval.py --search-space-id 1 \\
+        --query "budget för äldreomsorg" --repeats 20 --max-concurrency 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.agents.new_chat.tools.knowledge_base import (
+    _ALL_CONNECTORS,
+    search_knowledge_base_async,
+)
+from app.config import config
+from app.db import async_session_maker
+from app.services.connector_service import (
+    SHARED_SESSION_CONNECTORS,
+    ConnectorService,
+)
+
+_CONNECTOR_COUNTS = (1, 5, 15)
+_LOCAL_CONNECTORS = [
+    connector
+    for connector in _ALL_CONNECTORS
+    if connector not in SHARED_SESSION_CONNECTORS
+]
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _measure(
+    *,
+    query: str,
+    search_space_id: int,
+    connectors: list[str],
+    repeats: int,
+    top_k: int,
+) -> list[float]:
+    samples: list[float] = []
+    for _ in range(repeats):
+        async with async_session_maker() as session:
+            connector_service = ConnectorService(session, search_space_id)
+            started = time.perf_counter()
+            await search_knowledge_base_async(
+                query=query,
+                search_space_id=search_space_id,
+                db_session=session,
+                connector_service=connector_service,
+                connectors_to_search=connectors,
+                available_connectors=connectors,
+                top_k=top_k,
+            )
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--search-space-id", type=int, required=True)
+    parser.add_argument("--query", default="budget och kostnader för projektet")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.max_concurrency:
+        config.CONNECTOR_SEARCH_MAX_CONCURRENCY = args.max_concurrency
+    print(
+        f"search_space={args.search_space_id} repeats={args.repeats} "
+        f"max_concurrency={config.CONNECTOR_SEARCH_MAX_CONCURRENCY}"
+    )
+
+    # Warm up the connection pool and embedding model before timing.
+    config.CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS = True
+    await _measure(
+        query=args.query,
+        search_space_id=args.search_space_id,
+        connectors=_LOCAL_CONNECTORS[:1],
+        repeats=1,
+        top_k=args.top_k,
+    )
+
+    for count in _CONNECTOR_COUNTS:
+        connectors = _LOCAL_CONNECTORS[:count]
+        for label, isolated in (("sequential", False), ("concurrent", True)):
+            config.CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS = isolated
+            samples = await _measure(
+                query=args.query,
+                search_space_id=args.search_space_id,
+                connectors=connectors,
+                repeats=args.repeats,
+                top_k=args.top_k,
+            )
+            print(
+                f"{count:>3} connectors  {label:<10}  "
+                f"p50 {statistics.median(samples) * 1000:8.1f} ms  "
+                f"p95 {_percentile(samples, 0.95) * 1000:8.1f} ms  "
+                f"max {max(samples) * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Benchmark Docling conversion and large-document summarization.
+
+Conversion (``--pdf``): converts the file once on the event loop (the
+previous behaviour: ``converter.convert`` called inside the coroutine) and once
+through ``DoclingConversionPool``.  While each conversion runs, a 10 ms ticker
+measures the worst event loop stall, which is what every other request served
+by the same process waits for.  Pool start-up (model loading) is timed
+separately from the conversion itself.
+
+Summarization: chunks the converted markdown (or ``--chars`` of synthetic
+text) exactly like ``process_large_document_summary`` and runs the map-reduce
+stage against a fake LLM that sleeps ``--llm-latency`` seconds per call,
+sequentially (concurrency 1) and with ``--concurrency``.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_docling_pipeline.py --pdf report-300p.pdf
+    python scripts/benchmarks/benchmark_docling_pipeline.py --chars 1200000 \\
+        --llm-latency 0.5 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.docling_service import (
+    LARGE_DOCUMENT_THRESHOLD,
+    DoclingConversionPool,
+    DoclingService,
+    map_reduce_summarize,
+)
+
+
+async def _with_loop_lag(coro) -> tuple[object, float, float]:
+    """Run ``coro`` and return (result, seconds, worst ticker stall in seconds)."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - started - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    try:
+        result = await coro
+    finally:
+        elapsed = time.perf_counter() - started
+        done = True
+        await tick
+    return result, elapsed, worst
+
+
+async def _convert_on_loop(service: DoclingService, pdf: str) -> str:
+    return service.convert_to_markdown(pdf)
+
+
+def _page_count(pdf: str) -> int | None:
+    try:
+        from pypdf import PdfReader
+
+        return len(PdfReader(pdf).pages)
+    except Exception:
+        return None
+
+
+async def _bench_conversion(pdf: str) -> str:
+    pages = _page_count(pdf)
+    print(f"conversion of {pdf} ({pages or '?'} pages)")
+    print(f"{'mode':<10} {'seconds':>9} {'pages/s':>8} {'max loop stall':>15}")
+
+    def row(mode: str, seconds: float, stall: float) -> None:
+        rate = f"{pages / seconds:>8.2f}" if pages else f"{'-':>8}"
+        print(f"{mode:<10} {seconds:>9.2f} {rate} {stall:>14.2f}s")
+
+    service = DoclingService(load_converter=True)
+    content, seconds, stall = await _with_loop_lag(_convert_on_loop(service, pdf))
+    row("on-loop", seconds, stall)
+
+    pool = DoclingConversionPool(max_workers=1, max_queued=0, timeout=3600)
+    try:
+        # First job includes worker start-up and model loading
+        _, warmup, _ = await _with_loop_lag(pool.convert(pdf))
+        print(f"{'pool-warm':<10} {warmup:>9.2f}   (worker start + model load + job)")
+        _, seconds, stall = await _with_loop_lag(pool.convert(pdf))
+        row("pool", seconds, stall)
+    finally:
+        pool.shutdown()
+    return content
+
+
+async def _bench_summary(content: str, latency: float, concurrency: int) -> None:
+    from chonkie import OverlapRefinery, RecursiveChunker
+
+    chunks = OverlapRefinery(context_size=0.1, method="suffix").refine(
+        RecursiveChunker(chunk_size=8000).chunk(content)
+    )
+    texts = [chunk.text for chunk in chunks]
+    calls = 0
+
+    async def summarize(text, number, total):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(latency)
+        return text[:1200]
+
+    async def combine(summaries, title):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(latency)
+        return summaries[:2000]
+
+    print(
+        f"\nsummarization of {len(content):,} chars in {len(texts)} chunks "
+        f"(fake LLM, {latency:.2f}s per call)"
+    )
+    print(f"{'concurrency':>11} {'seconds':>9} {'LLM calls':>10}")
+    for limit in (1, concurrency):
+        calls = 0
+        started = time.perf_counter()
+        await map_reduce_summarize(
+            texts,
+            summarize_chunk=summarize,
+            combine=combine,
+            document_title="benchmark",
+            concurrency=limit,
+            reduce_budget_chars=LARGE_DOCUMENT_THRESHOLD,
+        )
+        print(f"{limit:>11} {time.perf_counter() - started:>9.2f} {calls:>10}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", help="PDF to convert (requires docling)")
+    parser.add_argument("--chars", type=int, default=1_200_000)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.pdf:
+        content = await _bench_conversion(args.pdf)
+    else:
+        print(
+            "conversion: not measured (no --pdf given); PDF throughput needs "
+            "docling and a real document\n"
+            f"summarization input: {args.chars:,} synthetic chars"
+        )
+        paragraph = (
+            "Statistiska centralbyrån publicerar kvartalsvis uppgifter om "
+            "befolkning, arbetsmarknad och ekonomi för samtliga kommuner. "
+        ) * 8
+        content = "\n\n".join(
+            paragraph for _ in range(args.chars // (len(paragraph) + 2) + 1)
+        )[: args.chars]
+
+    await _bench_summary(content, args.llm_latency, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmark document chunk embedding: per-chunk ``embed`` vs the batched pipeline.
+
+Chunks a synthetic (or supplied) document with the configured chunker and
+embeds every chunk twice:
+
+* **per-chunk** - the previous ``create_document_chunks`` path, one
+  synchronous ``embedding_model_instance.embed`` call per chunk on the loop;
+* **batched**   - ``app.services.embedding_service.embed_texts`` with
+  ``EMBEDDING_BATCH_SIZE`` / ``EMBEDDING_MAX_WORKERS``.
+
+For each path it reports chunks/sec and the worst event-loop stall observed
+by a 10 ms ticker running alongside.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_embedding_pipeline.py
+    python scripts/benchmarks/benchmark_embedding_pipeline.py --file report.md
+    python scripts/benchmarks/benchmark_embedding_pipeline.py --paragraphs 2000 --batch-size 64
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.config import config
+from app.services.embedding_service import embed_texts
+
+_PARAGRAPH = (
+    "Stycke {index}: Kommunens budget för äldreomsorg ökade under året och "
+    "nya riktlinjer för hemtjänst infördes. Rapporten beskriver kostnader, "
+    "personalförsörjning och brukarnöjdhet i detalj för varje stadsdel."
+)
+
+
+async def _measure_loop_stall(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - started - interval)
+    return worst
+
+
+async def _run(label: str, coro_factory, chunk_count: int) -> None:
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_measure_loop_stall(stop))
+    started = time.perf_counter()
+    await coro_factory()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    stall = await ticker
+    print(
+        f"{label:<10} {chunk_count:>7} chunks  {elapsed:8.2f} s  "
+        f"{chunk_count / elapsed if elapsed else 0:10.1f} chunks/s  "
+        f"max loop stall {stall * 1000:8.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--file", type=Path, help="Markdown/text file to chunk")
+    parser.add_argument("--paragraphs", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.file:
+        content = args.file.read_text(encoding="utf-8")
+    else:
+        content = "\n\n".join(
+            _PARAGRAPH.format(index=index) for index in range(args.paragraphs)
+        )
+    chunk_texts = [chunk.text for chunk in config.chunker_instance.chunk(content)]
+    print(
+        f"model={config.EMBEDDING_MODEL} chunks={len(chunk_texts)} "
+        f"batch_size={args.batch_size or config.EMBEDDING_BATCH_SIZE} "
+        f"workers={config.EMBEDDING_MAX_WORKERS}"
+    )
+
+    async def per_chunk() -> None:
+        for text in chunk_texts:
+            config.embedding_model_instance.embed(text)
+
+    async def batched() -> None:
+        await embed_texts(chunk_texts, batch_size=args.batch_size)
+
+    # Warm up model weights / tokenizer caches before timing.
+    config.embedding_model_instance.embed(chunk_texts[0] if chunk_texts else "warmup")
+    await _run("per-chunk", per_chunk, len(chunk_texts))
+    await _run("batched", batched, len(chunk_texts))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
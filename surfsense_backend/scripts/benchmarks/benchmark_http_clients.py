@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Benchmark per-request httpx clients against the shared client registry.
+
+Sends ``--requests`` GETs, ``--concurrency`` at a time, to ``--url``.  The
+``per-request`` mode opens an ``httpx.AsyncClient`` for every call (the
+previous behaviour of the SMHI, Riksdagen, Kolada and Trafikverket
+services); ``shared`` goes through ``get_http_client``.  Without ``--url`` a
+local keep-alive HTTP server is started, which shows the connection counts
+but not TLS cost; point ``--url`` at a real upstream (e.g.
+``https://opendata-download-metobs.smhi.se/api.json``) to include
+handshakes.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_http_clients.py --requests 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.http_clients import (
+    close_http_clients,
+    get_http_client,
+    http_client_stats,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"value": 1}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_local_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/data"
+
+
+async def _run(mode: str, url: str, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    connections = {"opened": 0}
+
+    async def count(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            connections["opened"] += 1
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if mode == "shared":
+                response = await get_http_client(url).get(url)
+            else:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.get(url, extensions={"trace": count})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - started
+
+    if mode == "shared":
+        stats = next(iter(http_client_stats().values()))
+        connections["opened"] = stats["connections_opened"]
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{mode:<12} {requests:>8} {connections['opened']:>11} "
+        f"{1000 * statistics.median(ordered):>9.2f} {1000 * p95:>9.2f} "
+        f"{requests / wall:>9.0f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    url = args.url or _start_local_server()
+    print(
+        f"{'mode':<12} {'requests':>8} {'connections':>11} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'req/s':>9}"
+    )
+    await _run("per-request", url, args.requests, args.concurrency)
+    try:
+        await _run("shared", url, args.requests, args.concurrency)
+        print(f"\nregistry stats: {http_client_stats()}")
+    finally:
+        await close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark per-chunk cost of ``IncrementalSchemaParser`` as responses grow.
+
+Streams synthetic synthesizer-style JSON (``thinking`` + ``response`` +
+a few decision fields) through ``feed_all`` in token-sized chunks and
+reports the mean cost per chunk for growing response lengths.  With the
+incremental tokenizer the per-chunk cost should stay flat; a parser that
+re-parses the whole buffer on every chunk grows linearly with the length.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_incremental_json_parser.py
+    python scripts/benchmarks/benchmark_incremental_json_parser.py --tokens 500 2000 8000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.agents.new_chat.incremental_json_parser import (
+    IncrementalSchemaParser,
+)
+
+_WORDS = (
+    "Kommunen",
+    "redovisar",
+    "budgeten",
+    "för",
+    "äldreomsorg",
+    'och "hemtjänst"',
+    "per\nstadsdel",
+    "med",
+    "ökade",
+    "kostnader",
+)
+
+
+def _payload(tokens: int) -> str:
+    half = tokens // 2
+    thinking = " ".join(_WORDS[i % len(_WORDS)] for i in range(half))
+    response = " ".join(_WORDS[(i * 3) % len(_WORDS)] for i in range(half))
+    return json.dumps(
+        {
+            "thinking": thinking,
+            "response": response,
+            "decision": "ok",
+            "confidence": 0.91,
+            "sources": [{"id": 1, "title": "Budget 2024"}],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _chunks(raw: str, chunk_chars: int) -> list[str]:
+    return [raw[i : i + chunk_chars] for i in range(0, len(raw), chunk_chars)]
+
+
+def _measure(chunks: list[str]) -> float:
+    parser = IncrementalSchemaParser()
+    started = time.perf_counter()
+    for chunk in chunks:
+        parser.feed_all(chunk)
+    elapsed = time.perf_counter() - started
+    parser.finalize()
+    return elapsed / len(chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--tokens", type=int, nargs="+", default=[250, 1000, 4000, 16000]
+    )
+    parser.add_argument("--chunk-chars", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for tokens in args.tokens:
+        chunks = _chunks(_payload(tokens), args.chunk_chars)
+        per_chunk = min(_measure(chunks) for _ in range(args.repeats))
+        print(
+            f"{tokens:>6} tokens  {len(chunks):>6} chunks  "
+            f"{per_chunk * 1_000_000:7.2f} us/chunk"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark MCP tool calls with per-call connections and pooled sessions.
+
+Starts a small FastMCP stdio server (written to a temporary file) and calls
+its ``echo`` tool ``--calls`` times.  The ``per-call`` mode reproduces the
+previous behaviour (spawn the server, ``initialize``, call, tear down for
+every call, like ``MCPClient.connect()`` in each tool invocation); the
+``pooled`` mode goes through ``MCPSessionManager``, sequentially and then
+with ``--concurrency`` calls in flight on the shared session.  Tool
+discovery is timed the same way (cold ``list_tools`` vs cached).
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_mcp_sessions.py --calls 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.agents.new_chat.tools.mcp_client import MCPClient
+from app.agents.new_chat.tools.mcp_session_pool import (
+    MCPServerConfig,
+    MCPSessionManager,
+)
+
+_SERVER_SOURCE = '''
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("benchmark")
+
+
+@server.tool()
+def echo(text: str) -> str:
+    """Return the text unchanged."""
+    return text
+
+
+if __name__ == "__main__":
+    server.run()
+'''
+
+
+def _row(mode: str, latencies: list[float], wall: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{mode:<18} {len(latencies):>6} {1000 * statistics.median(ordered):>9.1f} "
+        f"{1000 * p95:>9.1f} {len(latencies) / wall:>9.1f}"
+    )
+
+
+async def _timed(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def _per_call(command: str, args: list[str], calls: int) -> None:
+    async def one(i: int) -> None:
+        client = MCPClient(command, args)
+        async with client.connect():
+            await client.call_tool("echo", {"text": f"call {i}"})
+
+    started = time.perf_counter()
+    latencies = [await _timed(one(i)) for i in range(calls)]
+    _row("per-call", latencies, time.perf_counter() - started)
+
+
+async def _pooled(config: MCPServerConfig, calls: int, concurrency: int) -> None:
+    manager = MCPSessionManager()
+    try:
+        warmup = await _timed(manager.call_tool(config, "echo", {"text": "warm"}))
+        print(f"{'pooled (connect)':<18} {1:>6} {1000 * warmup:>9.1f}")
+
+        started = time.perf_counter()
+        latencies = [
+            await _timed(manager.call_tool(config, "echo", {"text": f"call {i}"}))
+            for i in range(calls)
+        ]
+        _row("pooled", latencies, time.perf_counter() - started)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(i: int) -> float:
+            async with semaphore:
+                return await _timed(
+                    manager.call_tool(config, "echo", {"text": f"call {i}"})
+                )
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(bounded(i) for i in range(calls)))
+        _row(f"pooled x{concurrency}", list(latencies), time.perf_counter() - started)
+
+        print(f"\n{'discovery':<18} {'ms':>9}")
+        cold = await _timed(_list_tools_per_call(config))
+        await manager.list_tools(config)
+        cached = await _timed(manager.list_tools(config))
+        print(f"{'per-call':<18} {1000 * cold:>9.1f}")
+        print(f"{'cached':<18} {1000 * cached:>9.3f}")
+        print(f"\nmanager stats: {manager.stats()}")
+    finally:
+        await manager.close_all()
+
+
+async def _list_tools_per_call(config: MCPServerConfig) -> None:
+    client = MCPClient(config.command, list(config.args))
+    async with client.connect():
+        await client.list_tools()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server_path = Path(tmp) / "benchmark_mcp_server.py"
+        server_path.write_text(_SERVER_SOURCE)
+        command, server_args = sys.executable, [str(server_path)]
+
+        print(f"{'mode':<18} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'calls/s':>9}")
+        await _per_call(command, server_args, args.calls)
+        await _pooled(
+            MCPServerConfig.stdio(command, server_args), args.calls, args.concurrency
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
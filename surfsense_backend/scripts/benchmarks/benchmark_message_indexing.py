@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+"""
+Benchmark per-message connector indexing on a synthetic 50k-message workspace.
+
+Generates a Slack-style workspace (``--channels`` channels, ``--messages``
+messages in total) and indexes it into a real search space three times with
+``bulk_upsert_messages``:
+
+* **initial** - every message is new;
+* **unchanged** - a re-run where nothing changed (lookups only);
+* **edited** - a re-run where ``--changed-fraction`` of the messages changed.
+
+For comparison the per-message path the indexers used before (one lookup,
+chunking and a synchronous document embedding per message, commit every 10)
+indexes a separate channel of ``--baseline-messages`` messages.  Throughput is reported
+as messages per second.  All synthetic documents are deleted afterwards.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_message_indexing.py \\
+        --search-space-id 1 --connector-id 3
+    python scripts/benchmarks/benchmark_message_indexing.py \\
+        --search-space-id 1 --connector-id 3 --messages 50000 --channels 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import delete
+
+from app.config import config
+from app.db import Document, DocumentType, async_session_maker
+from app.tasks.connector_indexers.base import (
+    build_document_metadata_markdown,
+    check_document_by_unique_identifier,
+    get_current_timestamp,
+)
+from app.tasks.connector_indexers.bulk_upsert import (
+    IndexableMessage,
+    bulk_upsert_messages,
+)
+from app.utils.document_converters import (
+    create_document_chunks,
+    generate_content_hash,
+    generate_unique_identifier_hash,
+)
+
+_WORDS = (
+    "budget",
+    "äldreomsorg",
+    "möte",
+    "protokoll",
+    "hemtjänst",
+    "beslut",
+    "skola",
+    "kostnad",
+    "upphandling",
+    "rapport",
+)
+
+
+def _workspace(
+    run_id: str, messages: int, channels: int, edit_every: int = 0
+) -> dict[str, list[IndexableMessage]]:
+    workspace: dict[str, list[IndexableMessage]] = {}
+    for index in range(messages):
+        channel = f"bench-{run_id}-c{index % channels}"
+        text = " ".join(_WORDS[(index + offset) % len(_WORDS)] for offset in range(24))
+        if edit_every and index % edit_every == 0:
+            text += " (redigerad)"
+        content = build_document_metadata_markdown(
+            [
+                (
+                    "METADATA",
+                    [f"CHANNEL_NAME: {channel}", f"MESSAGE_TIMESTAMP: {index}"],
+                ),
+                ("CONTENT", ["FORMAT: markdown", "TEXT_START", text, "TEXT_END"]),
+            ]
+        )
+        workspace.setdefault(channel, []).append(
+            IndexableMessage(
+                unique_identifier=f"{channel}_{index}",
+                title=f"Slack - {channel}",
+                content=content,
+                metadata={"channel_name": channel},
+            )
+        )
+    return workspace
+
+
+async def _index_bulk(
+    workspace: dict[str, list[IndexableMessage]],
+    *,
+    search_space_id: int,
+    connector_id: int,
+) -> tuple[float, int, int]:
+    indexed = skipped = 0
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        for messages in workspace.values():
+            result = await bulk_upsert_messages(
+                session,
+                messages,
+                document_type=DocumentType.SLACK_CONNECTOR,
+                search_space_id=search_space_id,
+                user_id=None,
+                connector_id=connector_id,
+            )
+            indexed += result.indexed
+            skipped += result.skipped
+    return time.perf_counter() - started, indexed, skipped
+
+
+async def _index_per_message(
+    messages: list[IndexableMessage],
+    *,
+    search_space_id: int,
+    connector_id: int,
+) -> float:
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        for count, message in enumerate(messages, start=1):
+            unique_identifier_hash = generate_unique_identifier_hash(
+                DocumentType.SLACK_CONNECTOR,
+                message.unique_identifier,
+                search_space_id,
+            )
+            content_hash = generate_content_hash(message.content, search_space_id)
+            existing = await check_document_by_unique_identifier(
+                session, unique_identifier_hash
+            )
+            if existing and existing.content_hash == content_hash:
+                continue
+            chunks = await create_document_chunks(message.content)
+            session.add(
+                Document(
+                    search_space_id=search_space_id,
+                    title=message.title,
+                    document_type=DocumentType.SLACK_CONNECTOR,
+                    document_metadata=message.metadata,
+                    content=message.content,
+                    embedding=config.embedding_model_instance.embed(message.content),
+                    chunks=chunks,
+                    content_hash=content_hash,
+                    unique_identifier_hash=unique_identifier_hash,
+                    updated_at=get_current_timestamp(),
+                    connector_id=connector_id,
+                )
+            )
+            if count % 10 == 0:
+                await session.commit()
+        await session.commit()
+    return time.perf_counter() - started
+
+
+async def _cleanup(
+    workspace: dict[str, list[IndexableMessage]], search_space_id: int
+) -> None:
+    hashes = [
+        generate_unique_identifier_hash(
+            DocumentType.SLACK_CONNECTOR, message.unique_identifier, search_space_id
+        )
+        for messages in workspace.values()
+        for message in messages
+    ]
+    async with async_session_maker() as session:
+        for start in range(0, len(hashes), 5000):
+            await session.execute(
+                delete(Document).where(
+                    Document.unique_identifier_hash.in_(hashes[start : start + 5000])
+                )
+            )
+        await session.commit()
+
+
+def _report(label: str, elapsed: float, messages: int) -> None:
+    print(
+        f"{label:<22} {messages:>7} messages  {elapsed:8.2f} s  "
+        f"{messages / elapsed:9.1f} msg/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--search-space-id", type=int, required=True)
+    parser.add_argument("--connector-id", type=int, required=True)
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--changed-fraction", type=float, default=0.1)
+    parser.add_argument("--baseline-messages", type=int, default=1000)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    workspace = _workspace(run_id, args.messages, args.channels)
+    edit_every = round(1 / args.changed_fraction) if args.changed_fraction else 0
+    edited = _workspace(run_id, args.messages, args.channels, edit_every)
+    baseline_workspace = _workspace(f"{run_id}-base", args.baseline_messages, 1)
+    kwargs = {
+        "search_space_id": args.search_space_id,
+        "connector_id": args.connector_id,
+    }
+    print(
+        f"search_space={args.search_space_id} messages={args.messages} "
+        f"channels={args.channels} run={run_id}"
+    )
+
+    try:
+        baseline = await _index_per_message(
+            next(iter(baseline_workspace.values())), **kwargs
+        )
+        _report("per-message (initial)", baseline, args.baseline_messages)
+
+        for label, messages in (
+            ("bulk (initial)", workspace),
+            ("bulk (unchanged)", workspace),
+            ("bulk (edited)", edited),
+        ):
+            elapsed, indexed, skipped = await _index_bulk(messages, **kwargs)
+            _report(label, elapsed, args.messages)
+            print(f"{'':<22} indexed={indexed} skipped={skipped}")
+    finally:
+        await _cleanup(workspace, args.search_space_id)
+        await _cleanup(baseline_workspace, args.search_space_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Benchmark a full bottom-up metadata separation run on the seeded catalog.
+
+Runs ``run_bottom_up_metadata_separation`` for a real search space the way
+the admin endpoint does (intent, agent and tool stages; no LLM refinement)
+and reports the wall-clock time of the run and of each stage, together with
+how many calls and texts reached the embedding model.  Each stage embeds
+its layer's item texts in one ``embed_batch`` call and keeps them as a
+NumPy matrix, so most model traffic should be batched.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_metadata_separation.py \\
+        --search-space-id 1 --user-id <uuid>
+    python scripts/benchmarks/benchmark_metadata_separation.py \\
+        --search-space-id 1 --user-id <uuid> --max-tools 50 --runs 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.config import config
+from app.db import User, async_session_maker
+from app.routes.admin_tool_settings_routes import (
+    _build_tool_index_for_search_space,
+    _infer_agent_for_tool,
+    _resolve_expected_route_and_intent,
+)
+from app.services import metadata_separation_service
+from app.services.agent_metadata_service import get_effective_agent_metadata
+from app.services.intent_definition_service import get_effective_intent_definitions
+from app.services.metadata_separation_service import run_bottom_up_metadata_separation
+from app.services.tool_retrieval_tuning_service import (
+    get_global_tool_retrieval_tuning,
+)
+
+
+class _CountingModel:
+    """Counts ``embed`` / ``embed_batch`` calls made to the wrapped model."""
+
+    def __init__(self, model):
+        self._model = model
+        self.calls = {"embed": 0, "embed_batch": 0, "texts": 0}
+
+    def embed(self, text):
+        self.calls["embed"] += 1
+        self.calls["texts"] += 1
+        return self._model.embed(text)
+
+    def embed_batch(self, texts):
+        self.calls["embed_batch"] += 1
+        self.calls["texts"] += len(texts)
+        batch = getattr(self._model, "embed_batch", None)
+        if batch is None:
+            return [self._model.embed(text) for text in texts]
+        return batch(texts)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+async def _run(search_space_id: int, user_id: str, max_tools: int) -> dict:
+    async with async_session_maker() as session:
+        user = await session.get(User, uuid.UUID(user_id))
+        if user is None:
+            raise SystemExit(f"User {user_id} not found")
+
+        async def rebuild(patch_map):
+            (
+                tool_index,
+                _persisted,
+                _effective,
+            ) = await _build_tool_index_for_search_space(
+                session,
+                user,
+                search_space_id=search_space_id,
+                metadata_patch=patch_map,
+            )
+            return tool_index
+
+        tool_index = await rebuild({})
+        expected_intent: dict[str, str] = {}
+        expected_agent: dict[str, str] = {}
+        for entry in tool_index:
+            tool_id = str(entry.tool_id or "")
+            route, intent_id = _resolve_expected_route_and_intent(
+                tool_id=tool_id, category=entry.category, route=None, intent=None
+            )
+            expected_intent[tool_id] = str(intent_id or "").lower() or "kunskap"
+            expected_agent[tool_id] = _infer_agent_for_tool(
+                tool_id, entry.category, route, None
+            )
+        started = time.perf_counter()
+        result = await run_bottom_up_metadata_separation(
+            rebuild_tool_index_fn=rebuild,
+            retrieval_tuning=await get_global_tool_retrieval_tuning(session),
+            expected_intent_by_tool=expected_intent,
+            expected_agent_by_tool=expected_agent,
+            intent_definitions=await get_effective_intent_definitions(session),
+            agent_metadata=await get_effective_agent_metadata(session),
+            tool_patch_map={},
+            intent_patch_map={},
+            agent_patch_map={},
+            max_tools=max_tools,
+            include_llm_refinement=False,
+        )
+        diagnostics = dict(result.get("diagnostics") or {})
+        diagnostics["wall_ms"] = (time.perf_counter() - started) * 1000
+        return diagnostics
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--search-space-id", type=int, required=True)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--max-tools", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    model = _CountingModel(config.embedding_model_instance)
+    config.embedding_model_instance = model
+    for run in range(1, max(1, args.runs) + 1):
+        # Start cold so every run embeds the catalog again.
+        metadata_separation_service._EMBED_CACHE.clear()
+        model.calls = dict.fromkeys(model.calls, 0)
+        diagnostics = await _run(args.search_space_id, args.user_id, args.max_tools)
+        stages = "  ".join(
+            f"{layer} {float(diagnostics.get(f'stage_{layer}_ms') or 0):8.1f} ms"
+            for layer in ("intent", "agent", "tool")
+        )
+        print(
+            f"run {run}: wall {diagnostics['wall_ms']:9.1f} ms  "
+            f"audits {float(diagnostics.get('baseline_audit_ms') or 0):8.1f}"
+            f"+{float(diagnostics.get('final_audit_ms') or 0):.1f} ms  {stages}"
+        )
+        print(
+            f"        embedding model: {model.calls['embed_batch']} batch calls, "
+            f"{model.calls['embed']} single calls, {model.calls['texts']} texts"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
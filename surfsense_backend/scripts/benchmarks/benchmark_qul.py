@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark NEXUS Query Understanding Layer latency per query.
+
+Reports p50/p99 of ``QueryUnderstandingLayer.analyze`` over a set of
+Swedish routing queries:
+
+* **static hints** - ``DOMAIN_HINTS``/``CATEGORY_HINTS`` from config;
+* **db hints** - a fresh copy of the hint maps per query, as
+  ``NexusService.route_query`` passes them after loading them from the DB
+  (same content, so the compiled automaton is reused);
+* **regex keywords** - the previous approach to keyword matching alone:
+  one ``re.search(r"\\b...\\b")`` per gazetteer key, region, abbreviation
+  and hint keyword.
+
+The one-off automaton build time is reported separately.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_qul.py
+    python scripts/benchmarks/benchmark_qul.py --rounds 200
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.nexus.config import CATEGORY_HINTS, DOMAIN_HINTS, SWEDISH_NORMALIZATION_BANK
+from app.nexus.routing.qul import MUNICIPALITY_GAZETTEER, QueryUnderstandingLayer
+from app.services.scb_regions import ALL_REGIONS, normalize_diacritik
+
+QUERIES = [
+    "Vad blir vädret i Stockholm imorgon?",
+    "Hur är vädret och vad kostar en bostad i Sundsvall?",
+    "Vad säger Trafikverket om E4 vid Uppsala?",
+    "Bostadspriser i gbg jämfört med sthlm senaste 12 månader",
+    "Statistik om arbetslöshet i Jonkoping och Vaxjo 2024",
+    "Jämför vad GPT och Claude tycker om AI",
+    "Generera en podcast om teknik",
+    "Lediga jobb i Malung-Sälen eller Upplands-Bro",
+    "Vad kostar en tvårumma i Malmö?",
+    "How do quantum computers work?",
+]
+
+
+def _regex_keywords(query: str) -> int:
+    lower = query.lower()
+    folded = normalize_diacritik(query)
+    hits = 0
+    for keyword in (*SWEDISH_NORMALIZATION_BANK, *MUNICIPALITY_GAZETTEER):
+        hits += bool(re.search(rf"\b{re.escape(keyword)}\b", lower))
+    for region in ALL_REGIONS:
+        region_norm = normalize_diacritik(region.name)
+        hits += bool(re.search(rf"\b{re.escape(region_norm)}\b", folded))
+    for hints_map in (DOMAIN_HINTS, CATEGORY_HINTS):
+        for keywords in hints_map.values():
+            for kw in keywords:
+                hits += bool(
+                    kw in lower
+                    if " " in kw
+                    else re.search(rf"\b{re.escape(kw)}\b", lower)
+                )
+    return hits
+
+
+def _percentiles(samples: list[float]) -> str:
+    ms = sorted(sample * 1000 for sample in samples)
+    p50 = ms[len(ms) // 2]
+    p99 = ms[min(len(ms) - 1, int(0.99 * len(ms)))]
+    return f"p50 {p50:7.3f} ms  p99 {p99:7.3f} ms"
+
+
+def _time(fn, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            started = time.perf_counter()
+            fn(query)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    qul = QueryUnderstandingLayer()
+    started = time.perf_counter()
+    qul.analyze("warm-up")
+    print(
+        f"automaton build (first query) {(time.perf_counter() - started) * 1000:.1f} ms"
+    )
+
+    def analyze_db_hints(query: str) -> None:
+        qul.analyze(
+            query,
+            domain_hints_map={k: list(v) for k, v in DOMAIN_HINTS.items()},
+            category_hints_map={k: list(v) for k, v in CATEGORY_HINTS.items()},
+        )
+
+    for label, fn in (
+        ("static hints", qul.analyze),
+        ("db hints", analyze_db_hints),
+        ("regex keywords", _regex_keywords),
+    ):
+        print(f"{label:<15} {_percentiles(_time(fn, args.rounds))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark the public-data response cache against an uncached fan-out.
+
+Simulates ``--requests`` lookups spread over ``--keys`` distinct endpoints
+(Zipf-like: a few hot keys take most traffic) against a fake upstream with
+``--latency-ms`` of delay, ``--concurrency`` lookups at a time.  The
+``uncached`` mode calls the upstream every time; ``cached`` goes through
+``ResponseCache`` (memory tier only, no Redis), so concurrent misses for the
+same key are coalesced and later lookups are served from memory.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_response_cache.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.response_cache import ResponseCache, response_cache_stats
+
+
+class _Upstream:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def fetch(self, key: str) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"key": key, "rows": list(range(20))}
+
+
+def _workload(requests: int, keys: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(keys)]
+    return [f"endpoint-{i}" for i in rng.choices(range(keys), weights, k=requests)]
+
+
+async def _run(mode: str, workload: list[str], latency: float, concurrency: int):
+    upstream = _Upstream(latency)
+    cache = ResponseCache(f"bench-{mode}", default_ttl=600, redis_url="")
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(key: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if mode == "cached":
+                await cache.get_or_fetch(key, lambda: upstream.fetch(key))
+            else:
+                await upstream.fetch(key)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(key) for key in workload))
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{mode:<10} {len(workload):>8} {upstream.calls:>9} "
+        f"{1000 * statistics.median(ordered):>9.2f} {1000 * p95:>9.2f} "
+        f"{len(workload) / wall:>10.0f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workload = _workload(args.requests, args.keys, args.seed)
+    latency = args.latency_ms / 1000
+
+    print(
+        f"{'mode':<10} {'requests':>8} {'upstream':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'req/s':>10}"
+    )
+    await _run("uncached", workload, latency, args.concurrency)
+    await _run("cached", workload, latency, args.concurrency)
+    print(f"\ncache stats: {response_cache_stats()['bench-cached']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
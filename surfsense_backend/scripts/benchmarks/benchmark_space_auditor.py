@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Benchmark the NEXUS Space Auditor on synthetic tool catalogs.
+
+For each catalog size, times the blocked auditor (silhouette, per-zone
+silhouette, confusion pairs, hubness and zone centroids; UMAP excluded) and
+reports peak memory traced during the run.  Up to ``--legacy-max`` points it
+also times the previous full-matrix implementation of the global silhouette
+and confusion pairs, which is O(n^2) in memory and runs per-point Python
+loops.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_space_auditor.py
+    python scripts/benchmarks/benchmark_space_auditor.py \\
+        --sizes 200 2000 20000 --dim 384 --block-size 512
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.nexus.layers.space_auditor import (
+    SpaceAuditor,
+    ToolPoint,
+    _cosine_similarity_matrix,
+)
+
+
+def _catalog(n: int, dim: int, zones: int = 17) -> tuple[list[ToolPoint], np.ndarray]:
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((zones, dim)).astype(np.float32)
+    zone_of = rng.integers(0, zones, size=n)
+    embeddings = centers[zone_of] + 0.6 * rng.standard_normal((n, dim)).astype(
+        np.float32
+    )
+    tools = [
+        ToolPoint(f"tool_{i}", f"ns_{z}_{i % 4}", f"zone_{z}", embeddings[i])
+        for i, z in enumerate(zone_of.tolist())
+    ]
+    return tools, embeddings
+
+
+def _legacy(embeddings: np.ndarray, tools: list[ToolPoint], threshold: float) -> None:
+    labels = [t.zone for t in tools]
+    dist = 1.0 - _cosine_similarity_matrix(embeddings)
+    label_indices: dict[str, list[int]] = {}
+    for i, label in enumerate(labels):
+        label_indices.setdefault(label, []).append(i)
+    for i, label in enumerate(labels):
+        same = [j for j in label_indices[label] if j != i]
+        if same:
+            float(np.mean([dist[i, j] for j in same]))
+        for other, indices in label_indices.items():
+            if other != label:
+                float(np.mean([dist[i, j] for j in indices]))
+    sim = 1.0 - dist
+    for i in range(len(tools)):
+        for j in range(i + 1, len(tools)):
+            if sim[i, j] >= threshold and tools[i].namespace != tools[j].namespace:
+                pass
+
+
+def _measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--block-size", type=int, default=512)
+    parser.add_argument("--legacy-max", type=int, default=2000)
+    args = parser.parse_args()
+
+    auditor = SpaceAuditor(block_size=args.block_size)
+    auditor._compute_umap = lambda embeddings, tools: []
+
+    print(f"{'points':>7} {'impl':<8} {'seconds':>9} {'peak MiB':>9}")
+    for n in args.sizes:
+        tools, embeddings = _catalog(n, args.dim)
+        elapsed, peak = _measure(
+            lambda tools=tools: auditor.compute_separation_matrix(tools)
+        )
+        print(f"{n:>7} {'blocked':<8} {elapsed:>9.2f} {peak:>9.1f}")
+        if n <= args.legacy_max:
+            elapsed, peak = _measure(
+                lambda tools=tools, embeddings=embeddings: _legacy(
+                    embeddings, tools, auditor.confusion_threshold
+                )
+            )
+            print(f"{n:>7} {'legacy':<8} {elapsed:>9.2f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
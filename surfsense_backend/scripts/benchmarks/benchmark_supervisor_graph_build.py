@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Benchmark supervisor graph acquisition per chat turn, with and without caching.
+
+Each simulated turn opens its own database session, as ``stream_new_chat``
+does, and obtains the supervisor graph for a real search space:
+
+* **per-turn build** - ``build_complete_graph`` on every turn (the default
+  chat path: tool registry, MCP tools, tool index and LangGraph compile);
+* **cached** - ``get_or_build_complete_graph``; the first turn builds, later
+  turns reuse the graph compiled for the current registry version.
+
+The time spent here is added to time-to-first-token of every turn, so the
+difference between the two medians is the TTFT saving.  The chat stream
+logs the end-to-end figure as ``[stream_new_chat] time to first token``.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_supervisor_graph_build.py --search-space-id 1
+    python scripts/benchmarks/benchmark_supervisor_graph_build.py \\
+        --search-space-id 1 --turns 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.agents.new_chat.bigtool_prompts import (
+    DEFAULT_WORKER_ACTION_PROMPT,
+    DEFAULT_WORKER_KNOWLEDGE_PROMPT,
+    build_worker_prompt,
+)
+from app.agents.new_chat.checkpointer import get_checkpointer
+from app.agents.new_chat.complete_graph import (
+    build_complete_graph,
+    get_or_build_complete_graph,
+)
+from app.agents.new_chat.statistics_prompts import build_statistics_system_prompt
+from app.db import async_session_maker
+from app.services.connector_service import ConnectorService
+from app.services.graph_holder import GraphHolder
+from app.services.llm_service import get_agent_llm
+
+
+async def _turn(build_graph, search_space_id: int, user_id: str | None) -> float:
+    async with async_session_maker() as session:
+        llm = await get_agent_llm(session, search_space_id)
+        if llm is None:
+            raise SystemExit(f"Search space {search_space_id} has no agent LLM")
+        started = time.perf_counter()
+        await build_graph(
+            llm=llm,
+            dependencies={
+                "search_space_id": search_space_id,
+                "db_session": session,
+                "connector_service": ConnectorService(
+                    session, search_space_id=search_space_id
+                ),
+                "user_id": user_id,
+                "thread_id": 0,
+                "runtime_hitl": {},
+            },
+            checkpointer=await get_checkpointer(),
+            knowledge_prompt=build_worker_prompt(
+                DEFAULT_WORKER_KNOWLEDGE_PROMPT, citations_enabled=True
+            ),
+            action_prompt=build_worker_prompt(
+                DEFAULT_WORKER_ACTION_PROMPT, citations_enabled=True
+            ),
+            statistics_prompt=build_statistics_system_prompt(),
+        )
+        return time.perf_counter() - started
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ms = [sample * 1000 for sample in samples]
+    print(
+        f"{label:<16} first {ms[0]:8.1f} ms  "
+        f"median(rest) {statistics.median(ms[1:] or ms):8.1f} ms  "
+        f"max {max(ms):8.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--search-space-id", type=int, required=True)
+    parser.add_argument("--user-id", default=None)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, build_graph in (
+        ("per-turn build", build_complete_graph),
+        ("cached", get_or_build_complete_graph),
+    ):
+        await GraphHolder.invalidate()
+        samples = [
+            await _turn(build_graph, args.search_space_id, args.user_id)
+            for _ in range(max(2, args.turns))
+        ]
+        _report(label, samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
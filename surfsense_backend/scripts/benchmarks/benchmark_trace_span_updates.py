@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Benchmark SSE bytes sent for live trace span output, cumulative vs delta.
+
+A ``TraceRecorder`` streams a simulated LLM response token by token, as
+``stream_new_chat`` does for model spans, in two modes:
+
+* **cumulative** - every token re-sends the whole span, including the
+  complete output so far (``TRACE_SPAN_DELTA_UPDATES=FALSE``);
+* **delta** - only the new text and its offset are sent, coalesced to at
+  most one update per ``--interval-ms`` window.
+
+Tokens arrive every ``--token-interval-ms`` milliseconds on a simulated
+clock.  Span rows go to a write-behind writer without a database.  The
+report lists bytes on the wire and CPU time spent formatting per response
+length.
+
+Usage
+-----
+    python scripts/benchmarks/benchmark_trace_span_updates.py
+    python scripts/benchmarks/benchmark_trace_span_updates.py \\
+        --tokens 500 2000 8000 --interval-ms 100 --token-interval-ms 15
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tests.trace_fakes import make_recorder
+
+
+async def _response(
+    tokens: int, *, delta_updates: bool, interval_ms: int, token_interval_ms: float
+) -> tuple[int, int, float]:
+    # Simulated time for the update window; CPU time is measured separately
+    clock = [0.0]
+    recorder = make_recorder(clock=lambda: clock[0])
+    recorder.delta_updates = delta_updates
+    recorder.update_interval = interval_ms / 1000
+
+    await recorder.start_span("llm-1", "model", "llm", input_data="fråga")
+    frames = 0
+    sent = 0
+    started = time.perf_counter()
+    for index in range(tokens):
+        clock[0] += token_interval_ms / 1000
+        frame = await recorder.append_span_output("llm-1", f" ord{index % 97}")
+        if frame:
+            frames += 1
+            sent += len(frame.encode("utf-8"))
+    frame = await recorder.end_span("llm-1")
+    elapsed = time.perf_counter() - started
+    return frames + 1, sent + len(frame.encode("utf-8")), elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tokens", type=int, nargs="+", default=[200, 1000, 4000])
+    parser.add_argument("--interval-ms", type=int, default=100)
+    parser.add_argument("--token-interval-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"{'tokens':>7} {'mode':<11} {'events':>7} {'bytes':>12} {'cpu ms':>9}")
+    for tokens in args.tokens:
+        for label, delta_updates in (("cumulative", False), ("delta", True)):
+            frames, sent, elapsed = await _response(
+                tokens,
+                delta_updates=delta_updates,
+                interval_ms=args.interval_ms,
+                token_interval_ms=args.token_interval_ms,
+            )
+            print(
+                f"{tokens:>7} {label:<11} {frames:>7} {sent:>12,} "
+                f"{elapsed * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -59,6 +59,7 @@ from app.db import (
     SurfsenseDocsDocument,
     UserMemory,
 )
+from app.services.embedding_service import embed_texts_sync
 
 logging.basicConfig(
     level=logging.INFO,
@@ -117,13 +118,18 @@ async def reembed_table(
         if not rows:
             break
 
+        pending = []
         for row in rows:
             text = getattr(row, text_column, None)
             if not text or not str(text).strip():
                 skipped += 1
                 continue
-            row.embedding = embed_fn(str(text).strip())
-            processed += 1
+            pending.append((row, str(text).strip()))
+        if pending:
+            embeddings = embed_fn([text for _, text in pending])
+            for (row, _), embedding in zip(pending, embeddings, strict=True):
+                row.embedding = embedding
+            processed += len(pending)
 
         await session.commit()
         offset += batch_size
@@ -139,7 +145,9 @@ async def reembed_table(
 
 
 async def main(args: argparse.Namespace) -> None:
-    embed_fn = config.embedding_model_instance.embed
+    # Texts already embedded with the current model (e.g. by an earlier,
+    # interrupted run) are served from the persistent embedding cache.
+    embed_fn = embed_texts_sync
     dim = getattr(config.embedding_model_instance, "dimension", "?")
 
     logger.info("=" * 60)
@@ -151,7 +159,7 @@ async def main(args: argparse.Namespace) -> None:
 
     # Quick smoke-test: embed a single string to make sure the model loads.
     try:
-        test_vec = embed_fn("test")
+        test_vec = config.embedding_model_instance.embed("test")
         logger.info("  Smoke test OK — produced %d-dim vector", len(test_vec))
     except Exception as exc:
         logger.error("  Smoke test FAILED: %s", exc)
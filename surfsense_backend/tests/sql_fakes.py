@@ -0,0 +1,63 @@
+"""Database-free SQLAlchemy session fakes shared by the query tests."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+
+def compile_postgres(statement, *, literal_binds: bool = False) -> str:
+    """Compile ``statement`` to PostgreSQL SQL text."""
+    compile_kwargs = {"literal_binds": True} if literal_binds else {}
+    return str(
+        statement.compile(dialect=postgresql.dialect(), compile_kwargs=compile_kwargs)
+    )
+
+
+class FakeResult:
+    """Result of a faked ``execute``.
+
+    Rows are tuples, or the entities themselves for single-entity selects.
+    """
+
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def all(self):
+        return list(self._rows)
+
+    def scalars(self) -> FakeResult:
+        return FakeResult(
+            row[0] if isinstance(row, tuple) else row for row in self._rows
+        )
+
+    def scalar(self):
+        return self.scalars().all()[0] if self._rows else None
+
+
+class RecordingSession:
+    """Async session that records each statement as PostgreSQL SQL.
+
+    By default every ``execute`` answers with the next of ``results``;
+    subclasses override ``respond`` to answer from the compiled statement.
+    """
+
+    def __init__(self, *results):
+        self._results = list(results)
+        self.statements: list[str] = []
+        self.commits = 0
+
+    async def execute(self, statement, params: dict[str, Any] | None = None):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        self.statements.append(sql)
+        return FakeResult(
+            self.respond(sql, compiled.params if params is None else params)
+        )
+
+    def respond(self, sql: str, params: dict[str, Any]):
+        return self._results.pop(0)
+
+    async def commit(self):
+        self.commits += 1
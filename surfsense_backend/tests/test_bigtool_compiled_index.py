@@ -0,0 +1,174 @@
+"""Tests for the matrix-backed compiled tool index in bigtool_store.py."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from app.agents.new_chat import bigtool_store
+from app.agents.new_chat.bigtool_store import (
+    ToolIndexEntry,
+    _top_k_positions,
+    clear_tool_caches,
+    get_compiled_tool_index,
+    smart_retrieve_tools,
+)
+
+
+def _cosine(left: list[float], right: list[float]) -> float:
+    dot = sum(a * b for a, b in zip(left, right, strict=False))
+    norm = math.sqrt(sum(a * a for a in left)) * math.sqrt(sum(b * b for b in right))
+    return dot / norm if norm else 0.0
+
+
+def _entry(
+    tool_id: str,
+    namespace: tuple[str, ...],
+    *,
+    semantic: list[float] | None = None,
+    structural: list[float] | None = None,
+    keywords: list[str] | None = None,
+) -> ToolIndexEntry:
+    return ToolIndexEntry(
+        tool_id=tool_id,
+        namespace=namespace,
+        name=tool_id,
+        description=f"Verktyg {tool_id}",
+        keywords=keywords or [],
+        example_queries=[],
+        category="general",
+        semantic_embedding=semantic,
+        structural_embedding=structural,
+    )
+
+
+class _FakeEmbedding:
+    def __init__(self, vector: list[float]):
+        self.vector = vector
+
+    def embed(self, text: str) -> list[float]:
+        return list(self.vector)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    clear_tool_caches()
+    yield
+    clear_tool_caches()
+
+
+@pytest.fixture
+def tool_index() -> list[ToolIndexEntry]:
+    return [
+        _entry(
+            "smhi_weather",
+            ("tools", "weather", "smhi"),
+            semantic=[1.0, 0.0, 0.0],
+            structural=[0.5, 0.5, 0.0],
+            keywords=["väder", "prognos"],
+        ),
+        _entry(
+            "scb_befolkning",
+            ("tools", "statistics", "scb"),
+            semantic=[0.0, 1.0, 0.0],
+            keywords=["befolkning"],
+        ),
+        _entry(
+            "kolada_ekonomi",
+            ("tools", "statistics", "kolada"),
+            semantic=[0.2, 0.9, 0.1],
+            structural=[0.0, 0.0, 2.0],
+        ),
+        _entry("search_web", ("tools", "knowledge", "web")),
+    ]
+
+
+def test_compiled_scores_match_python_cosine(tool_index):
+    compiled = get_compiled_tool_index(tool_index)
+    query = [0.3, 0.8, 0.1]
+    semantic, structural = compiled.embedding_scores(query)
+    for position, entry in enumerate(tool_index):
+        expected_semantic = (
+            _cosine(query, entry.semantic_embedding) if entry.semantic_embedding else 0.0
+        )
+        expected_structural = (
+            _cosine(query, entry.structural_embedding)
+            if entry.structural_embedding
+            else 0.0
+        )
+        assert semantic[position] == pytest.approx(expected_semantic, abs=1e-6)
+        assert structural[position] == pytest.approx(expected_structural, abs=1e-6)
+
+
+def test_embedding_scores_zero_for_mismatched_query(tool_index):
+    compiled = get_compiled_tool_index(tool_index)
+    semantic, structural = compiled.embedding_scores([1.0, 0.0])
+    assert not semantic.any()
+    assert not structural.any()
+
+
+def test_compiled_index_is_cached_and_rows_reused(tool_index):
+    compiled = get_compiled_tool_index(tool_index)
+    assert get_compiled_tool_index(list(tool_index)) is compiled
+
+    # Rebuilding with one changed tool keeps the other rows untouched.
+    changed = [
+        *tool_index[:1],
+        _entry(
+            "scb_befolkning",
+            ("tools", "statistics", "scb"),
+            semantic=[0.0, 0.0, 1.0],
+        ),
+        *tool_index[2:],
+    ]
+    rebuilt = get_compiled_tool_index(changed)
+    assert rebuilt is not compiled
+    cached_row = bigtool_store._TOOL_VECTOR_ROW_CACHE[("smhi_weather", "semantic")][1]
+    np.testing.assert_array_equal(rebuilt.semantic_matrix[0], cached_row)
+    np.testing.assert_allclose(rebuilt.semantic_matrix[1], [0.0, 0.0, 1.0])
+
+
+def test_namespace_mask(tool_index):
+    compiled = get_compiled_tool_index(tool_index)
+    mask = compiled.namespace_mask([("tools", "statistics")])
+    assert mask.tolist() == [False, True, True, False]
+    assert not compiled.namespace_mask([]).any()
+
+
+def test_top_k_positions_matches_stable_sort():
+    scores = np.array([0.5, 2.0, 0.5, 1.0, 2.0, 0.5, -1.0])
+    positions = np.array([6, 0, 1, 2, 3, 4, 5])
+    for k in range(0, 9):
+        expected = sorted(
+            positions.tolist(), key=lambda pos: scores[pos], reverse=True
+        )[:k]
+        assert _top_k_positions(scores, positions, k).tolist() == expected
+
+
+def test_smart_retrieval_prefers_primary_namespace(monkeypatch, tool_index):
+    from app.config import config
+
+    monkeypatch.setattr(
+        config, "embedding_model_instance", _FakeEmbedding([0.0, 1.0, 0.0])
+    )
+    monkeypatch.setattr(
+        bigtool_store.RerankerService, "get_reranker_instance", lambda: None
+    )
+    tool_ids, ranked = smart_retrieve_tools(
+        "befolkning i Malmö",
+        tool_index=tool_index,
+        primary_namespaces=[("tools", "statistics")],
+        fallback_namespaces=[("tools",)],
+        limit=2,
+        include_breakdown=True,
+    )
+    assert tool_ids == ["scb_befolkning", "kolada_ekonomi"]
+    # Breakdowns are only built for retrieved candidates.
+    ranked_ids = [item["tool_id"] for item in ranked]
+    assert ranked_ids[:2] == tool_ids
+    top = ranked[0]
+    assert top["namespace_scope"] == "primary"
+    assert top["lexical_candidate_selected"] is True
+    assert top["semantic_embedding_score_raw"] == pytest.approx(1.0, abs=1e-6)
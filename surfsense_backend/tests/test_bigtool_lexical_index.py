@@ -0,0 +1,122 @@
+"""Parity tests for the inverted lexical tool index in bigtool_store.py."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.agents.new_chat.bigtool_store import (
+    KOLADA_TOOL_DEFINITIONS,
+    SCB_TOOL_DEFINITIONS,
+    SMHI_TOOL_DEFINITIONS,
+    TRAFIKVERKET_TOOL_DEFINITIONS,
+    ToolIndexEntry,
+    ToolRetrievalTuning,
+    _normalize_text,
+    _score_entry_components,
+    _tokenize,
+    build_lexical_tool_index,
+    namespace_for_tool,
+    normalize_retrieval_tuning,
+)
+
+_DEFINITIONS = [
+    *SCB_TOOL_DEFINITIONS,
+    *KOLADA_TOOL_DEFINITIONS,
+    *SMHI_TOOL_DEFINITIONS,
+    *TRAFIKVERKET_TOOL_DEFINITIONS,
+]
+
+
+def _catalog() -> list[ToolIndexEntry]:
+    entries = [
+        ToolIndexEntry(
+            tool_id=definition.tool_id,
+            namespace=namespace_for_tool(definition.tool_id),
+            name=definition.name,
+            description=definition.description,
+            keywords=list(definition.keywords),
+            example_queries=list(definition.example_queries),
+            category="general",
+        )
+        for definition in _DEFINITIONS
+    ]
+    # Edge cases: empty name, duplicate and too-short keywords, and a keyword
+    # that normalises to the empty string (which matches every query).
+    entries.append(
+        ToolIndexEntry(
+            tool_id="edge_case_tool",
+            namespace=("tools", "general"),
+            name="",
+            description="",
+            keywords=["bil", "bil", "e4", "!!"],
+            example_queries=["Hur är vädret?"],
+            category="general",
+        )
+    )
+    return entries
+
+
+_QUERIES = [
+    "",
+    "a",
+    "bil",
+    "Hur är vädret?",
+    "befolkningsmängd i Stockholms kommun 2023",
+    "väder i Göteborg imorgon",
+    "trafikstörningar på E4 vid Södertälje",
+    "kolada äldreomsorg kostnad per brukare",
+    "arbetslöshet bland unga i Malmö",
+    *[
+        definition.example_queries[0]
+        for definition in _DEFINITIONS[::7]
+        if definition.example_queries
+    ],
+]
+
+
+@pytest.mark.parametrize(
+    "tuning",
+    [
+        normalize_retrieval_tuning(None),
+        ToolRetrievalTuning(
+            name_match_weight=1.5,
+            keyword_weight=7.0,
+            description_token_weight=0.3,
+            example_query_weight=4.0,
+        ),
+    ],
+)
+def test_indexed_scorer_matches_per_tool_scorer(tuning):
+    catalog = _catalog()
+    lexical_index = build_lexical_tool_index(catalog)
+    for query in _QUERIES:
+        query_norm = _normalize_text(query)
+        query_tokens = set(_tokenize(query_norm))
+        scores = lexical_index.score(query_tokens, query_norm, tuning)
+        for position, entry in enumerate(catalog):
+            expected = _score_entry_components(
+                entry, query_tokens, query_norm, tuning
+            )
+            assert scores.components_at(position) == expected, (
+                query,
+                entry.tool_id,
+            )
+
+
+def test_compound_word_fragment_matches():
+    entry = ToolIndexEntry(
+        tool_id="scb_befolkning",
+        namespace=("tools", "statistics", "scb"),
+        name="SCB befolkning",
+        description="Befolkningsstatistik",
+        keywords=["befolkning", "invånare"],
+        example_queries=[],
+        category="statistics",
+    )
+    lexical_index = build_lexical_tool_index([entry])
+    query_norm = _normalize_text("Befolkningsmängden i Uppsala")
+    scores = lexical_index.score(
+        set(_tokenize(query_norm)), query_norm, normalize_retrieval_tuning(None)
+    )
+    assert int(scores.keyword_hits_raw[0]) == 1
+    assert scores.lexical_score[0] > 0
@@ -0,0 +1,235 @@
+"""Tests for the bulk upsert pipeline used by per-message connector indexers."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from app.db import DocumentType
+from app.tasks.connector_indexers import bulk_upsert
+from app.tasks.connector_indexers.bulk_upsert import (
+    IndexableMessage,
+    bulk_upsert_messages,
+)
+from app.utils.document_converters import (
+    generate_content_hash,
+    generate_unique_identifier_hash,
+)
+from tests.sql_fakes import RecordingSession
+
+_SEARCH_SPACE_ID = 4
+
+
+class _DocumentTableSession(RecordingSession):
+    """Answers the pipeline's statements from an in-memory document table."""
+
+    def __init__(
+        self,
+        documents: dict[str, tuple[int, str]],
+        *,
+        concurrent_documents: dict[str, tuple[int, str]] | None = None,
+    ):
+        super().__init__()
+        # unique_identifier_hash -> (id, content_hash)
+        self.documents = dict(documents)
+        # Stored by another writer between the lookups and the first write
+        self.concurrent_documents = dict(concurrent_documents or {})
+        self.deleted_chunk_documents: list[int] = []
+        self.inserted_chunks: list[dict] = []
+
+    def respond(self, sql, params):
+        if sql.startswith("SELECT documents.unique_identifier_hash"):
+            wanted = _in_values(params, "unique_identifier_hash_1")
+            return [
+                (key, *value) for key, value in self.documents.items() if key in wanted
+            ]
+        if sql.startswith("SELECT documents.content_hash"):
+            wanted = _in_values(params, "content_hash_1")
+            stored = {content_hash for _, content_hash in self.documents.values()}
+            return [(value,) for value in wanted if value in stored]
+        if sql.startswith("INSERT INTO documents"):
+            self.documents.update(self.concurrent_documents)
+            self.concurrent_documents = {}
+            skip_conflicts = "ON CONFLICT DO NOTHING" in sql
+            assert skip_conflicts or (
+                "ON CONFLICT (unique_identifier_hash) DO UPDATE" in sql
+            )
+            rows = []
+            for index in range(_row_count(params, "unique_identifier_hash_m")):
+                key = params[f"unique_identifier_hash_m{index}"]
+                content_hash = params[f"content_hash_m{index}"]
+                stored_hashes = {value for _, value in self.documents.values()}
+                if skip_conflicts and (
+                    key in self.documents or content_hash in stored_hashes
+                ):
+                    continue
+                document_id = self.documents.get(key, (len(self.documents) + 1,))[0]
+                self.documents[key] = (document_id, content_hash)
+                rows.append((key, document_id))
+            return rows
+        if sql.startswith("DELETE FROM chunks"):
+            self.deleted_chunk_documents.extend(_in_values(params, "document_id_1"))
+            return []
+        if sql.startswith("INSERT INTO chunks"):
+            for index in range(_row_count(params, "document_id_m")):
+                self.inserted_chunks.append(
+                    {
+                        "document_id": params[f"document_id_m{index}"],
+                        "content": params[f"content_m{index}"],
+                    }
+                )
+            return []
+        raise AssertionError(f"Unexpected statement: {sql}")
+
+
+def _in_values(params: dict, name: str) -> list:
+    return list(params[name])
+
+
+def _row_count(params: dict, prefix: str) -> int:
+    return sum(1 for key in params if key.startswith(prefix))
+
+
+def _message(identifier: str, text: str) -> IndexableMessage:
+    return IndexableMessage(
+        unique_identifier=identifier,
+        title="Slack - general",
+        content=f"MESSAGE {identifier}: {text}",
+        metadata={"channel_name": "general"},
+    )
+
+
+def _identifier_hash(identifier: str) -> str:
+    return generate_unique_identifier_hash(
+        DocumentType.SLACK_CONNECTOR, identifier, _SEARCH_SPACE_ID
+    )
+
+
+def _install_fakes(monkeypatch) -> list[list[str]]:
+    embed_calls: list[list[str]] = []
+
+    async def fake_embed_texts(texts, *, batch_size=None):
+        embed_calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    chunker = SimpleNamespace(
+        chunk=lambda content: [
+            SimpleNamespace(text=part) for part in content.split(": ", 1)
+        ]
+    )
+    monkeypatch.setattr(bulk_upsert, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(bulk_upsert.config, "chunker_instance", chunker)
+    return embed_calls
+
+
+def _upsert(session, messages, **kwargs):
+    return asyncio.run(
+        bulk_upsert_messages(
+            session,
+            messages,
+            document_type=DocumentType.SLACK_CONNECTOR,
+            search_space_id=_SEARCH_SPACE_ID,
+            user_id="user-1",
+            connector_id=9,
+            **kwargs,
+        )
+    )
+
+
+def test_unchanged_messages_skip_embedding_and_writes(monkeypatch):
+    embed_calls = _install_fakes(monkeypatch)
+    messages = [_message(f"C1_{i}", f"hej {i}") for i in range(3)]
+    session = _DocumentTableSession(
+        {
+            _identifier_hash(m.unique_identifier): (
+                i + 1,
+                generate_content_hash(m.content, _SEARCH_SPACE_ID),
+            )
+            for i, m in enumerate(messages)
+        }
+    )
+
+    result = _upsert(session, messages)
+
+    assert (result.indexed, result.unchanged) == (0, 3)
+    assert embed_calls == []
+    # One lookup for the whole batch, nothing written.
+    assert len(session.statements) == 1
+    assert session.commits == 0
+
+
+def test_new_and_changed_messages_are_upserted_in_bulk(monkeypatch):
+    embed_calls = _install_fakes(monkeypatch)
+    unchanged = _message("C1_1", "oförändrad")
+    changed = _message("C1_2", "ny text")
+    session = _DocumentTableSession(
+        {
+            _identifier_hash("C1_1"): (
+                1,
+                generate_content_hash(unchanged.content, _SEARCH_SPACE_ID),
+            ),
+            _identifier_hash("C1_2"): (2, "old-hash"),
+        }
+    )
+    messages = [unchanged, changed, _message("C1_3", "första"), _message("C1_4", "x")]
+
+    result = _upsert(session, messages)
+
+    assert (result.created, result.updated, result.unchanged) == (2, 1, 1)
+    # Documents and chunks of all three messages are embedded in one call.
+    assert len(embed_calls) == 1
+    assert len(embed_calls[0]) == 3 + 6
+    assert session.deleted_chunk_documents == [2]
+    assert sorted({row["document_id"] for row in session.inserted_chunks}) == [2, 3, 4]
+    assert len(session.inserted_chunks) == 6
+    # One insert for the new documents, one upsert for the changed one
+    assert (
+        sum(sql.startswith("INSERT INTO documents") for sql in session.statements) == 2
+    )
+    assert session.commits == 1
+
+
+def test_duplicate_content_and_batches(monkeypatch):
+    _install_fakes(monkeypatch)
+    other = _message("C9_1", "delad")
+    session = _DocumentTableSession(
+        {"other-connector": (1, generate_content_hash(other.content, _SEARCH_SPACE_ID))}
+    )
+    duplicate = IndexableMessage(
+        unique_identifier="C1_dup", title="Slack - general", content=other.content
+    )
+    messages = [duplicate] + [_message(f"C1_{i}", "text") for i in range(5)]
+    # The same message twice in one batch is written once.
+    messages.insert(2, _message("C1_0", "text"))
+
+    result = _upsert(session, messages, batch_size=3)
+
+    assert (result.created, result.duplicates, result.unchanged) == (5, 1, 1)
+    assert session.commits == 3
+
+
+def test_rows_stored_concurrently_are_skipped(monkeypatch):
+    _install_fakes(monkeypatch)
+    same_message = _message("C1_1", "hej")
+    same_content = _message("C1_2", "delad")
+    session = _DocumentTableSession(
+        {},
+        concurrent_documents={
+            _identifier_hash("C1_1"): (
+                1,
+                generate_content_hash(same_message.content, _SEARCH_SPACE_ID),
+            ),
+            "other-connector": (
+                2,
+                generate_content_hash(same_content.content, _SEARCH_SPACE_ID),
+            ),
+        },
+    )
+
+    result = _upsert(session, [same_message, same_content, _message("C1_3", "ny")])
+
+    assert (result.created, result.updated, result.duplicates) == (1, 0, 2)
+    # Only the stored row gets chunks; the concurrent writer's rows keep theirs.
+    assert {row["document_id"] for row in session.inserted_chunks} == {3}
+    assert session.deleted_chunk_documents == []
+    assert session.commits == 1
@@ -0,0 +1,157 @@
+"""Tests for concurrent hybrid retrieval and connector fan-out in ConnectorService."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.config import config
+from app.services import connector_service as connector_service_module
+from app.services.connector_service import ConnectorService
+
+
+class _FakeSession:
+    def __init__(self, registry: list[_FakeSession]):
+        registry.append(self)
+        self.closed = False
+
+    async def __aenter__(self) -> _FakeSession:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.closed = True
+
+
+def _result(doc_id: int, title: str) -> dict:
+    return {
+        "document_id": doc_id,
+        "content": title,
+        "score": 0.0,
+        "chunks": [{"chunk_id": doc_id * 10, "content": title}],
+        "document": {"id": doc_id, "title": title, "metadata": {}},
+    }
+
+
+@pytest.fixture
+def retrieval(monkeypatch):
+    """Patch the retrievers and query embedding; record what they receive."""
+    state: dict = {"embeds": [], "calls": [], "sessions": [], "active": 0, "peak": 0}
+
+    async def _fake_embed_query(text: str) -> list[float]:
+        state["embeds"].append(text)
+        return [0.1, 0.2]
+
+    def _make_retriever(kind: str, results: list[dict]):
+        class _Retriever:
+            def __init__(self, session):
+                self.session = session
+
+            async def hybrid_search(self, **kwargs):
+                state["calls"].append((kind, self.session, kwargs))
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                await asyncio.sleep(0.01)
+                state["active"] -= 1
+                return results
+
+        return _Retriever
+
+    monkeypatch.setattr(connector_service_module, "embed_query", _fake_embed_query)
+    monkeypatch.setattr(
+        connector_service_module,
+        "ChucksHybridSearchRetriever",
+        _make_retriever("chunk", [_result(1, "a"), _result(2, "b")]),
+    )
+    monkeypatch.setattr(
+        connector_service_module,
+        "DocumentHybridSearchRetriever",
+        _make_retriever("document", [_result(2, "b"), _result(3, "c")]),
+    )
+    monkeypatch.setattr(
+        config, "CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS", True, raising=False
+    )
+    monkeypatch.setattr(config, "CONNECTOR_SEARCH_MAX_CONCURRENCY", 4, raising=False)
+    return state
+
+
+def _service(state: dict) -> ConnectorService:
+    return ConnectorService(
+        session=object(),
+        search_space_id=1,
+        session_factory=lambda: _FakeSession(state["sessions"]),
+    )
+
+
+def test_combined_search_embeds_once_and_isolates_sessions(retrieval):
+    service = _service(retrieval)
+    results = asyncio.run(
+        service._combined_rrf_search(
+            query_text="budget", search_space_id=1, document_type="FILE", top_k=5
+        )
+    )
+
+    assert retrieval["embeds"] == ["budget"]
+    assert retrieval["peak"] == 2
+    assert len(retrieval["sessions"]) == 2
+    assert all(session.closed for session in retrieval["sessions"])
+    used_sessions = {id(session) for _, session, _ in retrieval["calls"]}
+    assert used_sessions == {id(session) for session in retrieval["sessions"]}
+    for _, _, kwargs in retrieval["calls"]:
+        assert kwargs["query_embedding"] == [0.1, 0.2]
+        assert kwargs["top_k"] == 10
+
+    # Document 2 is ranked by both retrievers and wins the RRF fusion.
+    assert [item["document_id"] for item in results] == [2, 1, 3]
+
+
+def test_shared_session_fallback_runs_sequentially(monkeypatch, retrieval):
+    monkeypatch.setattr(config, "CONNECTOR_RETRIEVAL_ISOLATED_SESSIONS", False)
+    service = _service(retrieval)
+    asyncio.run(
+        service._combined_rrf_search(
+            query_text="budget", search_space_id=1, document_type="FILE"
+        )
+    )
+
+    assert retrieval["peak"] == 1
+    assert retrieval["sessions"] == []
+    assert all(session is service.session for _, session, _ in retrieval["calls"])
+
+
+def test_connector_fan_out_respects_cap_and_order(retrieval):
+    service = _service(retrieval)
+    active = {"now": 0, "peak": 0, "shared_peak": 0, "shared_now": 0}
+
+    async def _search(connector: str) -> list[dict]:
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        if connector.endswith("_API"):
+            active["shared_now"] += 1
+            active["shared_peak"] = max(active["shared_peak"], active["shared_now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        if connector.endswith("_API"):
+            active["shared_now"] -= 1
+        if connector == "BROKEN":
+            raise RuntimeError("boom")
+        return [{"connector": connector}]
+
+    connectors = [
+        "FILE",
+        "TAVILY_API",
+        "SLACK_CONNECTOR",
+        "BROKEN",
+        "LINKUP_API",
+        "NOTION_CONNECTOR",
+        "SEARXNG_API",
+    ]
+    results = asyncio.run(
+        service.search_connectors_concurrently(connectors, _search, max_concurrency=3)
+    )
+
+    assert list(results) == connectors
+    assert results["BROKEN"] == []
+    assert results["NOTION_CONNECTOR"] == [{"connector": "NOTION_CONNECTOR"}]
+    assert active["peak"] == 3
+    assert active["shared_peak"] == 1
@@ -0,0 +1,257 @@
+"""Tests for off-loop Docling conversion and map-reduce summarization."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.docling_service import (
+    DoclingConversionPool,
+    _group_for_reduce,
+    map_reduce_summarize,
+)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_chunks_are_summarized_concurrently_within_the_limit():
+    active = 0
+    peak = 0
+
+    async def summarize(text, number, total):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return f"summary of {text}"
+
+    combined: list[str] = []
+
+    async def combine(summaries, title):
+        combined.append(summaries)
+        return f"final: {title}"
+
+    result = _run(
+        map_reduce_summarize(
+            [f"chunk {i}" for i in range(10)],
+            summarize_chunk=summarize,
+            combine=combine,
+            document_title="Report",
+            concurrency=3,
+        )
+    )
+
+    assert result == "final: Report"
+    assert peak == 3
+    # Sections keep document order regardless of completion order
+    assert combined[0].index("=== Section 1 ===") < combined[0].index(
+        "=== Section 10 ==="
+    )
+    assert "summary of chunk 9" in combined[0]
+
+
+def test_reduce_is_hierarchical_and_stays_within_budget():
+    budget = 300
+    calls: list[tuple[str, str]] = []
+
+    async def summarize(text, number, total):
+        return "x" * 80
+
+    async def combine(summaries, title):
+        calls.append((summaries, title))
+        return "y" * 40
+
+    result = _run(
+        map_reduce_summarize(
+            [f"chunk {i}" for i in range(30)],
+            summarize_chunk=summarize,
+            combine=combine,
+            document_title="Big",
+            concurrency=4,
+            reduce_budget_chars=budget,
+        )
+    )
+
+    assert result == "y" * 40
+    assert calls[-1][1] == "Big"
+    # Intermediate combines ran before the final one
+    assert any(title.startswith("Big (part") for _, title in calls[:-1])
+    # Groups are cut at the budget (one trailing section may be merged in)
+    assert all(len(summaries) <= budget + 100 for summaries, _ in calls)
+
+
+def test_failed_chunks_and_final_combine_fall_back():
+    async def summarize(text, number, total):
+        if number == 2:
+            raise RuntimeError("llm down")
+        return text
+
+    async def combine(summaries, title):
+        raise RuntimeError("llm down")
+
+    result = _run(
+        map_reduce_summarize(
+            ["a", "b", "c"],
+            summarize_chunk=summarize,
+            combine=combine,
+            document_title="Doc",
+        )
+    )
+
+    assert result == (
+        "=== Section 1 ===\na\n\n"
+        "=== Section 2 ===\n[Processing failed]\n\n"
+        "=== Section 3 ===\nc"
+    )
+
+
+def test_group_for_reduce_always_shrinks():
+    sections = ["z" * 500 for _ in range(5)]
+    groups = _group_for_reduce(sections, budget_chars=100)
+
+    assert len(groups) < len(sections)
+    assert all(len(group) >= 2 for group in groups)
+    assert [s for group in groups for s in group] == sections
+
+
+def test_conversion_pool_runs_jobs_in_worker_processes():
+    pool = DoclingConversionPool(
+        max_workers=1, max_queued=1, timeout=30, initializer=None, convert_fn=str.upper
+    )
+    try:
+
+        async def run_jobs():
+            return await asyncio.gather(*(pool.convert(f"doc{i}") for i in range(4)))
+
+        assert _run(run_jobs()) == ["DOC0", "DOC1", "DOC2", "DOC3"]
+        assert pool.completed == 4
+    finally:
+        pool.shutdown()
+
+
+def test_conversion_timeout_restarts_the_pool():
+    pool = DoclingConversionPool(
+        max_workers=1,
+        max_queued=0,
+        timeout=0.5,
+        initializer=None,
+        convert_fn=time.sleep,
+    )
+    try:
+        with pytest.raises(TimeoutError):
+            _run(pool.convert(30))
+        assert pool.timed_out == 1
+        assert pool.restarts == 1
+
+        # A fresh pool serves the next job
+        assert _run(pool.convert(0)) is None
+    finally:
+        pool.shutdown()
+
+
+def test_worker_start_up_does_not_count_against_the_timeout():
+    # Model loading in the initializer takes longer than the job timeout
+    pool = DoclingConversionPool(
+        max_workers=2,
+        max_queued=2,
+        timeout=0.5,
+        initializer=functools.partial(time.sleep, 1.0),
+        convert_fn=str.upper,
+    )
+    try:
+
+        async def run_jobs():
+            return await asyncio.gather(*(pool.convert(f"doc{i}") for i in range(3)))
+
+        assert _run(run_jobs()) == ["DOC0", "DOC1", "DOC2"]
+        assert pool.timed_out == 0
+        assert pool.restarts == 0
+    finally:
+        pool.shutdown()
+
+
+def _convert_in_daemon(results) -> None:
+    pool = DoclingConversionPool(
+        max_workers=1, max_queued=1, timeout=30, initializer=None, convert_fn=str.upper
+    )
+    try:
+
+        async def run_jobs():
+            return await asyncio.gather(*(pool.convert(f"doc{i}") for i in range(2)))
+
+        results.put((_run(run_jobs()), pool.completed, pool._executor is None))
+    except BaseException as exc:
+        results.put(repr(exc))
+    finally:
+        pool.shutdown()
+
+
+def test_conversion_pool_converts_in_process_inside_a_daemonic_worker():
+    # Celery prefork children are daemonic and may not start pool workers
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_convert_in_daemon, args=(results,), daemon=True)
+    process.start()
+    try:
+        assert results.get(timeout=30) == (["DOC0", "DOC1"], 2, True)
+    finally:
+        process.join(timeout=5)
+
+
+class _FakeConverter:
+    def convert(self, file_path):
+        return SimpleNamespace(
+            document=SimpleNamespace(export_to_markdown=lambda: f"# {file_path}")
+        )
+
+
+def _create_services_in_daemon(results) -> None:
+    from app.services import docling_service
+
+    loads = 0
+
+    def initialize(self):
+        nonlocal loads
+        loads += 1
+        self.converter = _FakeConverter()
+
+    docling_service.DoclingService._configure_ssl_environment = lambda self: None
+    docling_service.DoclingService._check_wsl2_gpu_support = lambda self: None
+    docling_service.DoclingService._initialize_docling = initialize
+    docling_service.DOCLING_PROCESS_WORKERS = 1
+    try:
+
+        async def process_twice():
+            contents = []
+            for name in ("a.pdf", "b.pdf"):
+                service = docling_service.create_docling_service()
+                result = await service.process_document(name, name)
+                contents.append(result["content"])
+            return contents
+
+        results.put((_run(process_twice()), loads))
+    except BaseException as exc:
+        results.put(repr(exc))
+    finally:
+        docling_service.get_conversion_pool().shutdown()
+
+
+def test_daemonic_worker_loads_the_converter_once_per_process():
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=_create_services_in_daemon, args=(results,), daemon=True
+    )
+    process.start()
+    try:
+        assert results.get(timeout=30) == (["# a.pdf", "# b.pdf"], 1)
+    finally:
+        process.join(timeout=5)
@@ -0,0 +1,110 @@
+"""Tests for the persistent content-hash embedding cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services import embedding_cache
+from app.services.embedding_cache import (
+    EmbeddingCache,
+    embed_with_cache,
+    embedding_cache_key,
+)
+
+
+@pytest.fixture
+def cache(tmp_path) -> EmbeddingCache:
+    return EmbeddingCache(tmp_path / "embeddings.sqlite3", max_entries=10)
+
+
+def test_round_trip_and_counters(cache):
+    key = embedding_cache_key("hej")
+    cache.put_many("model-a", {key: [0.5, 1.5, -2.0]})
+
+    found = cache.get_many("model-a", [key, embedding_cache_key("saknas")])
+    assert list(found) == [key]
+    np.testing.assert_allclose(found[key], [0.5, 1.5, -2.0])
+    assert found[key].dtype == np.float32
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["writes"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_model_name_is_part_of_key(cache):
+    key = embedding_cache_key("text")
+    cache.put_many("model-a", {key: [1.0]})
+    assert cache.get_many("model-b", [key]) == {}
+
+    assert cache.invalidate_other_models("model-b") == 1
+    assert cache.get_many("model-a", [key]) == {}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "embeddings.sqlite3"
+    key = embedding_cache_key("beständig")
+    EmbeddingCache(path).put_many("model", {key: [3.0, 4.0]})
+
+    reopened = EmbeddingCache(path)
+    np.testing.assert_allclose(reopened.get_many("model", [key])[key], [3.0, 4.0])
+    assert reopened.stats()["entries"] == 1
+
+
+def test_eviction_drops_least_recently_used(monkeypatch, cache):
+    monkeypatch.setattr(embedding_cache, "_LAST_USED_REFRESH_SECONDS", 0.0)
+    keys = [embedding_cache_key(f"text {index}") for index in range(10)]
+    for index, key in enumerate(keys):
+        cache.put_many("model", {key: [float(index)]})
+    # Touch the first key so it survives eviction.
+    cache.get_many("model", [keys[0]])
+
+    cache.put_many("model", {embedding_cache_key("overflow"): [99.0]})
+
+    stats = cache.stats()
+    assert stats["entries"] <= cache.max_entries
+    assert stats["evictions"] > 0
+    assert keys[0] in cache.get_many("model", [keys[0]])
+    assert keys[1] not in cache.get_many("model", [keys[1]])
+
+
+def test_hits_refresh_last_used_only_when_stale(monkeypatch, cache):
+    key = embedding_cache_key("läst")
+    cache.put_many("model", {key: [1.0]})
+
+    for _ in range(3):
+        cache.get_many("model", [key])
+    assert cache.stats()["last_used_refreshes"] == 0
+
+    monkeypatch.setattr(embedding_cache, "_LAST_USED_REFRESH_SECONDS", 0.0)
+    cache.get_many("model", [key])
+    assert cache.stats()["last_used_refreshes"] == 1
+
+
+def test_embed_with_cache_only_embeds_misses(monkeypatch, cache):
+    monkeypatch.setattr(embedding_cache, "get_embedding_cache", lambda: cache)
+    monkeypatch.setattr(embedding_cache, "_current_model_name", lambda: "model")
+    calls: list[list[str]] = []
+
+    def _embed_batch(texts: list[str]) -> list[list[float]]:
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    first = embed_with_cache(["a", "bb", "a"], _embed_batch)
+    second = embed_with_cache(["bb", "ccc"], _embed_batch)
+
+    assert calls == [["a", "bb"], ["ccc"]]
+    assert [float(vector[0]) for vector in first] == [1.0, 2.0, 1.0]
+    assert [float(vector[0]) for vector in second] == [2.0, 3.0]
+    # Computed and cached vectors come back in the same form
+    assert {vector.dtype for vector in first + second} == {np.dtype(np.float32)}
+
+
+def test_embed_with_cache_passthrough_when_disabled(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "get_embedding_cache", lambda: None)
+    assert embed_with_cache(["x", "x"], lambda texts: [[1.0]] * len(texts)) == [
+        [1.0],
+        [1.0],
+    ]
@@ -0,0 +1,90 @@
+"""Tests for the batched document embedding pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.config import config
+from app.services import embedding_cache, embedding_service
+from app.services.embedding_service import embed_text, embed_texts
+
+
+class _RecordingEmbedding:
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self.threads: set[str] = set()
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        self.threads.add(threading.current_thread().name)
+        return [[float(len(text)), float(sum(map(ord, text)) % 97)] for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def _no_persistent_cache(monkeypatch):
+    monkeypatch.setattr(config, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(embedding_cache, "_cache", None)
+
+
+@pytest.fixture
+def recording_model(monkeypatch):
+    model = _RecordingEmbedding()
+    monkeypatch.setattr(config, "embedding_model_instance", model)
+    monkeypatch.setattr(config, "EMBEDDING_BATCH_SIZE", 3)
+    return model
+
+
+def test_embed_texts_batches_and_preserves_order(recording_model):
+    texts = [f"chunk {index}" for index in range(7)]
+    embeddings = asyncio.run(embed_texts(texts))
+
+    assert embeddings == [recording_model.embed_batch([text])[0] for text in texts]
+    assert [len(batch) for batch in recording_model.batches[:3]] == [3, 3, 1]
+    assert all(
+        name.startswith("embedding") for name in recording_model.threads - {"MainThread"}
+    )
+
+
+def test_embed_texts_dedupes_identical_texts(recording_model):
+    texts = ["samma", "annan", "samma", "samma"]
+    embeddings = asyncio.run(embed_texts(texts, batch_size=10))
+
+    assert recording_model.batches == [["samma", "annan"]]
+    assert embeddings[0] == embeddings[2] == embeddings[3]
+    assert embeddings[1] != embeddings[0]
+
+
+def test_embed_texts_empty(recording_model):
+    assert asyncio.run(embed_texts([])) == []
+    assert recording_model.batches == []
+
+
+def test_embed_text_falls_back_without_embed_batch(monkeypatch):
+    class _SingleOnly:
+        def embed(self, text: str) -> list[float]:
+            return [1.0, float(len(text))]
+
+    monkeypatch.setattr(config, "embedding_model_instance", _SingleOnly())
+    assert asyncio.run(embed_text("hej")) == [1.0, 3.0]
+
+
+def test_embed_texts_rejects_short_batches(monkeypatch):
+    class _Broken:
+        def embed_batch(self, texts: list[str]) -> list[list[float]]:
+            return []
+
+    monkeypatch.setattr(config, "embedding_model_instance", _Broken())
+    with pytest.raises(ValueError):
+        asyncio.run(embed_texts(["a", "b"]))
+
+
+def test_shutdown_recreates_executor(recording_model):
+    asyncio.run(embed_text("a"))
+    embedding_service.shutdown_embedding_executor()
+    assert asyncio.run(embed_text("b")) == recording_model.embed_batch(["b"])[0]
@@ -0,0 +1,168 @@
+"""Tests for the shared per-origin HTTP client registry."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import http_clients
+from app.services.http_clients import (
+    close_http_clients,
+    close_loop_http_clients,
+    get_http_client,
+    get_sync_http_client,
+    http_client_stats,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/moved":
+            # Like a self-hosted Jira behind a trailing-slash redirect
+            self.send_response(301)
+            self.send_header("Location", "/data/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b'{"ok": true}'
+        if self.path == "/echo-cookie":
+            body = (self.headers.get("Cookie") or "").encode()
+        self.send_response(200)
+        if self.path == "/login":
+            self.send_header("Set-Cookie", "JSESSIONID=user-a; Path=/")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    http_clients._stats.clear()
+
+
+def test_one_client_per_origin_and_loop(server_url):
+    async def scenario():
+        first = get_http_client(f"{server_url}/a?x=1")
+        same = get_http_client(f"{server_url}/b")
+        other = get_http_client("https://api.example.com/graphql")
+        await close_http_clients()
+        return first, same, other
+
+    first, same, other = asyncio.run(scenario())
+    assert first is same
+    assert first is not other
+    assert first.is_closed and other.is_closed
+
+    async def next_loop():
+        client = get_http_client(server_url)
+        await close_http_clients()
+        return client
+
+    assert asyncio.run(next_loop()) is not first
+
+
+def test_relative_url_is_rejected():
+    async def scenario():
+        get_http_client("/relative/path")
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+
+
+def test_sequential_requests_reuse_one_connection(server_url):
+    async def scenario():
+        for _ in range(5):
+            response = await get_http_client(server_url).get(f"{server_url}/data")
+            assert response.json() == {"ok": True}
+        await close_http_clients()
+
+    asyncio.run(scenario())
+    stats = http_client_stats()[server_url]
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+    assert stats["tls_handshakes"] == 0
+
+
+def test_sync_client_is_shared_and_counted(server_url):
+    client = get_sync_http_client(f"{server_url}/a")
+    assert client is get_sync_http_client(f"{server_url}/b")
+    for _ in range(3):
+        assert client.get(f"{server_url}/a").status_code == 200
+
+    asyncio.run(close_http_clients())
+    assert client.is_closed
+    stats = http_client_stats()[server_url]
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+
+
+def test_clients_follow_redirects(server_url):
+    async def scenario():
+        response = await get_http_client(server_url).get(f"{server_url}/moved")
+        await close_http_clients()
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.url.path == "/data/"
+
+    sync_response = get_sync_http_client(server_url).get(f"{server_url}/moved")
+    asyncio.run(close_http_clients())
+    assert sync_response.status_code == 200
+    assert sync_response.json() == {"ok": True}
+
+
+def test_clients_do_not_send_cookies_from_earlier_responses(server_url):
+    async def scenario():
+        client = get_http_client(server_url)
+        await client.get(f"{server_url}/login", headers={"Authorization": "Basic A"})
+        response = await client.get(
+            f"{server_url}/echo-cookie", headers={"Authorization": "Basic B"}
+        )
+        await close_loop_http_clients()
+        return response.text
+
+    assert asyncio.run(scenario()) == ""
+
+    sync_client = get_sync_http_client(server_url)
+    sync_client.get(f"{server_url}/login", headers={"Authorization": "Basic A"})
+    response = sync_client.get(
+        f"{server_url}/echo-cookie", headers={"Authorization": "Basic B"}
+    )
+    asyncio.run(close_http_clients())
+    assert response.text == ""
+    assert not sync_client.cookies
+
+
+def test_closing_loop_clients_keeps_blocking_clients(server_url):
+    sync_client = get_sync_http_client(server_url)
+    loop = asyncio.new_event_loop()
+    try:
+        client = loop.run_until_complete(_get_client(server_url))
+        loop.run_until_complete(close_loop_http_clients())
+    finally:
+        loop.close()
+
+    assert client.is_closed
+    assert not sync_client.is_closed
+    asyncio.run(close_http_clients())
+
+
+async def _get_client(url: str):
+    return get_http_client(url)
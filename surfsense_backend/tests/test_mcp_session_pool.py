@@ -0,0 +1,270 @@
+"""Tests for pooled MCP sessions and cached tool discovery."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_module(module_name: str, relative_path: str):
+    # Load by path so the heavy ``app.agents.new_chat.tools`` package
+    # (every builtin tool) is not imported.
+    module_path = _PROJECT_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Could not load module spec: {module_name}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_load_module(
+    "app.agents.new_chat.tools.mcp_client",
+    "app/agents/new_chat/tools/mcp_client.py",
+)
+_pool = _load_module(
+    "app.agents.new_chat.tools.mcp_session_pool",
+    "app/agents/new_chat/tools/mcp_session_pool.py",
+)
+MCPServerConfig = _pool.MCPServerConfig
+MCPSessionManager = _pool.MCPSessionManager
+
+
+class _FakeSession:
+    def __init__(self, server: _FakeServer):
+        self._server = server
+        self.closed = False
+
+    async def call_tool(self, name, arguments=None):
+        if self.closed:
+            raise anyio.ClosedResourceError
+        self._server.calls.append((name, arguments))
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{name}:{arguments}")])
+
+    async def list_tools(self):
+        self._server.list_calls += 1
+        return SimpleNamespace(
+            tools=[
+                SimpleNamespace(
+                    name="echo", description="Echo", inputSchema={"type": "object"}
+                )
+            ]
+        )
+
+
+class _FakeServer:
+    def __init__(self, fail_connects: int = 0):
+        self.fail_connects = fail_connects
+        self.opened = 0
+        self.exited = 0
+        self.calls: list = []
+        self.list_calls = 0
+        self.sessions: list[_FakeSession] = []
+        self.on_tools_changed = None
+
+    def opener(self, config, on_tools_changed):
+        @asynccontextmanager
+        async def open_session():
+            if self.fail_connects:
+                self.fail_connects -= 1
+                raise OSError("spawn failed")
+            self.opened += 1
+            self.on_tools_changed = on_tools_changed
+            session = _FakeSession(self)
+            self.sessions.append(session)
+            try:
+                yield session
+            finally:
+                self.exited += 1
+
+        return open_session()
+
+
+CONFIG = MCPServerConfig.stdio("npx", ["-y", "server"], {"TOKEN": "a"})
+
+
+def _manager(server: _FakeServer, **kwargs) -> MCPSessionManager:
+    return MCPSessionManager(opener=server.opener, retry_delay=0, **kwargs)
+
+
+def test_config_key_depends_on_content_not_order():
+    same = MCPServerConfig.stdio("npx", ["-y", "server"], {"TOKEN": "a"})
+    other = MCPServerConfig.stdio("npx", ["-y", "server"], {"TOKEN": "b"})
+    assert CONFIG.key == same.key
+    assert CONFIG.key != other.key
+    assert (
+        MCPServerConfig.http("https://x/mcp", {"A": "1", "B": "2"}).key
+        == MCPServerConfig.http("https://x/mcp", {"B": "2", "A": "1"}).key
+    )
+
+
+def test_concurrent_calls_share_one_session():
+    server = _FakeServer()
+
+    async def scenario():
+        manager = _manager(server)
+        results = await asyncio.gather(
+            *(manager.call_tool(CONFIG, "echo", {"i": i}) for i in range(10))
+        )
+        await manager.call_tool(CONFIG, "echo", {"i": 10})
+        stats = manager.stats()
+        await manager.close_all()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+    assert len(results) == 10
+    assert server.opened == 1
+    assert server.exited == 1
+    assert stats["connects"] == 1
+    assert stats["calls"] == 11
+
+
+def test_connect_retries_then_fails_with_runtime_error():
+    server = _FakeServer(fail_connects=2)
+
+    async def scenario():
+        manager = _manager(server)
+        await manager.call_tool(CONFIG, "echo", {})
+        await manager.close_all()
+
+    asyncio.run(scenario())
+    assert server.opened == 1
+
+    failing = _FakeServer(fail_connects=5)
+
+    async def scenario_failing():
+        await _manager(failing, max_retries=2).call_tool(CONFIG, "echo", {})
+
+    with pytest.raises(RuntimeError, match="after 2 attempts"):
+        asyncio.run(scenario_failing())
+
+
+def test_dead_session_is_replaced_and_call_retried():
+    server = _FakeServer()
+
+    async def scenario():
+        manager = _manager(server)
+        await manager.call_tool(CONFIG, "echo", {})
+        server.sessions[0].closed = True
+        result = await manager.call_tool(CONFIG, "echo", {"again": True})
+        stats = manager.stats()
+        await manager.close_all()
+        return result, stats
+
+    result, stats = asyncio.run(scenario())
+    assert "again" in result.content[0].text
+    assert server.opened == 2
+    assert stats["reconnects"] == 1
+
+
+def test_tool_errors_are_not_retried():
+    server = _FakeServer()
+
+    async def scenario():
+        manager = _manager(server)
+
+        async def boom(name, arguments=None):
+            raise ValueError("bad arguments")
+
+        await manager.list_tools(CONFIG)
+        server.sessions[0].call_tool = boom
+        try:
+            await manager.call_tool(CONFIG, "echo", {})
+        finally:
+            await manager.close_all()
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+    assert server.opened == 1
+
+
+def test_tool_list_is_cached_until_invalidated():
+    server = _FakeServer()
+
+    async def scenario():
+        manager = _manager(server)
+        handle = manager.handle(CONFIG, connector_id=7)
+        first = await handle.list_tools()
+        await handle.list_tools()
+        assert server.list_calls == 1
+
+        # Server-side notifications/tools/list_changed
+        server.on_tools_changed()
+        await handle.list_tools()
+        assert server.list_calls == 2
+
+        # Connector edited or deleted
+        await manager.invalidate_connector(7)
+        await handle.list_tools()
+        stats = manager.stats()
+        await manager.close_all()
+        return first, stats
+
+    first, stats = asyncio.run(scenario())
+    assert first == [
+        {"name": "echo", "description": "Echo", "input_schema": {"type": "object"}}
+    ]
+    assert server.list_calls == 3
+    assert server.opened == 2
+    assert stats["tools_cache_hits"] == 1
+    assert stats["tools_cache_misses"] == 3
+
+
+def test_idle_sessions_are_closed():
+    server = _FakeServer()
+    other = MCPServerConfig.http("https://example.com/mcp")
+
+    async def scenario():
+        manager = _manager(server, idle_timeout=0)
+        await manager.call_tool(CONFIG, "echo", {})
+        await manager.call_tool(other, "echo", {})
+        stats = manager.stats()
+        await manager.close_all()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert server.exited == 2
+    assert stats["sessions"] == 1
+
+
+def test_close_propagates_the_callers_cancellation():
+    server = _FakeServer()
+    exiting = asyncio.Event()
+    opener = server.opener
+
+    def slow_opener(config, on_tools_changed):
+        @asynccontextmanager
+        async def open_session():
+            async with opener(config, on_tools_changed) as session:
+                try:
+                    yield session
+                finally:
+                    exiting.set()
+                    await asyncio.sleep(3)
+
+        return open_session()
+
+    async def scenario():
+        manager = MCPSessionManager(opener=slow_opener, retry_delay=0)
+        await manager.call_tool(CONFIG, "echo", {})
+        closing = asyncio.create_task(manager.close_all())
+        await exiting.wait()
+        closing.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await closing
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    # The session owner was cancelled along with the caller
+    assert server.exited == 1
@@ -0,0 +1,173 @@
+"""Tests for the batched embedding matrices used by metadata separation."""
+
+from __future__ import annotations
+
+import zlib
+
+import numpy as np
+import pytest
+
+from app.services.metadata_separation_space import SeparationSpace
+
+
+class _Embedder:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[list[float] | None]:
+        self.calls.append(list(texts))
+        return [self.vector(text) for text in texts]
+
+    @staticmethod
+    def vector(text: str) -> list[float] | None:
+        if not text:
+            return None
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        return rng.standard_normal(8).tolist()
+
+
+def _text(payload: dict) -> str:
+    return payload.get("text", "")
+
+
+# Pairwise reference, as metadata_separation_service computed it per cell.
+def _cosine(left, right) -> float:
+    if not left or not right or len(left) != len(right):
+        return 0.0
+    dot = sum(a * b for a, b in zip(left, right, strict=True))
+    left_norm = sum(a * a for a in left)
+    right_norm = sum(b * b for b in right)
+    if left_norm <= 0.0 or right_norm <= 0.0:
+        return 0.0
+    return dot / ((left_norm**0.5) * (right_norm**0.5))
+
+
+def _fused(left_sem, left_struct, right_sem, right_struct, sem_w, struct_w) -> float:
+    sem = _cosine(left_sem, right_sem)
+    struct = _cosine(left_struct, right_struct)
+    total = max(0.0, sem_w) + max(0.0, struct_w)
+    if total <= 0.0:
+        return sem
+    return (sem * max(0.0, sem_w) + struct * max(0.0, struct_w)) / total
+
+
+def _mean(vectors):
+    usable = [vector for vector in vectors if vector]
+    if not usable:
+        return None
+    return [sum(column) / len(usable) for column in zip(*usable, strict=True)]
+
+
+def _catalog() -> tuple[dict[str, dict], dict[str, list[float] | None]]:
+    payloads = {f"tool_{i}": {"text": f"tool {i} {i % 3}"} for i in range(9)}
+    payloads["tool_blank"] = {"text": ""}
+    rng = np.random.default_rng(3)
+    structural = {item_id: rng.standard_normal(5).tolist() for item_id in payloads}
+    structural["tool_2"] = None
+    return payloads, structural
+
+
+@pytest.mark.parametrize("weights", [(1.0, 0.0), (0.7, 0.3), (0.0, 1.0), (0.0, 0.0)])
+def test_fused_matrix_and_nearest_match_pairwise_reference(weights):
+    payloads, structural = _catalog()
+    embedder = _Embedder()
+    space = SeparationSpace(
+        payloads=payloads,
+        text_of=_text,
+        embed_many=embedder,
+        structural=structural,
+        semantic_weight=weights[0],
+        structural_weight=weights[1],
+    )
+    labels = list(payloads)
+    sem = {item_id: embedder.vector(_text(payloads[item_id])) for item_id in labels}
+    expected = [
+        [_fused(sem[a], structural[a], sem[b], structural[b], *weights) for b in labels]
+        for a in labels
+    ]
+
+    np.testing.assert_allclose(space.matrix(labels), expected, atol=1e-12)
+    assert len(embedder.calls) == 1
+    for item_id in labels:
+        candidates = [value for value in labels if value != item_id]
+        scores = [expected[labels.index(item_id)][labels.index(c)] for c in candidates]
+        assert space.nearest(item_id, labels) == candidates[int(np.argmax(scores))]
+
+
+def test_refresh_reembeds_only_changed_rows_and_scores_candidates():
+    payloads, structural = _catalog()
+    embedder = _Embedder()
+    space = SeparationSpace(
+        payloads=payloads,
+        text_of=_text,
+        embed_many=embedder,
+        structural=structural,
+        semantic_weight=0.6,
+        structural_weight=0.4,
+    )
+    others = [item_id for item_id in payloads if item_id != "tool_4"]
+    candidate = {"text": "tool 4 rewritten"}
+    queries = ["find tool 4", "", "tool 4 1"]
+
+    assert space.refresh("tool_5", dict(payloads["tool_5"])) is False
+    old = space.semantic_vector(payloads["tool_4"], item_id="tool_4")
+    new = space.semantic_vector(candidate, item_id="tool_4")
+    old_sims = space.similarities(old, "tool_4", others)
+    new_sims = space.similarities(new, "tool_4", others)
+
+    sem = {item_id: embedder.vector(_text(payloads[item_id])) for item_id in payloads}
+    new_sem = embedder.vector(candidate["text"])
+    for position, other in enumerate(others):
+        assert old_sims[position] == pytest.approx(
+            _fused(
+                sem["tool_4"],
+                structural["tool_4"],
+                sem[other],
+                structural[other],
+                0.6,
+                0.4,
+            )
+        )
+        assert new_sims[position] == pytest.approx(
+            _fused(
+                new_sem, structural["tool_4"], sem[other], structural[other], 0.6, 0.4
+            )
+        )
+    query_vectors = [embedder.vector(query) for query in queries]
+    expected_alignment = np.mean(
+        [_cosine(vector, new_sem) for vector in query_vectors if vector]
+    )
+    assert space.alignment(queries, new) == pytest.approx(expected_alignment)
+
+    embedder.calls.clear()
+    assert space.refresh("tool_4", candidate) is True
+    assert embedder.calls == [["tool 4 rewritten"]]
+    refreshed = space.matrix(["tool_4", "tool_1"])
+    assert refreshed[0, 1] == pytest.approx(new_sims[others.index("tool_1")])
+
+
+def test_centroid_distance_matches_mean_vector_reference():
+    payloads, structural = _catalog()
+    embedder = _Embedder()
+    space = SeparationSpace(
+        payloads=payloads,
+        text_of=_text,
+        embed_many=embedder,
+        structural=structural,
+        semantic_weight=0.5,
+        structural_weight=0.5,
+    )
+    components = [["tool_0", "tool_1", "tool_2"], ["tool_3", "tool_blank"], ["tool_7"]]
+    sem = {item_id: embedder.vector(_text(payloads[item_id])) for item_id in payloads}
+    centroids = [
+        (_mean([sem[i] for i in component]), _mean([structural[i] for i in component]))
+        for component in components
+    ]
+    distances = [
+        1.0 - _fused(*centroids[a], *centroids[b], 0.5, 0.5)
+        for a in range(len(centroids))
+        for b in range(a + 1, len(centroids))
+    ]
+
+    assert space.centroid_distance(components) == pytest.approx(np.mean(distances))
+    assert space.centroid_distance(components[:1]) is None
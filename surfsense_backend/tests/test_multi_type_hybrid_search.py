@@ -0,0 +1,150 @@
+"""Tests for the multi-document-type hybrid search batch."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from app.db import DocumentType
+from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
+from app.retriever.documents_hybrid_search import DocumentHybridSearchRetriever
+from app.services.connector_service import ConnectorService
+from tests.sql_fakes import RecordingSession
+
+
+def _document(doc_id: int, document_type: DocumentType) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=doc_id,
+        title=f"Doc {doc_id}",
+        document_type=document_type,
+        document_metadata={"url": f"https://example.com/{doc_id}"},
+    )
+
+
+def _chunk(chunk_id: int, document: SimpleNamespace) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=chunk_id,
+        content=f"chunk {chunk_id}",
+        document=document,
+        document_id=document.id,
+    )
+
+
+def test_chunk_retriever_groups_results_per_type_in_two_statements():
+    file_doc = _document(1, DocumentType.FILE)
+    slack_doc = _document(2, DocumentType.SLACK_CONNECTOR)
+    ranked_rows = [
+        (_chunk(10, file_doc), 0.03),
+        (_chunk(20, slack_doc), 0.02),
+        (_chunk(11, file_doc), 0.01),
+    ]
+    all_chunks = [_chunk(10, file_doc), _chunk(11, file_doc), _chunk(20, slack_doc)]
+    session = RecordingSession(ranked_rows, all_chunks)
+
+    results = asyncio.run(
+        ChucksHybridSearchRetriever(session).hybrid_search_by_document_type(
+            query_text="budget",
+            top_k=5,
+            search_space_id=1,
+            document_types=["FILE", "SLACK_CONNECTOR", "NOTION_CONNECTOR", "UNKNOWN"],
+            query_embedding=[0.1, 0.2],
+        )
+    )
+
+    assert len(session.statements) == 2
+    assert "JOIN LATERAL" in session.statements[0]
+    assert "PARTITION BY documents.document_type" not in session.statements[0]
+    assert set(results) == {"FILE", "SLACK_CONNECTOR", "NOTION_CONNECTOR", "UNKNOWN"}
+    assert results["NOTION_CONNECTOR"] == []
+    assert results["UNKNOWN"] == []
+
+    (file_result,) = results["FILE"]
+    assert file_result["document_id"] == 1
+    assert file_result["score"] == 0.03
+    assert [c["chunk_id"] for c in file_result["chunks"]] == [10, 11]
+    assert file_result["content"] == "chunk 10\n\nchunk 11"
+    assert file_result["document"]["document_type"] == "FILE"
+    assert file_result["source"] == "FILE"
+    assert [item["document_id"] for item in results["SLACK_CONNECTOR"]] == [2]
+
+
+def test_document_retriever_keeps_hybrid_search_shape():
+    file_doc = _document(1, DocumentType.FILE)
+    note_doc = _document(3, DocumentType.NOTE)
+    session = RecordingSession(
+        [(file_doc, 0.5), (note_doc, 0.25)],
+        [_chunk(30, note_doc), _chunk(10, file_doc)],
+    )
+
+    results = asyncio.run(
+        DocumentHybridSearchRetriever(session).hybrid_search_by_document_type(
+            query_text="budget",
+            top_k=5,
+            search_space_id=1,
+            document_types=["FILE", "NOTE"],
+            query_embedding=[0.1, 0.2],
+        )
+    )
+
+    assert len(session.statements) == 2
+    assert "JOIN LATERAL" in session.statements[0]
+    assert "PARTITION BY documents.document_type" not in session.statements[0]
+    (note_result,) = results["NOTE"]
+    assert set(note_result) == {
+        "document_id",
+        "content",
+        "score",
+        "chunks",
+        "document",
+        "source",
+    }
+    assert note_result["chunks"] == [{"chunk_id": 30, "content": "chunk 30"}]
+    assert results["FILE"][0]["score"] == 0.5
+
+
+def test_prefetch_serves_combined_searches_from_one_batch(monkeypatch):
+    calls: list[tuple[str, dict]] = []
+
+    async def _fake_run(self, search_kwargs, method="hybrid_search"):
+        calls.append((method, search_kwargs))
+        chunk_results = {
+            "FILE": [{"document": {"id": 1}, "chunks": []}],
+            "SLACK_CONNECTOR": [{"document": {"id": 2}, "chunks": []}],
+        }
+        doc_results = {
+            "FILE": [{"document": {"id": 1}, "chunks": []}],
+            "SLACK_CONNECTOR": [],
+        }
+        return chunk_results, doc_results
+
+    monkeypatch.setattr(ConnectorService, "_run_hybrid_retrievers", _fake_run)
+    service = ConnectorService(session=object(), search_space_id=1)
+
+    async def _scenario():
+        await service.prefetch_combined_rrf_searches(
+            query_text="budget",
+            search_space_id=1,
+            document_types=["FILE", "SLACK_CONNECTOR"],
+            top_k=5,
+        )
+        file_docs = await service._combined_rrf_search(
+            query_text="budget", search_space_id=1, document_type="FILE", top_k=5
+        )
+        slack_docs = await service._combined_rrf_search(
+            query_text="budget",
+            search_space_id=1,
+            document_type="SLACK_CONNECTOR",
+            top_k=5,
+        )
+        return file_docs, slack_docs
+
+    file_docs, slack_docs = asyncio.run(_scenario())
+
+    assert [method for method, _ in calls] == ["hybrid_search_by_document_type"]
+    assert calls[0][1]["document_types"] == ["FILE", "SLACK_CONNECTOR"]
+    assert calls[0][1]["top_k"] == 10
+    # Document 1 was ranked first by both retrievers.
+    assert file_docs[0]["document_id"] == 1
+    assert file_docs[0]["score"] == 2.0 / 61
+    assert slack_docs[0]["document_id"] == 2
+    assert service._prefetched_rrf_results == {}
@@ -1,8 +1,14 @@
 """Tests for NEXUS QUL — Query Understanding Layer."""
 
+import random
+import re
+
 import pytest
 
-from app.nexus.routing.qul import QueryUnderstandingLayer
+from app.nexus.config import CATEGORY_HINTS, DOMAIN_HINTS, SWEDISH_NORMALIZATION_BANK
+from app.nexus.routing.keyword_automaton import KeywordAutomaton
+from app.nexus.routing.qul import MUNICIPALITY_GAZETTEER, QueryUnderstandingLayer
+from app.services.scb_regions import ALL_REGIONS, normalize_diacritik
 
 
 @pytest.fixture
@@ -114,3 +120,94 @@ class TestComplexityClassification:
     def test_compound(self, qul):
         result = qul.analyze("Hur är vädret och vad kostar bostäder?")
         assert result.complexity == "compound"
+
+
+def _regex_keywords(query, domain_hints, category_hints):
+    """The per-keyword regex matching QUL used before the automaton."""
+
+    def found(keyword, text):
+        return bool(re.search(rf"\b{re.escape(keyword)}\b", text))
+
+    normalized = query.strip()
+    for abbrev, expansion in SWEDISH_NORMALIZATION_BANK.items():
+        if found(abbrev, normalized.lower()):
+            pattern = rf"\b{re.escape(abbrev)}\b"
+            normalized = re.sub(pattern, expansion, normalized, flags=re.IGNORECASE)
+    lower = normalized.lower()
+    locations = []
+    for key, canonical in MUNICIPALITY_GAZETTEER.items():
+        if found(key, lower) and canonical not in locations:
+            locations.append(canonical)
+    for region in ALL_REGIONS:
+        if region.type == "country" or region.name in locations:
+            continue
+        if found(normalize_diacritik(region.name), normalize_diacritik(normalized)):
+            locations.append(region.name)
+    hints = []
+    for hints_map in (domain_hints, category_hints):
+        for name, keywords in hints_map.items():
+            if name not in hints and any(
+                kw in lower if " " in kw else found(kw, lower) for kw in keywords
+            ):
+                hints.append(name)
+    return normalized, locations, hints
+
+
+class TestKeywordAutomaton:
+    QUERIES = [
+        "Vad säger SMHI om vädret i sthlm?",
+        "Bostadspriser i gbg och Goteborg, samt Malmo",
+        "Hur mycket kostar en tvårumma i Upplands-Bro eller Dals-Ed?",
+        "SCB statistik för Jonkoping och Vaxjo 2024",
+        "Jämför /compare GPT och Claude",
+        "sl-trafik till Malung-Sälen, fk och af idag",
+        "Lediga jobb i Umeå? Vad är arbetslösheten i Luleå",
+        "stockholmsregionen och göteborgare",
+        "",
+        "   ",
+    ]
+
+    def test_analyze_matches_regex_implementation(self, qul):
+        db_domain = {zone: list(kws) for zone, kws in DOMAIN_HINTS.items()}
+        db_domain["egen"] = ["tvårumslägenhet", "/compare", "stockholm"]
+        db_category = {"agent-x": ["idag", "sveriges radio"], "tom": []}
+        for domain_hints, category_hints in (
+            (None, None),
+            (db_domain, db_category),
+        ):
+            for query in self.QUERIES:
+                result = qul.analyze(
+                    query,
+                    domain_hints_map=domain_hints,
+                    category_hints_map=category_hints,
+                )
+                normalized, locations, hints = _regex_keywords(
+                    query,
+                    DOMAIN_HINTS if domain_hints is None else domain_hints,
+                    CATEGORY_HINTS if category_hints is None else category_hints,
+                )
+                assert result.normalized_query == normalized, query
+                assert result.entities.locations == locations, query
+                assert result.domain_hints == hints, query
+
+    def test_automaton_rebuilt_only_when_hints_change(self, qul):
+        hints = {"zon": ["väder"]}
+        qul.analyze("väder", domain_hints_map=hints)
+        first = qul._keyword_automaton(dict(hints), None)
+        assert qul._keyword_automaton({"zon": ["väder"]}, None) is first
+        assert qul._keyword_automaton({"zon": ["väder", "regn"]}, None) is not first
+
+    def test_word_boundaries_match_re(self):
+        rng = random.Random(7)
+        keywords = ["ab", "b", "a_b", "-b", "a b", "bå", "ba-", "x"]
+        automaton = KeywordAutomaton(
+            [(kw, kw, True) for kw in keywords] + [("", "empty", True)]
+        )
+        for _ in range(500):
+            text = "".join(rng.choice("ab_- åx") for _ in range(rng.randint(0, 12)))
+            expected = {
+                kw for kw in keywords if re.search(rf"\b{re.escape(kw)}\b", text)
+            }
+            if re.search(r"\b\b", text):
+                expected.add("empty")
+            assert automaton.match(text) == expected, text
@@ -0,0 +1,252 @@
+"""Tests for the registry-versioned NEXUS routing snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.nexus import embeddings, platform_bridge
+from app.nexus.embeddings import nexus_batch_score
+from app.nexus.platform_bridge import PlatformTool
+from app.nexus.routing import routing_snapshot
+from app.nexus.routing.routing_snapshot import RoutingSnapshotHolder, ToolIndex
+
+ZONE_PREFIXES = {"väder": "[VÄDER] ", "trafik": "[TRAFI] "}
+
+
+class _FakeModel:
+    def embed(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "big")
+        return np.random.default_rng(seed).standard_normal(16).astype(np.float32)
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        return [self.embed(text) for text in texts]
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(embeddings, "_embedding_model", _FakeModel())
+    monkeypatch.setattr(embeddings, "_EMBED_CACHE", {})
+    monkeypatch.setattr(embeddings, "embed_with_cache", lambda texts, fn: fn(texts))
+
+
+def _tools() -> list[PlatformTool]:
+    tools = [
+        PlatformTool(
+            tool_id=f"smhi_weather_{i}",
+            name=f"smhi {i}",
+            description=f"Väderprognos {i}",
+            category="smhi",
+            namespace=("tools", "weather", "smhi"),
+            zone="väder",
+            keywords=["väder", "Prognos", "regn", "temperatur"][: 1 + i % 4],
+            example_queries=[f"Hur blir vädret {i}?"] if i % 2 else [],
+        )
+        for i in range(14)
+    ]
+    tools += [
+        PlatformTool(
+            tool_id=f"trafikverket_trafikinfo_{kind}",
+            name=kind,
+            description=f"Trafikinfo om {kind}",
+            category="trafikverket",
+            namespace=("tools", "trafik", kind),
+            zone="trafik",
+            keywords=[kind, "trafik", "stockning", "e4 norr"],
+        )
+        for kind in ("störningar", "olyckor", "köer", "vägarbeten", "avstängning")
+    ]
+    tools += [
+        PlatformTool(
+            tool_id=f"scb_stat_{i}",
+            name=f"scb {i}",
+            description="Statistik",
+            category="scb",
+            namespace=("tools", "statistics", "scb", f"del{i}"),
+            zone="statistik",
+            keywords=["statistik", "befolkning"],
+        )
+        for i in range(6)
+    ]
+    tools.append(
+        PlatformTool(
+            tool_id="gpt_external",
+            name="gpt",
+            description="External model",
+            category="external_model",
+            namespace=("tools", "external"),
+            zone="jämförelse",
+        )
+    )
+    return tools
+
+
+def _reference_entries(tools, query, zones, hints, agent_namespaces):
+    """Tool scoring as route_query computed it before the snapshot."""
+    query_lower = query.lower()
+    query_tokens = set(query_lower.split())
+    prefixed = query_lower
+    if zones and zones[0] in ZONE_PREFIXES:
+        prefixed = f"{ZONE_PREFIXES[zones[0]]}{query_lower}"
+    filtered = [pt for pt in tools if pt.category != "external_model"]
+    texts = []
+    for pt in filtered:
+        kw_text = " ".join(pt.keywords[:8]) if pt.keywords else ""
+        ex_text = " | ".join(pt.example_queries[:2]) if pt.example_queries else ""
+        texts.append(
+            f"{ZONE_PREFIXES.get(pt.zone, '')}{pt.tool_id} {pt.description} "
+            f"{kw_text} {ex_text}"
+        )
+    emb_scores = nexus_batch_score(prefixed, texts)
+    raw = []
+    for i, pt in enumerate(filtered):
+        emb = emb_scores[i] if emb_scores is not None else None
+        score = emb if emb is not None and emb > 0 else 0.20
+        if pt.zone in zones:
+            score += 0.05
+        tool_keywords = {k.lower() for k in pt.keywords}
+        keyword_hits = query_tokens & tool_keywords
+        if keyword_hits:
+            score += min(0.15, len(keyword_hits) * 0.05)
+        substring_hits = sum(
+            1
+            for kw in tool_keywords - keyword_hits
+            if len(kw) >= 4 and kw in query_lower
+        )
+        if substring_hits:
+            score += min(0.12, substring_hits * 0.04)
+        if pt.category in hints:
+            score += 0.10
+        name = pt.tool_id.lower().replace("_", " ")
+        if any(tok in query_lower for tok in name.split() if len(tok) > 3):
+            score += 0.05
+        raw.append(
+            ({"tool_id": pt.tool_id, "namespace": "/".join(pt.namespace)}, score)
+        )
+    raw.sort(key=lambda e: e[1], reverse=True)
+    top = raw[:20]
+    if agent_namespaces:
+        top_ids = {e[0]["tool_id"] for e in top}
+        for entry, score in raw[20:]:
+            if (
+                any(entry["namespace"].startswith(p) for p in agent_namespaces)
+                and entry["tool_id"] not in top_ids
+            ):
+                top.append((entry, score))
+    return [(entry["tool_id"], round(min(1.0, score), 4)) for entry, score in top]
+
+
+@pytest.mark.parametrize(
+    ("query", "zones", "hints", "agent_namespaces"),
+    [
+        ("Blir det regn och väder i Umeå imorgon", ["väder"], ["smhi"], None),
+        ("Trafikstockning på E4 norr, olyckor?", ["trafik"], [], ["tools/trafik"]),
+        ("befolkning statistik scb", ["statistik"], ["scb"], ["tools/statistics"]),
+        ("hej", [], [], None),
+    ],
+)
+def test_tool_index_matches_per_query_scoring(
+    fake_embeddings, query, zones, hints, agent_namespaces
+):
+    tools = _tools()
+    index = ToolIndex.build(tools, ZONE_PREFIXES)
+
+    entries = index.score(query, zones, hints, agent_namespaces=agent_namespaces)
+
+    assert index.embeddings.dtype == np.float32
+    assert [(e["tool_id"], e["score"]) for e in entries] == _reference_entries(
+        tools, query, zones, hints, agent_namespaces
+    )
+
+
+def test_holder_reuses_snapshot_until_registry_or_tools_change(
+    fake_embeddings, monkeypatch
+):
+    versions = [4]
+    loads: list[int] = []
+
+    async def fake_version(session):
+        return versions[-1]
+
+    async def load_agents(session):
+        loads.append(versions[-1])
+        return {"agent": object()}, {}, {"zon": ["väder"]}, {}
+
+    monkeypatch.setattr(routing_snapshot, "_registry_version", fake_version)
+    monkeypatch.setattr(platform_bridge, "_CACHE", _tools())
+    monkeypatch.setattr(platform_bridge, "_CACHE_GENERATION", 0)
+    monkeypatch.setattr(RoutingSnapshotHolder, "_snapshot", None)
+    monkeypatch.setattr(RoutingSnapshotHolder, "_builds", 0)
+    monkeypatch.setattr(RoutingSnapshotHolder, "_hits", 0)
+    monkeypatch.setattr(
+        routing_snapshot.config, "NEXUS_ROUTING_SNAPSHOT_RECHECK_SECONDS", 3600
+    )
+
+    async def scenario():
+        first = await RoutingSnapshotHolder.get(None, load_agents)
+        again = await RoutingSnapshotHolder.get(None, load_agents)
+        # The auto-loop patches tool metadata in memory.
+        platform_bridge.apply_overrides_to_cache(
+            {"smhi_weather_0": {"description": "Ny beskrivning"}}
+        )
+        patched = await RoutingSnapshotHolder.get(None, load_agents)
+        # A registry change is announced over PG NOTIFY.
+        versions.append(5)
+        await RoutingSnapshotHolder.invalidate()
+        bumped = await RoutingSnapshotHolder.get(None, load_agents)
+        return first, again, patched, bumped
+
+    first, again, patched, bumped = asyncio.run(scenario())
+
+    assert again is first
+    assert patched is not first
+    assert patched.tool_index.entries[0]["description"] == "Ny beskrivning"
+    assert bumped.registry_version == 5
+    assert loads == [4, 4, 5]
+    stats = RoutingSnapshotHolder.stats()
+    assert (stats["hits"], stats["builds"], stats["registry_version"]) == (1, 3, 5)
+
+
+def test_holder_rebuilds_snapshot_when_tool_embedding_failed(
+    fake_embeddings, monkeypatch
+):
+    class _FlakyModel(_FakeModel):
+        failures = 1
+
+        def embed_batch(self, texts):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("model not ready")
+            return super().embed_batch(texts)
+
+    async def fake_version(session):
+        return 7
+
+    async def load_agents(session):
+        return {}, {}, {}, {}
+
+    monkeypatch.setattr(embeddings, "_embedding_model", _FlakyModel())
+    monkeypatch.setattr(routing_snapshot, "_registry_version", fake_version)
+    monkeypatch.setattr(platform_bridge, "_CACHE", _tools())
+    monkeypatch.setattr(platform_bridge, "_CACHE_GENERATION", 0)
+    monkeypatch.setattr(RoutingSnapshotHolder, "_snapshot", None)
+    monkeypatch.setattr(
+        routing_snapshot.config, "NEXUS_ROUTING_SNAPSHOT_RECHECK_SECONDS", 0
+    )
+
+    async def scenario():
+        first = await RoutingSnapshotHolder.get(None, load_agents)
+        retried = await RoutingSnapshotHolder.get(None, load_agents)
+        again = await RoutingSnapshotHolder.get(None, load_agents)
+        return first, retried, again
+
+    first, retried, again = asyncio.run(scenario())
+
+    assert first.tool_index.embeddings is None
+    assert first.tool_index.embeddings_missing
+    assert retried is not first
+    assert retried.tool_index.embeddings is not None
+    assert again is retried
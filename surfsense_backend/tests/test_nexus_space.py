@@ -1,11 +1,13 @@
 """Tests for Space Auditor — Sprint 2."""
 
 import numpy as np
+import pytest
 
 from app.nexus.layers.space_auditor import (
     SpaceAuditor,
     ToolPoint,
     _cosine_similarity_matrix,
+    _silhouette_score_simple,
 )
 
 
@@ -119,6 +121,115 @@ class TestSpaceAuditor:
         assert report.total_tools == 0
 
 
+def _reference_silhouette(embeddings, labels):
+    """Per-point silhouette over the full distance matrix (pre-vectorization)."""
+    dist = 1.0 - _cosine_similarity_matrix(embeddings)
+    scores = []
+    for i, label in enumerate(labels):
+        same = [j for j, other in enumerate(labels) if other == label and j != i]
+        if not same:
+            scores.append(0.0)
+            continue
+        a = float(np.mean(dist[i, same]))
+        b = min(
+            float(np.mean([dist[i, j] for j, o in enumerate(labels) if o == other]))
+            for other in set(labels) - {label}
+        )
+        scores.append((b - a) / max(a, b) if max(a, b) > 0 else 0.0)
+    return float(np.mean(scores))
+
+
+def _reference_confusion_pairs(embeddings, tools, threshold):
+    sim = _cosine_similarity_matrix(embeddings)
+    pairs = [
+        (tools[i].tool_id, tools[j].tool_id, float(sim[i, j]))
+        for i in range(len(tools))
+        for j in range(i + 1, len(tools))
+        if sim[i, j] >= threshold and tools[i].namespace != tools[j].namespace
+    ]
+    pairs.sort(key=lambda p: p[2], reverse=True)
+    return pairs[:20]
+
+
+class TestBlockedAuditor:
+    @staticmethod
+    def _catalog(n: int = 160) -> list[ToolPoint]:
+        rng = np.random.default_rng(11)
+        centers = rng.standard_normal((5, 24))
+        tools = []
+        for i in range(n):
+            zone = i % 5
+            embedding = centers[zone] + 0.35 * rng.standard_normal(24)
+            tools.append(
+                ToolPoint(f"tool_{i}", f"ns_{zone}_{i % 3}", f"zone_{zone}", embedding)
+            )
+        # Exact duplicates across namespaces exercise tie ordering.
+        tools.append(ToolPoint("dup_a", "ns_dup_a", "zone_0", tools[0].embedding))
+        tools.append(ToolPoint("dup_b", "ns_dup_b", "zone_0", tools[0].embedding))
+        return tools
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 4096])
+    def test_matches_full_matrix_implementation(self, block_size):
+        tools = self._catalog()
+        embeddings = np.array([t.embedding for t in tools], dtype=np.float32)
+        auditor = SpaceAuditor(confusion_threshold=0.8, block_size=block_size)
+
+        report = auditor.compute_separation_matrix(tools)
+
+        assert report.global_silhouette == pytest.approx(
+            _reference_silhouette(embeddings, [t.zone for t in tools]), abs=1e-5
+        )
+        for zone, score in report.per_zone_silhouette.items():
+            members = [i for i, t in enumerate(tools) if t.zone == zone]
+            expected = _reference_silhouette(
+                embeddings[members], [tools[i].namespace for i in members]
+            )
+            assert score == pytest.approx(expected, abs=1e-5)
+        expected_pairs = _reference_confusion_pairs(embeddings, tools, 0.8)
+        assert len(expected_pairs) == 20
+        assert [(p.tool_a, p.tool_b) for p in report.confusion_pairs] == [
+            (a, b) for a, b, _ in expected_pairs
+        ]
+        assert [p.similarity for p in report.confusion_pairs] == pytest.approx(
+            [sim for _, _, sim in expected_pairs], abs=1e-5
+        )
+
+    def test_hubness_and_centroids_match_full_matrix(self):
+        tools = self._catalog(90)
+        embeddings = np.array([t.embedding for t in tools], dtype=np.float32)
+        auditor = SpaceAuditor(hubness_threshold=0.02, block_size=16)
+
+        sim = _cosine_similarity_matrix(embeddings)
+        np.fill_diagonal(sim, -1.0)
+        nn = np.argmax(sim, axis=1)
+        expected_hubs = {
+            tools[idx].tool_id: int((nn == idx).sum())
+            for idx in set(nn.tolist())
+            if (nn == idx).sum() / len(tools) > 0.02
+        }
+        alerts = auditor._detect_hubness(embeddings, tools)
+        assert {a.tool_id: a.times_as_nn for a in alerts} == expected_hubs
+        assert [a.actual_rate for a in alerts] == sorted(
+            (a.actual_rate for a in alerts), reverse=True
+        )
+
+        distances = auditor._compute_inter_zone_distances(embeddings, tools)
+        zone_1 = embeddings[[i for i, t in enumerate(tools) if t.zone == "zone_1"]]
+        zone_3 = embeddings[[i for i, t in enumerate(tools) if t.zone == "zone_3"]]
+        c1, c3 = zone_1.mean(axis=0), zone_3.mean(axis=0)
+        cosine = np.dot(c1, c3) / (np.linalg.norm(c1) * np.linalg.norm(c3))
+        assert distances["zone_1↔zone_3"] == pytest.approx(1.0 - cosine, abs=1e-5)
+        assert len(distances) == 10
+
+    def test_single_label_and_singletons(self):
+        embs = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], dtype=np.float32)
+        assert _silhouette_score_simple(embs, ["a", "a", "a"]) == 0.0
+        assert _silhouette_score_simple(embs, ["a", "b", "c"]) == 0.0
+        assert _silhouette_score_simple(embs, ["a", "a", "b"]) == pytest.approx(
+            _reference_silhouette(embs, ["a", "a", "b"]), abs=1e-6
+        )
+
+
 class TestECEMonitor:
     def test_perfect_calibration(self):
         from app.nexus.calibration.ece_monitor import compute_ece
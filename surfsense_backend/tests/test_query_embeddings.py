@@ -0,0 +1,170 @@
+"""Tests for the per-turn query embedding context."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.agents.new_chat import query_embeddings as query_embeddings_module
+from app.agents.new_chat.query_embeddings import (
+    QueryEmbeddingContext,
+    bind_query_embeddings,
+    embed_query,
+    embed_query_sync,
+    prefetch_query_embeddings,
+    reset_query_embeddings,
+)
+
+
+class _Embedder:
+    def __init__(self):
+        self.async_batches: list[list[str]] = []
+        self.sync_batches: list[list[str]] = []
+        self.threads: list[str] = []
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        self.async_batches.append(list(texts))
+
+        def _embed() -> list[list[float]]:
+            self.threads.append(threading.current_thread().name)
+            return [[float(len(text)), 1.0] for text in texts]
+
+        return await asyncio.to_thread(_embed)
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.sync_batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def _context(embedder: _Embedder) -> QueryEmbeddingContext:
+    return QueryEmbeddingContext(
+        aembed_batch=embedder.aembed, embed_batch=embedder.embed
+    )
+
+
+def test_concurrent_requests_share_one_off_loop_batch():
+    embedder = _Embedder()
+    context = _context(embedder)
+
+    async def _turn():
+        return await asyncio.gather(
+            context.aembed_many(["väder i Lund"]),
+            context.aembed_many(["tåg till Malmö", "väder i Lund"]),
+            context.aembed_many(["", "tåg till Malmö"]),
+        )
+
+    first, second, third = asyncio.run(_turn())
+
+    assert embedder.async_batches == [["väder i Lund", "tåg till Malmö"]]
+    assert embedder.threads and embedder.threads[0] != "MainThread"
+    assert first == [[12.0, 1.0]]
+    assert second == [[14.0, 1.0], [12.0, 1.0]]
+    assert third == [None, [14.0, 1.0]]
+    stats = context.stats()
+    assert stats["embed_calls"] == 1
+    assert stats["embedded_texts"] == 2
+    assert stats["requests"] == 4
+    assert stats["hits"] == 2
+
+
+def test_sync_lookups_reuse_prefetched_embeddings():
+    embedder = _Embedder()
+    context = _context(embedder)
+
+    async def _turn():
+        token = bind_query_embeddings(context)
+        try:
+            await prefetch_query_embeddings("befolkning i Malmö")
+            return embed_query_sync("befolkning i Malmö"), embed_query_sync("ny text")
+        finally:
+            reset_query_embeddings(token)
+
+    prefetched, missed = asyncio.run(_turn())
+
+    assert prefetched == [18.0, 1.0]
+    assert missed == [7.0, 1.0]
+    assert embedder.sync_batches == [["ny text"]]
+    assert context.embed("ny text") == [7.0, 1.0]
+    stats = context.stats()
+    assert stats["embed_calls"] == 2
+    assert stats["blocking_calls"] == 1
+    assert stats["hits"] == 2
+
+
+def test_failed_batch_resolves_waiters_with_none_and_is_retried():
+    calls: list[list[str]] = []
+
+    async def _flaky(texts):
+        calls.append(list(texts))
+        if len(calls) == 1:
+            raise RuntimeError("model offline")
+        return [[1.0] for _ in texts]
+
+    context = QueryEmbeddingContext(aembed_batch=_flaky, embed_batch=lambda t: [])
+
+    async def _turn():
+        first = await context.aembed_many(["a", "b"])
+        return first, await context.aembed_many(["a", "b"])
+
+    first, second = asyncio.run(_turn())
+    assert first == [None, None]
+    assert second == [[1.0], [1.0]]
+    assert calls == [["a", "b"], ["a", "b"]]
+    assert context.stats()["embed_calls"] == 2
+
+
+def test_cancelling_one_waiter_does_not_cancel_the_others():
+    async def _turn():
+        gate = asyncio.Event()
+
+        async def _slow(texts):
+            await gate.wait()
+            return [[2.0] for _ in texts]
+
+        context = QueryEmbeddingContext(aembed_batch=_slow, embed_batch=lambda t: [])
+        cancelled = asyncio.create_task(context.aembed_many(["same"]))
+        sibling = asyncio.create_task(context.aembed_many(["same"]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        return await sibling, cancelled.cancelled()
+
+    assert asyncio.run(_turn()) == ([[2.0]], True)
+
+
+def test_embed_query_falls_back_when_the_batch_failed(monkeypatch):
+    async def _failing(texts):
+        raise RuntimeError("model offline")
+
+    async def _embed_text(text: str):
+        raise RuntimeError("still offline")
+
+    monkeypatch.setattr(query_embeddings_module, "embed_text", _embed_text)
+    context = QueryEmbeddingContext(aembed_batch=_failing, embed_batch=lambda t: [])
+
+    async def _turn():
+        token = bind_query_embeddings(context)
+        try:
+            return await embed_query("fråga")
+        finally:
+            reset_query_embeddings(token)
+
+    with pytest.raises(RuntimeError, match="still offline"):
+        asyncio.run(_turn())
+
+
+def test_without_context_falls_back_to_direct_embedding(monkeypatch):
+    calls: list[str] = []
+
+    async def _embed_text(text: str):
+        calls.append(text)
+        return [0.5]
+
+    monkeypatch.setattr(query_embeddings_module, "embed_text", _embed_text)
+
+    assert asyncio.run(embed_query("fråga")) == [0.5]
+    assert asyncio.run(embed_query("fråga")) == [0.5]
+    assert calls == ["fråga", "fråga"]
@@ -0,0 +1,235 @@
+"""Tests for the two-tier public-data response cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import cache_control, response_cache
+from app.services.response_cache import ResponseCache, response_cache_stats
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def flushdb(self):
+        self.data.clear()
+        return True
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.setattr(cache_control, "_CACHE_DISABLED", False)
+    yield
+    response_cache._STATS.clear()
+
+
+def _cache(namespace: str, **kwargs) -> ResponseCache:
+    kwargs.setdefault("default_ttl", 60)
+    kwargs.setdefault("redis_url", "")
+    return ResponseCache(namespace, **kwargs)
+
+
+def _counter():
+    calls = {"n": 0}
+
+    async def fetch():
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        return {"call": calls["n"]}
+
+    return calls, fetch
+
+
+def test_hit_after_miss_and_per_call_ttl(monkeypatch):
+    cache = _cache("t-ttl")
+    calls, fetch = _counter()
+    clock = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: clock[0])
+
+    async def scenario():
+        first = await cache.get_or_fetch("a", fetch, ttl=10)
+        second = await cache.get_or_fetch("a", fetch, ttl=10)
+        clock[0] += 11 + cache.stale_ttl
+        third = await cache.get_or_fetch("a", fetch, ttl=10)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == ({"call": 1}, False)
+    assert second == ({"call": 1}, True)
+    assert third == ({"call": 2}, False)
+    assert calls["n"] == 2
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = _cache("t-flight")
+    calls, fetch = _counter()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(8)))
+
+    results = asyncio.run(scenario())
+    assert calls["n"] == 1
+    assert all(value == {"call": 1} for value, _ in results)
+
+    stats = response_cache_stats()["t-flight"]
+    assert stats["lookups"] == 8
+    assert stats["coalesced"] == 7
+    assert stats["upstream_calls_saved"] == 7
+
+
+def test_errors_are_not_cached_and_reach_every_waiter():
+    cache = _cache("t-errors")
+    calls = {"n": 0}
+
+    async def failing():
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("down")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(cache.get_or_fetch("k", failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, httpx.ConnectError) for result in results)
+    assert calls["n"] == 1
+    assert len(cache) == 0
+
+
+def test_stale_entry_is_served_while_refreshing(monkeypatch):
+    cache = _cache("t-swr", stale_ttl=30)
+    calls, fetch = _counter()
+    clock = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: clock[0])
+
+    async def scenario():
+        await cache.get_or_fetch("k", fetch, ttl=10)
+        clock[0] += 15
+        stale = await cache.get_or_fetch("k", fetch, ttl=10)
+        again = await cache.get_or_fetch("k", fetch, ttl=10)
+        await asyncio.sleep(0.05)
+        fresh = await cache.get_or_fetch("k", fetch, ttl=10)
+        return stale, again, fresh
+
+    stale, again, fresh = asyncio.run(scenario())
+    assert stale == ({"call": 1}, True)
+    assert again == ({"call": 1}, True)
+    assert fresh == ({"call": 2}, True)
+    assert calls["n"] == 2
+    stats = response_cache_stats()["t-swr"]
+    assert stats["stale_hits"] == 2
+    assert stats["background_refreshes"] == 1
+
+
+def test_conditional_revalidation_uses_validators(monkeypatch):
+    cache = _cache("t-etag")
+    clock = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: clock[0])
+    seen_headers: list[dict[str, str]] = []
+
+    async def request(headers):
+        seen_headers.append(dict(headers))
+        url = "https://example.com/data"
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=httpx.Request("GET", url))
+        return httpx.Response(
+            200,
+            json={"rows": [1, 2, 3]},
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+            request=httpx.Request("GET", url),
+        )
+
+    async def scenario():
+        first = await cache.get_or_fetch_http("k", request, lambda r: r.json(), ttl=10)
+        clock[0] += 10 + cache.stale_ttl + 1
+        second = await cache.get_or_fetch_http("k", request, lambda r: r.json(), ttl=10)
+        third = await cache.get_or_fetch_http("k", request, lambda r: r.json(), ttl=10)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == ({"rows": [1, 2, 3]}, False)
+    assert second == ({"rows": [1, 2, 3]}, False)
+    assert third == ({"rows": [1, 2, 3]}, True)
+    assert seen_headers == [
+        {},
+        {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        },
+    ]
+    assert response_cache_stats()["t-etag"]["not_modified"] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    cache = _cache("t-lru", max_entries=2)
+
+    async def value(v):
+        return v
+
+    async def scenario():
+        await cache.get_or_fetch("a", lambda: value(1))
+        await cache.get_or_fetch("b", lambda: value(2))
+        await cache.get_or_fetch("a", lambda: value(1))
+        await cache.get_or_fetch("c", lambda: value(3))
+        return await cache.get_or_fetch("b", lambda: value(20))
+
+    assert asyncio.run(scenario()) == (20, False)
+
+
+def test_disabled_cache_bypasses_tiers(monkeypatch):
+    cache = _cache("t-disabled")
+    calls, fetch = _counter()
+    monkeypatch.setattr(cache_control, "_CACHE_DISABLED", True)
+
+    async def scenario():
+        await cache.get_or_fetch("k", fetch)
+        return await cache.get_or_fetch("k", fetch)
+
+    assert asyncio.run(scenario()) == ({"call": 2}, False)
+    assert calls["n"] == 2
+    assert len(cache) == 0
+
+
+def test_clear_all_service_caches_flushes_memory_tier():
+    cache = _cache("t-clear")
+    calls, fetch = _counter()
+
+    async def scenario():
+        await cache.get_or_fetch("k", fetch)
+        assert cache_control.clear_all_service_caches() >= 1
+        return await cache.get_or_fetch("k", fetch)
+
+    assert asyncio.run(scenario()) == ({"call": 2}, False)
+    assert calls["n"] == 2
+
+
+def test_redis_tier_is_shared_between_instances(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(response_cache, "_get_redis", lambda url: fake if url else None)
+    writer = _cache("t-redis", redis_url="redis://test")
+    reader = _cache("t-redis", redis_url="redis://test")
+    calls, fetch = _counter()
+
+    async def scenario():
+        await writer.get_or_fetch("k", fetch)
+        return await reader.get_or_fetch("k", fetch)
+
+    assert asyncio.run(scenario()) == ({"call": 1}, True)
+    assert calls["n"] == 1
+    assert all(key.startswith("response_cache:t-redis:") for key in fake.data)
+
+    stats = response_cache_stats()["t-redis"]
+    assert stats["redis_hits"] == 1
+    assert stats["hit_ratio"] == 0.5
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _load_module(module_name: str, relative_path: str):
+    project_root = Path(__file__).resolve().parents[1]
+    module_path = project_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Could not load module spec: {module_name}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sandbox_runtime = _load_module(
+    "sandbox_warm_pool_test_module",
+    "app/agents/new_chat/sandbox_runtime.py",
+)
+
+
+class _FakeDocker:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, argv, **kwargs):
+        _ = kwargs
+        self.calls.append(list(argv))
+        stdout = "false" if argv[1] == "inspect" else "container-id"
+        return subprocess.CompletedProcess(argv, 0, stdout=stdout, stderr="")
+
+    def commands(self, name: str) -> list[list[str]]:
+        return [call for call in self.calls if call[1] == name]
+
+
+def _docker_pool(monkeypatch, tmp_path: Path, *, warm_pool_size: int = 1):
+    fake_docker = _FakeDocker()
+    monkeypatch.setattr(sandbox_runtime.subprocess, "run", fake_docker)
+    monkeypatch.setattr(
+        sandbox_runtime._DockerExecChannel,
+        "run",
+        lambda self, command, **kwargs: ("<no output>", 0, False),
+    )
+    pool = sandbox_runtime._DockerSandboxPool()
+    # Refill synchronously in tests instead of on a background thread.
+    monkeypatch.setattr(pool, "_schedule_refill", pool._refill)
+    config = sandbox_runtime.sandbox_config_from_runtime_flags(
+        {
+            "sandbox_enabled": True,
+            "sandbox_mode": "docker",
+            "sandbox_workspace_root": str(tmp_path),
+            "sandbox_warm_pool_size": warm_pool_size,
+        }
+    )
+    return pool, config, fake_docker
+
+
+def test_exec_channel_runs_commands_in_one_shell_process(tmp_path: Path) -> None:
+    channel = sandbox_runtime._DockerExecChannel(["sh"])
+    try:
+        output, exit_code, truncated = channel.run(
+            f"cd {tmp_path} && export FOO=bar && echo out && echo err >&2; exit 3",
+            timeout_seconds=5,
+            max_output_bytes=1000,
+        )
+        assert (output, exit_code, truncated) == ("out\n[stderr] err", 3, False)
+        process = channel._process
+
+        # Directory and environment changes do not leak between commands.
+        output, exit_code, _ = channel.run(
+            'printf "%s|%s" "$PWD" "${FOO:-unset}"',
+            timeout_seconds=5,
+            max_output_bytes=1000,
+        )
+        assert exit_code == 0
+        assert output.endswith("|unset")
+        assert str(tmp_path) not in output
+        assert channel._process is process
+    finally:
+        channel.close()
+
+
+def test_exec_channel_timeout_reopens_and_truncates() -> None:
+    channel = sandbox_runtime._DockerExecChannel(["sh"])
+    try:
+        output, exit_code, _ = channel.run(
+            "sleep 5", timeout_seconds=1, max_output_bytes=1000
+        )
+        assert exit_code == 124
+        assert "timed out" in output
+        assert not channel.alive()
+
+        output, exit_code, truncated = channel.run(
+            "seq 1 5000", timeout_seconds=5, max_output_bytes=100
+        )
+        assert exit_code == 0
+        assert truncated is True
+        assert output.startswith("1\n2\n3")
+        assert "[Output truncated due to size limits.]" in output
+    finally:
+        channel.close()
+
+
+def test_new_thread_binds_to_warm_container(monkeypatch, tmp_path: Path) -> None:
+    pool, config, fake_docker = _docker_pool(monkeypatch, tmp_path)
+    pool._refill(config)
+    assert len(fake_docker.commands("run")) == 1
+
+    workspace = tmp_path / "thread-1"
+    workspace.mkdir()
+    container_name, bound_workspace = pool.ensure(
+        container_name="oneseek-sandbox-thread-1",
+        workspace_path=workspace,
+        docker_image=config.docker_image,
+        config=config,
+    )
+
+    assert container_name.startswith("oneseek-sandbox-warm-")
+    assert workspace.is_symlink()
+    assert workspace.resolve() == bound_workspace
+    assert bound_workspace.parent == tmp_path / ".warm"
+    # The pool was refilled after the warm container was taken.
+    assert len(fake_docker.commands("run")) == 2
+
+    inspects = len(fake_docker.commands("inspect"))
+    again, _ = pool.ensure(
+        container_name=container_name,
+        workspace_path=bound_workspace,
+        docker_image=config.docker_image,
+        config=config,
+    )
+    assert again == container_name
+    assert len(fake_docker.commands("inspect")) == inspects
+
+    stats = pool.stats()
+    assert stats["acquires"] == 2
+    assert stats["warm_hits"] == 1
+    assert stats["reused"] == 1
+    assert stats["cold_starts"] == 0
+    assert stats["hit_rate"] == 1.0
+    assert stats["warm_ready"] == 1
+    assert set(stats["acquire_latency_ms"]) == {"p50", "p95", "max"}
+
+
+def test_workspace_with_files_cold_starts(monkeypatch, tmp_path: Path) -> None:
+    pool, config, fake_docker = _docker_pool(monkeypatch, tmp_path)
+    pool._refill(config)
+    workspace = tmp_path / "thread-2"
+    workspace.mkdir()
+    (workspace / "notes.md").write_text("kept", encoding="utf-8")
+
+    container_name, bound_workspace = pool.ensure(
+        container_name="oneseek-sandbox-thread-2",
+        workspace_path=workspace,
+        docker_image=config.docker_image,
+        config=config,
+    )
+
+    assert container_name == "oneseek-sandbox-thread-2"
+    assert bound_workspace == workspace
+    assert not workspace.is_symlink()
+    assert f"{workspace}:/workspace" in fake_docker.commands("run")[-1]
+    assert pool.stats()["cold_starts"] == 1
+
+
+def test_expired_warm_containers_are_reclaimed(monkeypatch, tmp_path: Path) -> None:
+    pool, config, fake_docker = _docker_pool(monkeypatch, tmp_path, warm_pool_size=2)
+    pool._refill(config)
+    for entry in pool._warm[pool._warm_key(config)]:
+        entry.created_at -= config.warm_idle_seconds
+
+    pool._reclaim_expired(config)
+
+    assert pool.stats()["warm_reclaimed"] == 2
+    assert pool.stats()["warm_ready"] == 0
+    assert len(fake_docker.commands("rm")) == 2
+    assert not any((tmp_path / ".warm").iterdir())
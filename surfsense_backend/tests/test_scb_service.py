@@ -609,10 +609,41 @@ def test_collect_tables_timeout():
     assert call_count <= 3
 
 
-def test_cache_lock_exists():
+def test_concurrent_list_nodes_share_one_request():
     service = _make_v1_service()
-    assert hasattr(service, "_cache_lock")
-    assert isinstance(service._cache_lock, asyncio.Lock)
+    calls = 0
+
+    async def fake_get_json(url, *, params=None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [{"id": "BE0101", "type": "l", "text": "Folkmängd"}]
+
+    service._get_json = fake_get_json  # type: ignore[method-assign]
+
+    async def run():
+        return await asyncio.gather(*(service.list_nodes("BE/") for _ in range(5)))
+
+    results = asyncio.get_event_loop().run_until_complete(run())
+    assert calls == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_malformed_list_nodes_response_is_not_cached():
+    service = _make_v1_service()
+    bodies = [{"error": "busy"}, [{"id": "BE0101", "type": "l", "text": "Folkmängd"}]]
+
+    async def fake_get_json(url, *, params=None):
+        return bodies.pop(0)
+
+    service._get_json = fake_get_json  # type: ignore[method-assign]
+
+    async def run():
+        return await service.list_nodes("BE/"), await service.list_nodes("BE/")
+
+    first, second = asyncio.get_event_loop().run_until_complete(run())
+    assert first == []
+    assert second == [{"id": "BE0101", "type": "l", "text": "Folkmängd"}]
 
 
 def test_get_json_with_persistent_client():
@@ -678,27 +709,23 @@ def test_encode_path():
 
 
 # ---------------------------------------------------------------------------
-# TTL-cache tests (OPT-4)
+# Response cache tests (OPT-4)
 # ---------------------------------------------------------------------------
 
 
-def test_ttl_cache_type():
-    """Caches should be TTLCache instances, not plain dicts."""
-    from cachetools import TTLCache
+def test_response_cache_type():
+    """Lookups go through the shared two-tier response cache."""
+    from app.services.response_cache import ResponseCache
 
     service = ScbService()
-    assert isinstance(service._node_cache, TTLCache)
-    assert isinstance(service._metadata_cache, TTLCache)
-    assert isinstance(service._codelist_cache, TTLCache)
+    assert isinstance(service._cache, ResponseCache)
+    assert service._cache.namespace == "scb"
 
 
-def test_ttl_cache_custom_ttl():
+def test_response_cache_custom_ttl():
     """Custom cache_ttl should be honoured."""
     service = ScbService(cache_ttl=120)
-    # TTLCache instances store ttl as attribute
-    assert service._node_cache.ttl == 120
-    assert service._metadata_cache.ttl == 120
-    assert service._codelist_cache.ttl == 120
+    assert service._cache.default_ttl == 120
 
 
 # ---------------------------------------------------------------------------
@@ -227,11 +227,7 @@ async def test_fetch_strang_data_success():
     mock_client = AsyncMock()
     mock_client.get = AsyncMock(return_value=mock_response)
 
-    mock_client_cls = MagicMock()
-    mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-    with patch("app.services.smhi_service.httpx.AsyncClient", mock_client_cls):
+    with patch("app.services.smhi_service.get_http_client", return_value=mock_client):
         result = await service.fetch_strang_data(parameter=116, lat=57.7, lon=11.97)
 
     assert result["time"] == fake_payload["time"]
@@ -257,11 +253,7 @@ async def test_fetch_strang_data_with_dates():
     mock_client = AsyncMock()
     mock_client.get = AsyncMock(return_value=mock_response)
 
-    mock_client_cls = MagicMock()
-    mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-    with patch("app.services.smhi_service.httpx.AsyncClient", mock_client_cls):
+    with patch("app.services.smhi_service.get_http_client", return_value=mock_client):
         await service.fetch_strang_data(
             parameter=120,
             lat=59.33,
@@ -289,11 +281,7 @@ async def test_fetch_strang_data_raises_on_http_error():
     mock_client = AsyncMock()
     mock_client.get = AsyncMock(return_value=mock_response)
 
-    mock_client_cls = MagicMock()
-    mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-    with patch("app.services.smhi_service.httpx.AsyncClient", mock_client_cls):
+    with patch("app.services.smhi_service.get_http_client", return_value=mock_client):
         with pytest.raises(httpx.HTTPStatusError):
             await service.fetch_strang_data(parameter=116, lat=57.7, lon=11.97)
 
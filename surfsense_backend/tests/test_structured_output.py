@@ -317,6 +317,44 @@ class TestIncrementalSchemaParser:
         assert partial["thinking"] == "kort"
         assert partial["response"] == "svar"
 
+    def test_char_by_char_matches_json_loads(self):
+        """Single-character chunks decode escapes split across chunks."""
+        payload = {
+            "thinking": 'Citat "här"\\ny rad\tflik åäö \U0001f600',
+            "plan": {"steps": [1, 2, {"note": "}]\\\""}], "ok": True},
+            "confidence": -1.5e2,
+            "response": "Svar € / klart",
+            "extra": None,
+        }
+        raw = json.dumps(payload)
+        parser = IncrementalSchemaParser()
+        thinking = response = ""
+        for char in raw:
+            t, r, _ = parser.feed_all(char)
+            thinking += t
+            response += r
+
+        assert thinking == payload["thinking"]
+        assert response == payload["response"]
+        assert parser._last_thinking_len == len(payload["thinking"])
+        _, _, partial = parser.feed_all("")
+        assert partial == payload
+        assert parser.finalize() == payload
+
+    def test_partial_holds_completed_fields(self):
+        parser = IncrementalSchemaParser()
+        _, partial = parser.feed('{"route": "kunskap", "confidence": 0.8, "th')
+        assert partial == {"route": "kunskap", "confidence": 0.8}
+        _, partial = parser.feed('inking": "pågår')
+        assert "thinking" not in partial
+
+    def test_non_json_output_yields_no_deltas(self):
+        parser = IncrementalSchemaParser()
+        t, r, partial = parser.feed_all('Svar utan JSON {"thinking": "x"}')
+        assert (t, r, partial) == ("", "", None)
+        with pytest.raises(json.JSONDecodeError):
+            parser.finalize()
+
 
 # ────────────────────────────────────────────────────────────────
 # Env flag
@@ -0,0 +1,184 @@
+"""Tests for reusing compiled supervisor graphs across chat turns."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections import OrderedDict
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from langchain_core.runnables import RunnableLambda
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.new_chat import complete_graph, supervisor_agent
+from app.agents.new_chat.request_dependencies import (
+    REQUEST_DEPENDENCIES_KEY,
+    bind_request_dependencies,
+    reset_request_dependencies,
+    resolve_request_dependencies,
+)
+from app.services.graph_holder import GraphHolder
+from app.services.graph_registry_service import RegistryCache
+
+
+def _holder(monkeypatch, versions: list[int]) -> list[dict]:
+    builds: list[dict] = []
+
+    async def fake_registry(session):
+        return SimpleNamespace(version=versions[-1])
+
+    async def fake_build(*, registry, **kwargs):
+        builds.append({"version": registry.version, **kwargs})
+        return object()
+
+    monkeypatch.setattr(RegistryCache, "get", fake_registry)
+    monkeypatch.setattr(GraphHolder, "_graphs", OrderedDict())
+    monkeypatch.setattr(GraphHolder, "_registry_version", 0)
+    monkeypatch.setattr(GraphHolder, "_build_fn", fake_build)
+    monkeypatch.setattr(GraphHolder, "_hits", 0)
+    monkeypatch.setattr(GraphHolder, "_builds", 0)
+    return builds
+
+
+def test_graph_holder_builds_once_per_key_and_version(monkeypatch):
+    versions = [3]
+    builds = _holder(monkeypatch, versions)
+
+    async def scenario():
+        first = await GraphHolder.get(None, key=("space", 1), marker="a")
+        again = await GraphHolder.get(None, key=("space", 1), marker="b")
+        other = await GraphHolder.get(None, key=("space", 2), marker="c")
+        versions.append(4)
+        rebuilt = await GraphHolder.get(None, key=("space", 1), marker="d")
+        return first, again, other, rebuilt
+
+    first, again, other, rebuilt = asyncio.run(scenario())
+
+    assert first is again
+    assert other is not first
+    assert rebuilt is not first
+    assert [(b["version"], b["marker"]) for b in builds] == [
+        (3, "a"),
+        (3, "c"),
+        (4, "d"),
+    ]
+    # The version bump dropped the graph of the other key as well.
+    assert list(GraphHolder._graphs) == [("space", 1)]
+    stats = GraphHolder.stats()
+    assert (stats["hits"], stats["builds"], stats["registry_version"]) == (1, 3, 4)
+
+
+def test_request_dependencies_come_from_run_config_or_context():
+    build_deps = {"thread_id": "build"}
+    assert resolve_request_dependencies(build_deps) is build_deps
+
+    token = bind_request_dependencies({"thread_id": "bound"})
+    try:
+        assert resolve_request_dependencies(build_deps)["thread_id"] == "bound"
+    finally:
+        reset_request_dependencies(token)
+
+    runnable = RunnableLambda(
+        lambda _: resolve_request_dependencies(build_deps)["thread_id"]
+    )
+    config = {"configurable": {REQUEST_DEPENDENCIES_KEY: {"thread_id": "turn-2"}}}
+    assert runnable.invoke(None, config=config) == "turn-2"
+
+
+def test_cache_key_ignores_clock_but_not_configuration():
+    llm = SimpleNamespace(_identifying_params={"model": "gpt", "temperature": 0})
+    dependencies = {"search_space_id": 1, "runtime_hitl": {"hybrid_mode": True}}
+
+    def key(prompt: str, **overrides):
+        return complete_graph.supervisor_graph_cache_key(
+            llm=llm,
+            dependencies={**dependencies, **overrides},
+            checkpointer=None,
+            knowledge_prompt=prompt,
+            compare_mode=False,
+        )
+
+    today = datetime.now(UTC).date().isoformat()
+    morning = f"Svara kort.\nToday's date (UTC): {today}\nCurrent time (UTC): 08:00:00"
+    evening = f"Svara kort.\nToday's date (UTC): {today}\nCurrent time (UTC): 21:15:09"
+
+    assert key(morning) == key(evening)
+    assert key(morning) != key("Svara utförligt.")
+    assert key(morning) != key(morning, search_space_id=2)
+    assert key(morning) != key(morning, runtime_hitl={"hybrid_mode": False})
+
+
+def test_changed_mcp_connectors_rebuild_the_cached_graph(monkeypatch):
+    builds = _holder(monkeypatch, [5])
+    connectors = ["mcp-1"]
+
+    async def fake_fingerprint(session, search_space_id):
+        return f"{search_space_id}:{','.join(connectors)}"
+
+    monkeypatch.setattr(complete_graph, "mcp_connectors_fingerprint", fake_fingerprint)
+    llm = SimpleNamespace(_identifying_params={"model": "gpt"})
+    # Only real sessions are fingerprinted; no connection is opened here.
+    session = object.__new__(AsyncSession)
+
+    async def turn():
+        return await complete_graph.get_or_build_complete_graph(
+            llm=llm,
+            dependencies={"db_session": session, "search_space_id": 1},
+            checkpointer=None,
+            knowledge_prompt="Svara kort.",
+        )
+
+    async def scenario():
+        first = await turn()
+        again = await turn()
+        connectors.append("mcp-2")
+        added = await turn()
+        connectors.remove("mcp-1")
+        removed = await turn()
+        return first, again, added, removed
+
+    first, again, added, removed = asyncio.run(scenario())
+
+    assert first is again
+    assert added is not first
+    assert removed is not added
+    assert len(builds) == 3
+
+
+def test_cached_graph_does_not_keep_the_build_request_alive(monkeypatch):
+    class _Session:
+        pass
+
+    async def fake_build(*, dependencies, **kwargs):
+        dependencies["_fan_out_tool_registry"] = {"tool": dependencies["db_session"]}
+        # Like the supervisor nodes, the graph keeps its build dependencies.
+        return lambda: dependencies
+
+    monkeypatch.setattr(complete_graph, "build_complete_graph", fake_build)
+    session = _Session()
+    session_ref = weakref.ref(session)
+    request = {
+        "db_session": session,
+        "connector_service": object(),
+        "search_space_id": 1,
+        "user_id": "build-user",
+        "thread_id": 7,
+        "checkpoint_ns": "build-ns",
+    }
+
+    graph = asyncio.run(
+        complete_graph._build_from_registry(registry="registry", dependencies=request)
+    )
+
+    assert request["_fan_out_tool_registry"] == {"tool": session}
+    # A turn without request dependencies must not see the build turn's user
+    assert set(graph()) == {"search_space_id", "graph_registry"}
+    assert resolve_request_dependencies(graph()).get("user_id") is None
+    del request, session
+    assert session_ref() is None
+
+
+def test_supervisor_closures_do_not_capture_request_objects():
+    captured = set(supervisor_agent.create_supervisor_agent.__code__.co_cellvars)
+    assert not captured & {"db_session", "connector_service"}
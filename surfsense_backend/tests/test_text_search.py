@@ -0,0 +1,74 @@
+"""Tests for the stored, language-aware full-text search helpers."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.db import Chunk
+from app.retriever.text_search import (
+    refresh_search_vectors,
+    search_space_tsquery,
+)
+from app.schemas.search_space import SearchSpaceCreate, SearchSpaceUpdate
+from tests.sql_fakes import RecordingSession, compile_postgres
+
+
+def test_tsquery_uses_search_space_config_and_stored_column():
+    tsquery = search_space_tsquery(7, "budget")
+    sql = compile_postgres(
+        select(Chunk.id).where(Chunk.search_vector.op("@@")(tsquery)),
+        literal_binds=True,
+    )
+
+    assert "chunks.search_vector @@ plainto_tsquery(CAST((SELECT" in sql
+    assert "searchspaces.text_search_config" in sql
+    assert "searchspaces.id = 7" in sql
+    assert "AS REGCONFIG)" in sql
+    assert "to_tsvector" not in sql
+
+
+def test_search_vector_is_not_loaded_with_chunks():
+    sql = compile_postgres(select(Chunk), literal_binds=True)
+    assert "search_vector" not in sql
+
+
+def test_search_space_schema_validates_text_search_config():
+    assert SearchSpaceCreate(name="Kommun").text_search_config == "swedish"
+    assert SearchSpaceUpdate(text_search_config="simple").text_search_config == (
+        "simple"
+    )
+    with pytest.raises(ValidationError):
+        SearchSpaceUpdate(text_search_config="german")
+
+
+class _BatchSession(RecordingSession):
+    """Pretends each table has ids 1..n and records batch parameters."""
+
+    def __init__(self, sizes: dict[str, int]):
+        super().__init__()
+        self.sizes = sizes
+        self.params: list[tuple[str, dict]] = []
+
+    def respond(self, sql, params):
+        if sql.startswith("SELECT searchspaces.text_search_config"):
+            return [("english",)]
+        table = "chunks" if "UPDATE chunks" in sql else "documents"
+        self.params.append((table, dict(params)))
+        start = params["last_id"] + 1
+        end = min(self.sizes[table], params["last_id"] + params["batch_size"])
+        return [(row_id,) for row_id in range(start, end + 1)]
+
+
+def test_refresh_search_vectors_walks_keyset_batches():
+    session = _BatchSession({"documents": 5, "chunks": 12})
+    refreshed = asyncio.run(refresh_search_vectors(session, 3, batch_size=5))
+
+    assert refreshed == {"documents": 5, "chunks": 12}
+    chunk_cursors = [p["last_id"] for table, p in session.params if table == "chunks"]
+    assert chunk_cursors == [0, 5, 10, 12]
+    assert all(p["config"] == "english" for _, p in session.params)
+    assert session.commits == len(session.params)
@@ -0,0 +1,204 @@
+"""Tests for keyset-paginated thread listing."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import ChatVisibility
+from app.services.thread_listing_service import (
+    DEFAULT_THREAD_PAGE_SIZE,
+    MAX_THREAD_PAGE_SIZE,
+    InvalidThreadCursorError,
+    build_thread_page_query,
+    clamp_thread_page_size,
+    decode_thread_cursor,
+    encode_thread_cursor,
+    fetch_all_threads,
+    fetch_thread_page,
+)
+from tests.sql_fakes import RecordingSession, compile_postgres
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+BASE_TIME = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+class _PagedSession(RecordingSession):
+    """Serves consecutive pages of ``rows``, honouring the page size."""
+
+    def __init__(self, rows, page_size):
+        super().__init__()
+        self._rows = rows
+        self._page_size = page_size
+        self.calls = 0
+
+    def respond(self, sql, params):
+        start = self.calls * self._page_size
+        self.calls += 1
+        return self._rows[start : start + self._page_size + 1]
+
+
+def _row(thread_id: int, created_by_id=USER_ID) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=thread_id,
+        title=f"Thread {thread_id}",
+        archived=False,
+        visibility=ChatVisibility.PRIVATE,
+        created_by_id=created_by_id,
+        created_at=BASE_TIME,
+        updated_at=BASE_TIME - timedelta(minutes=thread_id),
+    )
+
+
+def test_cursor_round_trip():
+    cursor = encode_thread_cursor(BASE_TIME, 42)
+    assert "=" not in cursor
+    assert decode_thread_cursor(cursor) == (BASE_TIME, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!!"])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidThreadCursorError):
+        decode_thread_cursor(cursor)
+
+
+def test_page_size_is_clamped():
+    assert clamp_thread_page_size(None) == DEFAULT_THREAD_PAGE_SIZE
+    assert clamp_thread_page_size(0) == DEFAULT_THREAD_PAGE_SIZE
+    assert clamp_thread_page_size(10) == 10
+    assert clamp_thread_page_size(10_000) == MAX_THREAD_PAGE_SIZE
+
+
+def test_query_has_one_limited_branch_per_visibility_rule():
+    member_sql = compile_postgres(
+        build_thread_page_query(
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=False,
+            archived=False,
+            limit=20,
+        )
+    )
+    owner_sql = compile_postgres(
+        build_thread_page_query(
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=True,
+            archived=False,
+            limit=20,
+        )
+    )
+
+    assert member_sql.count("UNION") == 1
+    assert owner_sql.count("UNION") == 2
+    assert "created_by_id IS NULL" not in member_sql
+    assert "created_by_id IS NULL" in owner_sql
+    # Every branch and the merged result are bounded by limit + 1
+    assert owner_sql.count("LIMIT") == 4
+    assert "new_chat_threads.archived = " in owner_sql
+    # Column projection only, no SELECT of the whole row
+    assert "needs_history_bootstrap" not in owner_sql
+
+
+def test_query_applies_keyset_and_title_filters():
+    sql = compile_postgres(
+        build_thread_page_query(
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=False,
+            archived=None,
+            limit=20,
+            cursor=(BASE_TIME, 7),
+            title="budget",
+        )
+    )
+
+    assert "(new_chat_threads.updated_at, new_chat_threads.id) <" in sql
+    assert "ILIKE" in sql
+    assert "new_chat_threads.archived =" not in sql
+    assert (
+        "ORDER BY accessible_threads.updated_at DESC, accessible_threads.id DESC" in sql
+    )
+
+
+def test_fetch_page_returns_next_cursor_only_when_more_rows_exist():
+    rows = [_row(i) for i in range(1, 5)]
+
+    session = RecordingSession(rows)
+    items, next_cursor = asyncio.run(
+        fetch_thread_page(
+            session,
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=False,
+            archived=False,
+            limit=3,
+        )
+    )
+    assert [item.id for item in items] == [1, 2, 3]
+    assert decode_thread_cursor(next_cursor) == (rows[2].updated_at, 3)
+    assert all(item.is_own_thread for item in items)
+
+    session = RecordingSession(rows[:3])
+    items, next_cursor = asyncio.run(
+        fetch_thread_page(
+            session,
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=False,
+            archived=False,
+            limit=3,
+        )
+    )
+    assert len(items) == 3
+    assert next_cursor is None
+
+
+def test_legacy_threads_are_own_threads_for_search_space_owner():
+    session = RecordingSession([_row(1, created_by_id=None)])
+    items, _ = asyncio.run(
+        fetch_thread_page(
+            session,
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=True,
+            archived=None,
+        )
+    )
+    assert items[0].is_own_thread is True
+
+
+def test_query_applies_visibility_filter():
+    sql = compile_postgres(
+        build_thread_page_query(
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=False,
+            archived=False,
+            limit=20,
+            visibility=ChatVisibility.PRIVATE,
+        )
+    )
+    assert sql.count("new_chat_threads.visibility = %(visibility_") == 3
+
+
+def test_fetch_all_threads_walks_every_page():
+    rows = [_row(i) for i in range(1, MAX_THREAD_PAGE_SIZE * 2 + 6)]
+    session = _PagedSession(rows, MAX_THREAD_PAGE_SIZE)
+
+    items = asyncio.run(
+        fetch_all_threads(
+            session,
+            search_space_id=1,
+            user_id=USER_ID,
+            is_search_space_owner=False,
+            archived=None,
+            title="thread",
+        )
+    )
+    assert [item.id for item in items] == [row.id for row in rows]
+    assert session.calls == 3
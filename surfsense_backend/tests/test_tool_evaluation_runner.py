@@ -0,0 +1,174 @@
+"""Tests for the concurrent, memoized tool-evaluation case runner."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.tool_evaluation_runner import (
+    DatabaseEvaluationCaseStore,
+    EvaluationCaseStore,
+    evaluation_case_key,
+    llm_identity,
+    run_evaluation_cases,
+)
+
+
+def test_cases_run_bounded_and_return_in_test_order():
+    tests = [{"id": f"case-{i}", "delay": 0.01 * (6 - i)} for i in range(6)]
+    active = 0
+    peak = 0
+    completed: list[str] = []
+
+    async def evaluate(idx, test):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(test["delay"])
+        active -= 1
+        completed.append(test["id"])
+        return {"index": idx, "test_id": test["id"]}
+
+    outcomes = asyncio.run(run_evaluation_cases(tests, evaluate, concurrency=3))
+
+    assert [outcome["test_id"] for outcome in outcomes] == [t["id"] for t in tests]
+    assert [outcome["index"] for outcome in outcomes] == list(range(6))
+    assert peak == 3
+    # Later cases are shorter, so cases finish out of test order.
+    assert completed != [t["id"] for t in tests]
+
+
+def test_concurrency_of_one_evaluates_sequentially():
+    order: list[str] = []
+
+    async def evaluate(idx, test):
+        order.append(f"start-{idx}")
+        await asyncio.sleep(0)
+        order.append(f"end-{idx}")
+        return idx
+
+    outcomes = asyncio.run(run_evaluation_cases([{}, {}, {}], evaluate, concurrency=1))
+
+    assert outcomes == [0, 1, 2]
+    assert order == ["start-0", "end-0", "start-1", "end-1", "start-2", "end-2"]
+
+
+def test_case_key_changes_with_any_input():
+    base = {
+        "kind": "tool",
+        "test": {"id": "t1", "question": "Vad blir vädret i Lund?"},
+        "metadata_hash": "abc",
+        "prompt_overrides": {"agent.weather": "x"},
+        "model": "gpt-4o",
+    }
+
+    assert evaluation_case_key(**base) == evaluation_case_key(**dict(base))
+    for field, value in (
+        ("metadata_hash", "abd"),
+        ("prompt_overrides", {"agent.weather": "y"}),
+        ("model", "gpt-4o-mini"),
+        ("test", {"id": "t1", "question": "Vad blir vädret i Malmö?"}),
+    ):
+        assert evaluation_case_key(**{**base, field: value}) != evaluation_case_key(
+            **base
+        )
+
+
+def test_llm_identity_prefers_model_name():
+    class _Llm:
+        model_name = "gpt-4o"
+
+    class _Anonymous:
+        pass
+
+    assert llm_identity(_Llm()) == "gpt-4o"
+    assert llm_identity(_Anonymous()) == "_Anonymous"
+    assert llm_identity(None) is None
+
+
+@pytest.mark.asyncio
+async def test_store_skips_memoized_cases_on_rerun():
+    store = EvaluationCaseStore()
+    calls: list[str] = []
+
+    async def evaluate(idx, test):
+        key = evaluation_case_key(kind="tool", test=test)
+        cached = await store.get(key)
+        if cached is not None:
+            return cached
+        calls.append(test["id"])
+        outcome = {"result": {"test_id": test["id"], "passed": True}}
+        await store.put(key, test_id=test["id"], outcome=outcome)
+        return outcome
+
+    tests = [{"id": "a"}, {"id": "b"}]
+    first = await run_evaluation_cases(tests, evaluate, concurrency=2)
+    second = await run_evaluation_cases([*tests, {"id": "c"}], evaluate, concurrency=2)
+
+    assert calls == ["a", "b", "c"]
+    assert second[:2] == first
+    assert (store.hits, store.misses) == (2, 3)
+
+
+class _StatementRecordingSession:
+    def __init__(self, statements: list) -> None:
+        self.statements = statements
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+        class _Result:
+            rowcount = 3
+
+        return _Result()
+
+    async def commit(self):
+        self.committed = True
+
+
+@pytest.mark.asyncio
+async def test_database_store_prunes_outcomes_past_retention():
+    statements: list = []
+    store = DatabaseEvaluationCaseStore(
+        search_space_id=1,
+        evaluation_kind="tool",
+        max_age_days=30,
+        session_factory=lambda: _StatementRecordingSession(statements),
+    )
+
+    assert await store.prune_expired() == 3
+    (statement,) = statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM tool_evaluation_case_results_global")
+    assert "updated_at <" in sql
+
+    statements.clear()
+    store.max_age_days = 0
+    assert await store.prune_expired() == 0
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_database_store_refreshes_updated_at_on_overwrite():
+    statements: list = []
+    store = DatabaseEvaluationCaseStore(
+        search_space_id=1,
+        evaluation_kind="tool",
+        session_factory=lambda: _StatementRecordingSession(statements),
+    )
+
+    await store.put("key-1", test_id="case-1", outcome={"passed": True})
+
+    (statement,) = statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (cache_key) DO UPDATE SET" in sql
+    assert "updated_at = now()" in sql
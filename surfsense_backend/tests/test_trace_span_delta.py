@@ -0,0 +1,130 @@
+"""Tests for delta-encoded trace span output updates."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+
+from app.services import trace_service
+from tests.trace_fakes import make_recorder
+
+
+def _recorder(*, delta_updates: bool, **kwargs) -> trace_service.TraceRecorder:
+    recorder = make_recorder(**kwargs)
+    recorder.delta_updates = delta_updates
+    return recorder
+
+
+def _event(frame: str) -> dict:
+    assert frame.startswith("data: ")
+    return json.loads(frame[len("data: ") :])
+
+
+def test_deltas_carry_offsets_and_coalesce_within_window():
+    clock = [100.0]
+
+    async def scenario():
+        recorder = _recorder(delta_updates=True, clock=lambda: clock[0])
+        recorder.update_interval = 0.1
+        await recorder.start_span("llm-1", "model", "llm")
+        frames = [await recorder.append_span_output("llm-1", "Hej")]
+        for token in (" där", ",", " värld"):
+            clock[0] += 0.02
+            frames.append(await recorder.append_span_output("llm-1", token))
+        clock[0] += 0.1
+        frames.append(await recorder.append_span_output("llm-1", "!"))
+        end = await recorder.end_span("llm-1")
+        return frames, end
+
+    frames, end = asyncio.run(scenario())
+
+    sent = [_event(frame) for frame in frames if frame]
+    assert frames[1:4] == [None, None, None]
+    assert [event["type"] for event in sent] == ["data-trace-span-delta"] * 2
+    assert [(e["data"]["offset"], e["data"]["delta"]) for e in sent] == [
+        (0, "Hej"),
+        (3, " där, värld!"),
+    ]
+    final = _event(end)["data"]
+    assert final["event"] == "end"
+    assert final["span"]["output"] == "Hej där, värld!"
+
+
+def test_cumulative_mode_resends_full_output():
+    async def scenario():
+        recorder = _recorder(delta_updates=False)
+        await recorder.start_span("llm-1", "model", "llm")
+        return [
+            await recorder.append_span_output("llm-1", token)
+            for token in ("a", "b", "c")
+        ]
+
+    frames = asyncio.run(scenario())
+
+    events = [_event(frame)["data"] for frame in frames]
+    assert [event["event"] for event in events] == ["update"] * 3
+    assert [event["span"]["output"] for event in events] == ["a", "ab", "abc"]
+
+
+def test_held_back_output_is_flushed_when_the_window_closes():
+    async def stalled_events():
+        yield {"event": "on_chat_model_stream", "run_id": "llm-1"}
+        # The model stops streaming; the span stays open meanwhile.
+        await asyncio.sleep(0.3)
+        yield {"event": "on_tool_start", "run_id": "tool-1"}
+
+    async def scenario():
+        recorder = _recorder(delta_updates=True)
+        recorder.update_interval = 0.05
+        await recorder.start_span("llm-1", "model", "llm")
+        received = []
+        async for event in trace_service.interleave_held_output(
+            stalled_events(), recorder
+        ):
+            if event["event"] == "on_chat_model_stream":
+                received.append(await recorder.append_span_output("llm-1", "Hej"))
+                received.append(await recorder.append_span_output("llm-1", " där"))
+            elif event["event"] == trace_service.HELD_OUTPUT_EVENT:
+                received.append(event["data"])
+            else:
+                received.append(event["event"])
+        return received
+
+    received = asyncio.run(scenario())
+
+    first, held, flushed, after = received
+    assert _event(first)["data"]["delta"] == "Hej"
+    assert held is None
+    # Sent before the stalled stream produced its next event
+    assert after == "on_tool_start"
+    assert _event(flushed)["data"]["offset"] == 3
+    assert _event(flushed)["data"]["delta"] == " där"
+
+
+def test_interleaved_events_share_one_context_and_close_the_source():
+    request_id = contextvars.ContextVar("request_id", default=None)
+    seen = []
+    closed = []
+
+    async def events():
+        request_id.set("turn-1")
+        try:
+            for index in range(3):
+                seen.append(request_id.get())
+                yield {"event": "on_chain_stream", "index": index}
+        finally:
+            closed.append(True)
+
+    async def scenario():
+        recorder = _recorder(delta_updates=True)
+        stream = trace_service.interleave_held_output(events(), recorder)
+        received = [await anext(stream), await anext(stream)]
+        await stream.aclose()
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert [event["index"] for event in received] == [0, 1]
+    assert "turn-1" in seen and None not in seen
+    assert closed == [True]
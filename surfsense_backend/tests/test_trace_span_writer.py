@@ -0,0 +1,111 @@
+"""Tests for write-behind persistence of chat trace spans."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from app.services.trace_writer import TraceSpanWriter
+from tests.trace_fakes import RecordingSessionFactory, make_recorder
+
+
+def _rows(statement: dict) -> dict[str, dict]:
+    params = statement["params"]
+    count = sum(1 for key in params if key.startswith("span_id_m"))
+    return {
+        params[f"span_id_m{i}"]: {
+            "status": params[f"status_m{i}"],
+            "duration_ms": params[f"duration_ms_m{i}"],
+        }
+        for i in range(count)
+    }
+
+
+def test_spans_stream_without_database_and_flush_in_one_upsert():
+    factory = RecordingSessionFactory()
+
+    async def scenario():
+        writer = TraceSpanWriter(
+            session_factory=factory, flush_interval_ms=60_000, max_batch_spans=50
+        )
+        recorder = make_recorder(writer)
+        events = [
+            await recorder.start_root_span(),
+            await recorder.start_span("tool-1", "search", "tool", input_data="q"),
+            await recorder.end_span("tool-1", output_data={"hits": 2}),
+        ]
+        queued = writer.stats()["queue_depth"]
+        writes_before_flush = len(factory.statements)
+        await writer.flush()
+        return events, queued, writes_before_flush, writer.stats()
+
+    events, queued, writes_before_flush, stats = asyncio.run(scenario())
+
+    assert all(event for event in events)
+    assert writes_before_flush == 0
+    assert queued == 2
+    assert len(factory.statements) == 1
+    statement = factory.statements[0]
+    assert "ON CONFLICT (session_id, span_id) DO UPDATE" in statement["sql"]
+    rows = _rows(statement)
+    # Start and end of tool-1 were coalesced into one completed row.
+    assert rows["tool-1"]["status"] == "completed"
+    assert rows["tool-1"]["duration_ms"] is not None
+    assert next(iter(rows.values()))["status"] == "running"
+    assert stats["coalesced"] == 1
+    assert stats["flushed_spans"] == 2
+    assert stats["queue_depth"] == 0
+    assert set(stats["flush_latency_ms"]) == {"p50", "p95", "max"}
+
+
+def test_full_batch_flushes_in_background_and_end_session_drains():
+    factory = RecordingSessionFactory()
+
+    async def scenario():
+        writer = TraceSpanWriter(
+            session_factory=factory, flush_interval_ms=60_000, max_batch_spans=3
+        )
+        recorder = make_recorder(writer)
+        recorder.db_session = SimpleNamespace(
+            execute=_noop, commit=_noop, rollback=_noop
+        )
+        for index in range(4):
+            await recorder.start_span(f"span-{index}", "step", "chain")
+        # Let the background task pick up the full batch.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        flushed_in_background = len(factory.statements)
+        await recorder.start_span("span-4", "step", "chain")
+        await recorder.end_session()
+        return flushed_in_background, writer.stats()
+
+    flushed_in_background, stats = asyncio.run(scenario())
+
+    assert flushed_in_background >= 1
+    assert stats["queue_depth"] == 0
+    assert stats["flushed_spans"] == 5
+    batch_sizes = [len(_rows(statement)) for statement in factory.statements]
+    assert batch_sizes[0] == 3
+    assert sum(batch_sizes) == 5
+
+
+def test_failed_flush_is_counted_and_dropped():
+    async def scenario():
+        writer = TraceSpanWriter(
+            session_factory=RecordingSessionFactory(fail=True), flush_interval_ms=10
+        )
+        writer.enqueue(
+            {"session_id": 1, "span_id": "a", "status": "running"},
+        )
+        await writer.flush()
+        return writer.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["failed_flushes"] == 1
+    assert stats["dropped_spans"] == 1
+    assert stats["queue_depth"] == 0
+
+
+async def _noop(*args, **kwargs):
+    return None
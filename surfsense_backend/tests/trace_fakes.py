@@ -0,0 +1,70 @@
+"""Database-free trace recorder fakes shared by the trace tests and benchmarks."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.new_streaming_service import VercelStreamingService
+from app.services.trace_service import TraceRecorder
+from app.services.trace_writer import TraceSpanWriter
+
+
+class RecordingSession:
+    """Async session that compiles each statement for PostgreSQL and logs it."""
+
+    def __init__(self, log: list[dict], fail: bool):
+        self._log = log
+        self._fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if self._fail:
+            raise RuntimeError("database unavailable")
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self._log.append({"sql": str(compiled), "params": compiled.params})
+
+    async def commit(self):
+        pass
+
+
+class RecordingSessionFactory:
+    """``session_factory`` for ``TraceSpanWriter``; collects every statement."""
+
+    def __init__(self, fail: bool = False):
+        self.statements: list[dict] = []
+        self.fail = fail
+
+    def __call__(self) -> RecordingSession:
+        return RecordingSession(self.statements, self.fail)
+
+
+def make_recorder(
+    writer: TraceSpanWriter | None = None, **kwargs: Any
+) -> TraceRecorder:
+    """A recorder for trace session 7 that writes spans to ``writer``.
+
+    Without a writer, spans go to one that never flushes on its own.
+    """
+    if writer is None:
+        writer = TraceSpanWriter(
+            session_factory=RecordingSessionFactory(), flush_interval_ms=60_000
+        )
+    recorder = TraceRecorder(
+        db_session=None,
+        trace_session=SimpleNamespace(id=7, session_id="trace-7", thread_id=3),
+        streaming_service=VercelStreamingService(),
+        root_name="Chat Response",
+        span_writer=writer,
+        **kwargs,
+    )
+    # Token estimation needs tokenizer files; it is not under test here.
+    recorder._estimate_tokens = lambda payload: 1
+    return recorder
@@ -235,6 +235,26 @@ function isGreetingQuery(query: string): boolean {
 	return cleaned.length <= 12 && GREETING_REGEX.test(cleaned);
 }
 
+/**
+ * Apply a ``data-trace-span-delta`` event: append the streamed output text of a
+ * running span. The backend sends only new text; ``offset`` 0 starts the output
+ * over. The span's ``end`` event later carries the complete output.
+ */
+function applyTraceSpanDelta(
+	spans: TraceSpan[],
+	spanId: string,
+	offset: number,
+	delta: string
+): TraceSpan[] {
+	const idx = spans.findIndex((s) => s.id === spanId);
+	if (idx < 0) return spans;
+	return spans.map((s, i) => {
+		if (i !== idx) return s;
+		const current = offset > 0 && typeof s.output === "string" ? s.output : "";
+		return { ...s, status: "running", output: current + delta };
+	});
+}
+
 const formatContextNumber = (value?: number) => {
 	if (typeof value !== "number" || Number.isNaN(value)) return "0";
 	return value.toLocaleString("sv-SE");
@@ -1629,6 +1649,25 @@ export default function NewChatPage() {
 											}
 											break;
 										}
+										case "data-trace-span-delta": {
+											const traceSessionId = parsed.data?.trace_session_id as string | undefined;
+											const spanId = parsed.data?.span_id as string | undefined;
+											const delta = parsed.data?.delta;
+											if (traceSessionId && spanId && typeof delta === "string") {
+												const offset = Number(parsed.data?.offset ?? 0);
+												setTraceSpansBySession((prev) => {
+													const existing = prev.get(traceSessionId);
+													if (!existing) return prev;
+													const newMap = new Map(prev);
+													newMap.set(
+														traceSessionId,
+														applyTraceSpanDelta(existing, spanId, offset, delta)
+													);
+													return newMap;
+												});
+											}
+											break;
+										}
 										case "data-compare-summary": {
 											compareSummary = parsed.data ?? null;
 											break;
@@ -2806,6 +2845,25 @@ export default function NewChatPage() {
 											}
 											break;
 										}
+										case "data-trace-span-delta": {
+											const traceSessionId = parsed.data?.trace_session_id as string | undefined;
+											const spanId = parsed.data?.span_id as string | undefined;
+											const delta = parsed.data?.delta;
+											if (traceSessionId && spanId && typeof delta === "string") {
+												const offset = Number(parsed.data?.offset ?? 0);
+												setTraceSpansBySession((prev) => {
+													const existing = prev.get(traceSessionId);
+													if (!existing) return prev;
+													const newMap = new Map(prev);
+													newMap.set(
+														traceSessionId,
+														applyTraceSpanDelta(existing, spanId, offset, delta)
+													);
+													return newMap;
+												});
+											}
+											break;
+										}
 										case "data-compare-summary": {
 											compareSummary = parsed.data ?? null;
 											break;
@@ -9,7 +9,7 @@ import {
 	TrashIcon,
 } from "lucide-react";
 import { useRouter } from "next/navigation";
-import { useCallback, useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { Button } from "@/components/ui/button";
 import {
 	DropdownMenu,
@@ -36,10 +36,15 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 	const [state, setState] = useState<ThreadListState>({
 		threads: [],
 		archivedThreads: [],
+		nextCursor: null,
+		archivedNextCursor: null,
 		isLoading: true,
 		error: null,
 	});
 	const [showArchived, setShowArchived] = useState(false);
+	const [isLoadingMore, setIsLoadingMore] = useState(false);
+	const [loadMoreFailed, setLoadMoreFailed] = useState(false);
+	const loadMoreTriggerRef = useRef<HTMLDivElement>(null);
 
 	// Create the thread list manager
 	const manager = useCallback(
@@ -60,6 +65,7 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 	// Load threads on mount and when searchSpaceId changes
 	const loadThreads = useCallback(async () => {
 		setState((prev) => ({ ...prev, isLoading: true }));
+		setLoadMoreFailed(false);
 		const newState = await manager().loadThreads();
 		setState(newState);
 	}, [manager]);
@@ -68,6 +74,52 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 		loadThreads();
 	}, [loadThreads]);
 
+	const nextCursor = showArchived ? state.archivedNextCursor : state.nextCursor;
+
+	// Append the next page of the shown list
+	const loadMoreThreads = useCallback(async () => {
+		if (!nextCursor) return;
+		setIsLoadingMore(true);
+		const page = await manager().loadMoreThreads(showArchived, nextCursor);
+		setIsLoadingMore(false);
+		// Stop loading on scroll after a failure until the user retries
+		setLoadMoreFailed(!page);
+		if (!page) return;
+		setState((prev) =>
+			showArchived
+				? {
+						...prev,
+						archivedThreads: [...prev.archivedThreads, ...page.items],
+						archivedNextCursor: page.nextCursor,
+					}
+				: {
+						...prev,
+						threads: [...prev.threads, ...page.items],
+						nextCursor: page.nextCursor,
+					}
+		);
+	}, [manager, nextCursor, showArchived]);
+
+	// Load the next page when the end of the list scrolls into view
+	useEffect(() => {
+		if (!nextCursor || isLoadingMore || loadMoreFailed || state.isLoading) return;
+
+		const observer = new IntersectionObserver(
+			(entries) => {
+				if (entries[0]?.isIntersecting) {
+					loadMoreThreads();
+				}
+			},
+			{ root: null, rootMargin: "100px", threshold: 0 }
+		);
+
+		if (loadMoreTriggerRef.current) {
+			observer.observe(loadMoreTriggerRef.current);
+		}
+
+		return () => observer.disconnect();
+	}, [loadMoreThreads, nextCursor, isLoadingMore, loadMoreFailed, state.isLoading]);
+
 	// Handle new thread creation
 	const handleNewThread = async () => {
 		await manager().createNewThread();
@@ -101,6 +153,9 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 	};
 
 	const displayedThreads = showArchived ? state.archivedThreads : state.threads;
+	// "+" marks a list with pages that have not been loaded yet
+	const activeCount = `${state.threads.length}${state.nextCursor ? "+" : ""}`;
+	const archivedCount = `${state.archivedThreads.length}${state.archivedNextCursor ? "+" : ""}`;
 
 	if (state.isLoading) {
 		return (
@@ -153,7 +208,7 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 							: "text-muted-foreground hover:text-foreground"
 					)}
 				>
-					Aktiva ({state.threads.length})
+					Aktiva ({activeCount})
 				</button>
 				<button
 					type="button"
@@ -165,7 +220,7 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 							: "text-muted-foreground hover:text-foreground"
 					)}
 				>
-					Arkiverade ({state.archivedThreads.length})
+					Arkiverade ({archivedCount})
 				</button>
 			</div>
 
@@ -198,6 +253,18 @@ export function ThreadList({ searchSpaceId, currentThreadId, className }: Thread
 								onDelete={() => handleDelete(thread.id)}
 							/>
 						))}
+						{nextCursor && (
+							<div ref={loadMoreTriggerRef} className="flex justify-center py-2">
+								{isLoadingMore && (
+									<span className="text-muted-foreground text-xs">Läser in fler...</span>
+								)}
+								{loadMoreFailed && !isLoadingMore && (
+									<Button variant="ghost" size="sm" onClick={loadMoreThreads}>
+										Försök igen
+									</Button>
+								)}
+							</div>
+						)}
 					</div>
 				)}
 			</div>
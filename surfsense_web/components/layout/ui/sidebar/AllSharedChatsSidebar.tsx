@@ -1,6 +1,6 @@
 "use client";
 
-import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useQuery, useQueryClient } from "@tanstack/react-query";
 import { format } from "date-fns";
 import {
 	ArchiveIcon,
@@ -16,7 +16,7 @@ import {
 import { AnimatePresence, motion } from "motion/react";
 import { useParams, useRouter } from "next/navigation";
 import { useTranslations } from "next-intl";
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { createPortal } from "react-dom";
 import { toast } from "sonner";
 import { Button } from "@/components/ui/button";
@@ -42,7 +42,7 @@ import { Tooltip, TooltipContent, TooltipTrigger } from "@/components/ui/tooltip
 import { useDebouncedValue } from "@/hooks/use-debounced-value";
 import {
 	deleteThread,
-	fetchThreads,
+	fetchThreadPage,
 	searchThreads,
 	updateThread,
 } from "@/lib/chat/thread-persistence";
@@ -82,6 +82,7 @@ export function AllSharedChatsSidebar({
 	const [renameDialogOpen, setRenameDialogOpen] = useState(false);
 	const [isRenaming, setIsRenaming] = useState(false);
 	const debouncedSearchQuery = useDebouncedValue(searchQuery, 300);
+	const loadMoreTriggerRef = useRef<HTMLDivElement>(null);
 
 	const isSearchMode = !!debouncedSearchQuery.trim();
 
@@ -116,13 +117,30 @@ export function AllSharedChatsSidebar({
 		}
 	}, [open]);
 
-	const {
-		data: threadsData,
-		error: threadsError,
-		isLoading: isLoadingThreads,
-	} = useQuery({
-		queryKey: ["all-threads", searchSpaceId],
-		queryFn: () => fetchThreads(Number(searchSpaceId)),
+	// Active and archived shared chats are paged separately, newest first
+	const activeQuery = useInfiniteQuery({
+		queryKey: ["all-threads", searchSpaceId, "shared", "active"],
+		queryFn: ({ pageParam }) =>
+			fetchThreadPage(Number(searchSpaceId), {
+				archived: false,
+				cursor: pageParam,
+				visibility: "SEARCH_SPACE",
+			}),
+		initialPageParam: undefined as string | undefined,
+		getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+		enabled: !!searchSpaceId && open && !isSearchMode,
+	});
+
+	const archivedQuery = useInfiniteQuery({
+		queryKey: ["all-threads", searchSpaceId, "shared", "archived"],
+		queryFn: ({ pageParam }) =>
+			fetchThreadPage(Number(searchSpaceId), {
+				archived: true,
+				cursor: pageParam,
+				visibility: "SEARCH_SPACE",
+			}),
+		initialPageParam: undefined as string | undefined,
+		getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
 		enabled: !!searchSpaceId && open && !isSearchMode,
 	});
 
@@ -136,7 +154,7 @@ export function AllSharedChatsSidebar({
 		enabled: !!searchSpaceId && open && isSearchMode,
 	});
 
-	// Filter to only shared chats (SEARCH_SPACE visibility)
+	// Search results cover all visibilities, so keep only shared chats
 	const { activeChats, archivedChats } = useMemo(() => {
 		if (isSearchMode) {
 			const sharedSearchResults = (searchData ?? []).filter(
@@ -148,19 +166,35 @@ export function AllSharedChatsSidebar({
 			};
 		}
 
-		if (!threadsData) return { activeChats: [], archivedChats: [] };
+		return {
+			activeChats: activeQuery.data?.pages.flatMap((page) => page.items) ?? [],
+			archivedChats: archivedQuery.data?.pages.flatMap((page) => page.items) ?? [],
+		};
+	}, [activeQuery.data, archivedQuery.data, searchData, isSearchMode]);
 
-		const activeShared = threadsData.threads.filter(
-			(thread) => thread.visibility === "SEARCH_SPACE"
-		);
-		const archivedShared = threadsData.archived_threads.filter(
-			(thread) => thread.visibility === "SEARCH_SPACE"
+	const threads = showArchived ? archivedChats : activeChats;
+	const pageQuery = showArchived ? archivedQuery : activeQuery;
+	const { fetchNextPage, hasNextPage, isFetchingNextPage } = pageQuery;
+
+	// Load the next page when the end of the list scrolls into view
+	useEffect(() => {
+		if (!hasNextPage || isFetchingNextPage || !open || isSearchMode) return;
+
+		const observer = new IntersectionObserver(
+			(entries) => {
+				if (entries[0]?.isIntersecting) {
+					fetchNextPage();
+				}
+			},
+			{ root: null, rootMargin: "100px", threshold: 0 }
 		);
 
-		return { activeChats: activeShared, archivedChats: archivedShared };
-	}, [threadsData, searchData, isSearchMode]);
+		if (loadMoreTriggerRef.current) {
+			observer.observe(loadMoreTriggerRef.current);
+		}
 
-	const threads = showArchived ? archivedChats : activeChats;
+		return () => observer.disconnect();
+	}, [fetchNextPage, hasNextPage, isFetchingNextPage, open, isSearchMode]);
 
 	const handleThreadClick = useCallback(
 		(threadId: number) => {
@@ -256,11 +290,12 @@ export function AllSharedChatsSidebar({
 		setSearchQuery("");
 	}, []);
 
-	const isLoading = isSearchMode ? isLoadingSearch : isLoadingThreads;
-	const error = isSearchMode ? searchError : threadsError;
+	const isLoading = isSearchMode ? isLoadingSearch : pageQuery.isLoading;
+	const error = isSearchMode ? searchError : pageQuery.error;
 
-	const activeCount = activeChats.length;
-	const archivedCount = archivedChats.length;
+	// "+" marks a tab whose list has more pages to load
+	const activeCount = `${activeChats.length}${activeQuery.hasNextPage ? "+" : ""}`;
+	const archivedCount = `${archivedChats.length}${archivedQuery.hasNextPage ? "+" : ""}`;
 
 	if (!mounted) return null;
 
@@ -461,6 +496,13 @@ export function AllSharedChatsSidebar({
 											</div>
 										);
 									})}
+									{!isSearchMode && hasNextPage && (
+										<div ref={loadMoreTriggerRef} className="flex justify-center py-2">
+											{isFetchingNextPage && (
+												<Spinner size="sm" className="text-muted-foreground" />
+											)}
+										</div>
+									)}
 								</div>
 							) : isSearchMode ? (
 								<div className="text-center py-8">
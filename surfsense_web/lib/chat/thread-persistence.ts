@@ -40,6 +40,8 @@ export interface MessageRecord {
 export interface ThreadListResponse {
 	threads: ThreadListItem[];
 	archived_threads: ThreadListItem[];
+	next_cursor: string | null;
+	archived_next_cursor: string | null;
 }
 
 export interface ThreadListItem {
@@ -62,17 +64,59 @@ export interface ThreadHistoryLoadResponse {
 // =============================================================================
 
 /**
- * Fetch list of threads for a search space
+ * Fetch one page of threads for a search space.
+ *
+ * Active and archived threads are paged independently: pass `next_cursor` /
+ * `archived_next_cursor` from the previous response as `cursor` /
+ * `archivedCursor` to get the following page.
  */
 export async function fetchThreads(
 	searchSpaceId: number,
-	limit?: number
+	limit?: number,
+	options?: {
+		cursor?: string;
+		archivedLimit?: number;
+		archivedCursor?: string;
+		archived?: boolean;
+		visibility?: ChatVisibility;
+	}
 ): Promise<ThreadListResponse> {
 	const params = new URLSearchParams({ search_space_id: String(searchSpaceId) });
 	if (limit) params.append("limit", String(limit));
+	if (options?.cursor) params.append("cursor", options.cursor);
+	if (options?.archivedLimit) params.append("archived_limit", String(options.archivedLimit));
+	if (options?.archivedCursor) params.append("archived_cursor", options.archivedCursor);
+	if (options?.archived !== undefined) params.append("archived", String(options.archived));
+	if (options?.visibility) params.append("visibility", options.visibility);
 	return baseApiService.get<ThreadListResponse>(`/api/v1/threads?${params}`);
 }
 
+export interface ThreadPage {
+	items: ThreadListItem[];
+	nextCursor: string | null;
+}
+
+/**
+ * Fetch one page of either active or archived threads.
+ */
+export async function fetchThreadPage(
+	searchSpaceId: number,
+	options: { archived: boolean; cursor?: string; limit?: number; visibility?: ChatVisibility }
+): Promise<ThreadPage> {
+	const { archived, cursor, limit, visibility } = options;
+	const response = archived
+		? await fetchThreads(searchSpaceId, undefined, {
+				archived,
+				archivedCursor: cursor,
+				archivedLimit: limit,
+				visibility,
+			})
+		: await fetchThreads(searchSpaceId, limit, { archived, cursor, visibility });
+	return archived
+		? { items: response.archived_threads, nextCursor: response.archived_next_cursor }
+		: { items: response.threads, nextCursor: response.next_cursor };
+}
+
 /**
  * Search threads by title
  */
@@ -198,6 +242,10 @@ export interface ThreadListAdapterConfig {
 export interface ThreadListState {
 	threads: ThreadListItem[];
 	archivedThreads: ThreadListItem[];
+	/** Cursor of the next active page, `null` once every thread is loaded */
+	nextCursor: string | null;
+	/** Cursor of the next archived page, `null` once every thread is loaded */
+	archivedNextCursor: string | null;
 	isLoading: boolean;
 	error: string | null;
 }
@@ -205,6 +253,8 @@ export interface ThreadListState {
 /**
  * Creates a thread list management object.
  * This provides methods to manage the thread list for the sidebar.
+ * Threads are loaded one page at a time; `loadMoreThreads` fetches the page
+ * after a cursor from the returned state.
  */
 export function createThreadListManager(config: ThreadListAdapterConfig) {
 	return {
@@ -214,6 +264,8 @@ export function createThreadListManager(config: ThreadListAdapterConfig) {
 				return {
 					threads: response.threads,
 					archivedThreads: response.archived_threads,
+					nextCursor: response.next_cursor,
+					archivedNextCursor: response.archived_next_cursor,
 					isLoading: false,
 					error: null,
 				};
@@ -222,12 +274,23 @@ export function createThreadListManager(config: ThreadListAdapterConfig) {
 				return {
 					threads: [],
 					archivedThreads: [],
+					nextCursor: null,
+					archivedNextCursor: null,
 					isLoading: false,
 					error: error instanceof Error ? error.message : "Failed to load threads",
 				};
 			}
 		},
 
+		async loadMoreThreads(archived: boolean, cursor: string): Promise<ThreadPage | null> {
+			try {
+				return await fetchThreadPage(config.searchSpaceId, { archived, cursor });
+			} catch (error) {
+				console.error("[ThreadListManager] Failed to load more threads:", error);
+				return null;
+			}
+		},
+
 		async createNewThread(title = "New Chat"): Promise<number | null> {
 			try {
 				const thread = await createThread(config.searchSpaceId, title);